@@ -0,0 +1,82 @@
+"""
+Memory footprint of a parsed configuration.
+
+Generates a synthetic configuration, parses it with ``parse_file`` and reports
+the memory retained by the resulting tree (tracemalloc) and the growth of the
+resident set size of the process.
+
+Usage:
+    python benchmarks/bench_memory.py [--virtual-servers N] [--real-servers N] [--src PATH]
+
+Pass ``--src`` with the ``src`` directory of another checkout to compare two
+versions of the package.
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from config_generator import generate_config
+
+
+def rss_bytes() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--virtual-servers", type=int, default=5000)
+    parser.add_argument("--real-servers", type=int, default=8)
+    parser.add_argument(
+        "--src",
+        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"),
+        help="src directory containing the keepalived_config package",
+    )
+    args = parser.parse_args()
+
+    sys.path.insert(0, args.src)
+    from keepalived_config import KeepAlivedConfigParser
+
+    with tempfile.NamedTemporaryFile("w", suffix=".conf", delete=False) as f:
+        f.write(
+            generate_config(args.virtual_servers, args.real_servers, args.real_servers, checks=("TCP_CHECK",))
+        )
+        config_file = f.name
+
+    try:
+        gc.collect()
+        rss_before = rss_bytes()
+        config = KeepAlivedConfigParser().parse_file(config_file)
+        gc.collect()
+        rss_after = rss_bytes()
+
+        # parse again under tracemalloc to measure what the tree itself retains
+        del config
+        gc.collect()
+        tracemalloc.start()
+        config = KeepAlivedConfigParser().parse_file(config_file)
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        os.remove(config_file)
+
+    nodes = 0
+    stack = list(config.params)
+    while stack:
+        item = stack.pop()
+        nodes += 1
+        stack.extend(getattr(item, "params", ()))
+
+    print(f"package:        {os.path.abspath(args.src)}")
+    print(f"nodes:          {nodes}")
+    print(f"rss growth:     {(rss_after - rss_before) / 2**20:.1f} MiB")
+    print(f"tree retained:  {retained / 2**20:.1f} MiB ({retained / nodes:.0f} bytes/node)")
+    print(f"parse peak:     {peak / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
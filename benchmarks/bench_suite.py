@@ -0,0 +1,297 @@
+"""
+Performance suite over synthetic configurations.
+
+For every size (number of virtual_server blocks) a deterministic configuration
+is generated (see config_generator.py) and the following operations are
+measured: parse_string, parse_file, to_str, save, manager CRUD calls and
+validate. Every benchmark reports the best wall time of ``--repeat`` runs and
+the peak traced memory of one extra run under tracemalloc (timings are never
+taken while tracing). Results are written as JSON so two commits can be
+compared on the same machine.
+
+Usage:
+    python benchmarks/bench_suite.py [--sizes 10,100,1000] [--min-real-servers N]
+        [--max-real-servers N] [--repeat N] [--only NAME,...] [--src PATH] [-o results.json]
+    python benchmarks/bench_suite.py --compare old.json new.json [--threshold 0.10]
+
+``--compare`` prints the time and peak memory ratio of every benchmark present
+in both files and exits with status 1 if any time ratio exceeds
+``1 + threshold``.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from config_generator import generate_config
+
+# number of calls of every manager CRUD benchmark
+CRUD_OPS = 200
+
+
+class Context:
+    """Inputs shared by the benchmarks of one size"""
+
+    def __init__(self, text: str, config_file: str, work_dir: str):
+        from keepalived_config import KeepAlivedConfigParser
+
+        self.text = text
+        self.config_file = config_file
+        self.work_dir = work_dir
+        self.parser_class = KeepAlivedConfigParser
+
+    def parse(self):
+        return self.parser_class().parse_string(self.text)
+
+    def manager(self):
+        from keepalived_config import KeepAlivedConfigManager
+
+        return KeepAlivedConfigManager(self.parse())
+
+
+# each benchmark returns (setup, run): setup() builds the input outside of the
+# measurement, run(state) is the measured call
+
+
+def bench_parse_string(ctx):
+    return (lambda: None), (lambda _: ctx.parse())
+
+
+def bench_parse_file(ctx):
+    return (lambda: None), (lambda _: ctx.parser_class().parse_file(ctx.config_file))
+
+
+def bench_to_str(ctx):
+    return ctx.parse, (lambda config: config.to_str())
+
+
+def bench_save(ctx):
+    out_file = os.path.join(ctx.work_dir, "save.conf")
+    return ctx.parse, (lambda config: config.save(out_file))
+
+
+def bench_save_atomic(ctx):
+    out_file = os.path.join(ctx.work_dir, "save_atomic.conf")
+
+    def setup():
+        if os.path.exists(out_file):
+            os.remove(out_file)
+        return ctx.parse()
+
+    return setup, (lambda config: config.save(out_file, atomic=True))
+
+
+def bench_crud_virtual_server(ctx):
+    def run(manager):
+        vs = manager.virtual_server
+        for i in range(CRUD_OPS):
+            ip = f"10.255.{i // 250}.{i % 250 + 1}"
+            vs.create_virtual_server(ip, 80, delay_loop=6, lb_algo="rr", lb_kind="DR", protocol="TCP")
+            vs.get_virtual_server(ip, 80)
+            vs.update_virtual_server(ip, 80, lb_algo="wrr")
+            vs.remove_virtual_server(ip, 80)
+
+    return ctx.manager, run
+
+
+def bench_crud_real_server(ctx):
+    def setup():
+        manager = ctx.manager()
+        manager.virtual_server.create_virtual_server("10.255.255.1", 80)
+        return manager
+
+    def run(manager):
+        vs = manager.virtual_server
+        for i in range(CRUD_OPS):
+            ip = f"10.254.{i // 250}.{i % 250 + 1}"
+            vs.add_real_server("10.255.255.1", 80, ip, 80, health_check="HTTP_GET")
+            vs.get_real_server("10.255.255.1", 80, ip, 80)
+            vs.update_real_server("10.255.255.1", 80, ip, 80, weight=2)
+            vs.remove_real_server("10.255.255.1", 80, ip, 80)
+
+    return setup, run
+
+
+def bench_crud_vrrp(ctx):
+    def run(manager):
+        vrrp = manager.vrrp
+        for i in range(CRUD_OPS):
+            name = f"VI_BENCH_{i}"
+            vrrp.create_vrrp_instance(
+                name, "BACKUP", f"bench{i // 255}", i % 255 + 1, 100,
+                virtual_ipaddresses=[f"10.253.{i // 250}.{i % 250 + 1}/32"],
+            )
+            vrrp.get_vrrp_instance(name)
+            vrrp.update_vrrp_instance(name, priority=150)
+            vrrp.remove_vrrp_instance(name)
+
+    return ctx.manager, run
+
+
+def bench_validate(ctx):
+    return ctx.manager, (lambda manager: manager.validate())
+
+
+BENCHMARKS = {
+    "parse_string": bench_parse_string,
+    "parse_file": bench_parse_file,
+    "to_str": bench_to_str,
+    "save": bench_save,
+    "save_atomic": bench_save_atomic,
+    "crud_virtual_server": bench_crud_virtual_server,
+    "crud_real_server": bench_crud_real_server,
+    "crud_vrrp": bench_crud_vrrp,
+    "validate": bench_validate,
+}
+
+
+def measure(setup, run, repeat: int) -> dict:
+    best = None
+    for _ in range(repeat):
+        state = setup()
+        gc.collect()
+        start = time.perf_counter()
+        run(state)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        del state
+
+    # peak memory of the measured call only, the input is built before tracing starts
+    state = setup()
+    gc.collect()
+    tracemalloc.start()
+    run(state)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del state
+    return {"time_s": best, "peak_bytes": peak}
+
+
+def git_commit(src: str):
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=src, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(args) -> dict:
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        sys.exit(f"unknown benchmarks: {', '.join(unknown)}")
+
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size in args.sizes:
+            text = generate_config(
+                size,
+                args.min_real_servers,
+                args.max_real_servers,
+                vrrp_instances=min(size, 1000),
+                seed=args.seed,
+            )
+            config_file = os.path.join(work_dir, f"keepalived_{size}.conf")
+            with open(config_file, "w") as f:
+                f.write(text)
+            ctx = Context(text, config_file, work_dir)
+
+            for name in names:
+                setup, run = BENCHMARKS[name](ctx)
+                result = measure(setup, run, args.repeat)
+                result.update({"benchmark": name, "size": size})
+                results.append(result)
+                print(
+                    f"{name:<22} {size:>7} vs  {result['time_s'] * 1000:>10.2f} ms  "
+                    f"{result['peak_bytes'] / 2**20:>9.1f} MiB peak",
+                    flush=True,
+                )
+            os.remove(config_file)
+
+    return {
+        "meta": {
+            "commit": git_commit(args.src),
+            "src": os.path.abspath(args.src),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "min_real_servers": args.min_real_servers,
+            "max_real_servers": args.max_real_servers,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "crud_ops": CRUD_OPS,
+        },
+        "results": results,
+    }
+
+
+def compare(old_file: str, new_file: str, threshold: float) -> int:
+    with open(old_file) as f:
+        old = json.load(f)
+    with open(new_file) as f:
+        new = json.load(f)
+
+    old_results = {(r["benchmark"], r["size"]): r for r in old["results"]}
+    regressions = 0
+    print(f"{'benchmark':<22} {'size':>7}  {'old ms':>10} {'new ms':>10} {'time':>7}  {'memory':>7}")
+    for result in new["results"]:
+        key = (result["benchmark"], result["size"])
+        if key not in old_results:
+            continue
+        before = old_results[key]
+        time_ratio = result["time_s"] / before["time_s"] if before["time_s"] else float("inf")
+        memory_ratio = result["peak_bytes"] / before["peak_bytes"] if before["peak_bytes"] else 1.0
+        flag = ""
+        if time_ratio > 1 + threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(
+            f"{key[0]:<22} {key[1]:>7}  {before['time_s'] * 1000:>10.2f} {result['time_s'] * 1000:>10.2f} "
+            f"{time_ratio:>6.2f}x  {memory_ratio:>6.2f}x{flag}"
+        )
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=lambda value: [int(size) for size in value.split(",")],
+        default=[10, 100, 1000],
+        help="comma separated numbers of virtual_server blocks (up to 100000)",
+    )
+    parser.add_argument("--min-real-servers", type=int, default=1)
+    parser.add_argument("--max-real-servers", type=int, default=16, help="up to 500")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", help="comma separated benchmark names: " + ", ".join(BENCHMARKS))
+    parser.add_argument(
+        "--src",
+        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"),
+        help="src directory containing the keepalived_config package",
+    )
+    parser.add_argument("-o", "--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two result files")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed time increase for --compare")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(compare(args.compare[0], args.compare[1], args.threshold))
+
+    sys.path.insert(0, args.src)
+    report = run_suite(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
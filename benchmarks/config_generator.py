@@ -0,0 +1,119 @@
+"""
+Deterministic generator of synthetic keepalived configurations.
+
+The same arguments always produce the same text, so benchmark results of two
+commits are measured on identical input. The number of real servers of every
+virtual server is drawn from ``[min_real_servers, max_real_servers]`` and the
+health checks cycle through ``checks`` with a seeded random generator.
+
+Usage:
+    python benchmarks/config_generator.py [--virtual-servers N] [--min-real-servers N]
+        [--max-real-servers N] [--vrrp-instances N] [--seed N] [-o FILE]
+"""
+import argparse
+import random
+import sys
+
+CHECKS = ("TCP_CHECK", "HTTP_GET", "UDP_CHECK")
+
+
+def _check_lines(check: str, rng: random.Random) -> list:
+    if check == "HTTP_GET":
+        return [
+            "        HTTP_GET {",
+            "            url {",
+            f"                path /health/{rng.randrange(100)}",
+            "                status_code 200",
+            "            }",
+            "            connect_timeout 3",
+            "        }",
+        ]
+    return [
+        f"        {check} {{",
+        "            connect_timeout 3",
+        "            delay_before_retry 3",
+        "        }",
+    ]
+
+
+def generate_config(
+    virtual_servers: int,
+    min_real_servers: int = 1,
+    max_real_servers: int = 500,
+    checks: tuple = CHECKS,
+    vrrp_instances: int = 0,
+    seed: int = 0,
+) -> str:
+    """
+    Generate the text of a configuration with ``virtual_servers`` virtual
+    servers and ``vrrp_instances`` VRRP instances.
+    """
+    rng = random.Random(seed)
+    lines = ["global_defs {", "    router_id LVS_BENCH", "}", ""]
+
+    for i in range(vrrp_instances):
+        lines += [
+            f"vrrp_instance VI_{i} {{",
+            f"    state {'MASTER' if i % 2 else 'BACKUP'}",
+            f"    interface eth{i // 255}",
+            f"    virtual_router_id {i % 255 + 1}",
+            f"    priority {100 + i % 50}",
+            "    advert_int 1",
+            "    virtual_ipaddress {",
+            f"        172.{16 + i // 65536 % 16}.{i // 256 % 256}.{i % 256}/32",
+            "    }",
+            "}",
+            "",
+        ]
+
+    for v in range(virtual_servers):
+        lines.append(f"# virtual server {v}")
+        lines.append(f"virtual_server 10.{v // 250 % 250}.{v % 250}.1 {80 + v // 62500} {{")
+        lines += [
+            "    delay_loop 6",
+            "    lb_algo rr",
+            "    lb_kind DR",
+            "    protocol TCP",
+        ]
+        if min_real_servers == max_real_servers:
+            real_servers = min_real_servers
+        else:
+            real_servers = rng.randint(min_real_servers, max_real_servers)
+        for r in range(real_servers):
+            check = checks[0] if len(checks) == 1 else rng.choice(checks)
+            lines += [
+                f"    real_server 192.{168 + r // 250}.{v % 250}.{r % 250 + 1} 80 {{",
+                "        weight 1",
+            ]
+            lines += _check_lines(check, rng)
+            lines.append("    }")
+        lines += ["}", ""]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--virtual-servers", type=int, default=100)
+    parser.add_argument("--min-real-servers", type=int, default=1)
+    parser.add_argument("--max-real-servers", type=int, default=500)
+    parser.add_argument("--vrrp-instances", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    args = parser.parse_args()
+
+    text = generate_config(
+        args.virtual_servers,
+        args.min_real_servers,
+        args.max_real_servers,
+        vrrp_instances=args.vrrp_instances,
+        seed=args.seed,
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,37 @@ from keepalived_config.keepalived_config_constants import KeepAlivedConfigConsta
 from keepalived_config.keepalived_config_param import KeepAlivedConfigParam
 from keepalived_config.keepalived_config_block import KeepAlivedConfigBlock
 from keepalived_config.keepalived_config_parser import KeepAlivedConfigParser
+from keepalived_config.keepalived_config_codec import KeepAlivedConfigCodec
+from keepalived_config.keepalived_config_cache import KeepAlivedConfigParseCache
+from keepalived_config.keepalived_config_snapshot import (
+    KeepAlivedConfigSnapshot,
+    KeepAlivedConfigSnapshotNode,
+    KeepAlivedConfigSnapshotParams,
+)
 from keepalived_config.keepalived_config import KeepAlivedConfig
+from keepalived_config.keepalived_config_index import KeepAlivedConfigIndexes
+from keepalived_config.keepalived_config_selector import KeepAlivedConfigSelector
+from keepalived_config.keepalived_config_diff import (
+    KeepAlivedConfigDiff,
+    KeepAlivedConfigChange,
+    KeepAlivedConfigChangeTypes,
+)
 from keepalived_config.keepalived_config_comment import KeepAlivedConfigComment
 from keepalived_config.keepalived_config_templates import KeepAlivedConfigTemplates
 from keepalived_config.keepalived_config_vrrp import KeepAlivedConfigVRRP
 from keepalived_config.keepalived_config_virtual_server import KeepAlivedConfigVirtualServer
 from keepalived_config.keepalived_config_result import OperationResult
+from keepalived_config.keepalived_config_metrics import (
+    KeepAlivedConfigMetrics,
+    KeepAlivedConfigMetricsSink,
+    KeepAlivedConfigHistogramSink,
+    KeepAlivedConfigCallbackSink,
+    KeepAlivedConfigPrometheusSink,
+)
+from keepalived_config.keepalived_config_lock import KeepAlivedConfigRWLock
+from keepalived_config.keepalived_config_transaction import KeepAlivedConfigTransaction
 from keepalived_config.keepalived_config_manager import KeepAlivedConfigManager
+from keepalived_config.keepalived_config_async import AsyncKeepAlivedConfigManager
 from keepalived_config.keepalived_config_types import VRRPConfig, VirtualServerConfig
 from keepalived_config.keepalived_config_base import KeepAlivedConfigBase
 from keepalived_config.keepalived_config_exceptions import (
@@ -29,5 +53,8 @@ from keepalived_config.keepalived_config_exceptions import (
     TemplateNotFoundError,
     ConfigParseError,
     ConfigSaveError,
-    ConfigValidationError
+    ConfigValidationError,
+    ConfigPatchError,
+    ConfigLockError,
+    ConfigTransactionError,
 )
\ No newline at end of file
@@ -1,8 +1,20 @@
+import io
+import locale
 import os
+import shutil
+import tempfile
+import weakref
+from stat import S_IMODE
 
 from keepalived_config.keepalived_config_constants import KeepAlivedConfigConstants
 from keepalived_config.keepalived_config_param import KeepAlivedConfigParam
 from keepalived_config.keepalived_config_block import KeepAlivedConfigBlock
+from keepalived_config.keepalived_config_param_list import KeepAlivedConfigParamList
+from keepalived_config.keepalived_config_diff import KeepAlivedConfigDiff
+from keepalived_config.keepalived_config_index import KeepAlivedConfigIndexes
+from keepalived_config.keepalived_config_selector import KeepAlivedConfigSelector
+from keepalived_config.keepalived_config_metrics import KeepAlivedConfigMetrics
+from keepalived_config.keepalived_config_snapshot import KeepAlivedConfigSnapshot
 from keepalived_config.keepalived_config_comment import (
     KeepAlivedConfigComment,
     KeepAlivedConfigCommentTypes,
@@ -17,7 +29,11 @@ class KeepAlivedConfig:
 
     def __init__(self, params: list = None, config_file=None):
         self._config_file = None
-        self._params: list[KeepAlivedConfigBlock | KeepAlivedConfigParam] = []
+        self._params: list[KeepAlivedConfigBlock | KeepAlivedConfigParam] = KeepAlivedConfigParamList(owner=self)
+        self._include_files: list[str] = []
+        self._indexes = None
+        # unreleased snapshots, see snapshot()
+        self._snapshots = weakref.WeakSet()
 
         if config_file:
             self.config_file = config_file
@@ -55,7 +71,25 @@ class KeepAlivedConfig:
                 f"Invalid params list! Expected list of {KeepAlivedConfigParam.__class__.__name__}' or {KeepAlivedConfigBlock.__class__.__name__}"
             )
 
-        self._params = params
+        self._params = KeepAlivedConfigParamList(params, owner=self)
+        if self._indexes is not None:
+            self._indexes.invalidate()
+
+    @property
+    def indexes(self) -> KeepAlivedConfigIndexes:
+        """
+        配置的二级索引（VRID、接口、VIP和真实服务器IP的反向查询），在第一次查询时构建
+        """
+        if self._indexes is None:
+            self._indexes = KeepAlivedConfigIndexes(self)
+        return self._indexes
+
+    @property
+    def include_files(self):
+        """
+        通过include指令引入的配置文件列表（按展开顺序）
+        """
+        return self._include_files
 
     @property
     def config_file(self):
@@ -83,13 +117,156 @@ class KeepAlivedConfig:
 
         self._config_file = config_file
 
+    # 比较本配置与另一个配置的结构差异
+    def diff(self, other: "KeepAlivedConfig") -> list:
+        """
+        比较本配置与另一个配置的结构差异
+
+        Args:
+            other (KeepAlivedConfig): 新配置
+
+        Returns:
+            list[KeepAlivedConfigChange]: 从本配置变为other所需的变化列表
+        """
+        return KeepAlivedConfigDiff.compare(self, other)
+
+    # 将变化列表一次性应用到本配置上
+    def apply_patch(self, changes: list):
+        """
+        将变化列表（diff()的结果或KeepAlivedConfigDiff.loads()还原的结果）一次性应用到本配置上
+
+        任何一处变化应用失败时，本配置保持原样。
+
+        Args:
+            changes (list[KeepAlivedConfigChange]): 变化列表
+
+        Raises:
+            ConfigPatchError: 当变化无法应用时
+        """
+        KeepAlivedConfigDiff.apply(self, changes)
+        if self._indexes is not None:
+            self._indexes.invalidate()
+
+    # 创建配置的只读快照
+    def snapshot(self) -> KeepAlivedConfigSnapshot:
+        """
+        创建配置的只读快照，耗时为O(1)
+
+        快照与配置共享未修改的节点，之后的修改只为快照保留被修改节点的原状态，
+        因此可以在不持有锁的情况下渲染或验证快照，同时继续修改配置。
+
+        Returns:
+            KeepAlivedConfigSnapshot: 快照，不再使用时应调用release()
+        """
+        return KeepAlivedConfigSnapshot(self)
+
+    # 按路径查询配置树中的节点
+    def select(self, query: str):
+        """
+        按路径查询配置树中的节点，语法见KeepAlivedConfigSelector
+
+        Args:
+            query (str): 查询字符串，例如"virtual_server[lb_kind=DR]/real_server[weight=0]"
+
+        Returns:
+            Iterator: 按文档顺序产生匹配的参数和配置块的生成器
+
+        Raises:
+            KeepAlivedConfigTypeError: 当查询不是字符串时
+            KeepAlivedConfigValueError: 当查询语法无效时
+        """
+        return KeepAlivedConfigSelector.select(self._params, query)
+
+    # 逐行产生整个配置的字符串格式
+    def iter_lines(self):
+        """
+        逐行产生整个配置的字符串格式（不包含换行符），整个配置树只遍历一次
+
+        Yields:
+            str: 配置行
+        """
+        for item in self._flat_items():
+            yield from item.iter_lines()
+
+    # 将整个配置直接写入文件对象
+    @KeepAlivedConfigMetrics.timed("config.write_to")
+    def write_to(self, fp):
+        """
+        将整个配置直接写入文件对象，内容与save()写入单个文件时一致
+
+        已修改的配置块以流式方式写入，不会缓存其渲染结果。
+
+        Args:
+            fp: 可写的文本文件对象
+        """
+        for item in self._flat_items():
+            item.write_to(fp)
+            fp.write("\n")
+
+    # 将整个配置转换为字符串格式
+    @KeepAlivedConfigMetrics.timed("config.to_str")
+    def to_str(self) -> str:
+        """
+        将整个配置转换为字符串格式，内容与save()写入单个文件时一致
+
+        展开过include指令的配置（include_files不为空）合并为单个文件：顶层的include指令
+        已被其引入的条目替代，不会输出，否则重新解析时这些条目会出现两次。
+
+        Returns:
+            str: 配置字符串
+        """
+        buffer = io.StringIO()
+        self._write_items(buffer, self._flat_items())
+        return buffer.getvalue()
+
+    # 合并为单个文件时的顶层条目，展开过的include指令被省略
+    def _flat_items(self) -> list:
+        if not self._include_files:
+            return self._params
+        return [item for item in self._params if not self._is_include(item)]
+
+    @staticmethod
+    def _is_include(item) -> bool:
+        # the check of KeepAlivedConfigParser._find_includes
+        return (
+            not isinstance(item, KeepAlivedConfigBlock)
+            and item.name == KeepAlivedConfigConstants.INCLUDE_DIRECTIVE
+        )
+
+    # 参数列表内容变化时由KeepAlivedConfigParamList调用，顶层没有需要失效的渲染缓存
+    def _touch(self):
+        pass
+
+    # 写入条目，未修改的配置块直接使用缓存的渲染结果，已修改的配置块重新渲染并缓存
+    @staticmethod
+    def _write_items(fp, items):
+        for item in items:
+            fp.write(item.to_str())
+            fp.write("\n")
+
     # 将配置保存到文件
-    def save(self, file=None):
+    @KeepAlivedConfigMetrics.timed("config.save")
+    def save(self, file=None, atomic: bool = False, backup: bool = False) -> bool:
         """
         将配置保存到文件
+
+        保存到配置自身的文件（file为空或与config_file相同）时，通过include引入的条目（source_file不为空）
+        会写回其来源文件，其余条目写入主配置文件。
+        file指定了其他路径时视为导出，所有条目合并写入该文件，内容与to_str()一致，不会改写include引入的文件；
+        展开过的include指令不写入导出的文件，其引入的条目已经在其中。
+
+        atomic为True时，每个文件先写入同一目录下的临时文件并fsync，然后通过rename替换目标文件
+        并fsync所在目录，keepalived在任何时刻都不会读到写了一半的文件。临时文件会继承原文件的
+        权限和属主；渲染结果在写入时逐块与磁盘上的内容比较，第一处不同时才创建临时文件，完全一致时跳过该文件，
+        不创建临时文件、不写入磁盘、不产生新inode。
         
         Args:
-            file (str, optional): 保存文件路径
+            file (str, optional): 保存文件路径，为空时使用config_file
+            atomic (bool): 是否使用原子保存模式
+            backup (bool): 原子保存模式下，替换前是否将原文件复制为"<文件名>.bak"
+
+        Returns:
+            bool: 是否有文件被写入（原子保存模式下内容未变化的文件不计入）
             
         Raises:
             ConfigSaveError: 当配置保存失败时
@@ -98,8 +275,161 @@ class KeepAlivedConfig:
             if not file:
                 file = self.config_file
 
-            with open(file, "w") as f:
+            if self.config_file and os.path.realpath(file) == os.path.realpath(self.config_file):
+                # included files are always rewritten, even if all their items were removed
+                files = {file: []}
+                for include_file in self._include_files:
+                    files.setdefault(include_file, [])
                 for item in self._params:
-                    f.write(item.to_str() + "\n")
+                    files.setdefault(item.source_file or file, []).append(item)
+            else:
+                # an export to another path leaves the included files alone
+                files = {file: list(self._flat_items())}
+
+            changed = False
+            for path, items in files.items():
+                if atomic:
+                    changed = self._write_file_atomic(path, items, backup) or changed
+                else:
+                    with open(path, "w") as f:
+                        self._write_items(f, items)
+                    changed = True
+            return changed
         except Exception as e:
-            raise ConfigSaveError(f"保存配置失败: {str(e)}") from e
\ No newline at end of file
+            raise ConfigSaveError(f"保存配置失败: {str(e)}") from e
+
+    # 原子地写入单个文件，内容未变化时返回False
+    def _write_file_atomic(self, path: str, items: list, backup: bool) -> bool:
+        # replace the file a symlink points to, not the symlink itself
+        target = os.path.realpath(path)
+        directory = os.path.dirname(target)
+
+        exists = os.path.exists(target)
+        writer = _AtomicFileWriter(target, exists)
+        try:
+            self._write_items(writer, items)
+            tmp_file = writer.finish()
+        except BaseException:
+            writer.discard()
+            raise
+        if tmp_file is None:
+            return False
+
+        try:
+            if exists:
+                stat = os.stat(target)
+                os.chmod(tmp_file, S_IMODE(stat.st_mode))
+                try:
+                    os.chown(tmp_file, stat.st_uid, stat.st_gid)
+                except PermissionError:
+                    # only root may hand files to other users, keep ours
+                    pass
+
+                if backup:
+                    shutil.copy2(target, f"{target}.bak")
+            else:
+                # mkstemp creates the file with 0600, use the mode open() would have used
+                umask = os.umask(0)
+                os.umask(umask)
+                os.chmod(tmp_file, 0o666 & ~umask)
+
+            os.replace(tmp_file, target)
+        except BaseException:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            raise
+
+        self._fsync_directory(directory)
+        return True
+
+    @staticmethod
+    def _fsync_directory(directory: str):
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            # not supported by every platform/filesystem
+            pass
+        finally:
+            os.close(fd)
+
+
+class _AtomicFileWriter:
+    """
+    原子保存时的写入对象：渲染结果逐块与目标文件比较，在第一处不同时才创建临时文件，
+    复制目标文件中相同的前缀后继续写入；内容完全一致时不创建临时文件，也不写入磁盘
+    """
+
+    _COPY_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, target: str, exists: bool):
+        self._target = target
+        # the encoding open() uses in the non-atomic mode
+        self._encoding = locale.getpreferredencoding(False)
+        self._original = open(target, "rb") if exists else None
+        self._matched = 0
+        self._fp = None
+        self._tmp_file = None
+
+    def write(self, text: str):
+        data = text.encode(self._encoding)
+        if self._fp is None:
+            if self._original is not None and self._original.read(len(data)) == data:
+                self._matched += len(data)
+                return
+            self._open_temp()
+        self._fp.write(data)
+
+    # 创建临时文件并写入与目标文件相同的前缀
+    def _open_temp(self):
+        fd, self._tmp_file = tempfile.mkstemp(
+            prefix=f".{os.path.basename(self._target)}.", suffix=".tmp", dir=os.path.dirname(self._target)
+        )
+        self._fp = os.fdopen(fd, "wb")
+        original = self._original
+        if original is None:
+            return
+        original.seek(0)
+        remaining = self._matched
+        while remaining:
+            chunk = original.read(min(remaining, self._COPY_CHUNK_SIZE))
+            if not chunk:
+                raise OSError(f"'{self._target}' was truncated while saving")
+            self._fp.write(chunk)
+            remaining -= len(chunk)
+        original.close()
+        self._original = None
+
+    def finish(self):
+        """
+        结束写入，返回已fsync的临时文件路径，内容与目标文件完全一致时返回None
+        """
+        if self._fp is None:
+            # the target has more content, or does not exist yet
+            if self._original is None or self._original.read(1):
+                self._open_temp()
+            else:
+                self._original.close()
+                self._original = None
+                return None
+        self._fp.flush()
+        os.fsync(self._fp.fileno())
+        self._fp.close()
+        self._fp = None
+        return self._tmp_file
+
+    def discard(self):
+        """
+        关闭文件并删除临时文件
+        """
+        if self._original is not None:
+            self._original.close()
+            self._original = None
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+        if self._tmp_file is not None and os.path.exists(self._tmp_file):
+            os.remove(self._tmp_file)
@@ -0,0 +1,362 @@
+import asyncio
+import contextlib
+import contextvars
+import functools
+import inspect
+import os
+from concurrent.futures import Executor
+from typing import Callable, Optional
+
+from keepalived_config.keepalived_config import KeepAlivedConfig
+from keepalived_config.keepalived_config_codec import KeepAlivedConfigCodec
+from keepalived_config.keepalived_config_parser import KeepAlivedConfigParser
+from keepalived_config.keepalived_config_cache import KeepAlivedConfigParseCache
+from keepalived_config.keepalived_config_manager import KeepAlivedConfigManager
+from keepalived_config.keepalived_config_result import OperationResult
+from keepalived_config.keepalived_config_snapshot import KeepAlivedConfigSnapshot
+from keepalived_config.keepalived_config_exceptions import (
+    ConfigParseError,
+    ConfigTransactionError,
+)
+
+
+# lock scopes of the current task, inherited by the tasks it creates
+_lock_scopes = contextvars.ContextVar("keepalived_config_lock_scopes", default=())
+
+
+class _LockScope:
+    """
+    locked()的一次持有；在其范围内创建的子任务只在该次持有尚未结束时重入，并通过children锁依次执行
+    """
+
+    __slots__ = ("manager", "parent", "active", "children")
+
+    def __init__(self, manager, parent):
+        self.manager = manager
+        self.parent = parent
+        self.active = True
+        self.children = asyncio.Lock()
+
+
+# 在子进程中解析配置文件，返回编码后的顶层条目（配置树对象不能高效地跨进程传递）
+def _parse_file_encoded(config_file: str, resolve_includes: bool) -> tuple:
+    config = KeepAlivedConfigParser().parse_file(config_file, resolve_includes=resolve_includes)
+    items = [(item.source_file, KeepAlivedConfigCodec.encode_item(item)) for item in config.params]
+    return items, list(config.include_files)
+
+
+# 从子进程返回的编码结果重新构建配置对象
+def _decode_config(config_file: str, items: list, include_files: list) -> KeepAlivedConfig:
+    config = KeepAlivedConfig(config_file=config_file)
+    nodes = []
+    for source_file, data in items:
+        node = KeepAlivedConfigCodec.decode_item(data)
+        if source_file is not None:
+            node.source_file = source_file
+        nodes.append(node)
+    config.params.extend(nodes)
+    config.include_files.extend(include_files)
+    return config
+
+
+class AsyncKeepAlivedConfigManager:
+    """
+    KeepAlivedConfigManager的asyncio版本
+
+    文件读写、解析和保存在线程池中执行，不阻塞事件循环；设置process_executor后，大于process_min_bytes的
+    配置文件在进程池中解析，结果以编解码器（KeepAlivedConfigCodec）的紧凑结构传回。
+    所有操作通过一个asyncio锁互斥执行，持有锁的任务可以重入（例如在transaction()内调用vrrp和virtual_server的方法），
+    在锁的范围内创建的子任务在该范围结束之前也可以重入，但彼此之间仍然依次执行；返回值和异常与同步的KeepAlivedConfigManager相同。
+
+    vrrp和virtual_server的方法以协程的形式提供，例如await manager.virtual_server.add_real_server(...)。
+    直接修改配置树或使用同步管理器（manager属性）时，应在locked()范围内进行，
+    否则可能与在线程池中执行的保存操作同时访问配置树。
+
+    Example:
+        ```python
+        async with AsyncKeepAlivedConfigManager(process_executor=ProcessPoolExecutor()) as manager:
+            await manager.load_config("/etc/keepalived/keepalived.conf")
+            async with manager.transaction():
+                await manager.virtual_server.create_virtual_server("10.0.0.1", 80)
+                await manager.virtual_server.add_real_server("10.0.0.1", 80, "10.0.1.1", 80)
+            await manager.save_config(atomic=True)
+        ```
+    """
+
+    # 使用进程池解析的最小文件大小，较小的文件在线程池中解析更快
+    PROCESS_MIN_BYTES = 256 * 1024
+
+    def __init__(
+        self,
+        config: Optional[KeepAlivedConfig] = None,
+        auto_save_path: Optional[str] = None,
+        parse_cache: Optional[KeepAlivedConfigParseCache] = None,
+        executor: Optional[Executor] = None,
+        process_executor: Optional[Executor] = None,
+        process_min_bytes: int = PROCESS_MIN_BYTES,
+    ):
+        """
+        初始化异步配置管理器
+
+        Args:
+            config (Optional[KeepAlivedConfig]): KeepAlived配置对象，如果未提供则创建新的
+            auto_save_path (Optional[str]): 自动保存路径，如果提供则在async with退出时自动保存
+            parse_cache (Optional[KeepAlivedConfigParseCache]): 解析缓存，设置后解析总是在线程池中进行
+                （命中时只需解码，且缓存对象不能传递到其他进程）
+            executor (Optional[Executor]): 执行文件读写、解析和保存的线程池，None表示使用事件循环的默认线程池
+            process_executor (Optional[Executor]): 解析大配置文件的进程池，None表示不使用进程池
+            process_min_bytes (int): 使用进程池解析的最小文件大小（字节）
+        """
+        self._manager = KeepAlivedConfigManager(config, auto_save_path, parse_cache)
+        self._parse_cache = parse_cache
+        self._executor = executor
+        self._process_executor = process_executor
+        self._process_min_bytes = process_min_bytes
+        self._lock = asyncio.Lock()
+        self.vrrp = _AsyncMethods(self, "vrrp")
+        self.virtual_server = _AsyncMethods(self, "virtual_server")
+
+    @property
+    def manager(self) -> KeepAlivedConfigManager:
+        """
+        同步配置管理器，应在locked()范围内使用
+        """
+        return self._manager
+
+    @property
+    def config(self) -> KeepAlivedConfig:
+        """
+        当前的配置对象
+        """
+        return self._manager.config
+
+    # 在async with语句范围内持有管理器的asyncio锁
+    @contextlib.asynccontextmanager
+    async def locked(self):
+        """
+        在async with语句范围内持有管理器的asyncio锁
+
+        每次持有记录为一个范围（保存在上下文变量中），可以重入：持有锁的任务再次调用locked()，
+        以及在范围内创建的子任务（例如asyncio.gather()、create_task()）调用locked()时，不再等待管理器的锁，
+        而是等待该范围的子任务锁，所以子任务之间、子任务与持有锁的任务的嵌套调用之间仍然依次执行。
+        范围结束之后仍在运行的子任务不再重入，需要重新等待管理器的锁。
+
+        直接在范围内修改配置树的同步代码不受子任务锁的保护，不应与访问配置的子任务同时进行。
+
+        Yields:
+            AsyncKeepAlivedConfigManager: 异步配置管理器
+        """
+        while True:
+            parent = self._active_scope()
+            lock = self._lock if parent is None else parent.children
+            await lock.acquire()
+            # the enclosing scope may have ended while this task was waiting
+            if parent is None or parent.active:
+                break
+            lock.release()
+
+        scope = _LockScope(self, parent)
+        token = _lock_scopes.set(_lock_scopes.get() + (scope,))
+        try:
+            yield self
+        finally:
+            scope.active = False
+            _lock_scopes.reset(token)
+            lock.release()
+
+    # 当前任务所在的、尚未结束的最内层锁范围
+    def _active_scope(self) -> Optional[_LockScope]:
+        for scope in reversed(_lock_scopes.get()):
+            if scope.manager is self:
+                while scope is not None and not scope.active:
+                    scope = scope.parent
+                return scope
+        return None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """
+        异步上下文管理器退出，如果设置了自动保存路径且没有异常则自动保存配置
+        """
+        if self._manager._auto_save_path is not None and exc_type is None:
+            await self.save_config(self._manager._auto_save_path)
+
+    async def _run(self, executor, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(executor, functools.partial(func, *args))
+
+    async def load_config(self, config_file: str, resolve_includes: bool = False) -> OperationResult:
+        """
+        从文件加载配置，读取和解析在线程池（或进程池）中进行，只有替换配置时持有锁
+
+        Args:
+            config_file (str): 配置文件路径
+            resolve_includes (bool): 是否展开include指令引用的配置文件
+
+        Returns:
+            OperationResult: 操作结果
+
+        Raises:
+            ConfigParseError: 当配置解析失败时
+        """
+        try:
+            if await self._use_processes(config_file):
+                items, include_files = await self._run(
+                    self._process_executor, _parse_file_encoded, config_file, resolve_includes
+                )
+                config = await self._run(self._executor, _decode_config, config_file, items, include_files)
+            else:
+                parser = KeepAlivedConfigParser(cache=self._parse_cache)
+                config = await self._run(self._executor, parser.parse_file, config_file, True, resolve_includes)
+            async with self.locked():
+                self._manager._set_config(config)
+            return OperationResult.ok(f"配置文件 '{config_file}' 加载成功")
+        except Exception as e:
+            raise ConfigParseError(f"加载配置文件失败: {str(e)}") from e
+
+    async def _use_processes(self, config_file: str) -> bool:
+        if self._process_executor is None or self._parse_cache is not None:
+            return False
+        try:
+            size = await self._run(self._executor, os.path.getsize, config_file)
+        except OSError:
+            # the parser reports the error
+            return False
+        return size >= self._process_min_bytes
+
+    async def save_config(
+        self, file_path: Optional[str] = None, atomic: bool = False, backup: bool = False
+    ) -> OperationResult:
+        """
+        保存配置到文件，渲染和写入在线程池中进行，期间持有锁，修改操作等待保存完成
+
+        Args:
+            file_path (Optional[str]): 保存文件路径，如果未提供则使用配置对象的默认路径
+            atomic (bool): 是否使用原子保存模式
+            backup (bool): 原子保存模式下，替换前是否保留"<文件名>.bak"备份
+
+        Returns:
+            OperationResult: 操作结果，数据部分表示是否有文件被写入
+
+        Raises:
+            ConfigSaveError: 当配置保存失败时
+        """
+        async with self.locked():
+            return await self._run(self._executor, self._manager.save_config, file_path, atomic, backup)
+
+    async def to_str(self) -> str:
+        """
+        在线程池中将配置转换为字符串格式
+
+        Returns:
+            str: 配置字符串
+        """
+        async with self.locked():
+            return await self._run(self._executor, self._manager.config.to_str)
+
+    async def validate(self) -> OperationResult:
+        """
+        验证配置完整性
+
+        Returns:
+            OperationResult: 操作结果，数据部分包含验证问题列表
+        """
+        async with self.locked():
+            return self._manager.validate()
+
+    def snapshot(self) -> KeepAlivedConfigSnapshot:
+        """
+        创建当前配置的只读快照，耗时为O(1)，快照可以在任何线程中读取而不持有锁
+
+        Returns:
+            KeepAlivedConfigSnapshot: 快照，不再使用时应调用release()或使用with语句
+        """
+        return self._manager.snapshot()
+
+    @contextlib.asynccontextmanager
+    async def transaction(self, save_hook: Optional[Callable[[list], None]] = None):
+        """
+        开始事务，async with语句正常结束时提交，发生异常时回滚，与KeepAlivedConfigManager.transaction()相同
+
+        事务持有管理器的锁直到结束；save_hook可以是普通函数或协程函数，抛出异常时事务回滚。
+
+        Args:
+            save_hook (Optional[Callable[[list], None]]): 最外层事务提交且配置有变化时调用，参数为变化列表
+
+        Yields:
+            KeepAlivedConfigTransaction: 事务
+
+        Raises:
+            ConfigTransactionError: 当为保存点指定save_hook时
+        """
+        async with self.locked():
+            if save_hook is not None and self._manager._transaction is not None:
+                raise ConfigTransactionError("Only the outermost transaction has a save hook")
+            # the hook may be a coroutine function, it is called here instead of by commit()
+            tx = self._manager.transaction()
+            try:
+                yield tx
+            except BaseException:
+                if tx.active:
+                    tx.rollback()
+                raise
+            if not tx.active:
+                return
+
+            if save_hook is not None:
+                changes = tx.pending_changes()
+                if changes:
+                    try:
+                        result = save_hook(changes)
+                        if inspect.isawaitable(result):
+                            await result
+                    except BaseException:
+                        tx.rollback()
+                        raise
+            tx.commit()
+
+    async def vrrp_instances(self) -> list:
+        """
+        获取所有VRRP实例名称
+
+        Returns:
+            list: VRRP实例名称列表
+        """
+        async with self.locked():
+            return self._manager.vrrp_instances
+
+    async def virtual_servers(self) -> list:
+        """
+        获取所有虚拟服务器名称
+
+        Returns:
+            list: 虚拟服务器名称列表
+        """
+        async with self.locked():
+            return self._manager.virtual_servers
+
+
+class _AsyncMethods:
+    """
+    将同步管理器（vrrp或virtual_server）的方法包装为持有管理器锁执行的协程函数
+    """
+
+    def __init__(self, owner: AsyncKeepAlivedConfigManager, name: str):
+        self._owner = owner
+        self._name = name
+
+    def __getattr__(self, attr):
+        value = getattr(getattr(self._owner._manager, self._name), attr)
+        if not callable(value):
+            return value
+
+        owner = self._owner
+        name = self._name
+
+        @functools.wraps(value)
+        async def call(*args, **kwargs):
+            async with owner.locked():
+                # looked up again, load_config() replaces the managers
+                return getattr(getattr(owner._manager, name), attr)(*args, **kwargs)
+        return call
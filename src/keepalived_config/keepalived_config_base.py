@@ -12,6 +12,9 @@ class KeepAlivedConfigBase:
     Keepalived配置管理基类，提供通用的配置操作方法
     """
 
+    # 线程安全模式下由KeepAlivedConfigManager设置的共享读写锁，None表示不加锁
+    _lock = None
+
     def _get_param(self, block: KeepAlivedConfigBlock, param_name: str) -> Optional[KeepAlivedConfigParam]:
         """
         在块中查找指定名称的参数
@@ -23,10 +26,7 @@ class KeepAlivedConfigBase:
         Returns:
             Optional[KeepAlivedConfigParam]: 参数对象，如果不存在则返回None
         """
-        for param in block.params:
-            if isinstance(param, KeepAlivedConfigParam) and param.name == param_name:
-                return param
-        return None
+        return block.params.find_one(param_name, KeepAlivedConfigParam)
 
     def _update_param(self, block: KeepAlivedConfigBlock, param_name: str, param_value: str):
         """
@@ -54,10 +54,7 @@ class KeepAlivedConfigBase:
         Returns:
             Optional[KeepAlivedConfigBlock]: 子块对象，如果不存在则返回None
         """
-        for param in block.params:
-            if isinstance(param, KeepAlivedConfigBlock) and param.name == block_name:
-                return param
-        return None
+        return block.params.find_one(block_name, KeepAlivedConfigBlock)
 
     def _add_comment(self, block: KeepAlivedConfigBlock, comment: str, inline: bool = False):
         """
@@ -2,25 +2,49 @@ from keepalived_config.keepalived_config_param import (
     KeepAlivedConfigParam,
     KeepAlivedConfigConstants,
 )
+from keepalived_config.keepalived_config_param_list import KeepAlivedConfigParamList
 
 
 class KeepAlivedConfigBlock(KeepAlivedConfigParam):
+    __slots__ = ("_params", "_rendered", "_rendered_level")
+
     def __init__(self, type_name: str, name: str = "", comments=None):
         if not isinstance(type_name, str):
             raise TypeError(
                 f"Invalid type type_name '{type(type_name)}'! Expected 'str'"
             )
 
+        # rendered text of the unchanged block, see to_str()
+        self._rendered = None
+        self._rendered_level = 0
+
+        # keep the (interned) type name itself for blocks without a name part
         super().__init__(
-            name=f"{type_name}{' ' + name if name else ''}", value="", comments=comments
+            name=f"{type_name} {name}" if name else type_name, value="", comments=comments
         )
 
-        self._params: list[KeepAlivedConfigParam | KeepAlivedConfigBlock] = []
+        self._params: list[KeepAlivedConfigParam | KeepAlivedConfigBlock] = KeepAlivedConfigParamList(owner=self)
+
+    # 使用已验证的完整名称直接创建配置块（跳过类型检查，用于批量生成节点）
+    @classmethod
+    def _from_trusted(cls, name: str):
+        block = super()._from_trusted(name)
+        block._rendered = None
+        block._rendered_level = 0
+        block._params = KeepAlivedConfigParamList(owner=block)
+        return block
 
     @property
     def params(self):
         return self._params
 
+    @property
+    def dirty(self):
+        """
+        配置块自上次渲染（to_str）以来是否被修改过
+        """
+        return self._rendered is None
+
     # 向配置块中添加参数或子块
     def add_param(self, param):
         if not isinstance(param, KeepAlivedConfigParam):
@@ -29,14 +53,47 @@ class KeepAlivedConfigBlock(KeepAlivedConfigParam):
             )
         self._params.append(param)
 
-    # 将配置块转换为字符串格式，包含所有子参数和适当的缩进
+    # 逐行产生配置块及其所有子参数的字符串格式，整个树只遍历一次
+    def iter_lines(self, indent_level=0):
+        header = None
+        for line in super().iter_lines(indent_level):
+            if header is not None:
+                yield header
+            header = line
+        yield f"{header} {{"
+
+        for param in self._params:
+            yield from param.iter_lines(indent_level + 1)
+
+        yield f"{KeepAlivedConfigConstants.get_indent(indent_level)}}}"
+
+    # 将配置块转换为字符串格式，未修改的配置块直接返回缓存的渲染结果
     def to_str(self, indent_level=0):
-        Str = f"{super().to_str(indent_level)} {{" + "\n"
-        if self._params:
-            Str += (
-                "\n".join([param.to_str((indent_level + 1)) for param in self._params])
-                + "\n"
-            )
-        Str += f"{KeepAlivedConfigConstants.get_indent(indent_level)}}}"
+        if self._rendered is None or self._rendered_level != indent_level:
+            lines = list(KeepAlivedConfigParam.iter_lines(self, indent_level))
+            lines[-1] = f"{lines[-1]} {{"
+            # sub blocks reuse their own cached text
+            lines.extend(param.to_str(indent_level + 1) for param in self._params)
+            lines.append(f"{KeepAlivedConfigConstants.get_indent(indent_level)}}}")
+
+            self._rendered = "\n".join(lines)
+            self._rendered_level = indent_level
+
+        return self._rendered
+
+    def write_to(self, fp, indent_level=0):
+        if self._rendered is not None and self._rendered_level == indent_level:
+            fp.write(self._rendered)
+            return
+        super().write_to(fp, indent_level)
 
-        return Str
\ No newline at end of file
+    # 使本配置块及其所有上级配置块缓存的渲染结果失效
+    def _touch(self):
+        block = self
+        # an unrendered block never has a rendered ancestor, so the walk can stop there
+        while block._rendered is not None:
+            block._rendered = None
+            parent = block._parent
+            if parent is None or not isinstance(parent.owner, KeepAlivedConfigBlock):
+                return
+            block = parent.owner
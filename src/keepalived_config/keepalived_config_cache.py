@@ -0,0 +1,247 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Callable, Optional
+
+from keepalived_config.keepalived_config_codec import KeepAlivedConfigCodec
+from keepalived_config.keepalived_config_exceptions import (
+    KeepAlivedConfigTypeError,
+    KeepAlivedConfigValueError,
+)
+
+
+class KeepAlivedConfigParseCache:
+    """
+    基于磁盘的解析结果缓存
+
+    每个配置文件（以及keep_empty_lines选项）对应缓存目录中的一个条目，条目以路径、
+    修改时间、文件大小和内容哈希作为键，保存编码后的配置树。命中时直接解码配置树，
+    跳过分词和正则匹配；缓存总大小超过max_bytes时，按最近使用时间淘汰最旧的条目。
+
+    Example:
+        ```python
+        cache = KeepAlivedConfigParseCache("/var/cache/keepalived-api")
+        config = KeepAlivedConfigParser(cache=cache).parse_file("/etc/keepalived/keepalived.conf")
+        print(cache.stats())
+        ```
+    """
+
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+    ENTRY_SUFFIX = ".json"
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        初始化解析缓存
+
+        Args:
+            cache_dir (str): 缓存目录，不存在时自动创建
+            max_bytes (int): 缓存目录的最大总大小（字节）
+
+        Raises:
+            KeepAlivedConfigTypeError: 当参数类型错误时
+            KeepAlivedConfigValueError: 当max_bytes无效时
+        """
+        if not isinstance(cache_dir, str):
+            raise KeepAlivedConfigTypeError(
+                f"Invalid cache_dir type '{type(cache_dir)}'! Expected 'str'"
+            )
+        if not isinstance(max_bytes, int) or max_bytes <= 0:
+            raise KeepAlivedConfigValueError(
+                f"Invalid max_bytes '{max_bytes}'! Expected positive integer"
+            )
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._cache_dir = cache_dir
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def cache_dir(self):
+        return self._cache_dir
+
+    @property
+    def max_bytes(self):
+        return self._max_bytes
+
+    # 从缓存加载配置文件的解析结果，未命中时调用parse解析并写入缓存
+    def load(
+        self,
+        path: str,
+        keep_empty_lines: bool,
+        parse: Callable[[bytes], list],
+    ) -> list:
+        """
+        从缓存加载配置文件的解析结果，未命中时调用parse解析并写入缓存
+
+        Args:
+            path (str): 配置文件路径
+            keep_empty_lines (bool): 解析时是否保留空行（属于缓存键的一部分）
+            parse (Callable[[bytes], list]): 未命中时用文件内容解析出顶层条目的函数
+
+        Returns:
+            list: 顶层参数和配置块列表（每次调用都是新的对象）
+
+        Raises:
+            FileNotFoundError: 当配置文件不存在时
+            OSError: 当配置文件读取失败时
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        with open(path, "rb") as f:
+            content = f.read()
+        content_hash = hashlib.sha256(content).hexdigest()
+
+        entry_file = self._entry_file(path, keep_empty_lines)
+        entry = self._read_entry(entry_file)
+        if (
+            entry is not None
+            and entry.get("path") == path
+            and entry.get("mtime_ns") == stat.st_mtime_ns
+            and entry.get("size") == stat.st_size
+            and entry.get("hash") == content_hash
+        ):
+            try:
+                items = KeepAlivedConfigCodec.decode(entry["items"])
+            except (KeyError, KeepAlivedConfigValueError):
+                items = None
+
+            if items is not None:
+                with self._lock:
+                    self._hits += 1
+                self._touch(entry_file)
+                return items
+
+        with self._lock:
+            self._misses += 1
+
+        items = parse(content)
+        self._write_entry(
+            entry_file,
+            {
+                "path": path,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "hash": content_hash,
+                "items": KeepAlivedConfigCodec.encode(items),
+            },
+        )
+        return items
+
+    # 使缓存失效
+    def invalidate(self, path: Optional[str] = None):
+        """
+        使缓存失效
+
+        Args:
+            path (Optional[str]): 配置文件路径，None表示清空全部缓存
+        """
+        if path is None:
+            entry_files = self._entry_files()
+        else:
+            path = os.path.abspath(path)
+            entry_files = [self._entry_file(path, keep) for keep in (True, False)]
+
+        for entry_file in entry_files:
+            try:
+                os.remove(entry_file)
+            except FileNotFoundError:
+                pass
+
+    # 获取缓存统计信息
+    def stats(self) -> dict:
+        """
+        获取缓存统计信息
+
+        Returns:
+            dict: 包含hits、misses、evictions、entries和size（字节）的字典
+        """
+        entry_files = self._entry_files()
+        size = 0
+        for entry_file in entry_files:
+            try:
+                size += os.path.getsize(entry_file)
+            except FileNotFoundError:
+                pass
+
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": len(entry_files),
+                "size": size,
+            }
+
+    def _entry_file(self, path: str, keep_empty_lines: bool) -> str:
+        key = hashlib.sha256(f"{path}\0{int(bool(keep_empty_lines))}".encode()).hexdigest()
+        return os.path.join(self._cache_dir, key + self.ENTRY_SUFFIX)
+
+    def _entry_files(self) -> list:
+        return [
+            os.path.join(self._cache_dir, name)
+            for name in os.listdir(self._cache_dir)
+            if name.endswith(self.ENTRY_SUFFIX)
+        ]
+
+    @staticmethod
+    def _read_entry(entry_file: str) -> Optional[dict]:
+        try:
+            with open(entry_file, "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            # missing or corrupt entries are treated as a miss
+            return None
+        return entry if isinstance(entry, dict) else None
+
+    @staticmethod
+    def _touch(entry_file: str):
+        try:
+            os.utime(entry_file)
+        except OSError:
+            pass
+
+    # 写入缓存条目，写入失败不影响解析结果
+    def _write_entry(self, entry_file: str, entry: dict):
+        tmp_file = f"{entry_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_file, "w") as f:
+                json.dump(entry, f, separators=(",", ":"))
+            os.replace(tmp_file, entry_file)
+        except OSError:
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+            return
+
+        self._evict(keep=entry_file)
+
+    # 按最近使用时间淘汰条目，直到缓存总大小不超过max_bytes
+    def _evict(self, keep: str):
+        entries = []
+        total = 0
+        for entry_file in self._entry_files():
+            try:
+                stat = os.stat(entry_file)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry_file))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, entry_file in entries:
+            if total <= self._max_bytes:
+                break
+            if entry_file == keep:
+                continue
+            try:
+                os.remove(entry_file)
+            except FileNotFoundError:
+                continue
+            total -= size
+            with self._lock:
+                self._evictions += 1
@@ -0,0 +1,94 @@
+from keepalived_config.keepalived_config_param import KeepAlivedConfigParam
+from keepalived_config.keepalived_config_block import KeepAlivedConfigBlock
+from keepalived_config.keepalived_config_comment import (
+    KeepAlivedConfigComment,
+    KeepAlivedConfigCommentTypes,
+)
+from keepalived_config.keepalived_config_exceptions import KeepAlivedConfigValueError
+
+
+class KeepAlivedConfigCodec:
+    """
+    配置树编解码器
+
+    将参数和配置块转换为只包含列表、字符串和整数的紧凑结构（可直接JSON序列化），
+    并能从该结构重新构建配置树，无需重新分词和正则匹配。
+
+    编码格式:
+        参数:   [0, name, value, comments]
+        配置块: [1, name, comments, [子节点...]]
+        注释:   [comment_str, type]
+    """
+
+    PARAM = 0
+    BLOCK = 1
+
+    # 将节点列表编码为基本类型结构
+    @classmethod
+    def encode(cls, items: list) -> list:
+        """
+        将节点列表编码为基本类型结构
+
+        Args:
+            items (list): 参数或配置块列表
+
+        Returns:
+            list: 编码后的结构
+        """
+        return [cls.encode_item(item) for item in items]
+
+    # 将单个节点编码为基本类型结构
+    @classmethod
+    def encode_item(cls, item: KeepAlivedConfigParam) -> list:
+        # read the backing field, the comments property would allocate a list for every node
+        comments = [
+            [comment.comment_str, comment.type.value] for comment in item._comments
+        ]
+        if isinstance(item, KeepAlivedConfigBlock):
+            return [cls.BLOCK, item.name, comments, cls.encode(item.params)]
+        return [cls.PARAM, item.name, item.value, comments]
+
+    # 将基本类型结构解码为节点列表
+    @classmethod
+    def decode(cls, data: list) -> list:
+        """
+        将基本类型结构解码为节点列表
+
+        Args:
+            data (list): encode()产生的结构
+
+        Returns:
+            list: 参数或配置块列表
+
+        Raises:
+            KeepAlivedConfigValueError: 当结构无效时
+        """
+        return [cls.decode_item(item) for item in data]
+
+    # 将基本类型结构解码为单个节点
+    @classmethod
+    def decode_item(cls, data: list) -> KeepAlivedConfigParam:
+        try:
+            if data[0] == cls.BLOCK:
+                _, name, comments, children = data
+                block = KeepAlivedConfigBlock(name, comments=cls._decode_comments(comments))
+                block.params.extend(cls.decode_item(child) for child in children)
+                return block
+            if data[0] == cls.PARAM:
+                _, name, value, comments = data
+                return KeepAlivedConfigParam(
+                    name, value, comments=cls._decode_comments(comments)
+                )
+        except (TypeError, ValueError) as e:
+            raise KeepAlivedConfigValueError(f"Invalid encoded item '{data}': {str(e)}") from e
+
+        raise KeepAlivedConfigValueError(f"Invalid encoded item type '{data[0]}'")
+
+    @staticmethod
+    def _decode_comments(comments: list):
+        if not comments:
+            return None
+        return [
+            KeepAlivedConfigComment(comment_str, type=KeepAlivedConfigCommentTypes(comment_type))
+            for comment_str, comment_type in comments
+        ]
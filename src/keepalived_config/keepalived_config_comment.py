@@ -10,6 +10,8 @@ class KeepAlivedConfigCommentTypes(enum.Enum):
 
 
 class KeepAlivedConfigComment:
+    __slots__ = ("_comment_str", "_type")
+
     COMMENT_INDICATOR = "#"
     COMMENT_REGEX = re.compile(
         r"(^ *[#!](?P<comment>((.+)|())$))|( +[#!] (?P<inline_comment>.*$))"
@@ -1,6 +1,11 @@
 class KeepAlivedConfigConstants:
     DEFAULT_PATH = "/etc/keepalived/keepalived.conf"
     INDENT_WIDTH = 4
+    INCLUDE_DIRECTIVE = "include"
+
+    # validate()检查的必需参数
+    VRRP_REQUIRED_PARAMS = ("state", "interface", "virtual_router_id", "priority")
+    VIRTUAL_SERVER_REQUIRED_PARAMS = ("delay_loop", "lb_algo", "lb_kind", "protocol")
 
     @staticmethod
     def get_indent(level: int = 0) -> str:
@@ -0,0 +1,418 @@
+import enum
+import json
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from keepalived_config.keepalived_config_param import KeepAlivedConfigParam
+from keepalived_config.keepalived_config_block import KeepAlivedConfigBlock
+from keepalived_config.keepalived_config_codec import KeepAlivedConfigCodec
+from keepalived_config.keepalived_config_exceptions import (
+    KeepAlivedConfigTypeError,
+    ConfigPatchError,
+)
+
+
+class KeepAlivedConfigChangeTypes(enum.Enum):
+    ADDED = "added"
+    REMOVED = "removed"
+    MODIFIED = "modified"
+
+
+@dataclass
+class KeepAlivedConfigChange:
+    """
+    配置树中的一处变化
+
+    path为从顶层开始的节点完整名称路径，例如
+    ("virtual_server 10.0.0.1 80", "real_server 10.0.0.2 80", "weight")。
+    参数变化的old/new为参数值；配置块变化的old/new为配置块对象
+    （新增时old为None，删除时new为None）。
+    occurrences与path一一对应，记录每一级在同一层同名配置块中的序号（从0开始），
+    用于区分同名的配置块（例如同一HTTP_GET中的多个url）；为空时表示每一级都是第一个。
+    """
+    type: KeepAlivedConfigChangeTypes
+    path: tuple
+    old: Optional[Any] = None
+    new: Optional[Any] = None
+    occurrences: tuple = ()
+
+    @property
+    def name(self) -> str:
+        """变化节点的完整名称"""
+        return self.path[-1]
+
+    @property
+    def is_block(self) -> bool:
+        """变化的节点是否为配置块"""
+        return isinstance(self.old, KeepAlivedConfigBlock) or isinstance(
+            self.new, KeepAlivedConfigBlock
+        )
+
+
+class KeepAlivedConfigDiff:
+    """
+    两个配置树之间的结构化比较
+
+    节点按完整名称（例如"vrrp_instance VI_1"、"virtual_server 10.0.0.1 80"）而不是位置进行匹配，
+    每一层都通过字典分组，整体耗时与节点数量成线性关系。空行和注释不参与比较。
+    同一层中名称重复的参数按值比较（例如多个相同的参数行），名称重复的配置块按出现顺序配对，
+    并通过变化记录的occurrences区分。
+
+    变化列表可以通过apply()重新应用到另一个配置上，并可以通过dumps()/loads()序列化传输。
+    """
+
+    _PARAM = 0
+    _BLOCK = 1
+
+    # 比较两个配置
+    @classmethod
+    def compare(cls, old, new) -> list:
+        """
+        比较两个配置，返回从old变为new所需的变化列表
+
+        对于有变化的配置块，先返回一条MODIFIED记录，再返回其内部的具体变化。
+
+        Args:
+            old (KeepAlivedConfig): 原配置
+            new (KeepAlivedConfig): 新配置
+
+        Returns:
+            list[KeepAlivedConfigChange]: 变化列表
+
+        Raises:
+            KeepAlivedConfigTypeError: 当参数类型错误时
+
+        Example:
+            ```python
+            for change in KeepAlivedConfigDiff.compare(running_config, new_config):
+                print(change.type.value, " / ".join(change.path))
+            ```
+        """
+        for config in (old, new):
+            if not hasattr(config, "params"):
+                raise KeepAlivedConfigTypeError(
+                    f"Invalid config type '{type(config)}'! Expected 'KeepAlivedConfig'"
+                )
+
+        changes = []
+        if old is not new:
+            cls._compare_params(old.params, new.params, (), (), changes)
+        return changes
+
+    @classmethod
+    def _compare_params(cls, old_params, new_params, path, occurrences, changes):
+        if cls._same_layout(old_params, new_params):
+            # only the sub blocks may differ, no need to group by name
+            seen = {}
+            for old_node, new_node in zip(old_params, new_params):
+                if not isinstance(old_node, KeepAlivedConfigBlock):
+                    continue
+                name = old_node.name
+                occurrence = seen.get(name, 0)
+                seen[name] = occurrence + 1
+                if old_node is not new_node:
+                    cls._compare_block(
+                        old_node, new_node, path + (name,), occurrences + (occurrence,), changes
+                    )
+            return
+
+        old_groups = cls._group(old_params)
+        new_groups = cls._group(new_params)
+
+        for name, old_nodes in old_groups.items():
+            new_nodes = new_groups.get(name, ())
+            cls._compare_group(name, old_nodes, new_nodes, path, occurrences, changes)
+
+        for name, new_nodes in new_groups.items():
+            if name not in old_groups:
+                cls._compare_group(name, (), new_nodes, path, occurrences, changes)
+
+    # 判断两个参数列表的名称、类型和参数值是否按相同顺序排列（常见的未变化情况）
+    @staticmethod
+    def _same_layout(old_params, new_params) -> bool:
+        if len(old_params) != len(new_params):
+            return False
+        for old_node, new_node in zip(old_params, new_params):
+            if old_node is new_node:
+                continue
+            # read the backing fields, this loop runs for every node of both trees
+            if old_node._name != new_node._name or type(old_node) is not type(new_node):
+                return False
+            if old_node._value != new_node._value:
+                return False
+        return True
+
+    @staticmethod
+    def _group(params) -> dict:
+        groups = {}
+        for node in params:
+            name = node.name
+            # blank lines
+            if not name:
+                continue
+            groups.setdefault(name, []).append(node)
+        return groups
+
+    @classmethod
+    def _compare_group(cls, name, old_nodes, new_nodes, path, occurrences, changes):
+        node_path = path + (name,)
+        old_blocks = [node for node in old_nodes if isinstance(node, KeepAlivedConfigBlock)]
+        new_blocks = [node for node in new_nodes if isinstance(node, KeepAlivedConfigBlock)]
+
+        # blocks with the same name are paired in order of appearance
+        for i, (old_block, new_block) in enumerate(zip(old_blocks, new_blocks)):
+            cls._compare_block(old_block, new_block, node_path, occurrences + (i,), changes)
+        # surplus blocks are removed from the end, the lower occurrences stay valid
+        for i in range(len(old_blocks) - 1, len(new_blocks) - 1, -1):
+            changes.append(
+                KeepAlivedConfigChange(
+                    KeepAlivedConfigChangeTypes.REMOVED, node_path, old_blocks[i], None, occurrences + (i,)
+                )
+            )
+        for i in range(len(old_blocks), len(new_blocks)):
+            changes.append(
+                KeepAlivedConfigChange(
+                    KeepAlivedConfigChangeTypes.ADDED, node_path, None, new_blocks[i], occurrences + (i,)
+                )
+            )
+
+        old_values = [node.value for node in old_nodes if not isinstance(node, KeepAlivedConfigBlock)]
+        new_values = [node.value for node in new_nodes if not isinstance(node, KeepAlivedConfigBlock)]
+        if old_values == new_values:
+            return
+
+        if len(old_values) == 1 and len(new_values) == 1:
+            changes.append(
+                KeepAlivedConfigChange(
+                    KeepAlivedConfigChangeTypes.MODIFIED, node_path, old_values[0], new_values[0],
+                    occurrences + (0,),
+                )
+            )
+            return
+
+        # params with duplicate names are compared as a multiset of values
+        remaining = {}
+        for value in new_values:
+            remaining[value] = remaining.get(value, 0) + 1
+        for value in old_values:
+            if remaining.get(value):
+                remaining[value] -= 1
+            else:
+                changes.append(
+                    KeepAlivedConfigChange(
+                        KeepAlivedConfigChangeTypes.REMOVED, node_path, value, None, occurrences + (0,)
+                    )
+                )
+        for value in new_values:
+            if remaining.get(value):
+                remaining[value] -= 1
+                changes.append(
+                    KeepAlivedConfigChange(
+                        KeepAlivedConfigChangeTypes.ADDED, node_path, None, value, occurrences + (0,)
+                    )
+                )
+
+    @classmethod
+    def _compare_block(cls, old_block, new_block, path, occurrences, changes):
+        # shared (unchanged) subtrees need no comparison
+        if old_block is new_block:
+            return
+
+        block_changes = []
+        cls._compare_params(old_block.params, new_block.params, path, occurrences, block_changes)
+        if block_changes:
+            changes.append(
+                KeepAlivedConfigChange(
+                    KeepAlivedConfigChangeTypes.MODIFIED, path, old_block, new_block, occurrences
+                )
+            )
+            changes.extend(block_changes)
+
+    # 将变化列表应用到配置上
+    @classmethod
+    def apply(cls, config, changes: list):
+        """
+        将变化列表一次性应用到配置上
+
+        节点通过与管理器相同的完整名称寻址（例如"virtual_server 10.0.0.1 80"），
+        每一级都使用参数列表的名称索引查找，同名的配置块通过occurrences中的序号区分。删除和修改要求节点存在且原值一致；
+        任何一处变化应用失败时，已应用的变化都会被撤销，配置保持原样。
+        对配置块的MODIFIED记录只校验配置块存在，具体变化由其后的记录描述。
+        被删除的节点在应用过程中只做标记（之后的查找会跳过它们），全部变化应用成功后每个参数列表只重建一次，
+        所以从同一个大配置块中删除大量节点的耗时与其大小成线性关系。
+
+        Args:
+            config (KeepAlivedConfig): 目标配置
+            changes (list[KeepAlivedConfigChange]): 变化列表
+
+        Raises:
+            ConfigPatchError: 当变化无法应用时
+        """
+        undo_log = []
+        # id(params) -> (params, ids of the nodes to remove)
+        removals = {}
+        try:
+            for change in changes:
+                cls._apply_change(config, change, undo_log, removals)
+            for params, removed in removals.values():
+                params[:] = [node for node in params if id(node) not in removed]
+        except Exception as e:
+            for undo in reversed(undo_log):
+                undo()
+            if isinstance(e, ConfigPatchError):
+                raise
+            raise ConfigPatchError(f"应用配置补丁失败: {str(e)}") from e
+
+    @classmethod
+    def _apply_change(cls, config, change, undo_log, removals):
+        if not isinstance(change, KeepAlivedConfigChange) or not change.path:
+            raise ConfigPatchError(f"Invalid change '{change}'")
+
+        occurrences = change.occurrences or (0,) * len(change.path)
+        if len(occurrences) != len(change.path):
+            raise ConfigPatchError(f"Invalid occurrences of change '{change}'")
+
+        params = config.params
+        for name, occurrence in zip(change.path[:-1], occurrences):
+            block = cls._find_block(params, name, occurrence, removals)
+            if block is None:
+                raise ConfigPatchError(
+                    f"Block '{name}' (occurrence {occurrence}) of change path "
+                    f"'{' / '.join(change.path)}' not found"
+                )
+            params = block.params
+
+        name = change.path[-1]
+        path_str = " / ".join(change.path)
+
+        if change.type == KeepAlivedConfigChangeTypes.ADDED:
+            if change.is_block:
+                # never share nodes between two trees
+                node = KeepAlivedConfigCodec.decode_item(KeepAlivedConfigCodec.encode_item(change.new))
+            else:
+                node = KeepAlivedConfigParam(name, change.new)
+            params.append(node)
+            undo_log.append(lambda: params.remove(node))
+            return
+
+        if change.is_block:
+            block = cls._find_block(params, name, occurrences[-1], removals)
+            if block is None:
+                raise ConfigPatchError(f"Block '{path_str}' (occurrence {occurrences[-1]}) not found")
+            if change.type == KeepAlivedConfigChangeTypes.REMOVED:
+                cls._remove_node(params, block, removals)
+            return
+
+        removed = cls._removed(params, removals)
+        node = next(
+            (
+                node
+                for node in params.find(name)
+                if not isinstance(node, KeepAlivedConfigBlock)
+                and node.value == change.old
+                and id(node) not in removed
+            ),
+            None,
+        )
+        if node is None:
+            raise ConfigPatchError(f"Param '{path_str}' with value '{change.old}' not found")
+
+        if change.type == KeepAlivedConfigChangeTypes.REMOVED:
+            cls._remove_node(params, node, removals)
+        elif change.type == KeepAlivedConfigChangeTypes.MODIFIED:
+            old_value = node.value
+            node.value = change.new
+            undo_log.append(lambda: setattr(node, "value", old_value))
+        else:
+            raise ConfigPatchError(f"Invalid change type '{change.type}'")
+
+    # 查找同名配置块中指定序号的配置块，已标记删除的配置块不计入序号
+    @classmethod
+    def _find_block(cls, params, name: str, occurrence: int, removals: dict):
+        removed = cls._removed(params, removals)
+        blocks = [
+            node for node in params.find(name)
+            if isinstance(node, KeepAlivedConfigBlock) and id(node) not in removed
+        ]
+        if 0 <= occurrence < len(blocks):
+            return blocks[occurrence]
+        return None
+
+    @staticmethod
+    def _removed(params, removals: dict):
+        entry = removals.get(id(params))
+        return entry[1] if entry is not None else ()
+
+    # 标记删除节点，apply()在所有变化应用成功后统一重建参数列表
+    @staticmethod
+    def _remove_node(params, node, removals: dict):
+        removals.setdefault(id(params), (params, set()))[1].add(id(node))
+
+    # 将变化列表序列化为紧凑的JSON字符串
+    @classmethod
+    def dumps(cls, changes: list) -> str:
+        """
+        将变化列表序列化为紧凑的JSON字符串
+
+        新增的配置块会完整编码；删除和修改的配置块只记录路径，
+        因为应用补丁时只需要用路径定位它们。路径中有非第一个同名配置块时，附加各级的序号。
+
+        Args:
+            changes (list[KeepAlivedConfigChange]): 变化列表
+
+        Returns:
+            str: JSON字符串
+        """
+        data = []
+        for change in changes:
+            if change.is_block:
+                new = (
+                    KeepAlivedConfigCodec.encode_item(change.new)
+                    if change.type == KeepAlivedConfigChangeTypes.ADDED
+                    else None
+                )
+                entry = [change.type.value[0], list(change.path), cls._BLOCK, None, new]
+            else:
+                entry = [change.type.value[0], list(change.path), cls._PARAM, change.old, change.new]
+            # occurrences are only needed with duplicate block names
+            if any(change.occurrences):
+                entry.append(list(change.occurrences))
+            data.append(entry)
+        return json.dumps(data, separators=(",", ":"))
+
+    # 从JSON字符串还原变化列表
+    @classmethod
+    def loads(cls, data: str) -> list:
+        """
+        从dumps()产生的JSON字符串还原变化列表
+
+        删除和修改的配置块以不含子节点的同名配置块表示。
+
+        Args:
+            data (str): JSON字符串
+
+        Returns:
+            list[KeepAlivedConfigChange]: 变化列表
+
+        Raises:
+            ConfigPatchError: 当数据格式无效时
+        """
+        types = {change_type.value[0]: change_type for change_type in KeepAlivedConfigChangeTypes}
+        changes = []
+        try:
+            for entry in json.loads(data):
+                change_type, path, kind, old, new = entry[:5]
+                occurrences = tuple(int(i) for i in entry[5]) if len(entry) > 5 else ()
+                change_type = types[change_type]
+                path = tuple(path)
+                if kind == cls._BLOCK:
+                    if change_type == KeepAlivedConfigChangeTypes.ADDED:
+                        new = KeepAlivedConfigCodec.decode_item(new)
+                    else:
+                        old = KeepAlivedConfigBlock(path[-1])
+                        if change_type == KeepAlivedConfigChangeTypes.MODIFIED:
+                            new = KeepAlivedConfigBlock(path[-1])
+                changes.append(KeepAlivedConfigChange(change_type, path, old, new, occurrences))
+        except (ValueError, TypeError, KeyError, IndexError) as e:
+            raise ConfigPatchError(f"Invalid change set: {str(e)}") from e
+        return changes
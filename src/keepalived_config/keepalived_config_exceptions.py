@@ -85,4 +85,19 @@ class ConfigSaveError(KeepAlivedConfigError):
 
 class ConfigValidationError(KeepAlivedConfigError):
     """配置验证错误异常"""
-    pass
\ No newline at end of file
+    pass
+
+
+class ConfigPatchError(KeepAlivedConfigError):
+    """配置补丁应用错误异常"""
+    pass
+
+
+class ConfigLockError(KeepAlivedConfigError):
+    """配置锁使用错误异常"""
+    pass
+
+
+class ConfigTransactionError(KeepAlivedConfigError):
+    """配置事务使用错误异常"""
+    pass
@@ -0,0 +1,374 @@
+from typing import Dict, List, Optional, Union
+
+from keepalived_config.keepalived_config_block import KeepAlivedConfigBlock
+from keepalived_config.keepalived_config_param import KeepAlivedConfigParam
+
+
+class KeepAlivedConfigIndexes:
+    """
+    配置对象的二级索引
+
+    维护以下映射，使常见的反向查询不需要遍历整个配置树:
+    - (interface, virtual_router_id) -> VRRP实例名称（另有每个接口已使用ID的位图）
+    - interface -> VRRP实例名称
+    - VIP地址（不含前缀长度） -> VRRP实例名称
+    - 真实服务器IP -> 虚拟服务器名称（格式: "IP PORT"）
+
+    索引在第一次查询时通过一次遍历构建，之后由VRRP和虚拟服务器管理器增量维护。
+    不经过管理器直接修改配置树（例如直接操作params）后，需要调用invalidate()，
+    索引会在下一次查询时重新构建。
+
+    Example:
+        ```python
+        indexes = manager.config.indexes
+        print(indexes.get_vrrp_instances_by_vip("10.0.0.100"))
+        print(indexes.get_router_ids("eth1"))
+        print(indexes.get_virtual_servers_by_real_server("10.9.0.17"))
+        ```
+    """
+
+    _VRRP_PREFIX = "vrrp_instance "
+    _VS_PREFIX = "virtual_server "
+    _RS_PREFIX = "real_server "
+    _VIP_BLOCKS = ("virtual_ipaddress", "virtual_ipaddress_excluded")
+
+    def __init__(self, config):
+        """
+        初始化索引
+
+        Args:
+            config (KeepAlivedConfig): 被索引的配置对象
+        """
+        self._config = config
+        self._built = False
+        self._reset()
+
+    def _reset(self):
+        # interface -> {virtual_router_id: {instance name: None}}, a misconfigured tree may reuse an id
+        self._router_ids: Dict[str, Dict[Union[int, str], Dict[str, None]]] = {}
+        # interface -> bitmap of the used ids 0-255 (bit n set when id n is used)
+        self._router_id_bits: Dict[str, int] = {}
+        # interface -> {instance name: None}, dicts keep the document order
+        self._interfaces: Dict[str, Dict[str, None]] = {}
+        # address -> {instance name: None}
+        self._vips: Dict[str, Dict[str, None]] = {}
+        # real server ip -> {virtual server name: number of real servers with that ip}
+        self._real_servers: Dict[str, Dict[str, int]] = {}
+        # instance name -> (interface, virtual_router_id, addresses)
+        self._vrrp_entries: Dict[str, tuple] = {}
+        # virtual server name -> {real server ip: count}
+        self._vs_entries: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def built(self) -> bool:
+        """
+        索引是否已经构建
+        """
+        return self._built
+
+    # 使索引失效，下一次查询时重新构建
+    def invalidate(self):
+        """
+        使索引失效，下一次查询时重新构建
+
+        不经过管理器直接修改配置树后调用。
+        """
+        self._built = False
+        self._reset()
+
+    # 根据接口和虚拟路由器ID查找VRRP实例
+    def get_vrrp_instance_by_router_id(
+        self, interface: str, virtual_router_id: Union[int, str]
+    ) -> Optional[str]:
+        """
+        根据接口和虚拟路由器ID查找VRRP实例，复杂度O(1)
+
+        Args:
+            interface (str): 网络接口
+            virtual_router_id (Union[int, str]): 虚拟路由器ID
+
+        Returns:
+            Optional[str]: VRRP实例名称，如果不存在则返回None
+        """
+        self._ensure_built()
+        names = self._router_ids.get(interface, {}).get(self._router_id_key(virtual_router_id))
+        return next(iter(names)) if names else None
+
+    # 获取接口上已使用的虚拟路由器ID
+    def get_router_ids(self, interface: str) -> Dict[Union[int, str], str]:
+        """
+        获取接口上已使用的虚拟路由器ID，复杂度O(k)
+
+        Args:
+            interface (str): 网络接口
+
+        Returns:
+            Dict[Union[int, str], str]: 虚拟路由器ID到VRRP实例名称的字典（ID为整数，无法解析的保留原字符串）
+        """
+        self._ensure_built()
+        return {
+            virtual_router_id: next(iter(names))
+            for virtual_router_id, names in self._router_ids.get(interface, {}).items()
+        }
+
+    # 获取接口上已使用的虚拟路由器ID位图
+    def get_router_id_bitmap(self, interface: str) -> int:
+        """
+        获取接口上已使用的虚拟路由器ID位图，复杂度O(1)
+
+        Args:
+            interface (str): 网络接口
+
+        Returns:
+            int: 位图，虚拟路由器ID n已被使用时第n位为1（只包含0到255之间的ID）
+        """
+        self._ensure_built()
+        return self._router_id_bits.get(interface, 0)
+
+    # 获取使用指定接口的VRRP实例
+    def get_vrrp_instances_by_interface(self, interface: str) -> List[str]:
+        """
+        获取使用指定接口的VRRP实例，复杂度O(k)
+
+        Args:
+            interface (str): 网络接口
+
+        Returns:
+            List[str]: VRRP实例名称列表
+        """
+        self._ensure_built()
+        return list(self._interfaces.get(interface, ()))
+
+    # 获取拥有指定VIP的VRRP实例
+    def get_vrrp_instances_by_vip(self, address: str) -> List[str]:
+        """
+        获取拥有指定VIP的VRRP实例，复杂度O(k)
+
+        Args:
+            address (str): VIP地址，前缀长度（例如"/24"）会被忽略
+
+        Returns:
+            List[str]: VRRP实例名称列表
+        """
+        self._ensure_built()
+        return list(self._vips.get(self._address_key(address), ()))
+
+    # 获取指向指定真实服务器IP的虚拟服务器
+    def get_virtual_servers_by_real_server(self, real_server_ip: str) -> List[str]:
+        """
+        获取包含指定IP真实服务器的虚拟服务器，复杂度O(k)
+
+        Args:
+            real_server_ip (str): 真实服务器IP地址
+
+        Returns:
+            List[str]: 虚拟服务器名称列表，格式为 "IP PORT"
+        """
+        self._ensure_built()
+        return list(self._real_servers.get(real_server_ip, ()))
+
+    # 以下方法由管理器在修改配置树后调用，索引尚未构建时不做任何事情
+
+    # 记录新增的VRRP实例
+    def add_vrrp_instance(self, vrrp_block: KeepAlivedConfigBlock):
+        if self._built:
+            self._index_vrrp_instance(vrrp_block)
+
+    # 移除VRRP实例的索引项
+    def remove_vrrp_instance(self, vrrp_block: KeepAlivedConfigBlock):
+        if self._built:
+            self._unindex_vrrp_instance(vrrp_block.name[len(self._VRRP_PREFIX):])
+
+    # VRRP实例的接口、虚拟路由器ID或VIP变化后重新索引
+    def update_vrrp_instance(self, vrrp_block: KeepAlivedConfigBlock):
+        if self._built:
+            self._unindex_vrrp_instance(vrrp_block.name[len(self._VRRP_PREFIX):])
+            self._index_vrrp_instance(vrrp_block)
+
+    # 记录新增的虚拟服务器（包括其中的真实服务器）
+    def add_virtual_server(self, vs_block: KeepAlivedConfigBlock):
+        if self._built:
+            self._index_virtual_server(vs_block)
+
+    # 移除虚拟服务器的索引项
+    def remove_virtual_server(self, vs_block: KeepAlivedConfigBlock):
+        if self._built:
+            self._unindex_virtual_server(vs_block.name[len(self._VS_PREFIX):])
+
+    # 记录虚拟服务器中新增的真实服务器
+    def add_real_servers(self, vs_block: KeepAlivedConfigBlock, rs_blocks: list):
+        if not self._built:
+            return
+        vs_name = vs_block.name[len(self._VS_PREFIX):]
+        entry = self._vs_entries.get(vs_name)
+        # only the first virtual server of a duplicate name is indexed
+        if entry is not None:
+            self._index_real_servers(vs_name, entry, rs_blocks)
+
+    # 移除虚拟服务器中被删除的真实服务器
+    def remove_real_servers(self, vs_block: KeepAlivedConfigBlock, rs_blocks: list):
+        if not self._built:
+            return
+        vs_name = vs_block.name[len(self._VS_PREFIX):]
+        entry = self._vs_entries.get(vs_name)
+        if entry is None:
+            return
+        for rs_block in rs_blocks:
+            # the same ip may be used by several real servers (ports) of one virtual server
+            real_server_ip = self._real_server_ip(rs_block)
+            if real_server_ip is None or real_server_ip not in entry:
+                continue
+            self._decrement(entry, real_server_ip)
+            self._decrement(self._real_servers[real_server_ip], vs_name)
+            if not self._real_servers[real_server_ip]:
+                del self._real_servers[real_server_ip]
+
+    def _ensure_built(self):
+        if self._built:
+            return
+        self._reset()
+        for item in self._config.params:
+            if not isinstance(item, KeepAlivedConfigBlock):
+                continue
+            if item.name.startswith(self._VRRP_PREFIX):
+                self._index_vrrp_instance(item)
+            elif item.name.startswith(self._VS_PREFIX):
+                self._index_virtual_server(item)
+        self._built = True
+
+    def _index_vrrp_instance(self, vrrp_block: KeepAlivedConfigBlock):
+        instance_name = vrrp_block.name[len(self._VRRP_PREFIX):]
+        if instance_name in self._vrrp_entries:
+            # the first instance of a duplicate name wins, like find_one()
+            return
+
+        interface = None
+        virtual_router_id = None
+        addresses = []
+        for param in vrrp_block.params:
+            if isinstance(param, KeepAlivedConfigBlock):
+                if param.name in self._VIP_BLOCKS:
+                    addresses.extend(self._block_addresses(param))
+            elif not isinstance(param, KeepAlivedConfigParam):
+                # comments
+                continue
+            elif param.name == "interface" and interface is None:
+                interface = param.value
+            elif param.name == "virtual_router_id" and virtual_router_id is None:
+                virtual_router_id = self._router_id_key(param.value)
+
+        if interface is not None:
+            self._interfaces.setdefault(interface, {})[instance_name] = None
+            if virtual_router_id is not None:
+                names = self._router_ids.setdefault(interface, {}).setdefault(virtual_router_id, {})
+                names[instance_name] = None
+                self._router_id_bits[interface] = (
+                    self._router_id_bits.get(interface, 0) | self._router_id_bit(virtual_router_id)
+                )
+        for address in addresses:
+            self._vips.setdefault(address, {})[instance_name] = None
+        self._vrrp_entries[instance_name] = (interface, virtual_router_id, tuple(addresses))
+
+    def _unindex_vrrp_instance(self, instance_name: str):
+        entry = self._vrrp_entries.pop(instance_name, None)
+        if entry is None:
+            return
+        interface, virtual_router_id, addresses = entry
+
+        if interface is not None:
+            self._discard(self._interfaces, interface, instance_name)
+            router_ids = self._router_ids.get(interface)
+            if router_ids is not None and virtual_router_id in router_ids:
+                self._discard(router_ids, virtual_router_id, instance_name)
+                if virtual_router_id not in router_ids and interface in self._router_id_bits:
+                    # no other instance uses the id any more
+                    self._router_id_bits[interface] &= ~self._router_id_bit(virtual_router_id)
+                if not router_ids:
+                    del self._router_ids[interface]
+                    self._router_id_bits.pop(interface, None)
+        for address in addresses:
+            self._discard(self._vips, address, instance_name)
+
+        # another instance with the same name takes over
+        vrrp_block = self._config.params.find_one(self._VRRP_PREFIX + instance_name, KeepAlivedConfigBlock)
+        if vrrp_block is not None:
+            self._index_vrrp_instance(vrrp_block)
+
+    def _index_virtual_server(self, vs_block: KeepAlivedConfigBlock):
+        vs_name = vs_block.name[len(self._VS_PREFIX):]
+        if vs_name in self._vs_entries:
+            return
+        entry = self._vs_entries[vs_name] = {}
+        self._index_real_servers(vs_name, entry, vs_block.params)
+
+    def _index_real_servers(self, vs_name: str, entry: dict, rs_blocks):
+        for rs_block in rs_blocks:
+            real_server_ip = self._real_server_ip(rs_block)
+            if real_server_ip is None:
+                continue
+            entry[real_server_ip] = entry.get(real_server_ip, 0) + 1
+            servers = self._real_servers.setdefault(real_server_ip, {})
+            servers[vs_name] = servers.get(vs_name, 0) + 1
+
+    def _unindex_virtual_server(self, vs_name: str):
+        entry = self._vs_entries.pop(vs_name, None)
+        if entry is None:
+            return
+        for real_server_ip in entry:
+            self._real_servers[real_server_ip].pop(vs_name, None)
+            if not self._real_servers[real_server_ip]:
+                del self._real_servers[real_server_ip]
+
+        vs_block = self._config.params.find_one(self._VS_PREFIX + vs_name, KeepAlivedConfigBlock)
+        if vs_block is not None:
+            self._index_virtual_server(vs_block)
+
+    @classmethod
+    def _real_server_ip(cls, rs_block) -> Optional[str]:
+        if not isinstance(rs_block, KeepAlivedConfigBlock) or not rs_block.name.startswith(cls._RS_PREFIX):
+            return None
+        return rs_block.name[len(cls._RS_PREFIX):].split(" ", 1)[0]
+
+    @classmethod
+    def _block_addresses(cls, vip_block: KeepAlivedConfigBlock) -> list:
+        addresses = []
+        for param in vip_block.params:
+            if not isinstance(param, KeepAlivedConfigParam) or isinstance(param, KeepAlivedConfigBlock):
+                continue
+            # parsed lines keep the address as the name, generated lines as the value
+            text = f"{param.name} {param.value}".split()
+            if text:
+                addresses.append(cls._address_key(text[0]))
+        return addresses
+
+    @staticmethod
+    def _address_key(address: str) -> str:
+        return str(address).split("/", 1)[0]
+
+    @staticmethod
+    def _router_id_key(virtual_router_id: Union[int, str]) -> Union[int, str]:
+        try:
+            return int(virtual_router_id)
+        except (TypeError, ValueError):
+            return str(virtual_router_id)
+
+    @staticmethod
+    def _router_id_bit(virtual_router_id: Union[int, str]) -> int:
+        if isinstance(virtual_router_id, int) and 0 <= virtual_router_id <= 255:
+            return 1 << virtual_router_id
+        return 0
+
+    @staticmethod
+    def _discard(index: dict, key: str, name: str):
+        names = index.get(key)
+        if names is None:
+            return
+        names.pop(name, None)
+        if not names:
+            del index[key]
+
+    @staticmethod
+    def _decrement(counts: dict, key: str):
+        counts[key] -= 1
+        if not counts[key]:
+            del counts[key]
@@ -0,0 +1,176 @@
+import contextlib
+import functools
+import threading
+
+from keepalived_config.keepalived_config_exceptions import ConfigLockError
+
+
+class KeepAlivedConfigRWLock:
+    """
+    可重入的读写锁
+
+    多个线程可以同时持有读锁，写锁与其他任何锁互斥。有线程等待写锁时，新的读者会等待，
+    避免写者在持续的读请求下饿死。同一线程可以重复获取已持有的锁，持有写锁时也可以获取读锁；
+    持有读锁时获取写锁（锁升级）会抛出ConfigLockError，因为两个同时升级的读者会相互等待。
+
+    Example:
+        ```python
+        lock = KeepAlivedConfigRWLock()
+        with lock.read_locked():
+            ...
+        with lock.write_locked():
+            ...
+        ```
+    """
+
+    def __init__(self):
+        """
+        初始化读写锁
+        """
+        # uncontended calls only take the mutex, the condition is used when a thread has to wait
+        self._mutex = threading.Lock()
+        self._condition = threading.Condition(self._mutex)
+        self._readers = 0
+        self._writer = False
+        self._waiting_readers = 0
+        self._waiting_writers = 0
+        # per thread: depth (number of nested acquisitions) and writer
+        self._local = threading.local()
+
+    # 获取读锁
+    def acquire_read(self):
+        """
+        获取读锁，当前线程已持有读锁或写锁时直接返回
+        """
+        local = self._local
+        depth = getattr(local, "depth", 0)
+        if depth:
+            local.depth = depth + 1
+            return
+
+        with self._mutex:
+            if self._writer or self._waiting_writers:
+                self._waiting_readers += 1
+                try:
+                    while self._writer or self._waiting_writers:
+                        self._condition.wait()
+                finally:
+                    self._waiting_readers -= 1
+            self._readers += 1
+        local.depth = 1
+        local.writer = False
+
+    # 获取写锁
+    def acquire_write(self):
+        """
+        获取写锁，当前线程已持有写锁时直接返回
+
+        Raises:
+            ConfigLockError: 当前线程只持有读锁时
+        """
+        local = self._local
+        depth = getattr(local, "depth", 0)
+        if depth:
+            if not local.writer:
+                raise ConfigLockError("Cannot acquire the write lock while holding the read lock")
+            local.depth = depth + 1
+            return
+
+        with self._mutex:
+            if self._writer or self._readers:
+                self._waiting_writers += 1
+                try:
+                    while self._writer or self._readers:
+                        self._condition.wait()
+                finally:
+                    self._waiting_writers -= 1
+            self._writer = True
+        local.depth = 1
+        local.writer = True
+
+    # 释放当前线程持有的读锁或写锁
+    def release(self):
+        """
+        释放当前线程最近一次获取的读锁或写锁
+
+        Raises:
+            ConfigLockError: 当前线程未持有锁时
+        """
+        local = self._local
+        depth = getattr(local, "depth", 0)
+        if not depth:
+            raise ConfigLockError("Cannot release a lock that is not held")
+        local.depth = depth - 1
+        if depth > 1:
+            return
+
+        with self._mutex:
+            if local.writer:
+                self._writer = False
+            else:
+                self._readers -= 1
+            if self._waiting_readers or self._waiting_writers:
+                self._condition.notify_all()
+
+    # 在with语句范围内持有读锁
+    @contextlib.contextmanager
+    def read_locked(self):
+        """
+        在with语句范围内持有读锁
+        """
+        self.acquire_read()
+        try:
+            yield self
+        finally:
+            self.release()
+
+    # 在with语句范围内持有写锁
+    @contextlib.contextmanager
+    def write_locked(self):
+        """
+        在with语句范围内持有写锁
+
+        Raises:
+            ConfigLockError: 当前线程只持有读锁时
+        """
+        self.acquire_write()
+        try:
+            yield self
+        finally:
+            self.release()
+
+    # 管理器读操作的装饰器
+    @staticmethod
+    def reading(func):
+        """
+        管理器读操作的装饰器，在管理器的_lock不为None时持有读锁执行
+        """
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            lock = self._lock
+            if lock is None:
+                return func(self, *args, **kwargs)
+            lock.acquire_read()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                lock.release()
+        return wrapper
+
+    # 管理器写操作的装饰器
+    @staticmethod
+    def writing(func):
+        """
+        管理器写操作的装饰器，在管理器的_lock不为None时持有写锁执行
+        """
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            lock = self._lock
+            if lock is None:
+                return func(self, *args, **kwargs)
+            lock.acquire_write()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                lock.release()
+        return wrapper
@@ -1,9 +1,17 @@
-from typing import Optional
+import contextlib
+import threading
+from typing import Callable, Optional
 from keepalived_config.keepalived_config import KeepAlivedConfig
+from keepalived_config.keepalived_config_constants import KeepAlivedConfigConstants
 from keepalived_config.keepalived_config_vrrp import KeepAlivedConfigVRRP
 from keepalived_config.keepalived_config_virtual_server import KeepAlivedConfigVirtualServer
 from keepalived_config.keepalived_config_parser import KeepAlivedConfigParser
+from keepalived_config.keepalived_config_cache import KeepAlivedConfigParseCache
 from keepalived_config.keepalived_config_result import OperationResult
+from keepalived_config.keepalived_config_metrics import KeepAlivedConfigMetrics
+from keepalived_config.keepalived_config_lock import KeepAlivedConfigRWLock
+from keepalived_config.keepalived_config_snapshot import KeepAlivedConfigSnapshot
+from keepalived_config.keepalived_config_transaction import KeepAlivedConfigTransaction
 from keepalived_config.keepalived_config_exceptions import (
     ConfigParseError,
     ConfigSaveError,
@@ -20,20 +28,127 @@ class KeepAlivedConfigManager:
     - 虚拟服务器管理
     - 配置文件解析
     - 配置保存
+
+    thread_safe为True时，所有管理器共享一个读写锁：读操作（如get_real_server、list_virtual_servers、
+    vrrp_instances、validate）可以并行执行，写操作（如update_virtual_server、add_real_server、
+    load_config）互斥执行，读者不会看到只完成了一半的修改。返回的配置块是配置树中的对象，
+    需要在多次读取之间保持一致时，应在read_locked()范围内访问。
     """
 
-    def __init__(self, config: Optional[KeepAlivedConfig] = None, auto_save_path: Optional[str] = None):
+    def __init__(
+        self,
+        config: Optional[KeepAlivedConfig] = None,
+        auto_save_path: Optional[str] = None,
+        parse_cache: Optional[KeepAlivedConfigParseCache] = None,
+        thread_safe: bool = False,
+    ):
         """
         初始化配置管理器
         
         Args:
             config (Optional[KeepAlivedConfig]): KeepAlived配置对象，如果未提供则创建新的
             auto_save_path (Optional[str]): 自动保存路径，如果提供则在上下文管理器退出时自动保存
+            parse_cache (Optional[KeepAlivedConfigParseCache]): 解析缓存，load_config在文件未变化时直接从缓存加载
+            thread_safe (bool): 是否使用读写锁同步各个管理器的操作
         """
-        self.config = config or KeepAlivedConfig()
-        self.vrrp = KeepAlivedConfigVRRP(self.config)
-        self.virtual_server = KeepAlivedConfigVirtualServer(self.config)
+        self._lock = KeepAlivedConfigRWLock() if thread_safe else None
+        # serializes writers of the same files, save_config only holds the read lock
+        self._save_lock = threading.Lock()
+        # innermost unfinished transaction, see transaction()
+        self._transaction = None
+        self._set_config(config or KeepAlivedConfig())
         self._auto_save_path = auto_save_path
+        self._parse_cache = parse_cache
+
+    # 使用新的配置对象并重新创建VRRP和虚拟服务器管理器
+    def _set_config(self, config: KeepAlivedConfig):
+        vrrp = KeepAlivedConfigVRRP(config)
+        virtual_server = KeepAlivedConfigVirtualServer(config)
+        vrrp._lock = virtual_server._lock = self._lock
+        self.config = config
+        self.vrrp = vrrp
+        self.virtual_server = virtual_server
+
+    @property
+    def thread_safe(self) -> bool:
+        """
+        是否使用读写锁同步各个管理器的操作
+
+        Returns:
+            bool: 是否为线程安全模式
+        """
+        return self._lock is not None
+
+    def read_locked(self):
+        """
+        在with语句范围内持有读锁，用于需要保持一致的多次读取；非线程安全模式下不做任何事情
+
+        Returns:
+            上下文管理器
+        """
+        if self._lock is None:
+            return contextlib.nullcontext(self)
+        return self._lock.read_locked()
+
+    def write_locked(self):
+        """
+        在with语句范围内持有写锁，用于需要整体生效的多次修改；非线程安全模式下不做任何事情
+
+        Returns:
+            上下文管理器
+
+        Raises:
+            ConfigLockError: 当前线程只持有读锁时
+        """
+        if self._lock is None:
+            return contextlib.nullcontext(self)
+        return self._lock.write_locked()
+
+    @KeepAlivedConfigRWLock.reading
+    def snapshot(self) -> KeepAlivedConfigSnapshot:
+        """
+        创建当前配置的只读快照，耗时为O(1)
+
+        快照与配置共享未修改的节点，写操作只为快照保留被修改节点的原状态，
+        因此长时间的读取（渲染、验证）可以在快照上进行而不持有读锁，写操作不必等待。
+
+        Returns:
+            KeepAlivedConfigSnapshot: 快照，不再使用时应调用release()或使用with语句
+
+        Example:
+            ```python
+            with manager.snapshot() as snapshot:
+                result = snapshot.validate()
+                text = snapshot.to_str()
+            ```
+        """
+        return self.config.snapshot()
+
+    def transaction(self, save_hook: Optional[Callable[[list], None]] = None) -> KeepAlivedConfigTransaction:
+        """
+        开始事务，with语句正常结束时提交，发生异常时回滚对配置的所有修改
+
+        回滚按撤销日志恢复被修改的节点，耗时与修改的数量成正比；事务内再次调用transaction()
+        或tx.savepoint()创建嵌套的保存点。线程安全模式下事务持有写锁直到结束。
+
+        Args:
+            save_hook (Optional[Callable[[list], None]]): 最外层事务提交且配置有变化时调用，
+                参数为变化列表（KeepAlivedConfigChange），抛出异常时事务回滚
+
+        Returns:
+            KeepAlivedConfigTransaction: 事务
+
+        Raises:
+            ConfigTransactionError: 当为保存点指定save_hook时
+
+        Example:
+            ```python
+            with manager.transaction(save_hook=lambda changes: manager.save_config(atomic=True)):
+                manager.virtual_server.create_virtual_server("10.0.0.1", 80)
+                manager.virtual_server.add_real_server("10.0.0.1", 80, "10.0.1.1", 80)
+            ```
+        """
+        return KeepAlivedConfigTransaction(self, save_hook)
 
     def __enter__(self):
         """
@@ -58,12 +173,14 @@ class KeepAlivedConfigManager:
             self.save_config(self._auto_save_path)
         # 返回None表示不抑制异常
 
-    def load_config(self, config_file: str) -> OperationResult:
+    @KeepAlivedConfigMetrics.timed("manager.load_config")
+    def load_config(self, config_file: str, resolve_includes: bool = False) -> OperationResult:
         """
         从文件加载配置
         
         Args:
             config_file (str): 配置文件路径
+            resolve_includes (bool): 是否展开include指令引用的配置文件
             
         Returns:
             OperationResult: 操作结果
@@ -72,35 +189,46 @@ class KeepAlivedConfigManager:
             ConfigParseError: 当配置解析失败时
         """
         try:
-            parser = KeepAlivedConfigParser()
-            self.config = parser.parse_file(config_file)
-            # 重新初始化管理器以使用新的配置
-            self.vrrp = KeepAlivedConfigVRRP(self.config)
-            self.virtual_server = KeepAlivedConfigVirtualServer(self.config)
+            parser = KeepAlivedConfigParser(cache=self._parse_cache)
+            config = parser.parse_file(config_file, resolve_includes=resolve_includes)
+            # 重新初始化管理器以使用新的配置，解析在锁外完成，读者只在替换时等待
+            with self.write_locked():
+                self._set_config(config)
             return OperationResult.ok(f"配置文件 '{config_file}' 加载成功")
         except Exception as e:
             raise ConfigParseError(f"加载配置文件失败: {str(e)}") from e
 
-    def save_config(self, file_path: Optional[str] = None) -> OperationResult:
+    @KeepAlivedConfigMetrics.timed("manager.save_config")
+    @KeepAlivedConfigRWLock.reading
+    def save_config(
+        self, file_path: Optional[str] = None, atomic: bool = False, backup: bool = False
+    ) -> OperationResult:
         """
         保存配置到文件
         
         Args:
             file_path (Optional[str]): 保存文件路径，如果未提供则使用配置对象的默认路径
+            atomic (bool): 是否使用原子保存模式（临时文件 + fsync + rename，内容未变化时跳过写入）
+            backup (bool): 原子保存模式下，替换前是否保留"<文件名>.bak"备份
             
         Returns:
-            OperationResult: 操作结果
+            OperationResult: 操作结果，数据部分表示是否有文件被写入
             
         Raises:
             ConfigSaveError: 当配置保存失败时
         """
         try:
-            self.config.save(file_path)
+            with self._save_lock:
+                changed = self.config.save(file_path, atomic=atomic, backup=backup)
             path = file_path or self.config.config_file or "default location"
-            return OperationResult.ok(f"配置保存成功到 '{path}'")
+            if not changed:
+                return OperationResult.ok(f"配置未变化，跳过保存 '{path}'", changed)
+            return OperationResult.ok(f"配置保存成功到 '{path}'", changed)
         except Exception as e:
             raise ConfigSaveError(f"保存配置失败: {str(e)}") from e
 
+    @KeepAlivedConfigMetrics.timed("manager.validate")
+    @KeepAlivedConfigRWLock.reading
     def validate(self) -> OperationResult:
         """
         验证配置完整性
@@ -120,8 +248,7 @@ class KeepAlivedConfigManager:
                 vrrp_block = self.vrrp.get_vrrp_instance(instance_name)
                 if vrrp_block:
                     # 检查必需参数
-                    required_params = ["state", "interface", "virtual_router_id", "priority"]
-                    for param_name in required_params:
+                    for param_name in KeepAlivedConfigConstants.VRRP_REQUIRED_PARAMS:
                         param = self.vrrp._get_param(vrrp_block, param_name)
                         if not param or not param.value:
                             issues.append(f"VRRP实例 '{instance_name}' 缺少必需参数 '{param_name}'")
@@ -139,8 +266,7 @@ class KeepAlivedConfigManager:
                         if result:
                             vs_block = result.data
                             # 检查必需参数
-                            required_params = ["delay_loop", "lb_algo", "lb_kind", "protocol"]
-                            for param_name in required_params:
+                            for param_name in KeepAlivedConfigConstants.VIRTUAL_SERVER_REQUIRED_PARAMS:
                                 param = self.virtual_server._get_param(vs_block, param_name)
                                 if not param or not param.value:
                                     issues.append(f"虚拟服务器 '{vs_name}' 缺少必需参数 '{param_name}'")
@@ -0,0 +1,343 @@
+import abc
+import bisect
+import contextlib
+import functools
+import os
+import tempfile
+import threading
+from time import perf_counter
+from typing import Callable, Iterator, Optional
+
+from keepalived_config.keepalived_config_exceptions import (
+    KeepAlivedConfigTypeError,
+    KeepAlivedConfigValueError,
+)
+
+
+class KeepAlivedConfigMetricsSink(abc.ABC):
+    """
+    性能统计接收器的抽象基类
+
+    被统计的操作每完成一次就调用一次record，子类必须实现record，决定如何汇总或转发这些数据。
+    """
+
+    # 记录一次操作的耗时
+    @abc.abstractmethod
+    def record(self, name: str, seconds: float):
+        """
+        记录一次操作的耗时
+
+        Args:
+            name (str): 操作名称，例如"parser.parse_file"、"vrrp.create_vrrp_instance"
+            seconds (float): 耗时（秒）
+        """
+
+    # 输出汇总结果，trace()结束时调用
+    def flush(self):
+        """
+        输出汇总结果，默认不做任何事情
+        """
+        pass
+
+
+class KeepAlivedConfigHistogramSink(KeepAlivedConfigMetricsSink):
+    """
+    内存中的耗时直方图，按操作名称统计次数、总耗时、最小/最大耗时和各个桶的次数
+    """
+
+    DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        """
+        初始化直方图
+
+        Args:
+            buckets (tuple): 桶的上界（秒），按升序排列
+
+        Raises:
+            KeepAlivedConfigValueError: 当桶的上界无效时
+        """
+        buckets = tuple(float(bound) for bound in buckets)
+        if not buckets or any(bound <= 0 for bound in buckets) or list(buckets) != sorted(set(buckets)):
+            raise KeepAlivedConfigValueError(
+                f"Invalid buckets '{buckets}'! Expected ascending positive numbers"
+            )
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        # name -> [count, total, min, max, bucket counts (last one is +Inf)]
+        self._data = {}
+
+    @property
+    def buckets(self) -> tuple:
+        return self._buckets
+
+    def record(self, name: str, seconds: float):
+        index = bisect.bisect_left(self._buckets, seconds)
+        with self._lock:
+            entry = self._data.get(name)
+            if entry is None:
+                entry = self._data[name] = [0, 0.0, seconds, seconds, [0] * (len(self._buckets) + 1)]
+            entry[0] += 1
+            entry[1] += seconds
+            if seconds < entry[2]:
+                entry[2] = seconds
+            if seconds > entry[3]:
+                entry[3] = seconds
+            entry[4][index] += 1
+
+    # 获取统计结果
+    def stats(self) -> dict:
+        """
+        获取统计结果
+
+        Returns:
+            dict: 操作名称 -> {"count", "total", "min", "max", "mean", "buckets"}，
+                  buckets为桶上界 -> 累计次数（耗时不超过该上界的次数，最后一个上界为inf）
+        """
+        with self._lock:
+            data = {name: (count, total, low, high, list(counts))
+                    for name, (count, total, low, high, counts) in self._data.items()}
+
+        stats = {}
+        for name, (count, total, low, high, counts) in data.items():
+            cumulative = 0
+            buckets = {}
+            for bound, bucket_count in zip(self._buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                buckets[bound] = cumulative
+            stats[name] = {
+                "count": count,
+                "total": total,
+                "min": low,
+                "max": high,
+                "mean": total / count,
+                "buckets": buckets,
+            }
+        return stats
+
+    # 清空统计结果
+    def reset(self):
+        """
+        清空统计结果
+        """
+        with self._lock:
+            self._data = {}
+
+    # 将统计结果转换为Prometheus文本格式
+    def to_prometheus(self, metric_name: str = "keepalived_config_operation_seconds") -> str:
+        """
+        将统计结果转换为Prometheus文本格式（histogram类型，操作名称作为operation标签）
+
+        Args:
+            metric_name (str): 指标名称
+
+        Returns:
+            str: Prometheus文本格式的统计结果
+        """
+        lines = [
+            f"# HELP {metric_name} Duration of keepalived_config operations in seconds.",
+            f"# TYPE {metric_name} histogram",
+        ]
+        for name, entry in sorted(self.stats().items()):
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            for bound, count in entry["buckets"].items():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{metric_name}_bucket{{operation="{label}",le="{le}"}} {count}')
+            lines.append(f'{metric_name}_sum{{operation="{label}"}} {entry["total"]!r}')
+            lines.append(f'{metric_name}_count{{operation="{label}"}} {entry["count"]}')
+        return "\n".join(lines) + "\n"
+
+
+class KeepAlivedConfigPrometheusSink(KeepAlivedConfigHistogramSink):
+    """
+    以Prometheus文本格式输出到文件的直方图，例如供node_exporter的textfile collector读取
+
+    flush()先写入同一目录下的临时文件再通过rename替换目标文件，读取方不会读到写了一半的文件。
+    """
+
+    def __init__(self, path: str, buckets: tuple = KeepAlivedConfigHistogramSink.DEFAULT_BUCKETS):
+        """
+        初始化Prometheus接收器
+
+        Args:
+            path (str): 输出文件路径
+            buckets (tuple): 桶的上界（秒），按升序排列
+
+        Raises:
+            KeepAlivedConfigTypeError: 当path类型错误时
+            KeepAlivedConfigValueError: 当桶的上界无效时
+        """
+        if not isinstance(path, str):
+            raise KeepAlivedConfigTypeError(f"Invalid path type '{type(path)}'! Expected 'str'")
+        super().__init__(buckets)
+        self._path = path
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def flush(self):
+        directory = os.path.dirname(os.path.abspath(self._path))
+        fd, tmp_file = tempfile.mkstemp(
+            prefix=f".{os.path.basename(self._path)}.", suffix=".tmp", dir=directory
+        )
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(self.to_prometheus())
+            os.chmod(tmp_file, 0o644)
+            os.replace(tmp_file, self._path)
+        except BaseException:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            raise
+
+
+class KeepAlivedConfigCallbackSink(KeepAlivedConfigMetricsSink):
+    """
+    将每次操作的耗时转发给回调函数，例如接入已有的监控客户端
+    """
+
+    def __init__(self, callback: Callable[[str, float], None]):
+        """
+        初始化回调接收器
+
+        Args:
+            callback (Callable[[str, float], None]): 以操作名称和耗时（秒）调用的函数
+
+        Raises:
+            KeepAlivedConfigTypeError: 当callback不可调用时
+        """
+        if not callable(callback):
+            raise KeepAlivedConfigTypeError(
+                f"Invalid callback type '{type(callback)}'! Expected callable"
+            )
+        self._callback = callback
+
+    def record(self, name: str, seconds: float):
+        self._callback(name, seconds)
+
+
+class KeepAlivedConfigMetrics:
+    """
+    可选的性能统计
+
+    默认不启用，此时被统计的函数只多一次属性读取和判断。设置接收器后，解析
+    （parser.parse_file、parser.parse_string，以及其中的parser.read、parser.tokenize、
+    parser.build阶段）、序列化和保存（config.to_str、config.save）以及管理器的各个操作
+    （如vrrp.create_vrrp_instance、virtual_server.add_real_server、manager.validate）
+    每完成一次就向接收器记录一次耗时。
+
+    接收器是进程级的，对所有线程生效。启用统计时解析的各个阶段依次完成（先读取全部行，
+    再分词，再构建配置树），以便分别计时，因此会暂时占用更多内存。
+
+    Example:
+        ```python
+        with KeepAlivedConfigMetrics.trace() as sink:
+            manager.load_config("/etc/keepalived/keepalived.conf")
+            manager.vrrp.create_vrrp_instance("VI_2", "BACKUP", "eth0", 52, 90)
+        print(sink.stats()["parser.tokenize"]["total"])
+        ```
+    """
+
+    _sink: Optional[KeepAlivedConfigMetricsSink] = None
+
+    # 设置接收器
+    @classmethod
+    def set_sink(cls, sink: Optional[KeepAlivedConfigMetricsSink]) -> Optional[KeepAlivedConfigMetricsSink]:
+        """
+        设置接收器，None表示停止统计
+
+        Args:
+            sink (Optional[KeepAlivedConfigMetricsSink]): 接收器
+
+        Returns:
+            Optional[KeepAlivedConfigMetricsSink]: 之前的接收器
+
+        Raises:
+            KeepAlivedConfigTypeError: 当sink类型错误时
+        """
+        if sink is not None and not callable(getattr(sink, "record", None)):
+            raise KeepAlivedConfigTypeError(
+                f"Invalid sink type '{type(sink)}'! Expected object with a record() method"
+            )
+        previous = cls._sink
+        cls._sink = sink
+        return previous
+
+    # 获取当前的接收器
+    @classmethod
+    def get_sink(cls) -> Optional[KeepAlivedConfigMetricsSink]:
+        """
+        获取当前的接收器
+
+        Returns:
+            Optional[KeepAlivedConfigMetricsSink]: 当前的接收器，未启用统计时为None
+        """
+        return cls._sink
+
+    # 在with语句范围内启用统计
+    @classmethod
+    @contextlib.contextmanager
+    def trace(cls, sink: Optional[KeepAlivedConfigMetricsSink] = None) -> Iterator[KeepAlivedConfigMetricsSink]:
+        """
+        在with语句范围内启用统计，退出时调用接收器的flush()并恢复之前的接收器
+
+        Args:
+            sink (Optional[KeepAlivedConfigMetricsSink]): 接收器，未提供时使用新的KeepAlivedConfigHistogramSink
+
+        Yields:
+            KeepAlivedConfigMetricsSink: 使用的接收器
+
+        Raises:
+            KeepAlivedConfigTypeError: 当sink类型错误时
+        """
+        if sink is None:
+            sink = KeepAlivedConfigHistogramSink()
+        previous = cls.set_sink(sink)
+        try:
+            yield sink
+        finally:
+            cls._sink = previous
+            flush = getattr(sink, "flush", None)
+            if callable(flush):
+                flush()
+
+    # 记录一次操作的耗时
+    @classmethod
+    def record(cls, name: str, seconds: float):
+        """
+        向当前的接收器记录一次操作的耗时，未启用统计时不做任何事情
+
+        Args:
+            name (str): 操作名称
+            seconds (float): 耗时（秒）
+        """
+        sink = cls._sink
+        if sink is not None:
+            sink.record(name, seconds)
+
+    # 统计函数耗时的装饰器
+    @staticmethod
+    def timed(name: str):
+        """
+        统计函数耗时的装饰器，函数抛出异常时同样记录
+
+        Args:
+            name (str): 操作名称
+
+        Returns:
+            Callable: 装饰器
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                sink = KeepAlivedConfigMetrics._sink
+                if sink is None:
+                    return func(*args, **kwargs)
+                start = perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    sink.record(name, perf_counter() - start)
+            return wrapper
+        return decorator
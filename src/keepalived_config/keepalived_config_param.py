@@ -1,24 +1,139 @@
+import itertools
 import re
 
 from keepalived_config.keepalived_config_constants import KeepAlivedConfigConstants
+from keepalived_config.keepalived_config_snapshot import KeepAlivedConfigSnapshot
 from keepalived_config.keepalived_config_comment import (
     KeepAlivedConfigCommentTypes,
     KeepAlivedConfigComment,
 )
 
+_BLANK_LINE_REGEX = re.compile(r"^ *$")
+
+# shared by all params without comments, replaced by a comment list when the comments are first used
+_NO_COMMENTS = ()
+
+
+def _to_value(value) -> str:
+    try:
+        return str(value)
+    except:
+        raise TypeError(f"Invalid value type '{type(value)}'! Expected 'str'")
+
+
+class KeepAlivedConfigCommentList(list):
+    """
+    参数的注释列表，行为与普通列表相同
+
+    修改之前先为未释放的快照保留参数的状态，修改之后使包含参数的配置块缓存的渲染结果失效，
+    所以可以像普通列表一样直接修改param.comments。
+    """
+
+    __slots__ = ("_owner",)
+
+    def __init__(self, iterable=(), owner=None):
+        super().__init__(iterable)
+        self._owner = owner
+
+    def _before_change(self):
+        if KeepAlivedConfigSnapshot._active:
+            KeepAlivedConfigSnapshot._preserve(self._owner)
+
+    def append(self, comment):
+        self._before_change()
+        super().append(comment)
+        self._owner._touch()
+
+    def extend(self, comments):
+        self._before_change()
+        super().extend(comments)
+        self._owner._touch()
+
+    def __iadd__(self, comments):
+        self.extend(comments)
+        return self
+
+    def insert(self, i, comment):
+        self._before_change()
+        super().insert(i, comment)
+        self._owner._touch()
+
+    def remove(self, comment):
+        self._before_change()
+        super().remove(comment)
+        self._owner._touch()
+
+    def pop(self, i=-1):
+        self._before_change()
+        comment = super().pop(i)
+        self._owner._touch()
+        return comment
+
+    def clear(self):
+        self._before_change()
+        super().clear()
+        self._owner._touch()
+
+    def __setitem__(self, key, value):
+        self._before_change()
+        super().__setitem__(key, value)
+        self._owner._touch()
+
+    def __delitem__(self, key):
+        self._before_change()
+        super().__delitem__(key)
+        self._owner._touch()
+
+    def __imul__(self, n):
+        self._before_change()
+        result = super().__imul__(n)
+        self._owner._touch()
+        return result
+
+    def sort(self, *args, **kwargs):
+        self._before_change()
+        super().sort(*args, **kwargs)
+        self._owner._touch()
+
+    def reverse(self):
+        self._before_change()
+        super().reverse()
+        self._owner._touch()
+
 
 class KeepAlivedConfigParam:
-    def __init__(self, name, value: str = "", comments=None):
-        self._name = None
-        self._value = None
+    __slots__ = ("_name", "_value", "_comments", "_source_file", "_parent", "_epoch")
 
-        self.name = name
-        self.value = value
-        self._comments: list[KeepAlivedConfigComment] = []
+    _WRITE_CHUNK_LINES = 1024
+
+    def __init__(self, name, value: str = "", comments=None):
+        # a new param is in no snapshot and has no parent, the setters' hooks are not needed
+        if not isinstance(name, str):
+            raise TypeError(f"Invalid name type '{type(name)}'! Expected 'str'")
+        self._name = name
+        self._value = value if isinstance(value, str) else _to_value(value)
+        self._source_file = None
+        # the parameter list containing this param
+        self._parent = None
+        # snapshot number of the last preserved state, see KeepAlivedConfigSnapshot
+        self._epoch = KeepAlivedConfigSnapshot._epoch
+        self._comments: list[KeepAlivedConfigComment] = _NO_COMMENTS
 
         if comments:
             self.add_comments(comments)
 
+    # 使用已验证的字符串直接创建参数（跳过类型检查，用于批量生成节点）
+    @classmethod
+    def _from_trusted(cls, name: str, value: str = ""):
+        param = cls.__new__(cls)
+        param._name = name
+        param._value = value
+        param._comments = _NO_COMMENTS
+        param._source_file = None
+        param._parent = None
+        param._epoch = KeepAlivedConfigSnapshot._epoch
+        return param
+
     @property
     def name(self):
         return self._name
@@ -27,7 +142,12 @@ class KeepAlivedConfigParam:
     def name(self, name: str):
         if not isinstance(name, str):
             raise TypeError(f"Invalid name type '{type(name)}'! Expected 'str'")
+        if KeepAlivedConfigSnapshot._active:
+            KeepAlivedConfigSnapshot._preserve(self)
         self._name = name
+        if self._parent is not None:
+            self._parent.invalidate_index()
+            self._touch()
 
     @property
     def value(self):
@@ -35,19 +155,61 @@ class KeepAlivedConfigParam:
 
     @value.setter
     def value(self, value: str):
-        if isinstance(value, str):
-            self._value = value
-            return
+        if not isinstance(value, str):
+            value = _to_value(value)
 
-        try:
-            self._value = str(value)
-        except:
-            raise TypeError(f"Invalid value type '{type(value)}'! Expected 'str'")
+        if KeepAlivedConfigSnapshot._active:
+            KeepAlivedConfigSnapshot._preserve(self)
+        self._value = value
+        if self._parent is not None:
+            self._touch()
 
     @property
-    def comments(self):
+    def source_file(self):
+        """
+        条目所在的配置文件（通过include引入时），None表示属于主配置文件
+        """
+        return self._source_file
+
+    @source_file.setter
+    def source_file(self, source_file: str):
+        if source_file is not None and not isinstance(source_file, str):
+            raise TypeError(
+                f"Invalid source_file type '{type(source_file)}'! Expected 'str'"
+            )
+        if KeepAlivedConfigSnapshot._active:
+            KeepAlivedConfigSnapshot._preserve(self)
+        self._source_file = source_file
+
+    @property
+    def comments(self) -> KeepAlivedConfigCommentList:
+        """
+        参数的注释列表，读取没有副作用，通过列表进行的修改会自动标记参数已被修改
+        """
+        if self._comments is _NO_COMMENTS:
+            self._comments = KeepAlivedConfigCommentList(owner=self)
         return self._comments
 
+    @comments.setter
+    def comments(self, comments: list):
+        if not isinstance(comments, (list, tuple)):
+            raise TypeError(
+                f"Invalid comments type '{type(comments)}'! Expected 'list'"
+            )
+        for comment in comments:
+            if not isinstance(comment, KeepAlivedConfigComment):
+                raise TypeError(
+                    f"Invalid comment type '{type(comment)}'! Expected '{KeepAlivedConfigComment.__class__.__name__}'"
+                )
+        # we can only have 1 inline comment
+        if sum(1 for comment in comments if comment.type == KeepAlivedConfigCommentTypes.INLINE) > 1:
+            raise ValueError(f"More than one inline comment for param '{self._name}'")
+
+        if KeepAlivedConfigSnapshot._active:
+            KeepAlivedConfigSnapshot._preserve(self)
+        self._comments = KeepAlivedConfigCommentList(comments, owner=self) if comments else _NO_COMMENTS
+        self._touch()
+
     # 添加单个注释，验证注释类型并防止重复的行内注释
     def add_comment(self, comment: KeepAlivedConfigComment):
         if not isinstance(comment, KeepAlivedConfigComment):
@@ -67,7 +229,8 @@ class KeepAlivedConfigParam:
                 f"Inline comment already exists for param '{self._name}': '{comment.comment_str}'"
             )
 
-        self._comments.append(comment)
+        # the list preserves the state and invalidates the render caches
+        self.comments.append(comment)
 
     # 添加多个注释
     def add_comments(self, comments: list):
@@ -78,24 +241,63 @@ class KeepAlivedConfigParam:
         for comment in comments:
             self.add_comment(comment)
 
+    # 标记参数已被修改，使包含它的配置块缓存的渲染结果失效
+    def mark_dirty(self):
+        """
+        标记参数已被修改，使包含它的配置块缓存的渲染结果失效
+
+        通过属性和列表（包括comments列表）进行的修改会自动标记，只有直接修改已取得的注释对象等情况才需要手动调用。
+        快照和事务保留的是调用时的状态，需要被快照或回滚保留的注释修改应通过comments列表、add_comment()或comments赋值进行。
+        """
+        if KeepAlivedConfigSnapshot._active:
+            KeepAlivedConfigSnapshot._preserve(self)
+        self._touch()
+
+    def _touch(self):
+        parent = self._parent
+        if parent is not None:
+            parent._touch()
+
     # 将参数转换为字符串格式，包含注释和适当的缩进
     def to_str(self, indent_level=0):
-        Str = ""
-        if self.__get_generic_comments__():
-            Str = (
-                "\n".join(
-                    [
-                        f"{KeepAlivedConfigConstants.get_indent(indent_level)}{str(comment)}"
-                        for comment in self.__get_generic_comments__()
-                    ]
-                )
-                + "\n"
-            )
-        Str += f"{KeepAlivedConfigConstants.get_indent(indent_level)}{self._name}{' ' + self._value if self._value else ''}{self.__get_inline_comment__() if self.__get_inline_comment__() else ''}"
+        return "\n".join(self.iter_lines(indent_level))
+
+    # 逐行产生参数的字符串格式，各行以换行符连接后与to_str()的结果完全一致
+    def iter_lines(self, indent_level=0):
+        indent = KeepAlivedConfigConstants.get_indent(indent_level)
+        inline_comment = ""
+        has_generic_comments = False
+        for comment in self._comments:
+            if comment.type == KeepAlivedConfigCommentTypes.GENERIC:
+                has_generic_comments = True
+                yield f"{indent}{str(comment)}"
+            elif not inline_comment:
+                inline_comment = str(comment)
+
+        line = f"{indent}{self._name}{' ' + self._value if self._value else ''}{inline_comment}"
+        if not has_generic_comments and not line.strip() and _BLANK_LINE_REGEX.match(line):
+            line = ""
+        yield line
+
+    # 将参数的字符串格式直接写入文件对象
+    def write_to(self, fp, indent_level=0):
+        """
+        将参数的字符串格式直接写入文件对象，不在内存中构建完整的字符串
+
+        写入的内容与to_str(indent_level)完全一致（不包含结尾的换行符）。
 
-        if re.match(r"^ *$", Str):
-            return ""
-        return Str
+        Args:
+            fp: 可写的文本文件对象
+            indent_level (int): 缩进级别
+        """
+        lines = self.iter_lines(indent_level)
+        fp.write(next(lines))
+        # hand the lines over in bounded chunks to keep the number of write calls low
+        while True:
+            chunk = list(itertools.islice(lines, self._WRITE_CHUNK_LINES))
+            if not chunk:
+                break
+            fp.write("\n" + "\n".join(chunk))
 
     def __get_inline_comment__(self) -> str:
         inline_comment: list[KeepAlivedConfigComment] = list(
@@ -0,0 +1,252 @@
+from typing import Optional
+
+from keepalived_config.keepalived_config_snapshot import KeepAlivedConfigSnapshot
+
+
+class KeepAlivedConfigParamList(list):
+    """
+    配置块和配置对象使用的参数列表
+
+    在普通列表的基础上维护按需构建的名称索引（完整名称 -> 节点列表）和关键字索引
+    （名称的第一个单词，例如"real_server" -> 节点列表），使按名称或关键字查找子节点的
+    复杂度为O(1)。append/extend会增量更新索引，remove/pop增量更新名称索引，
+    其余修改操作以及节点改名会使索引失效，并在下一次查找时重新构建。
+
+    列表记录其所有者（配置块或配置对象），任何修改都会通知所有者，
+    使配置块缓存的渲染结果失效；存在未释放的快照时，修改之前先为快照保留列表的内容。
+    """
+
+    __slots__ = ("_index", "_keywords", "_owner", "_epoch")
+
+    def __init__(self, iterable=(), owner=None):
+        super().__init__(iterable)
+        self._index: Optional[dict] = None
+        self._keywords: Optional[dict] = None
+        self._owner = owner
+        # snapshot number of the last preserved content, see KeepAlivedConfigSnapshot
+        self._epoch = KeepAlivedConfigSnapshot._epoch
+        if KeepAlivedConfigSnapshot._active:
+            for node in self:
+                KeepAlivedConfigSnapshot._preserve_moved(node, self)
+        for node in self:
+            node._parent = self
+
+    @property
+    def owner(self):
+        """
+        列表的所有者（配置块或配置对象）
+        """
+        return self._owner
+
+    # 查找指定完整名称的所有子节点
+    def find(self, name: str) -> list:
+        """
+        查找指定完整名称的所有子节点
+
+        Args:
+            name (str): 节点的完整名称（例如"vrrp_instance VI_1"）
+
+        Returns:
+            list: 按文档顺序排列的节点列表，不存在时为空列表
+        """
+        return list(self._get_index().get(name, ()))
+
+    # 查找指定完整名称的第一个子节点
+    def find_one(self, name: str, node_type: type = None):
+        """
+        查找指定完整名称的第一个子节点
+
+        Args:
+            name (str): 节点的完整名称
+            node_type (type, optional): 只返回该类型的节点
+
+        Returns:
+            节点对象，如果不存在则返回None
+        """
+        for node in self._get_index().get(name, ()):
+            if node_type is None or isinstance(node, node_type):
+                return node
+        return None
+
+    # 查找名称以指定关键字开头的所有子节点
+    def find_keyword(self, keyword: str) -> list:
+        """
+        查找名称的第一个单词为指定关键字的所有子节点
+
+        Args:
+            keyword (str): 关键字（例如"real_server"同时匹配"real_server 10.0.0.1 80"等所有真实服务器）
+
+        Returns:
+            list: 按文档顺序排列的节点列表，不存在时为空列表
+        """
+        return list(self._get_keywords().get(keyword, ()))
+
+    # 使名称索引失效
+    def invalidate_index(self):
+        self._index = None
+        self._keywords = None
+
+    # 通知所有者列表内容已变化
+    def _touch(self):
+        owner = self._owner
+        if owner is not None:
+            owner._touch()
+
+    def _get_index(self) -> dict:
+        index = self._index
+        if index is None:
+            index = {}
+            for node in self:
+                index.setdefault(node.name, []).append(node)
+            self._index = index
+        return index
+
+    def _get_keywords(self) -> dict:
+        keywords = self._keywords
+        if keywords is None:
+            keywords = {}
+            for node in self:
+                keywords.setdefault(node.name.split(" ", 1)[0], []).append(node)
+            self._keywords = keywords
+        return keywords
+
+    def _index_remove(self, node):
+        nodes = self._index.get(node.name)
+        if nodes is None:
+            self._index = None
+            return
+        for i, indexed in enumerate(nodes):
+            if indexed is node:
+                del nodes[i]
+                break
+        if not nodes:
+            del self._index[node.name]
+
+    def append(self, node):
+        if KeepAlivedConfigSnapshot._active:
+            KeepAlivedConfigSnapshot._preserve(self)
+            KeepAlivedConfigSnapshot._preserve_moved(node, self)
+        super().append(node)
+        node._parent = self
+        if self._index is not None:
+            self._index.setdefault(node.name, []).append(node)
+        if self._keywords is not None:
+            self._keywords.setdefault(node.name.split(" ", 1)[0], []).append(node)
+        self._touch()
+
+    def extend(self, nodes):
+        nodes = list(nodes)
+        if KeepAlivedConfigSnapshot._active:
+            KeepAlivedConfigSnapshot._preserve(self)
+            for node in nodes:
+                KeepAlivedConfigSnapshot._preserve_moved(node, self)
+        super().extend(nodes)
+        index = self._index
+        keywords = self._keywords
+        for node in nodes:
+            node._parent = self
+            if index is not None:
+                index.setdefault(node.name, []).append(node)
+            if keywords is not None:
+                keywords.setdefault(node.name.split(" ", 1)[0], []).append(node)
+        self._touch()
+
+    def __iadd__(self, nodes):
+        self.extend(nodes)
+        return self
+
+    def remove(self, node):
+        if KeepAlivedConfigSnapshot._active:
+            KeepAlivedConfigSnapshot._preserve(self)
+        for i, item in enumerate(self):
+            if item is node:
+                break
+        else:
+            # fall back to equality semantics of list.remove
+            i = self.index(node)
+            node = self[i]
+        super().__delitem__(i)
+        if self._index is not None:
+            self._index_remove(node)
+        self._keywords = None
+        self._touch()
+
+    def pop(self, i=-1):
+        if KeepAlivedConfigSnapshot._active:
+            KeepAlivedConfigSnapshot._preserve(self)
+        node = super().pop(i)
+        if self._index is not None:
+            self._index_remove(node)
+        self._keywords = None
+        self._touch()
+        return node
+
+    def insert(self, i, node):
+        if KeepAlivedConfigSnapshot._active:
+            KeepAlivedConfigSnapshot._preserve(self)
+            KeepAlivedConfigSnapshot._preserve_moved(node, self)
+        super().insert(i, node)
+        node._parent = self
+        self._index = None
+        self._keywords = None
+        self._touch()
+
+    def clear(self):
+        if KeepAlivedConfigSnapshot._active:
+            KeepAlivedConfigSnapshot._preserve(self)
+        super().clear()
+        self._index = None
+        self._keywords = None
+        self._touch()
+
+    def __setitem__(self, key, value):
+        if KeepAlivedConfigSnapshot._active:
+            KeepAlivedConfigSnapshot._preserve(self)
+        if isinstance(key, slice):
+            value = list(value)
+            if KeepAlivedConfigSnapshot._active:
+                for node in value:
+                    KeepAlivedConfigSnapshot._preserve_moved(node, self)
+            for node in value:
+                node._parent = self
+        else:
+            if KeepAlivedConfigSnapshot._active:
+                KeepAlivedConfigSnapshot._preserve_moved(value, self)
+            value._parent = self
+        super().__setitem__(key, value)
+        self._index = None
+        self._keywords = None
+        self._touch()
+
+    def __delitem__(self, key):
+        if KeepAlivedConfigSnapshot._active:
+            KeepAlivedConfigSnapshot._preserve(self)
+        super().__delitem__(key)
+        self._index = None
+        self._keywords = None
+        self._touch()
+
+    def __imul__(self, n):
+        if KeepAlivedConfigSnapshot._active:
+            KeepAlivedConfigSnapshot._preserve(self)
+        result = super().__imul__(n)
+        self._index = None
+        self._keywords = None
+        self._touch()
+        return result
+
+    def sort(self, *args, **kwargs):
+        if KeepAlivedConfigSnapshot._active:
+            KeepAlivedConfigSnapshot._preserve(self)
+        super().sort(*args, **kwargs)
+        self._index = None
+        self._keywords = None
+        self._touch()
+
+    def reverse(self):
+        if KeepAlivedConfigSnapshot._active:
+            KeepAlivedConfigSnapshot._preserve(self)
+        super().reverse()
+        self._index = None
+        self._keywords = None
+        self._touch()
@@ -1,12 +1,23 @@
-import re
+import glob
+import io
+import itertools
 import os
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Iterator, Union, TextIO
 
+from keepalived_config.keepalived_config_constants import KeepAlivedConfigConstants
 from keepalived_config.keepalived_config import (
     KeepAlivedConfig,
     KeepAlivedConfigParam,
     KeepAlivedConfigBlock,
     KeepAlivedConfigComment,
 )
+from keepalived_config.keepalived_config_tokenizer import (
+    KeepAlivedConfigTokenizer,
+    KeepAlivedConfigTokenTypes,
+)
+from keepalived_config.keepalived_config_metrics import KeepAlivedConfigMetrics
 from keepalived_config.keepalived_config_exceptions import (
     ConfigParseError,
     KeepAlivedConfigValueError,
@@ -15,27 +26,44 @@ from keepalived_config.keepalived_config_exceptions import (
 
 
 class KeepAlivedConfigParser:
-    KEY_VALUE_REGEX = re.compile(
-        r"^ *(?![!#])(?P<key>[\w\-]+)(?: +(?P<value>[^{}\n\r]+))?(?: +(?P<block_type>[{}]))?$"
-    )
+    def __init__(self, cache=None):
+        """
+        初始化解析器
 
-    def __init__(self):
+        Args:
+            cache (KeepAlivedConfigParseCache, optional): 解析缓存，parse_file在文件未变化时直接从缓存加载
+        """
+        self._cache = cache
         self._config: KeepAlivedConfig = None
         self._items: list[KeepAlivedConfigParam | KeepAlivedConfigBlock] = []
-        self._block_nesting_level = 0
+        self._block_stack: list[KeepAlivedConfigBlock] = []
         self._comments: list[KeepAlivedConfigComment] = []
         self._parse_source = None
 
     # 解析配置文件并返回KeepAlivedConfig对象
+    @KeepAlivedConfigMetrics.timed("parser.parse_file")
     def parse_file(
-        self, config_file, keep_empty_lines: bool = True
+        self,
+        config_file,
+        keep_empty_lines: bool = True,
+        resolve_includes: bool = False,
+        max_workers: int = None,
     ) -> KeepAlivedConfig:
         """
         解析配置文件并返回KeepAlivedConfig对象
+
+        文件按行流式读取，不会一次性读入内存。
+
+        启用resolve_includes时，顶层的include指令会被展开：按keepalived的方式对路径做glob匹配
+        （相对路径以所在文件的目录为基准，匹配结果按名称排序），被引用的文件在线程池中并行解析，
+        解析结果按顺序插入到对应include指令之后，并通过source_file记录条目来源，
+        以便保存时写回各自的文件。块内部的include指令不会被展开，仍作为普通参数保留。
         
         Args:
             config_file: 配置文件路径
             keep_empty_lines: 是否保留空行
+            resolve_includes: 是否展开include指令
+            max_workers: 并行解析被引用文件的最大线程数，None表示使用默认值
             
         Returns:
             KeepAlivedConfig: 解析后的配置对象
@@ -43,22 +71,39 @@ class KeepAlivedConfigParser:
         Raises:
             ConfigParseError: 当配置文件解析失败时
             FileNotFoundError: 当配置文件不存在时
+            KeepAlivedConfigValueError: 当配置文件为空时
         """
         self._config = KeepAlivedConfig(config_file=config_file)
 
         self._parse_source = self._config.config_file
 
-        try:
-            with open(self._config.config_file, "r") as f:
-                contents = f.read()
-        except FileNotFoundError:
-            raise
-        except Exception as e:
-            raise ConfigParseError(f"无法读取配置文件 '{config_file}': {str(e)}") from e
+        if self._cache is not None:
+            self._config.params.extend(
+                self._load_cached(self._config.config_file, keep_empty_lines, allow_empty=False)
+            )
+        else:
+            try:
+                f = open(self._config.config_file, "r")
+            except FileNotFoundError:
+                raise
+            except Exception as e:
+                raise ConfigParseError(f"无法读取配置文件 '{config_file}': {str(e)}") from e
+
+            with f:
+                first_line = self._read_first_line(f, config_file)
+                if not first_line:
+                    raise KeepAlivedConfigValueError(f"Empty config file '{config_file}'!")
 
-        return self.parse_string(contents, keep_empty_lines)
+                lines = itertools.chain((first_line,), self._read_lines(f, config_file))
+                self._parse_lines(lines, keep_empty_lines)
+
+        if resolve_includes:
+            self._resolve_includes(keep_empty_lines, max_workers)
+
+        return self._config
 
     # 解析配置字符串并返回KeepAlivedConfig对象
+    @KeepAlivedConfigMetrics.timed("parser.parse_string")
     def parse_string(
         self, config_string: str, keep_empty_lines: bool = True
     ) -> KeepAlivedConfig:
@@ -86,129 +131,308 @@ class KeepAlivedConfigParser:
         if not config_string:
             raise KeepAlivedConfigValueError("Empty config_string provided!")
 
-        self._keep_empty_lines = keep_empty_lines
-        if not self._config:
-            self._config = KeepAlivedConfig()
+        return self._parse_lines(config_string.split("\n"), keep_empty_lines)
 
-        if not self._parse_source:
-            self._parse_source = "string"
+    # 增量解析配置，每完成一个顶层条目就立即返回
+    def iter_parse(
+        self, config: Union[str, TextIO], keep_empty_lines: bool = True
+    ) -> Iterator[Union[KeepAlivedConfigParam, KeepAlivedConfigBlock]]:
+        """
+        增量解析配置文件，逐行读取，在顶层条目（如global_defs、每个vrrp_instance、
+        每个virtual_server）的右花括号出现时立即返回该条目
 
-        self._parse_config_file_contents(config_string.split("\n"))
+        已返回的条目不会被解析器保留，因此可以用有限的内存扫描或过滤非常大的配置文件。
 
-        if self._block_nesting_level > 0:
-            raise ConfigParseError(
-                f"Unexpected end of file! Missing '}}' at nesting level {self._block_nesting_level}"
-            )
+        Args:
+            config (Union[str, TextIO]): 配置文件路径或已打开的文本文件对象
+            keep_empty_lines (bool): 是否保留空行
 
-        self._config.params.extend(self._items)
+        Yields:
+            Union[KeepAlivedConfigParam, KeepAlivedConfigBlock]: 已完整解析的顶层条目
 
-        return self._config
+        Raises:
+            KeepAlivedConfigTypeError: 当config类型错误时
+            FileNotFoundError: 当配置文件不存在时
+            ConfigParseError: 当配置文件解析失败时
 
-    # 解析配置文件内容行列表
-    def _parse_config_file_contents(self, file_contents: list) -> list:
-        self._items = []
+        Example:
+            ```python
+            parser = KeepAlivedConfigParser()
+            for item in parser.iter_parse("/etc/keepalived/keepalived.conf"):
+                if item.name.startswith("virtual_server"):
+                    print(item.name)
+            ```
+        """
+        self._keep_empty_lines = keep_empty_lines
 
-        for line_nr, line in enumerate(file_contents, 1):
-            self._parse_config_file_line(line.strip(), line_nr)
+        if isinstance(config, str):
+            self._parse_source = config
+            try:
+                f = open(config, "r")
+            except FileNotFoundError:
+                raise
+            except Exception as e:
+                raise ConfigParseError(f"无法读取配置文件 '{config}': {str(e)}") from e
+
+            with f:
+                yield from self._iter_items(self._tokenize(self._read_lines(f, config)))
+            return
 
-    # 解析单行配置内容
-    def _parse_config_file_line(self, line: str, line_nr: int):
-        active_block = self._get_active_block(self._items, self._block_nesting_level)
+        if not hasattr(config, "readline"):
+            raise KeepAlivedConfigTypeError(
+                f"Invalid config type '{type(config)}'! Expected 'str' or file object"
+            )
 
-        if not line and self._keep_empty_lines:
-            if active_block:
-                active_block.params.append(KeepAlivedConfigParam("", ""))
-            else:
-                self._items.append(KeepAlivedConfigParam("", ""))
-            return
+        self._parse_source = getattr(config, "name", "stream")
+        yield from self._iter_items(
+            self._tokenize(self._read_lines(config, self._parse_source))
+        )
 
-        if line and KeepAlivedConfigComment.has_comment(line):
-            self._comments.append(KeepAlivedConfigComment.from_str(line))
-            line = re.sub(KeepAlivedConfigComment.COMMENT_REGEX, "", line)
+    # 解析配置行并将结果添加到配置对象中
+    def _parse_lines(self, lines, keep_empty_lines: bool) -> KeepAlivedConfig:
+        self._keep_empty_lines = keep_empty_lines
+        if not self._config:
+            self._config = KeepAlivedConfig()
 
-        if not line:
-            return
+        if not self._parse_source:
+            self._parse_source = "string"
 
-        if line.startswith("}") and self._block_nesting_level == 0:
-            raise ValueError(
-                f"Unexpected '}}' found at nesting level 0! Reference: {self._parse_source}@{line_nr}: '{line}'"
-            )
+        self._items = self._build_items(lines)
+        self._config.params.extend(self._items)
 
-        if line.startswith("}") and self._block_nesting_level > 0:
-            self._block_nesting_level -= 1
-            active_block = self._get_active_block(
-                self._items, self._block_nesting_level
-            )
-            return
+        return self._config
 
-        match = re.match(self.KEY_VALUE_REGEX, line)
-        if not match:
-            # there are special cases where we have a single value without a key, which is not catched by the regex
-            items = line.split(" ")
-            if len(items) == 1:
-                items = [items[0], None, None]
-            else:
-                raise ValueError(
-                    f"Unexpected line format in {self._config.config_file}@{line_nr}: '{line}'"
+    def _tokenize(self, lines):
+        return KeepAlivedConfigTokenizer(self._parse_source).tokenize(lines)
+
+    # 由配置行构建顶层条目，启用性能统计时分别记录读取、分词和构建配置树的耗时
+    def _build_items(self, lines) -> list:
+        if KeepAlivedConfigMetrics.get_sink() is None:
+            return list(self._iter_items(self._tokenize(lines)))
+
+        # run the phases one after another so that each one can be timed
+        start = perf_counter()
+        lines = list(lines)
+        read = perf_counter()
+        tokens = list(self._tokenize(lines))
+        tokenized = perf_counter()
+        items = list(self._iter_items(tokens))
+        built = perf_counter()
+
+        KeepAlivedConfigMetrics.record("parser.read", read - start)
+        KeepAlivedConfigMetrics.record("parser.tokenize", tokenized - read)
+        KeepAlivedConfigMetrics.record("parser.build", built - tokenized)
+        return items
+
+    # 展开顶层include指令，并行解析被引用的文件并按顺序合并到配置中
+    def _resolve_includes(self, keep_empty_lines: bool, max_workers: int = None):
+        main_file = os.path.abspath(self._config.config_file)
+        parsed = {main_file: self._config.params}
+        includes = {main_file: self._find_includes(main_file, self._config.params)}
+
+        # parse the referenced files wave by wave, files of the same wave are independent
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            wave = includes[main_file]
+            while wave:
+                pending = list(
+                    dict.fromkeys(
+                        path
+                        for _, paths in wave
+                        for path in paths
+                        if path not in parsed
+                    )
+                )
+                results = executor.map(
+                    lambda path: self._parse_fragment(path, keep_empty_lines), pending
+                )
+                wave = []
+                for path, items in zip(pending, results):
+                    parsed[path] = items
+                    includes[path] = self._find_includes(path, items)
+                    wave.extend(includes[path])
+
+        include_files = []
+
+        def expand(path, stack):
+            paths_by_param = {id(param): paths for param, paths in includes[path]}
+            result = []
+            for item in parsed[path]:
+                if path != main_file:
+                    item.source_file = path
+                result.append(item)
+                for include_path in paths_by_param.get(id(item), ()):
+                    if include_path in stack:
+                        raise ConfigParseError(
+                            f"Circular include of '{include_path}' found in '{path}'"
+                        )
+                    if include_path in include_files:
+                        raise ConfigParseError(
+                            f"Config file '{include_path}' is included more than once"
+                        )
+                    include_files.append(include_path)
+                    result.extend(expand(include_path, stack + (include_path,)))
+            return result
+
+        self._config.params[:] = expand(main_file, (main_file,))
+        self._config.include_files.extend(include_files)
+
+    # 查找顶层include指令并解析其匹配的文件路径
+    @staticmethod
+    def _find_includes(source, items):
+        includes = []
+        base_dir = os.path.dirname(source)
+        for item in items:
+            if (
+                isinstance(item, KeepAlivedConfigBlock)
+                or item.name != KeepAlivedConfigConstants.INCLUDE_DIRECTIVE
+            ):
+                continue
+            pattern = item.value.strip().strip('"')
+            if not pattern:
+                raise ConfigParseError(f"Missing include path in '{source}'")
+            pattern = os.path.join(base_dir, os.path.expanduser(pattern))
+            # like keepalived, patterns without matches are ignored
+            includes.append(
+                (
+                    item,
+                    sorted(
+                        os.path.normpath(path)
+                        for path in glob.glob(pattern)
+                        if os.path.isfile(path)
+                    ),
                 )
-        else:
-            items = match.groups()
-        valid_items = len(list(filter(None, items)))
-        if valid_items < 1 or valid_items > 3:
-            raise ValueError(
-                f"Unexpected line format in {self._parse_source}@{line_nr}: '{line}'"
             )
+        return includes
+
+    # 解析单个被引用的文件，返回其顶层条目
+    def _parse_fragment(self, path, keep_empty_lines: bool):
+        parser = KeepAlivedConfigParser(cache=self._cache)
+        if self._cache is not None:
+            parser._parse_source = path
+            return parser._load_cached(path, keep_empty_lines)
+        return list(parser.iter_parse(path, keep_empty_lines))
+
+    # 通过解析缓存加载配置文件的顶层条目，未命中时解析文件内容
+    def _load_cached(self, path, keep_empty_lines: bool, allow_empty: bool = True):
+        def parse(content: bytes):
+            if not content and not allow_empty:
+                raise KeepAlivedConfigValueError(f"Empty config file '{path}'!")
+            self._keep_empty_lines = keep_empty_lines
+            # decode like open() in text mode does
+            lines = self._read_lines(io.TextIOWrapper(io.BytesIO(content)), path)
+            return self._build_items(lines)
 
-        key, value, block_type = items
+        try:
+            return self._cache.load(path, keep_empty_lines, parse)
+        except FileNotFoundError:
+            raise
+        except OSError as e:
+            raise ConfigParseError(f"无法读取配置文件 '{path}': {str(e)}") from e
 
-        if block_type and block_type == "{":
-            self._block_nesting_level += 1
-            new_block = KeepAlivedConfigBlock(
-                key, name=value, comments=self._comments.copy()
+    # 从文件对象中读取首行，将读取错误转换为ConfigParseError
+    @staticmethod
+    def _read_first_line(f, source) -> str:
+        try:
+            return f.readline()
+        except (OSError, UnicodeDecodeError) as e:
+            raise ConfigParseError(f"无法读取配置文件 '{source}': {str(e)}") from e
+
+    # 从文件对象中逐行读取，将读取错误转换为ConfigParseError
+    @staticmethod
+    def _read_lines(f, source):
+        try:
+            yield from f
+        except (OSError, UnicodeDecodeError) as e:
+            raise ConfigParseError(f"无法读取配置文件 '{source}': {str(e)}") from e
+
+    # 根据分词器产生的词法单元构建配置树，每完成一个顶层条目就返回该条目
+    def _iter_items(self, tokens):
+        KEY = KeepAlivedConfigTokenTypes.KEY
+        VALUE = KeepAlivedConfigTokenTypes.VALUE
+        BLOCK_START = KeepAlivedConfigTokenTypes.BLOCK_START
+        BLOCK_END = KeepAlivedConfigTokenTypes.BLOCK_END
+        COMMENT = KeepAlivedConfigTokenTypes.COMMENT
+        BLANK = KeepAlivedConfigTokenTypes.BLANK
+
+        self._block_stack = []
+        self._comments = []
+        block_stack = self._block_stack
+        # blocks under construction have neither a name index nor rendered text yet,
+        # skip the bookkeeping of KeepAlivedConfigParamList and only link the parent
+        append_child = list.append
+
+        def add_child(node):
+            params = block_stack[-1]._params
+            node._parent = params
+            append_child(params, node)
+
+        pending_key = None
+        pending_value = ""
+
+        for token_type, value, line_nr in tokens:
+            if token_type is VALUE:
+                pending_value = value
+                continue
+
+            if token_type is BLOCK_START:
+                block = KeepAlivedConfigBlock(
+                    pending_key, name=pending_value, comments=self._take_comments()
+                )
+                if block_stack:
+                    add_child(block)
+                block_stack.append(block)
+                pending_key = None
+                continue
+
+            # any other token completes the param of the previous key
+            if pending_key is not None:
+                param = KeepAlivedConfigParam(
+                    pending_key, pending_value, comments=self._take_comments()
+                )
+                pending_key = None
+                if block_stack:
+                    add_child(param)
+                else:
+                    yield param
+
+            if token_type is KEY:
+                pending_key = value
+                pending_value = ""
+            elif token_type is COMMENT:
+                self._comments.append(value)
+            elif token_type is BLANK:
+                if self._keep_empty_lines:
+                    if block_stack:
+                        add_child(KeepAlivedConfigParam("", ""))
+                    else:
+                        yield KeepAlivedConfigParam("", "")
+            elif token_type is BLOCK_END:
+                if not block_stack:
+                    raise ValueError(
+                        f"Unexpected '}}' found at nesting level 0! Reference: {self._parse_source}@{line_nr}: '{value}'"
+                    )
+                block = block_stack.pop()
+                if not block_stack:
+                    yield block
+
+        if pending_key is not None:
+            param = KeepAlivedConfigParam(
+                pending_key, pending_value, comments=self._take_comments()
             )
-            self._comments.clear()
-            if active_block:
-                active_block.add_param(new_block)
+            if block_stack:
+                add_child(param)
             else:
-                self._items.append(new_block)
-            return
-
-        if valid_items == 1:
-            value = ""
+                yield param
 
-        # normal case where we have a key and a value
-        config_param = KeepAlivedConfigParam(key, value, comments=self._comments.copy())
-        self._comments.clear()
-        if active_block:
-            active_block.add_param(config_param)
-        else:
-            self._items.append(config_param)
-
-    # 获取指定嵌套级别的活动配置块
-    def _get_active_block(self, config: list, nesting_level: int):
-        if not isinstance(config, list):
-            raise TypeError(f"Invalid config type '{type(config)}'! Expected 'list'")
-        if not isinstance(nesting_level, int):
-            raise TypeError(
-                f"Invalid nesting_level type '{type(nesting_level)}'! Expected 'int'"
-            )
-        if nesting_level < 0:
-            raise ValueError(
-                f"Invalid nesting_level value '{nesting_level}'! Expected '>= 0'"
+        if block_stack:
+            raise ConfigParseError(
+                f"Unexpected end of file! Missing '}}' at nesting level {len(block_stack)}"
             )
 
-        if nesting_level == 0:
+    # 取出待处理的注释，交给下一个参数或子块
+    def _take_comments(self):
+        if not self._comments:
             return None
-
-        active_block = (
-            config[-1] if isinstance(config[-1], KeepAlivedConfigBlock) else None
-        )
-        for _ in range(1, nesting_level, 1):
-            if not active_block:
-                return None
-            if not active_block.params or not isinstance(
-                active_block.params[-1], KeepAlivedConfigBlock
-            ):
-                return None
-            active_block = active_block.params[-1]
-        return active_block
\ No newline at end of file
+        comments = self._comments
+        self._comments = []
+        return comments
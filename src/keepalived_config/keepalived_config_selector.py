@@ -0,0 +1,262 @@
+import functools
+import re
+from fnmatch import fnmatchcase
+from typing import Iterator, Optional
+
+from keepalived_config.keepalived_config_block import KeepAlivedConfigBlock
+from keepalived_config.keepalived_config_param import KeepAlivedConfigParam
+from keepalived_config.keepalived_config_exceptions import (
+    KeepAlivedConfigTypeError,
+    KeepAlivedConfigValueError,
+)
+
+
+_STEP_REGEX = re.compile(r'^\s*(?:"(?P<quoted>[^"]*)"|(?P<pattern>[^\[\]"]+))\s*(?P<predicates>(?:\[.*\])?)\s*$')
+_PREDICATE_REGEX = re.compile(
+    r'\[\s*(?P<key>[^\[\]=!"\s]+)\s*(?:(?P<op>!?=)\s*(?:"(?P<quoted>[^"]*)"|(?P<value>[^\[\]"]*?)))?\s*\]'
+)
+_GLOB_CHARS = ("*", "?")
+
+
+class _Predicate:
+    """
+    节点过滤条件: [key]、[key=value] 或 [key!=value]
+    """
+
+    __slots__ = ("key", "negate", "value", "is_glob")
+
+    def __init__(self, key: str, op: Optional[str], value: Optional[str]):
+        self.key = key
+        self.negate = op == "!="
+        self.value = value
+        self.is_glob = value is not None and any(char in value for char in _GLOB_CHARS)
+
+    def matches(self, node) -> bool:
+        if not isinstance(node, KeepAlivedConfigBlock):
+            return False
+        # read the index directly, predicates run for every candidate node
+        children = node.params._get_keywords().get(self.key, ())
+        if self.value is None:
+            return bool(children)
+
+        found = False
+        for child in children:
+            if isinstance(child, KeepAlivedConfigBlock):
+                continue
+            # "key value" params store the value separately, "key a b" keep "a b" as the value
+            value = child.value if child.name == self.key else child.name.split(" ", 1)[1]
+            if value == self.value or (self.is_glob and fnmatchcase(value, self.value)):
+                found = True
+                break
+        return found != self.negate
+
+
+class _Step:
+    """
+    查询路径中的一步: 名称模式加上可选的过滤条件
+    """
+
+    __slots__ = ("pattern", "is_glob", "is_full_name", "predicates")
+
+    def __init__(self, pattern: str, quoted: bool, predicates: tuple):
+        self.pattern = pattern
+        self.is_glob = not quoted and any(char in pattern for char in _GLOB_CHARS)
+        # a pattern with a space matches the complete node name such as "virtual_server 10.0.0.1 80",
+        # otherwise only the keyword (the first word of the name)
+        self.is_full_name = quoted or " " in pattern
+        self.predicates = predicates
+
+    def accepts(self, node) -> bool:
+        for predicate in self.predicates:
+            if not predicate.matches(node):
+                return False
+        return True
+
+    def matches_arguments(self, arguments: str) -> bool:
+        if self.is_glob:
+            return fnmatchcase(arguments, self.pattern)
+        return arguments == self.pattern
+
+    def candidates(self, params) -> Iterator[tuple]:
+        """
+        产生(节点, 是否仅匹配了关键字)，按文档顺序
+        """
+        if not self.is_glob:
+            # literal patterns are answered by the name indexes of the parameter list
+            if self.is_full_name:
+                for node in params.find(self.pattern):
+                    yield node, False
+            else:
+                for node in params.find_keyword(self.pattern):
+                    yield node, node.name != self.pattern
+            # generated list entries (e.g. virtual_ipaddress) keep the text in the value
+            for node in params.find(""):
+                if node.value == self.pattern:
+                    yield node, False
+            return
+
+        for node in params:
+            text = _node_text(node)
+            if not text:
+                # blank lines
+                continue
+            if self.is_full_name:
+                if fnmatchcase(text, self.pattern):
+                    yield node, False
+            else:
+                keyword = text.split(" ", 1)[0]
+                if fnmatchcase(keyword, self.pattern):
+                    yield node, keyword != text
+
+
+def _node_text(node) -> str:
+    if not isinstance(node, KeepAlivedConfigParam):
+        # comments
+        return ""
+    return node.name or node.value
+
+
+class KeepAlivedConfigSelector:
+    """
+    配置树的路径查询
+
+    查询由"/"分隔的若干步组成，每一步匹配上一步结果的子节点:
+    - 关键字（例如"real_server"）匹配名称第一个单词相同的所有节点，
+      带参数的节点（例如"vrrp_instance VI_1"）的下一步如果与其参数匹配，则作为参数步骤，
+      例如"vrrp_instance/VI_1"、"vrrp_instance/*"；否则下一步匹配其子节点
+    - 包含空格的名称（例如"virtual_server 10.0.0.1 80"）与完整名称匹配
+    - 名称可以使用通配符"*"和"?"，例如"*"匹配所有节点，"vrrp_*/VI_?"
+    - 双引号中的名称按字面与完整名称匹配，可以包含"/"，例如"virtual_ipaddress/\"10.0.0.1/24\""
+    - 过滤条件: [key]表示存在名为key的子节点，[key=value]表示存在值为value的key参数
+      （value可以使用通配符或双引号），[key!=value]为[key=value]的否定
+
+    不含通配符的步骤通过参数列表的名称索引和关键字索引查找，不会扫描全部子节点。
+    查询字符串编译后缓存，结果以生成器的方式按文档顺序逐个产生。
+
+    Example:
+        ```python
+        for rs in config.select("virtual_server[lb_kind=DR]/real_server[weight=0]"):
+            print(rs.name)
+        vips = [vip.name or vip.value for vip in config.select("vrrp_instance/*/virtual_ipaddress/*")]
+        ```
+    """
+
+    # 在参数列表中执行查询
+    @classmethod
+    def select(cls, params, query: str) -> Iterator:
+        """
+        在参数列表中执行查询
+
+        Args:
+            params (KeepAlivedConfigParamList): 查询起点的参数列表（配置对象或配置块的params）
+            query (str): 查询字符串
+
+        Returns:
+            Iterator: 按文档顺序产生匹配的参数和配置块
+
+        Raises:
+            KeepAlivedConfigTypeError: 当查询不是字符串时
+            KeepAlivedConfigValueError: 当查询语法无效时
+        """
+        if not isinstance(query, str):
+            raise KeepAlivedConfigTypeError(f"Invalid query type '{type(query)}'! Expected 'str'")
+        steps = cls.compile(query)
+        return cls._walk(params, steps, 0)
+
+    # 编译查询字符串
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def compile(query: str) -> tuple:
+        """
+        编译查询字符串，结果会被缓存
+
+        Args:
+            query (str): 查询字符串
+
+        Returns:
+            tuple: 编译后的查询步骤
+
+        Raises:
+            KeepAlivedConfigTypeError: 当查询不是字符串时
+            KeepAlivedConfigValueError: 当查询语法无效时
+        """
+        if not isinstance(query, str):
+            raise KeepAlivedConfigTypeError(f"Invalid query type '{type(query)}'! Expected 'str'")
+
+        steps = []
+        for step in KeepAlivedConfigSelector._split(query):
+            match = _STEP_REGEX.match(step)
+            if match is None:
+                raise KeepAlivedConfigValueError(f"Invalid query step '{step}' in '{query}'")
+
+            quoted = match.group("quoted") is not None
+            pattern = match.group("quoted") if quoted else match.group("pattern").strip()
+            if not pattern:
+                raise KeepAlivedConfigValueError(f"Empty query step in '{query}'")
+
+            predicates = []
+            text = match.group("predicates")
+            position = 0
+            for predicate in _PREDICATE_REGEX.finditer(text):
+                if predicate.start() != position:
+                    break
+                value = predicate.group("quoted")
+                if value is None:
+                    value = predicate.group("value")
+                    value = value.strip() if value is not None else None
+                predicates.append(_Predicate(predicate.group("key"), predicate.group("op"), value))
+                position = predicate.end()
+            if position != len(text):
+                raise KeepAlivedConfigValueError(f"Invalid predicate '{text[position:]}' in '{query}'")
+
+            steps.append(_Step(pattern, quoted, tuple(predicates)))
+        return tuple(steps)
+
+    @staticmethod
+    def _split(query: str) -> list:
+        steps = []
+        current = []
+        quoted = False
+        depth = 0
+        for char in query:
+            if char == '"':
+                quoted = not quoted
+            elif not quoted:
+                if char == "[":
+                    depth += 1
+                elif char == "]":
+                    depth -= 1
+                    if depth < 0:
+                        raise KeepAlivedConfigValueError(f"Unbalanced ']' in query '{query}'")
+                elif char == "/" and depth == 0:
+                    steps.append("".join(current))
+                    current = []
+                    continue
+            current.append(char)
+        if quoted:
+            raise KeepAlivedConfigValueError(f"Unbalanced '\"' in query '{query}'")
+        if depth:
+            raise KeepAlivedConfigValueError(f"Unbalanced '[' in query '{query}'")
+        steps.append("".join(current))
+        return steps
+
+    @classmethod
+    def _walk(cls, params, steps: tuple, position: int) -> Iterator:
+        step = steps[position]
+        for node, keyword_only in step.candidates(params):
+            if not step.accepts(node):
+                continue
+
+            next_position = position + 1
+            if keyword_only and next_position < len(steps):
+                # the next step may address the arguments of the node, e.g. "vrrp_instance/VI_1"
+                argument_step = steps[next_position]
+                if argument_step.matches_arguments(_node_text(node).split(" ", 1)[1]):
+                    if not argument_step.accepts(node):
+                        continue
+                    next_position += 1
+
+            if next_position == len(steps):
+                yield node
+            elif isinstance(node, KeepAlivedConfigBlock):
+                yield from cls._walk(node.params, steps, next_position)
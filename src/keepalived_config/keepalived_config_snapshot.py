@@ -0,0 +1,450 @@
+import io
+import re
+import threading
+import weakref
+
+from keepalived_config.keepalived_config_constants import KeepAlivedConfigConstants
+from keepalived_config.keepalived_config_comment import (
+    KeepAlivedConfigComment,
+    KeepAlivedConfigCommentTypes,
+)
+from keepalived_config.keepalived_config_result import OperationResult
+from keepalived_config.keepalived_config_exceptions import KeepAlivedConfigValueError
+
+_BLANK_LINE_REGEX = re.compile(r"^ *$")
+
+
+class KeepAlivedConfigSnapshot:
+    """
+    配置在某一时刻的只读视图
+
+    创建快照的耗时为O(1)：快照与配置共享所有节点，不复制配置树。之后参数、配置块或参数列表
+    第一次被修改时，修改之前的状态被保留到所有尚未释放、且创建于该节点上次被保留之后的快照中，
+    同时记录从配置根到该节点路径上的配置块。读取快照时，被保留的节点使用保留的状态，
+    其余节点直接读取配置中的对象（整个子树未被修改的配置块直接使用缓存的渲染结果）。
+    因此快照占用的额外内存与创建之后的修改次数成正比，与配置大小无关。
+    节点被移入其他配置（或不属于任何配置的配置块）时，之后的修改无法再找到原配置的快照，
+    所以移动之前为原配置的快照保留其整个子树。
+
+    写者在修改节点之前保留其状态，读者先读取节点再检查是否已被保留，所以读取快照不需要持有锁，
+    写者可以同时继续修改配置；读者也不会写入配置中的任何对象（包括渲染缓存）。
+
+    节点的epoch记录其最近一次被保留（或被创建）时的全局快照编号，编号不小于某个快照的节点
+    已经为该快照保留过（或者在该快照之后才创建），再次修改时不会重复保留。
+
+    快照不再使用时应调用release()（或使用with语句），未释放的快照在被垃圾回收时自动释放；
+    没有未释放的快照时，修改节点只多一次计数判断。
+
+    Example:
+        ```python
+        with manager.snapshot() as snapshot:
+            text = snapshot.to_str()
+            result = snapshot.validate()
+        ```
+    """
+
+    # number of unreleased snapshots of all configurations
+    _active = 0
+    # global snapshot number, incremented by every new snapshot
+    _epoch = 0
+    _counter_lock = threading.Lock()
+
+    def __init__(self, config):
+        """
+        创建配置的快照，通常通过KeepAlivedConfig.snapshot()或KeepAlivedConfigManager.snapshot()调用
+
+        Args:
+            config (KeepAlivedConfig): 配置对象
+        """
+        cls = KeepAlivedConfigSnapshot
+        with cls._counter_lock:
+            cls._epoch += 1
+            cls._active += 1
+            self._epoch = cls._epoch
+
+        # the list object itself: set_params() replaces the list of the config instead of changing it
+        self._root = config.params
+        self._config_file = config.config_file
+        self._include_files = tuple(config.include_files)
+        # id(node or list) -> (node or list, preserved state)
+        self._versions = {}
+        # ids of the blocks above preserved nodes
+        self._changed = set()
+        self._released = False
+        self._finalizer = weakref.finalize(self, cls._release_active)
+        config._snapshots.add(self)
+
+    @classmethod
+    def _release_active(cls):
+        with cls._counter_lock:
+            cls._active -= 1
+
+    @property
+    def epoch(self) -> int:
+        """
+        快照编号
+        """
+        return self._epoch
+
+    @property
+    def config_file(self):
+        """
+        创建快照时配置的文件路径
+        """
+        return self._config_file
+
+    @property
+    def include_files(self) -> tuple:
+        """
+        创建快照时通过include指令引入的配置文件
+        """
+        return self._include_files
+
+    @property
+    def released(self) -> bool:
+        """
+        快照是否已被释放
+        """
+        return self._released
+
+    @property
+    def preserved(self) -> int:
+        """
+        为本快照保留的节点和参数列表状态的数量
+        """
+        return len(self._versions)
+
+    # 释放快照
+    def release(self):
+        """
+        释放快照，之后的修改不再为其保留状态，读取已释放的快照会抛出KeepAlivedConfigValueError
+        """
+        self._released = True
+        self._versions = {}
+        self._changed = set()
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    # 获取快照中的顶层条目
+    @property
+    def params(self) -> "KeepAlivedConfigSnapshotParams":
+        """
+        快照中的顶层参数和配置块
+
+        Returns:
+            KeepAlivedConfigSnapshotParams: 只读节点视图的元组
+
+        Raises:
+            KeepAlivedConfigValueError: 当快照已被释放时
+        """
+        self._check_released()
+        return self._view_list(self._root)
+
+    # 逐行产生快照的字符串格式
+    def iter_lines(self):
+        """
+        逐行产生快照的字符串格式（不包含换行符），与创建快照时配置的iter_lines()一致
+
+        Yields:
+            str: 配置行
+        """
+        for item in self._flat_items():
+            yield from item.iter_lines()
+
+    # 将快照直接写入文件对象
+    def write_to(self, fp):
+        """
+        将快照直接写入文件对象，内容与创建快照时配置的write_to()一致
+
+        Args:
+            fp: 可写的文本文件对象
+        """
+        for item in self._flat_items():
+            fp.write(item.to_str())
+            fp.write("\n")
+
+    # 将快照转换为字符串格式
+    def to_str(self) -> str:
+        """
+        将快照转换为字符串格式，内容与创建快照时配置的to_str()一致
+
+        Returns:
+            str: 配置字符串
+        """
+        buffer = io.StringIO()
+        self.write_to(buffer)
+        return buffer.getvalue()
+
+    # 验证快照中配置的完整性
+    def validate(self) -> OperationResult:
+        """
+        验证快照中配置的完整性，检查与KeepAlivedConfigManager.validate()相同
+
+        Returns:
+            OperationResult: 操作结果，数据部分包含验证问题列表
+        """
+        issues = []
+        for item in self.params:
+            if not item.is_block:
+                continue
+            parts = item.name.split(" ", 1)
+            if len(parts) != 2:
+                continue
+
+            if parts[0].startswith("vrrp_instance"):
+                required_params = KeepAlivedConfigConstants.VRRP_REQUIRED_PARAMS
+                message = "VRRP实例 '{}' 缺少必需参数 '{}'"
+            elif parts[0].startswith("virtual_server"):
+                required_params = KeepAlivedConfigConstants.VIRTUAL_SERVER_REQUIRED_PARAMS
+                message = "虚拟服务器 '{}' 缺少必需参数 '{}'"
+            else:
+                continue
+
+            params = item.params
+            for param_name in required_params:
+                param = params.find_one(param_name)
+                if not param or not param.value:
+                    issues.append(message.format(parts[1], param_name))
+
+        if issues:
+            return OperationResult.fail("配置验证发现问题", issues)
+        return OperationResult.ok("配置验证通过")
+
+    # 与KeepAlivedConfig.to_str()相同，展开过的include指令被省略
+    def _flat_items(self):
+        params = self.params
+        if not self._include_files:
+            return params
+        return [
+            item for item in params
+            if item.is_block or item.name != KeepAlivedConfigConstants.INCLUDE_DIRECTIVE
+        ]
+
+    def _check_released(self):
+        if self._released:
+            raise KeepAlivedConfigValueError("Snapshot has been released")
+
+    # 读取参数列表在快照中的内容
+    def _children(self, params) -> tuple:
+        # read first, then check: a writer preserves the state before it changes the list
+        items = tuple(params)
+        entry = self._versions.get(id(params))
+        if entry is not None:
+            return entry[1]
+        return items
+
+    def _view_list(self, params) -> "KeepAlivedConfigSnapshotParams":
+        return KeepAlivedConfigSnapshotParams(
+            KeepAlivedConfigSnapshotNode(self, node) for node in self._children(params)
+        )
+
+    # 在节点或参数列表被修改之前为未释放的快照保留其状态（由节点和参数列表调用）
+    @classmethod
+    def _preserve(cls, target):
+        epoch = cls._epoch
+        last = target._epoch
+        if last == epoch:
+            return
+
+        config, path = cls._find_config(target)
+        if config is not None:
+            snapshots = [
+                snapshot for snapshot in config._snapshots
+                if snapshot._epoch > last and not snapshot._released
+            ]
+            if snapshots:
+                state = cls._state(target)
+                key = id(target)
+                for snapshot in snapshots:
+                    if key in snapshot._versions:
+                        continue
+                    # mark the path first, readers check it after reading cached text
+                    for block in path:
+                        snapshot._changed.add(id(block))
+                    snapshot._versions[key] = (target, state)
+        target._epoch = epoch
+
+    # 节点被移入其他配置（或不属于任何配置的参数列表）之前，为原配置的快照保留其整个子树（由参数列表调用）
+    @classmethod
+    def _preserve_moved(cls, node, params):
+        parent = node._parent
+        if parent is None or parent is params:
+            return
+        # after the move the nodes can no longer find the snapshots of their old configuration
+        config = cls._find_config(node)[0]
+        if config is None or not config._snapshots or config is cls._find_config(params)[0]:
+            return
+        stack = [node]
+        while stack:
+            item = stack.pop()
+            cls._preserve(item)
+            children = getattr(item, "_params", None)
+            if children is not None:
+                cls._preserve(children)
+                stack.extend(children)
+
+    # 查找节点或参数列表所属的配置对象以及其上级配置块
+    @staticmethod
+    def _find_config(target):
+        path = []
+        if isinstance(target, list):
+            owner = target._owner
+        else:
+            parent = target._parent
+            if parent is None:
+                return None, path
+            owner = parent._owner
+
+        while owner is not None:
+            if hasattr(owner, "_snapshots"):
+                return owner, path
+            path.append(owner)
+            parent = owner._parent
+            if parent is None:
+                break
+            owner = parent._owner
+        return None, path
+
+    @staticmethod
+    def _state(target):
+        if isinstance(target, list):
+            return tuple(target)
+        # comment objects can be changed in place, keep copies
+        comments = tuple(
+            KeepAlivedConfigComment(comment.comment_str, type=comment.type)
+            for comment in target._comments
+        )
+        return (target._name, target._value, comments, target._source_file)
+
+
+class KeepAlivedConfigSnapshotParams(tuple):
+    """
+    快照中的参数列表，提供与KeepAlivedConfigParamList相同的查找方法（线性查找）
+    """
+
+    __slots__ = ()
+
+    # 查找指定完整名称的所有节点
+    def find(self, name: str) -> list:
+        return [node for node in self if node.name == name]
+
+    # 查找指定完整名称的第一个节点
+    def find_one(self, name: str):
+        for node in self:
+            if node.name == name:
+                return node
+        return None
+
+    # 查找名称的第一个单词为指定关键字的所有节点
+    def find_keyword(self, keyword: str) -> list:
+        return [node for node in self if node.name.split(" ", 1)[0] == keyword]
+
+
+class KeepAlivedConfigSnapshotNode:
+    """
+    快照中参数或配置块的只读视图，在访问时创建
+    """
+
+    __slots__ = ("_snapshot", "_node", "_name", "_value", "_comments", "_source_file")
+
+    def __init__(self, snapshot: KeepAlivedConfigSnapshot, node):
+        # read first, then check: a writer preserves the state before it changes the node
+        state = (node._name, node._value, tuple(node._comments), node._source_file)
+        entry = snapshot._versions.get(id(node))
+        if entry is not None:
+            state = entry[1]
+
+        self._snapshot = snapshot
+        self._node = node
+        self._name, self._value, self._comments, self._source_file = state
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def value(self) -> str:
+        return self._value
+
+    @property
+    def comments(self) -> tuple:
+        return self._comments
+
+    @property
+    def source_file(self):
+        return self._source_file
+
+    @property
+    def is_block(self) -> bool:
+        # parameters have no params list
+        return getattr(self._node, "_params", None) is not None
+
+    @property
+    def params(self) -> KeepAlivedConfigSnapshotParams:
+        """
+        配置块在快照中的子节点，参数没有子节点
+        """
+        if not self.is_block:
+            return KeepAlivedConfigSnapshotParams()
+        return self._snapshot._view_list(self._node._params)
+
+    def __repr__(self):
+        return f"KeepAlivedConfigSnapshotNode({self._name!r})"
+
+    # 逐行产生节点的字符串格式，与KeepAlivedConfigParam/KeepAlivedConfigBlock.iter_lines()一致
+    def iter_lines(self, indent_level=0):
+        cached = self._cached_text(indent_level)
+        if cached is not None:
+            yield from cached.split("\n")
+            return
+
+        indent = KeepAlivedConfigConstants.get_indent(indent_level)
+        inline_comment = ""
+        has_generic_comments = False
+        for comment in self._comments:
+            if comment.type == KeepAlivedConfigCommentTypes.GENERIC:
+                has_generic_comments = True
+                yield f"{indent}{str(comment)}"
+            elif not inline_comment:
+                inline_comment = str(comment)
+
+        line = f"{indent}{self._name}{' ' + self._value if self._value else ''}{inline_comment}"
+        if not self.is_block:
+            if not has_generic_comments and not line.strip() and _BLANK_LINE_REGEX.match(line):
+                line = ""
+            yield line
+            return
+
+        yield f"{line} {{"
+        for child in self.params:
+            yield from child.iter_lines(indent_level + 1)
+        yield f"{indent}}}"
+
+    # 将节点转换为字符串格式
+    def to_str(self, indent_level=0) -> str:
+        cached = self._cached_text(indent_level)
+        if cached is not None:
+            return cached
+        return "\n".join(self.iter_lines(indent_level))
+
+    # 将节点的字符串格式直接写入文件对象
+    def write_to(self, fp, indent_level=0):
+        fp.write(self.to_str(indent_level))
+
+    # 整个子树在快照之后都未被修改的配置块，返回其缓存的渲染结果
+    def _cached_text(self, indent_level):
+        node = self._node
+        text = getattr(node, "_rendered", None)
+        if text is None or node._rendered_level != indent_level:
+            return None
+        key = id(node)
+        snapshot = self._snapshot
+        # checked after reading the text, see KeepAlivedConfigSnapshot._preserve
+        if key in snapshot._changed or key in snapshot._versions:
+            return None
+        return text
@@ -1,12 +1,367 @@
-import copy
-from keepalived_config.keepalived_config_constants import KeepAlivedConfigConstants
+import dataclasses
+import re
+from keepalived_config.keepalived_config_constants import KeepAlivedConfigDefaults
 from keepalived_config.keepalived_config_param import KeepAlivedConfigParam
 from keepalived_config.keepalived_config_block import KeepAlivedConfigBlock
-from keepalived_config.keepalived_config_comment import (
-    KeepAlivedConfigComment,
-    KeepAlivedConfigCommentTypes,
-)
 from keepalived_config.keepalived_config import KeepAlivedConfig
+from keepalived_config.keepalived_config_exceptions import TemplateError
+
+_PLACEHOLDER_REGEX = re.compile(r"\{([^{}]*)\}")
+_PLACEHOLDER_NAME_REGEX = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class _CompiledText:
+    """
+    A template string split into literal parts and placeholder slots
+    """
+
+    __slots__ = ("parts", "placeholders", "constant", "single_placeholder")
+
+    def __init__(self, text, where: str):
+        text = str(text)
+        parts = []
+        position = 0
+        for match in _PLACEHOLDER_REGEX.finditer(text):
+            literal = text[position:match.start()]
+            if literal:
+                parts.append((False, literal))
+            name = match.group(1)
+            if not _PLACEHOLDER_NAME_REGEX.match(name):
+                raise TemplateError(f"Invalid placeholder '{match.group(0)}' in {where}")
+            parts.append((True, name))
+            position = match.end()
+        literal = text[position:]
+        if literal:
+            parts.append((False, literal))
+
+        for is_placeholder, literal in parts:
+            if not is_placeholder and ("{" in literal or "}" in literal):
+                raise TemplateError(f"Unbalanced brace in {where}: '{text}'")
+
+        self.parts = tuple(parts)
+        self.placeholders = frozenset(name for is_placeholder, name in parts if is_placeholder)
+        # text without placeholders is rendered once
+        self.constant = text if not self.placeholders else None
+        # name of the placeholder if the text is exactly one placeholder
+        self.single_placeholder = parts[0][1] if len(parts) == 1 and parts[0][0] else None
+
+    def render(self, values: dict) -> str:
+        if self.constant is not None:
+            return self.constant
+        if self.single_placeholder is not None:
+            return str(values[self.single_placeholder])
+        return "".join(
+            str(values[part]) if is_placeholder else part for is_placeholder, part in self.parts
+        )
+
+
+class _CompiledRealServer:
+    """
+    Render plan of the real_server section of a virtual server template
+
+    Every field can be overridden by a fixed keyword argument (for example
+    real_server_ip), otherwise the template value (or the built-in default when
+    the template omits the field) is rendered. The health check branch is chosen
+    per instance, so only the placeholders of the chosen branch are required.
+    """
+
+    # field -> (override keyword, default when the template omits the field)
+    _FIELDS = {
+        "ip": ("real_server_ip", "192.168.1.101"),
+        "port": ("real_server_port", "80"),
+        "weight": ("real_server_weight", KeepAlivedConfigDefaults.REAL_SERVER_WEIGHT),
+        "health_check": ("health_check_type", KeepAlivedConfigDefaults.REAL_SERVER_HEALTH_CHECK),
+    }
+
+    # check block -> [(param, override keyword, default, optional)]
+    _CHECKS = {
+        "TCP_CHECK": [
+            ("connect_timeout", "tcp_connect_timeout", KeepAlivedConfigDefaults.TCP_CHECK_CONNECT_TIMEOUT, False),
+            ("delay_before_retry", "tcp_delay_before_retry", KeepAlivedConfigDefaults.TCP_CHECK_DELAY_BEFORE_RETRY, False),
+        ],
+        "HTTP_GET": [
+            ("url", "http_url", KeepAlivedConfigDefaults.HTTP_GET_URL, False),
+            ("digest", "http_digest", None, True),
+            ("status_code", "http_status_code", None, True),
+        ],
+        "UDP_CHECK": [
+            ("connect_timeout", "udp_connect_timeout", KeepAlivedConfigDefaults.UDP_CHECK_CONNECT_TIMEOUT, False),
+            ("delay_before_retry", "udp_delay_before_retry", KeepAlivedConfigDefaults.UDP_CHECK_DELAY_BEFORE_RETRY, False),
+        ],
+    }
+
+    _CHECK_ALIASES = {"tcp_check": "TCP_CHECK", "http_check": "HTTP_GET"}
+
+    def __init__(self, definition: dict, where: str):
+        if not isinstance(definition, dict):
+            raise TemplateError(f"Invalid real_server definition in {where}! Expected 'dict'")
+
+        self.fields = {
+            field: self._compile_field(definition, field, key, default, where)
+            for field, (key, default) in self._FIELDS.items()
+        }
+
+        self.checks = {}
+        for check_type, check_params in self._CHECKS.items():
+            check_definition = definition.get(check_type) or {}
+            self.checks[check_type] = [
+                (
+                    param_name,
+                    self._compile_field(check_definition, param_name, key, default, f"{where} / {check_type}"),
+                    optional,
+                )
+                for param_name, key, default, optional in check_params
+            ]
+
+    @staticmethod
+    def _compile_field(definition, field, key, default, where):
+        if field in definition:
+            text = _CompiledText(definition[field], f"{where} / {field}")
+        elif default is not None:
+            text = _CompiledText(default, f"{where} / {field}")
+        else:
+            text = None
+        return key, text
+
+    @property
+    def placeholders(self) -> frozenset:
+        names = set()
+        for key, text in self.fields.values():
+            names.add(key)
+            if text is not None:
+                names |= text.placeholders
+        for check_params in self.checks.values():
+            for _, (key, text), _ in check_params:
+                names.add(key)
+                if text is not None:
+                    names |= text.placeholders
+        return frozenset(names)
+
+    @staticmethod
+    def _resolve_field(field, overrides, values, missing):
+        key, text = field
+        value = overrides.get(key)
+        if value is not None:
+            return str(value)
+        if text is None:
+            return None
+        absent = [name for name in text.placeholders if values.get(name) is None]
+        if absent:
+            missing.update(absent)
+            return None
+        return text.render(values)
+
+    def resolve(self, overrides: dict, values: dict, missing: set):
+        """
+        Resolve all fields of one instance, collecting missing placeholders
+
+        Only explicitly passed parameters (overrides) replace template values,
+        defaults are used for the placeholders of the template values.
+        """
+        resolved = {
+            field: self._resolve_field(compiled, overrides, values, missing)
+            for field, compiled in self.fields.items()
+        }
+
+        health_check = resolved["health_check"]
+        health_check = self._CHECK_ALIASES.get(health_check, health_check)
+        check_params = []
+        for param_name, field, optional in self.checks.get(health_check, ()):
+            # optional params are left out instead of being reported
+            value = self._resolve_field(field, overrides, values, set() if optional else missing)
+            if value is not None:
+                check_params.append((param_name, value))
+
+        return resolved, health_check, check_params
+
+    @staticmethod
+    def build(resolved) -> KeepAlivedConfigBlock:
+        fields, health_check, check_params = resolved
+        real_server_block = KeepAlivedConfigBlock._from_trusted(f"real_server {fields['ip']} {fields['port']}")
+        nodes = [KeepAlivedConfigParam._from_trusted("weight", fields["weight"])]
+        if health_check in _CompiledRealServer._CHECKS:
+            check_block = KeepAlivedConfigBlock._from_trusted(health_check)
+            check_block.params.extend(
+                KeepAlivedConfigParam._from_trusted(param_name, value) for param_name, value in check_params
+            )
+            nodes.append(check_block)
+        real_server_block.params.extend(nodes)
+        return real_server_block
+
+
+class _CompiledTemplate:
+    """
+    Render plan of a template definition
+
+    The nested template dict is walked once and turned into a flat list of
+    operations with the placeholder positions already split out, so rendering an
+    instance only fills the slots and allocates the nodes.
+    """
+
+    _PARAM = 0
+    _FLAG = 1
+    _BLOCK = 2
+    _LIST = 3
+    _REAL_SERVER = 4
+
+    def __init__(self, template_name: str, definition: dict, defaults: dict):
+        where = f"template '{template_name}'"
+        self.name = template_name
+        self.type = definition["type"]
+        self.defaults = dict(defaults)
+        self.defaults.update(definition.get("defaults") or {})
+
+        if self.type == "virtual_server":
+            self.block_name = _CompiledText("{virtual_server_ip} {virtual_server_port}", where)
+        else:
+            self.block_name = None
+
+        self.real_servers = []
+        self.ops = self._compile_params(definition["params"], where)
+
+        placeholders = set()
+        self._collect(self.ops, placeholders)
+        self.placeholders = frozenset(placeholders)
+
+    def _compile_params(self, params, where) -> tuple:
+        if not isinstance(params, dict):
+            raise TemplateError(f"Invalid params in {where}! Expected 'dict'")
+
+        ops = []
+        for param_name, param_value in params.items():
+            # nodes are built with the trusted constructors, so names are checked here
+            if not isinstance(param_name, str):
+                raise TemplateError(f"Invalid param name '{param_name}' in {where}! Expected 'str'")
+            param_where = f"{where} / {param_name}"
+            if isinstance(param_value, dict):
+                if param_name == "real_server":
+                    self.real_servers.append(_CompiledRealServer(param_value, param_where))
+                    ops.append((self._REAL_SERVER, param_name, len(self.real_servers) - 1))
+                else:
+                    ops.append((self._BLOCK, param_name, self._compile_params(param_value, param_where)))
+            elif isinstance(param_value, (list, tuple)):
+                items = tuple(_CompiledText(item, param_where) for item in param_value)
+                ops.append((self._LIST, param_name, items))
+            elif param_value == "":
+                ops.append((self._FLAG, param_name, None))
+            else:
+                ops.append((self._PARAM, param_name, _CompiledText(param_value, param_where)))
+        return tuple(ops)
+
+    def _collect(self, ops, placeholders):
+        for kind, _, arg in ops:
+            if kind == self._PARAM:
+                placeholders |= arg.placeholders
+            elif kind == self._LIST:
+                for item in arg:
+                    placeholders |= item.placeholders
+            elif kind == self._BLOCK:
+                self._collect(arg, placeholders)
+
+    @property
+    def all_placeholders(self) -> frozenset:
+        """Placeholders of all sections, including every health check branch"""
+        names = set(self.placeholders)
+        for real_server in self.real_servers:
+            names |= real_server.placeholders
+        if self.block_name is not None:
+            names |= self.block_name.placeholders
+        return frozenset(names)
+
+    def prepare(self, instance_name, kwargs: dict):
+        """
+        Check the instance parameters and resolve all dynamic parts before any
+        node is allocated
+
+        Raises:
+            TemplateError: if placeholders without a value or default are used
+        """
+        defaults = self.defaults
+        values = {}
+        missing = set()
+        for name in self.placeholders:
+            value = kwargs.get(name)
+            if value is None:
+                value = defaults.get(name)
+            if value is None:
+                missing.add(name)
+            elif isinstance(value, (list, tuple)):
+                values[name] = value
+            else:
+                values[name] = str(value)
+
+        block_name = instance_name
+        if not block_name and self.block_name is not None:
+            block_name = self._resolve_text(self.block_name, kwargs, missing)
+
+        real_servers = []
+        if self.real_servers:
+            real_servers = [
+                real_server.resolve(
+                    kwargs, self._lookup(real_server.placeholders, kwargs), missing
+                )
+                for real_server in self.real_servers
+            ]
+
+        if missing:
+            raise TemplateError(
+                f"Missing values for placeholders {sorted(missing)} of template '{self.name}'"
+            )
+        return block_name, values, real_servers
+
+    def _lookup(self, names, kwargs) -> dict:
+        """Values of the given placeholders that are passed or have a default"""
+        defaults = self.defaults
+        values = {}
+        for name in names:
+            value = kwargs.get(name)
+            if value is None:
+                value = defaults.get(name)
+            if value is not None:
+                values[name] = value
+        return values
+
+    def _resolve_text(self, text, kwargs, missing):
+        values = self._lookup(text.placeholders, kwargs)
+        absent = text.placeholders - values.keys()
+        if absent:
+            missing.update(absent)
+            return None
+        return text.render(values)
+
+    def build(self, prepared) -> KeepAlivedConfigBlock:
+        block_name, values, real_servers = prepared
+        block = KeepAlivedConfigBlock._from_trusted(f"{self.type} {block_name}" if block_name else self.type)
+        self._build_params(block, self.ops, values, real_servers)
+        return block
+
+    def _build_params(self, block, ops, values, real_servers):
+        # children are collected first and added to the block at once
+        nodes = []
+        for kind, param_name, arg in ops:
+            if kind == self._PARAM:
+                nodes.append(KeepAlivedConfigParam._from_trusted(param_name, arg.render(values)))
+            elif kind == self._FLAG:
+                nodes.append(KeepAlivedConfigParam._from_trusted(param_name))
+            elif kind == self._BLOCK:
+                sub_block = KeepAlivedConfigBlock._from_trusted(param_name)
+                self._build_params(sub_block, arg, values, real_servers)
+                nodes.append(sub_block)
+            elif kind == self._LIST:
+                sub_block = KeepAlivedConfigBlock._from_trusted(param_name)
+                entries = []
+                for item in arg:
+                    value = values.get(item.single_placeholder) if item.single_placeholder else None
+                    if isinstance(value, (list, tuple)):
+                        # a list value fills one line per entry
+                        entries.extend(KeepAlivedConfigParam._from_trusted("", str(entry)) for entry in value)
+                    else:
+                        entries.append(KeepAlivedConfigParam._from_trusted("", item.render(values)))
+                sub_block.params.extend(entries)
+                nodes.append(sub_block)
+            else:
+                nodes.append(_CompiledRealServer.build(real_servers[arg]))
+        block.params.extend(nodes)
 
 
 class KeepAlivedConfigTemplates:
@@ -97,11 +452,43 @@ class KeepAlivedConfigTemplates:
         }
     }
 
+    # Values used for placeholders that are not passed to from_template()
+    _placeholder_defaults = {
+        "advert_int": 1,
+        "auth_type": "PASS",
+        "auth_pass": "CHANGEME",
+        "virtual_ipaddress": "192.168.1.100/24",
+        "notification_email": "admin@example.com",
+        "delay_loop": KeepAlivedConfigDefaults.VIRTUAL_SERVER_DELAY_LOOP,
+        "lb_algo": KeepAlivedConfigDefaults.VIRTUAL_SERVER_LB_ALGO,
+        "lb_kind": KeepAlivedConfigDefaults.VIRTUAL_SERVER_LB_KIND,
+        "protocol": KeepAlivedConfigDefaults.VIRTUAL_SERVER_PROTOCOL,
+        "real_server_ip": "192.168.1.101",
+        "real_server_port": 80,
+        "real_server_weight": KeepAlivedConfigDefaults.REAL_SERVER_WEIGHT,
+        "health_check_type": KeepAlivedConfigDefaults.REAL_SERVER_HEALTH_CHECK,
+        "tcp_connect_timeout": KeepAlivedConfigDefaults.TCP_CHECK_CONNECT_TIMEOUT,
+        "tcp_delay_before_retry": KeepAlivedConfigDefaults.TCP_CHECK_DELAY_BEFORE_RETRY,
+        "http_url": KeepAlivedConfigDefaults.HTTP_GET_URL,
+        "udp_connect_timeout": KeepAlivedConfigDefaults.UDP_CHECK_CONNECT_TIMEOUT,
+        "udp_delay_before_retry": KeepAlivedConfigDefaults.UDP_CHECK_DELAY_BEFORE_RETRY,
+    }
+
+    # Render plans by template name, built at registration or first use
+    _compiled = {}
+
     @classmethod
     def from_template(cls, template_name: str, instance_name: str = None, config_class=None, **kwargs) -> "KeepAlivedConfig":
         """
         Create configuration from template
         
+        The template is compiled into a render plan once (at registration or on
+        first use), so each call only fills the placeholder slots and allocates
+        the nodes. Placeholders without a value or default are reported before
+        any node is created instead of being left in the output. Keyword
+        arguments that the template does not use are ignored, and None values
+        count as not given.
+        
         Args:
             template_name (str): Template name
             instance_name (str): Instance name (required for VRRP templates)
@@ -110,165 +497,170 @@ class KeepAlivedConfigTemplates:
             
         Returns:
             KeepAlivedConfig: Configuration object created based on template
+            
+        Raises:
+            ValueError: If the template doesn't exist or a VRRP template has no instance name
+            TemplateError: If placeholders have neither a value nor a default
         """
-        if template_name not in cls._templates:
-            raise ValueError(f"Template '{template_name}' not found. Available templates: {list(cls._templates.keys())}")
+        compiled = cls._get_compiled(template_name)
+        if compiled.type == "vrrp_instance" and not instance_name:
+            raise ValueError("Instance name is required for VRRP instance templates")
             
         if config_class is None:
             config_class = KeepAlivedConfig
             
-        template = cls._templates[template_name]
+        block = compiled.build(compiled.prepare(instance_name, kwargs))
         config = config_class()
+        config.params.append(block)
+        return config
+
+    @classmethod
+    def render_many(cls, template_name: str, rows, instance_names=None, stream: bool = False):
+        """
+        Render one template for many instances in a single call
+        
+        The compiled render plan is looked up once and shared by all rows, each
+        row only fills the placeholder slots. Every row gets its own nodes (a
+        node belongs to exactly one parameter list), so the blocks can be added
+        to different configurations independently.
         
-        # Special handling for virtual_server template
-        if template_name == "basic_virtual_server":
-            block = KeepAlivedConfigBlock(template["type"], instance_name or "{virtual_server_ip} {virtual_server_port}")
+        Args:
+            template_name (str): Template name
+            rows: The template parameters of each instance, one of
+                - an iterable of dicts (an "instance_name" key names the instance)
+                - an iterable of dataclass objects such as VRRPConfig or VirtualServerConfig
+                - a columnar dict of equally long lists, e.g. {"instance_name": [...], "priority": [...]}
+            instance_names (Iterable[str]): Instance names, one per row (overrides "instance_name" of the rows)
+            stream (bool): Yield the blocks one at a time instead of returning a list
             
-            # Add basic parameters
-            for param_name, param_value in template["params"].items():
-                if param_name == "real_server":
-                    # Process real_server using the helper method
-                    real_server_block = cls._process_real_server(param_value, kwargs)
-                    block.add_param(real_server_block)
-                else:
-                    block.add_param(KeepAlivedConfigParam(param_name, cls._replace_placeholders(str(param_value), kwargs)))
-            config.params.append(block)
-            return config
+        Returns:
+            list[KeepAlivedConfigBlock] or Iterator[KeepAlivedConfigBlock]: The rendered blocks in row order
             
-        # Handle VRRP templates
-        if template["type"] == "vrrp_instance":
-            if not instance_name:
-                raise ValueError("Instance name is required for VRRP instance templates")
-            block = KeepAlivedConfigBlock(template["type"], instance_name)
-        else:
-            block = KeepAlivedConfigBlock(template["type"])
-        
-        # Add parameters from template
-        for param_name, param_value in template["params"].items():
-            if isinstance(param_value, dict):
-                # Nested blocks
-                if param_name == "real_server":
-                    # Special handling for real_server using the helper method
-                    real_server_block = cls._process_real_server(param_value, kwargs)
-                    block.add_param(real_server_block)
-                else:
-                    sub_block = KeepAlivedConfigBlock(param_name)
-                    for sub_param_name, sub_param_value in param_value.items():
-                        # Handle authentication password
-                        if param_name == "authentication" and sub_param_name == "auth_pass":
-                            if sub_param_value == "{auth_pass}":
-                                # Use provided password or generate secure one
-                                password = kwargs.get("auth_pass", "CHANGEME")
-                                sub_block.add_param(KeepAlivedConfigParam(sub_param_name, password))
-                            else:
-                                sub_block.add_param(KeepAlivedConfigParam(sub_param_name, cls._replace_placeholders(str(sub_param_value), kwargs)))
-                        else:
-                            sub_block.add_param(KeepAlivedConfigParam(sub_param_name, cls._replace_placeholders(str(sub_param_value), kwargs)))
-                    block.add_param(sub_block)
-            elif isinstance(param_value, list):
-                # List parameters
-                if param_name == "virtual_ipaddress":
-                    if "{virtual_ipaddress}" in param_value:
-                        # Use provided virtual IP address
-                        vip = kwargs.get("virtual_ipaddress", "192.168.1.100/24")
-                        sub_block = KeepAlivedConfigBlock(param_name)
-                        sub_block.add_param(KeepAlivedConfigParam("", vip))
-                        block.add_param(sub_block)
-                    else:
-                        sub_block = KeepAlivedConfigBlock(param_name)
-                        for ip in param_value:
-                            sub_block.add_param(KeepAlivedConfigParam("", cls._replace_placeholders(str(ip), kwargs)))
-                        block.add_param(sub_block)
-                elif param_name == "notification_email":
-                    if "{notification_email}" in param_value:
-                        # Use provided notification email
-                        email = kwargs.get("notification_email", "admin@example.com")
-                        sub_block = KeepAlivedConfigBlock(param_name)
-                        sub_block.add_param(KeepAlivedConfigParam("", email))
-                        block.add_param(sub_block)
-                    else:
-                        sub_block = KeepAlivedConfigBlock(param_name)
-                        for email in param_value:
-                            sub_block.add_param(KeepAlivedConfigParam("", cls._replace_placeholders(str(email), kwargs)))
-                        block.add_param(sub_block)
+        Raises:
+            ValueError: If the template doesn't exist, the rows are invalid or a VRRP row has no instance name
+            TemplateError: If a row leaves placeholders without a value or default
+            
+        Example:
+            ```python
+            blocks = KeepAlivedConfigTemplates.render_many(
+                "complete_vrrp_backup",
+                {
+                    "instance_name": ["VI_1", "VI_2"],
+                    "interface": ["eth0", "eth0"],
+                    "virtual_router_id": [51, 52],
+                    "priority": [90, 90],
+                },
+            )
+            config.params.extend(blocks)
+            ```
+        """
+        compiled = cls._get_compiled(template_name)
+        blocks = cls._render_rows(compiled, cls._iter_rows(rows, instance_names))
+        if stream:
+            return blocks
+        return list(blocks)
+
+    @classmethod
+    def _render_rows(cls, compiled: _CompiledTemplate, rows):
+        requires_name = compiled.type == "vrrp_instance"
+        for row_number, (instance_name, kwargs) in enumerate(rows):
+            if requires_name and not instance_name:
+                raise ValueError(f"Row {row_number}: Instance name is required for VRRP instance templates")
+            try:
+                prepared = compiled.prepare(instance_name, kwargs)
+            except TemplateError as e:
+                raise TemplateError(f"Row {row_number}: {str(e)}") from e
+            yield compiled.build(prepared)
+
+    @classmethod
+    def _iter_rows(cls, rows, instance_names=None):
+        """
+        Normalize the supported row formats into (instance_name, kwargs) pairs
+        """
+        if isinstance(rows, dict):
+            rows = cls._iter_columns(rows)
+
+        names = iter(instance_names) if instance_names is not None else None
+        for row in rows:
+            if dataclasses.is_dataclass(row) and not isinstance(row, type):
+                kwargs = cls._dataclass_kwargs(row)
+            elif isinstance(row, dict):
+                kwargs = row
             else:
-                # Simple parameters
-                if param_value == "":
-                    block.add_param(KeepAlivedConfigParam(param_name))
-                else:
-                    # Replace placeholders with provided values or defaults
-                    replaced_value = cls._replace_placeholders(str(param_value), kwargs)
-                    block.add_param(KeepAlivedConfigParam(param_name, replaced_value))
-        
-        config.params.append(block)
-        return config
+                raise ValueError(f"Invalid row type '{type(row)}'! Expected 'dict' or dataclass")
+
+            instance_name = kwargs.get("instance_name")
+            if names is not None:
+                try:
+                    instance_name = next(names)
+                except StopIteration:
+                    raise ValueError("Fewer instance names than rows") from None
+            yield instance_name, kwargs
 
     @staticmethod
-    def _process_real_server(real_server_config, template_params):
+    def _iter_columns(columns: dict):
+        lengths = set()
+        for name, column in columns.items():
+            if not isinstance(column, (list, tuple)):
+                raise ValueError(f"Invalid column '{name}' type '{type(column)}'! Expected 'list'")
+            lengths.add(len(column))
+        if len(lengths) > 1:
+            raise ValueError(f"All columns must have the same length, got lengths {sorted(lengths)}")
+
+        names = list(columns)
+        for values in zip(*(columns[name] for name in names)):
+            yield dict(zip(names, values))
+
+    @staticmethod
+    def _dataclass_kwargs(row) -> dict:
+        # empty strings are the "not set" value of the config classes (e.g. auth_pass)
+        kwargs = {
+            field.name: getattr(row, field.name)
+            for field in dataclasses.fields(row)
+            if getattr(row, field.name) != ""
+        }
+        # VRRPConfig keeps the addresses in a list named after the create_vrrp_instance parameter
+        if kwargs.get("virtual_ipaddresses") and kwargs.get("virtual_ipaddress") is None:
+            kwargs["virtual_ipaddress"] = kwargs["virtual_ipaddresses"]
+        return kwargs
+
+    @classmethod
+    def get_template_placeholders(cls, template_name: str) -> dict:
         """
-        Process real_server configuration and create the corresponding block
+        Get the placeholders used by a template
         
         Args:
-            real_server_config (dict): Real server configuration
-            template_params (dict): Template parameters for dynamic replacement
+            template_name (str): Name of the template
             
         Returns:
-            KeepAlivedConfigBlock: Real server block
+            dict: Placeholder name -> default value (None if the placeholder has no default)
+            
+        Raises:
+            ValueError: If template doesn't exist
         """
-        # Get real server IP and port with defaults
-        rs_ip = template_params.get("real_server_ip", real_server_config.get("ip", "192.168.1.101"))
-        rs_port = template_params.get("real_server_port", real_server_config.get("port", "80"))
-        
-        real_server_block = KeepAlivedConfigBlock("real_server", f"{rs_ip} {rs_port}")
-        
-        # Get weight with default
-        weight = template_params.get("real_server_weight", real_server_config.get("weight", "1"))
-        real_server_block.add_param(KeepAlivedConfigParam("weight", str(weight)))
+        compiled = cls._get_compiled(template_name)
+        return {
+            name: compiled.defaults.get(name) for name in sorted(compiled.all_placeholders)
+        }
+
+    @classmethod
+    def _get_compiled(cls, template_name: str) -> _CompiledTemplate:
+        """
+        Get the render plan of a template, compiling it on first use
         
-        # Add health check block based on health_check type
-        health_check_type = template_params.get("health_check_type", real_server_config.get("health_check", "TCP_CHECK"))
-        if health_check_type == "tcp_check" or health_check_type == "TCP_CHECK":
-            # Add TCP_CHECK block
-            tcp_check_block = KeepAlivedConfigBlock("TCP_CHECK")
-            tcp_check_params = real_server_config["TCP_CHECK"]
-            
-            # Get TCP check parameters with defaults
-            connect_timeout = template_params.get("tcp_connect_timeout", tcp_check_params.get("connect_timeout", "3"))
-            delay_before_retry = template_params.get("tcp_delay_before_retry", tcp_check_params.get("delay_before_retry", "3"))
-            
-            tcp_check_block.add_param(KeepAlivedConfigParam("connect_timeout", str(connect_timeout)))
-            tcp_check_block.add_param(KeepAlivedConfigParam("delay_before_retry", str(delay_before_retry)))
-            real_server_block.add_param(tcp_check_block)
-        elif health_check_type == "http_check" or health_check_type == "HTTP_GET":
-            # Add HTTP_GET block
-            http_check_block = KeepAlivedConfigBlock("HTTP_GET")
-            http_check_params = real_server_config["HTTP_GET"]
-            
-            # Get HTTP check parameters with defaults
-            url = template_params.get("http_url", http_check_params.get("url", "/"))
-            digest = template_params.get("http_digest", http_check_params.get("digest"))
-            status_code = template_params.get("http_status_code", http_check_params.get("status_code"))
-            
-            http_check_block.add_param(KeepAlivedConfigParam("url", str(url)))
-            if digest is not None:
-                http_check_block.add_param(KeepAlivedConfigParam("digest", str(digest)))
-            if status_code is not None:
-                http_check_block.add_param(KeepAlivedConfigParam("status_code", str(status_code)))
-            real_server_block.add_param(http_check_block)
-        elif health_check_type == "UDP_CHECK":
-            # Add UDP_CHECK block
-            udp_check_block = KeepAlivedConfigBlock("UDP_CHECK")
-            udp_check_params = real_server_config["UDP_CHECK"]
-            
-            # Get UDP check parameters with defaults
-            connect_timeout = template_params.get("udp_connect_timeout", udp_check_params.get("connect_timeout", "3"))
-            delay_before_retry = template_params.get("udp_delay_before_retry", udp_check_params.get("delay_before_retry", "3"))
-            
-            udp_check_block.add_param(KeepAlivedConfigParam("connect_timeout", str(connect_timeout)))
-            udp_check_block.add_param(KeepAlivedConfigParam("delay_before_retry", str(delay_before_retry)))
-            real_server_block.add_param(udp_check_block)
+        Raises:
+            ValueError: If template doesn't exist
+            TemplateError: If the template definition is invalid
+        """
+        if template_name not in cls._templates:
+            raise ValueError(f"Template '{template_name}' not found. Available templates: {list(cls._templates.keys())}")
             
-        return real_server_block
+        definition = cls._templates[template_name]
+        cached = cls._compiled.get(template_name)
+        if cached is None or cached[0] is not definition:
+            cached = (definition, _CompiledTemplate(template_name, definition, cls._placeholder_defaults))
+            cls._compiled[template_name] = cached
+        return cached[1]
 
     @classmethod
     def register_template(cls, template_name: str, template_definition: dict):
@@ -277,7 +669,12 @@ class KeepAlivedConfigTemplates:
         
         Args:
             template_name (str): Name of the template
-            template_definition (dict): Template definition with type and params
+            template_definition (dict): Template definition with type and params,
+                optionally "defaults" with values for placeholders that are not passed
+                
+        Raises:
+            ValueError: If the definition is not a dictionary with type and params
+            TemplateError: If the definition contains invalid placeholders
         """
         if not isinstance(template_definition, dict):
             raise ValueError("Template definition must be a dictionary")
@@ -285,6 +682,10 @@ class KeepAlivedConfigTemplates:
         if "type" not in template_definition or "params" not in template_definition:
             raise ValueError("Template definition must contain 'type' and 'params' keys")
             
+        cls._compiled[template_name] = (
+            template_definition,
+            _CompiledTemplate(template_name, template_definition, cls._placeholder_defaults),
+        )
         cls._templates[template_name] = template_definition
 
     @classmethod
@@ -300,6 +701,7 @@ class KeepAlivedConfigTemplates:
         """
         if template_name in cls._templates:
             del cls._templates[template_name]
+            cls._compiled.pop(template_name, None)
             return True
         return False
 
@@ -332,6 +734,7 @@ class KeepAlivedConfigTemplates:
             
         Raises:
             ValueError: If template doesn't exist or definition is invalid
+            TemplateError: If the definition contains invalid placeholders
         """
         if template_name not in cls._templates:
             raise ValueError(f"Template '{template_name}' not found. Available templates: {list(cls._templates.keys())}")
@@ -342,6 +745,10 @@ class KeepAlivedConfigTemplates:
         if "type" not in template_definition or "params" not in template_definition:
             raise ValueError("Template definition must contain 'type' and 'params' keys")
             
+        cls._compiled[template_name] = (
+            template_definition,
+            _CompiledTemplate(template_name, template_definition, cls._placeholder_defaults),
+        )
         cls._templates[template_name] = template_definition
 
     @classmethod
@@ -366,22 +773,3 @@ class KeepAlivedConfigTemplates:
             list: List of template names
         """
         return list(cls._templates.keys())
-        
-    @staticmethod
-    def _replace_placeholders(text: str, template_params: dict) -> str:
-        """
-        Replace placeholders in text with provided values
-        
-        Args:
-            text (str): Text with placeholders
-            template_params (dict): Template parameters for replacement
-            
-        Returns:
-            str: Text with placeholders replaced
-        """
-        result = text
-        for key, value in template_params.items():
-            placeholder = "{" + key + "}"
-            if placeholder in result:
-                result = result.replace(placeholder, str(value))
-        return result
\ No newline at end of file
@@ -0,0 +1,129 @@
+import enum
+import functools
+import re
+import sys
+from typing import Iterable, Iterator, NamedTuple, Any
+
+from keepalived_config.keepalived_config_comment import (
+    KeepAlivedConfigComment,
+    KeepAlivedConfigCommentTypes,
+)
+
+
+class KeepAlivedConfigTokenTypes(enum.Enum):
+    KEY = 0
+    VALUE = 1
+    BLOCK_START = 2
+    BLOCK_END = 3
+    COMMENT = 4
+    BLANK = 5
+
+
+class KeepAlivedConfigToken(NamedTuple):
+    """
+    词法单元，由分词器产生并交给解析器构建配置树
+    """
+    type: KeepAlivedConfigTokenTypes
+    value: Any
+    line_nr: int
+
+
+class KeepAlivedConfigTokenizer:
+    """
+    Keepalived配置分词器
+
+    每行只做一次组合正则匹配，按顺序产生带类型的词法单元：
+    行内注释（如果有）先于该行的键/值/花括号产生，以便解析器将其挂到同一行的参数上。
+    """
+
+    # 一个行内注释的起始位置: 空格 + '#'或'!' + 空格
+    _NOT_INLINE = r"(?! +[#!] )"
+
+    LINE_REGEX = re.compile(
+        r"(?:"
+        r"[#!](?P<comment>.*)"
+        r"|(?P<close>\})(?:" + _NOT_INLINE + r".)*"
+        r"|(?P<key>[\w\-]+)"
+        r"(?:" + _NOT_INLINE + r" +(?P<value>(?:" + _NOT_INLINE + r"[^{}\n\r])+))?"
+        r"(?: +(?P<brace>[{}]))?"
+        r"|(?P<other>(?:" + _NOT_INLINE + r".)+)"
+        r")"
+        r"(?: +[#!] (?P<inline_comment>.*))?$"
+    )
+
+    def __init__(self, source: str = "string"):
+        """
+        初始化分词器
+
+        Args:
+            source (str): 配置来源（文件路径或"string"），用于错误信息
+        """
+        self._source = source
+
+    def tokenize(self, lines: Iterable[str]) -> Iterator[KeepAlivedConfigToken]:
+        """
+        对配置行进行分词
+
+        行可以带或不带结尾的换行符（例如直接迭代文件对象）。
+        与 ``str.split("\\n")`` 的语义保持一致：如果最后一行以换行符结尾，会额外产生一个空行。
+
+        Args:
+            lines (Iterable[str]): 配置行
+
+        Yields:
+            KeepAlivedConfigToken: 词法单元
+
+        Raises:
+            ValueError: 当行格式无法识别时
+        """
+        KEY = KeepAlivedConfigTokenTypes.KEY
+        VALUE = KeepAlivedConfigTokenTypes.VALUE
+        BLOCK_START = KeepAlivedConfigTokenTypes.BLOCK_START
+        BLOCK_END = KeepAlivedConfigTokenTypes.BLOCK_END
+        COMMENT = KeepAlivedConfigTokenTypes.COMMENT
+        BLANK = KeepAlivedConfigTokenTypes.BLANK
+        INLINE = KeepAlivedConfigCommentTypes.INLINE
+        match_line = self.LINE_REGEX.match
+        # keys repeat on almost every line, share a single string object per keyword
+        intern = sys.intern
+        # bypass the NamedTuple constructor wrapper, tokens are created for every line
+        token = functools.partial(tuple.__new__, KeepAlivedConfigToken)
+
+        line_nr = 0
+        raw_line = ""
+        for line_nr, raw_line in enumerate(lines, 1):
+            line = raw_line.strip()
+            if not line:
+                yield token((BLANK, None, line_nr))
+                continue
+
+            comment, close, key, value, brace, other, inline_comment = match_line(line).groups()
+
+            if inline_comment is not None:
+                yield token((COMMENT, KeepAlivedConfigComment(inline_comment, type=INLINE), line_nr))
+
+            if comment is not None:
+                comment = comment.strip()
+                if not comment:
+                    raise ValueError(f"Invalid comment string '{line}'")
+                yield token((COMMENT, KeepAlivedConfigComment(comment), line_nr))
+            elif close is not None:
+                yield token((BLOCK_END, line, line_nr))
+            elif key is not None:
+                yield token((KEY, intern(key), line_nr))
+                if value is not None:
+                    yield token((VALUE, value, line_nr))
+                if brace == "{":
+                    yield token((BLOCK_START, None, line_nr))
+                elif brace == "}":
+                    yield token((BLOCK_END, brace, line_nr))
+            else:
+                # there are special cases where we have a single value without a key (e.g. an ip address)
+                if " " in other:
+                    raise ValueError(
+                        f"Unexpected line format in {self._source}@{line_nr}: '{other}'"
+                    )
+                yield token((KEY, other, line_nr))
+
+        if not line_nr or raw_line.endswith("\n"):
+            yield token((BLANK, None, line_nr + 1))
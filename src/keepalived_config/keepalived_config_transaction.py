@@ -0,0 +1,255 @@
+from types import SimpleNamespace
+from typing import Callable, Optional
+
+from keepalived_config.keepalived_config_param import KeepAlivedConfigParam
+from keepalived_config.keepalived_config_block import KeepAlivedConfigBlock
+from keepalived_config.keepalived_config_diff import KeepAlivedConfigDiff
+from keepalived_config.keepalived_config_snapshot import KeepAlivedConfigSnapshot
+from keepalived_config.keepalived_config_exceptions import ConfigTransactionError
+
+
+class KeepAlivedConfigTransaction:
+    """
+    配置管理器上的事务，通常通过KeepAlivedConfigManager.transaction()创建
+
+    事务开始时创建配置的快照（KeepAlivedConfigSnapshot），快照记录的每个节点和参数列表第一次被修改前的状态
+    就是事务的撤销日志：回滚时按相反顺序恢复这些状态，耗时与修改的节点数量成正比，不需要复制整个配置。
+    事务内可以通过savepoint()（或再次调用manager.transaction()）创建嵌套的保存点，保存点回滚时只撤销
+    其之后的修改，提交时其修改并入上一级事务。
+
+    最外层事务提交时，将事务内的变化列表（KeepAlivedConfigChange，与KeepAlivedConfigDiff.compare()相同）
+    交给save_hook，例如保存配置或下发到其他节点；save_hook抛出异常时事务回滚，异常继续抛出。
+
+    线程安全模式下，事务从开始到结束一直持有管理器的写锁，其他线程不会看到事务的中间状态。
+
+    Example:
+        ```python
+        with manager.transaction(save_hook=lambda changes: manager.save_config(atomic=True)) as tx:
+            manager.virtual_server.create_virtual_server("10.0.0.1", 80)
+            with tx.savepoint():
+                manager.virtual_server.add_real_server("10.0.0.1", 80, "10.0.1.1", 80)
+        ```
+    """
+
+    def __init__(self, manager, save_hook: Optional[Callable[[list], None]] = None):
+        """
+        开始事务；管理器上已有未结束的事务时，新事务是其嵌套的保存点
+
+        Args:
+            manager (KeepAlivedConfigManager): 配置管理器
+            save_hook (Optional[Callable[[list], None]]): 最外层事务提交时调用，参数为变化列表
+
+        Raises:
+            ConfigTransactionError: 当为保存点指定save_hook时
+        """
+        self._lock = manager._lock
+        if self._lock is not None:
+            self._lock.acquire_write()
+        # read under the write lock, transactions of other threads have finished
+        parent = manager._transaction
+        if parent is not None and save_hook is not None:
+            if self._lock is not None:
+                self._lock.release()
+            raise ConfigTransactionError("Only the outermost transaction has a save hook")
+
+        self._manager = manager
+        self._save_hook = save_hook
+        self._parent = parent
+        self._changes = None
+        self._config = manager.config
+        self._snapshot = KeepAlivedConfigSnapshot(self._config)
+        manager._transaction = self
+
+    @property
+    def active(self) -> bool:
+        """
+        事务是否尚未提交或回滚
+        """
+        return self._snapshot is not None
+
+    @property
+    def parent(self) -> Optional["KeepAlivedConfigTransaction"]:
+        """
+        上一级事务，最外层事务为None
+        """
+        return self._parent
+
+    @property
+    def edits(self) -> int:
+        """
+        撤销日志的长度，即事务开始后被修改的节点和参数列表的数量
+        """
+        if self._snapshot is None:
+            return 0
+        return self._snapshot.preserved
+
+    @property
+    def changes(self) -> Optional[list]:
+        """
+        最外层事务提交时的变化列表，提交之前或保存点为None
+        """
+        return self._changes
+
+    # 创建嵌套的保存点
+    def savepoint(self) -> "KeepAlivedConfigTransaction":
+        """
+        创建嵌套的保存点，保存点回滚时只撤销其之后的修改
+
+        Returns:
+            KeepAlivedConfigTransaction: 保存点
+
+        Raises:
+            ConfigTransactionError: 当事务已结束或已有未结束的保存点时
+        """
+        self._check_active()
+        if self._manager._transaction is not self:
+            raise ConfigTransactionError("Transaction already has an active savepoint")
+        return KeepAlivedConfigTransaction(self._manager)
+
+    # 计算事务开始以来的变化列表
+    def pending_changes(self) -> list:
+        """
+        计算事务开始以来的变化列表，未修改的子树与配置共享，耗时与修改的数量成正比
+
+        Returns:
+            list[KeepAlivedConfigChange]: 变化列表
+
+        Raises:
+            ConfigTransactionError: 当事务已结束时
+        """
+        self._check_active()
+        # against the current configuration, load_config() may have replaced it
+        before = SimpleNamespace(params=self._before())
+        return KeepAlivedConfigDiff.compare(before, self._manager.config)
+
+    # 提交事务
+    def commit(self) -> list:
+        """
+        提交事务；最外层事务计算变化列表并交给save_hook，保存点的修改并入上一级事务
+
+        Returns:
+            list[KeepAlivedConfigChange]: 变化列表，保存点返回空列表
+
+        Raises:
+            ConfigTransactionError: 当事务已结束时
+        """
+        self._check_active()
+        self._finish_savepoints()
+        if self._parent is not None:
+            self._finish()
+            return []
+
+        try:
+            changes = self.pending_changes()
+            if changes and self._save_hook is not None:
+                self._save_hook(changes)
+        except BaseException:
+            self.rollback()
+            raise
+        self._changes = changes
+        self._finish()
+        return changes
+
+    # 回滚事务
+    def rollback(self):
+        """
+        回滚事务，按相反顺序恢复被修改的节点和参数列表，耗时与修改的数量成正比
+
+        Raises:
+            ConfigTransactionError: 当事务已结束时
+        """
+        self._check_active()
+        self._finish_savepoints()
+        snapshot = self._snapshot
+        undo_log = list(snapshot._versions.values())
+        root = snapshot._root
+        # the restored states need not be kept for this transaction
+        snapshot.release()
+
+        try:
+            for target, state in reversed(undo_log):
+                self._restore(target, state)
+
+            config = self._config
+            if config._params is not root:
+                # set_params() replaced the top level list
+                config._params = root
+                root[:] = tuple(root)
+            if self._manager.config is not config:
+                # load_config() replaced the configuration
+                self._manager._set_config(config)
+            if config._indexes is not None:
+                config._indexes.invalidate()
+        finally:
+            self._finish()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        没有异常时提交事务，否则回滚事务，异常继续抛出
+        """
+        if not self.active:
+            # committed or rolled back inside the with statement
+            return
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+    def _check_active(self):
+        if self._snapshot is None:
+            raise ConfigTransactionError("Transaction has already been committed or rolled back")
+
+    # 结束未结束的保存点，其修改并入本事务
+    def _finish_savepoints(self):
+        manager = self._manager
+        while manager._transaction is not self:
+            manager._transaction._finish()
+
+    # 结束事务，释放快照和写锁
+    def _finish(self):
+        self._snapshot.release()
+        self._snapshot = None
+        self._manager._transaction = self._parent
+        if self._lock is not None:
+            self._lock.release()
+
+    @staticmethod
+    def _restore(target, state):
+        # through the regular setters: indexes, render caches and other snapshots are updated
+        if isinstance(target, list):
+            target[:] = state
+            return
+        name, value, comments, source_file = state
+        target.name = name
+        target.value = value
+        target.source_file = source_file
+        target.comments = comments
+
+    # 事务开始时的顶层条目，未修改的子树与配置共享，只为修改过的节点创建副本
+    def _before(self) -> tuple:
+        snapshot = self._snapshot
+        versions = snapshot._versions
+        changed = snapshot._changed
+
+        def children(params):
+            entry = versions.get(id(params))
+            return entry[1] if entry is not None else params
+
+        def copy(node):
+            key = id(node)
+            entry = versions.get(key)
+            if entry is None and key not in changed:
+                return node
+            name, value = (entry[1][0], entry[1][1]) if entry is not None else (node.name, node.value)
+            if not isinstance(node, KeepAlivedConfigBlock):
+                return KeepAlivedConfigParam._from_trusted(name, value)
+            block = KeepAlivedConfigBlock._from_trusted(name)
+            block._value = value
+            # a plain tuple, a parameter list would take the shared nodes from the configuration
+            block._params = tuple(copy(child) for child in children(node._params))
+            return block
+
+        return tuple(copy(node) for node in children(snapshot._root))
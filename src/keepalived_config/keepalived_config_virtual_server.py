@@ -8,6 +8,8 @@ from keepalived_config.keepalived_config_comment import (
 )
 from keepalived_config.keepalived_config_constants import KeepAlivedConfigDefaults
 from keepalived_config.keepalived_config_result import OperationResult
+from keepalived_config.keepalived_config_metrics import KeepAlivedConfigMetrics
+from keepalived_config.keepalived_config_lock import KeepAlivedConfigRWLock
 from keepalived_config.keepalived_config_templates import KeepAlivedConfigTemplates
 from keepalived_config.keepalived_config_types import VirtualServerConfig
 from keepalived_config.keepalived_config_exceptions import (
@@ -58,6 +60,8 @@ class KeepAlivedConfigVirtualServer(KeepAlivedConfigBase):
         # 虚拟服务器管理器本身不处理自动保存，因为配置保存由KeepAlivedConfig处理
         pass
 
+    @KeepAlivedConfigMetrics.timed("virtual_server.create_virtual_server")
+    @KeepAlivedConfigRWLock.writing
     def create_virtual_server(
         self,
         virtual_server_ip: str,
@@ -246,9 +250,12 @@ class KeepAlivedConfigVirtualServer(KeepAlivedConfigBase):
         
         # 添加到配置中
         self.config.params.append(vs_block)
+        self.config.indexes.add_virtual_server(vs_block)
         
         return OperationResult.ok(f"虚拟服务器 '{vs_name}' 创建成功", vs_block)
 
+    @KeepAlivedConfigMetrics.timed("virtual_server.create_from_template")
+    @KeepAlivedConfigRWLock.writing
     def create_from_template(self, template_name: str, instance_name: str, config: VirtualServerConfig = None, **kwargs) -> OperationResult:
         """
         从模板创建虚拟服务器
@@ -294,25 +301,28 @@ class KeepAlivedConfigVirtualServer(KeepAlivedConfigBase):
             ```
         """
         try:
-            # 使用模板创建虚拟服务器配置
-            template_config = KeepAlivedConfigTemplates.from_template(template_name, instance_name, **kwargs)
-            
             # 检查是否已存在相同IP和端口的虚拟服务器
             result = self.get_virtual_server_by_name(instance_name)
             if result.success:
                 return OperationResult.fail(f"虚拟服务器 '{instance_name}' 已存在")
             
+            # 使用模板创建虚拟服务器配置
+            template_config = KeepAlivedConfigTemplates.from_template(template_name, instance_name, **kwargs)
+            
             # 获取模板生成的虚拟服务器块
             if template_config.params and isinstance(template_config.params[0], KeepAlivedConfigBlock):
                 vs_block = template_config.params[0]
                 # 添加到当前配置中
                 self.config.params.append(vs_block)
+                self.config.indexes.add_virtual_server(vs_block)
                 return OperationResult.ok(f"虚拟服务器 '{instance_name}' 从模板 '{template_name}' 创建成功", vs_block)
             else:
                 return OperationResult.fail("模板未生成有效的虚拟服务器配置")
         except Exception as e:
             return OperationResult.fail(f"从模板创建虚拟服务器失败: {str(e)}", e)
 
+    @KeepAlivedConfigMetrics.timed("virtual_server.get_virtual_server")
+    @KeepAlivedConfigRWLock.reading
     def get_virtual_server(self, virtual_server_ip: str, virtual_server_port: Union[int, str]) -> OperationResult:
         """
         获取指定IP和端口的虚拟服务器
@@ -349,6 +359,8 @@ class KeepAlivedConfigVirtualServer(KeepAlivedConfigBase):
         else:
             return OperationResult.fail(f"虚拟服务器 '{virtual_server_ip} {virtual_server_port}' 不存在")
 
+    @KeepAlivedConfigMetrics.timed("virtual_server.get_virtual_server_by_name")
+    @KeepAlivedConfigRWLock.reading
     def get_virtual_server_by_name(self, name: str) -> OperationResult:
         """
         根据名称获取虚拟服务器
@@ -365,13 +377,13 @@ class KeepAlivedConfigVirtualServer(KeepAlivedConfigBase):
         if not isinstance(name, str):
             raise KeepAlivedConfigTypeError(f"名称必须是字符串, got {type(name)}")
             
-        for param in self.config.params:
-            if isinstance(param, KeepAlivedConfigBlock) and \
-               param.name.startswith("virtual_server") and \
-               param.name.endswith(name):
-                return OperationResult.ok(f"成功获取虚拟服务器 '{name}'", param)
+        vs_block = self.config.params.find_one(f"virtual_server {name}", KeepAlivedConfigBlock)
+        if vs_block is not None:
+            return OperationResult.ok(f"成功获取虚拟服务器 '{name}'", vs_block)
         return OperationResult.fail(f"虚拟服务器 '{name}' 不存在")
 
+    @KeepAlivedConfigMetrics.timed("virtual_server.list_virtual_servers")
+    @KeepAlivedConfigRWLock.reading
     def list_virtual_servers(self) -> OperationResult:
         """
         列出所有虚拟服务器
@@ -397,6 +409,8 @@ class KeepAlivedConfigVirtualServer(KeepAlivedConfigBase):
                     virtual_servers.append(parts[1])
         return OperationResult.ok("成功获取虚拟服务器列表", virtual_servers)
 
+    @KeepAlivedConfigMetrics.timed("virtual_server.remove_virtual_server")
+    @KeepAlivedConfigRWLock.writing
     def remove_virtual_server(self, virtual_server_ip: str, virtual_server_port: Union[int, str]) -> OperationResult:
         """
         删除指定IP和端口的虚拟服务器
@@ -435,15 +449,16 @@ class KeepAlivedConfigVirtualServer(KeepAlivedConfigBase):
             raise KeepAlivedConfigTypeError(str(e))
             
         vs_name = f"{virtual_server_ip} {virtual_server_port}"
-        for i, param in enumerate(self.config.params):
-            if isinstance(param, KeepAlivedConfigBlock) and \
-               param.name.startswith("virtual_server") and \
-               param.name.endswith(vs_name):
-                self.config.params.pop(i)
-                return OperationResult.ok(f"虚拟服务器 '{vs_name}' 删除成功")
+        vs_block = self.config.params.find_one(f"virtual_server {vs_name}", KeepAlivedConfigBlock)
+        if vs_block is not None:
+            self.config.params.remove(vs_block)
+            self.config.indexes.remove_virtual_server(vs_block)
+            return OperationResult.ok(f"虚拟服务器 '{vs_name}' 删除成功")
                 
         raise VirtualServerNotFoundError(f"虚拟服务器 '{vs_name}' 不存在")
 
+    @KeepAlivedConfigMetrics.timed("virtual_server.update_virtual_server")
+    @KeepAlivedConfigRWLock.writing
     def update_virtual_server(
         self,
         virtual_server_ip: str,
@@ -598,6 +613,8 @@ class KeepAlivedConfigVirtualServer(KeepAlivedConfigBase):
             
         return OperationResult.ok(f"虚拟服务器 '{virtual_server_ip} {virtual_server_port}' 更新成功")
 
+    @KeepAlivedConfigMetrics.timed("virtual_server.add_real_server")
+    @KeepAlivedConfigRWLock.writing
     def add_real_server(
         self,
         virtual_server_ip: str,
@@ -664,26 +681,9 @@ class KeepAlivedConfigVirtualServer(KeepAlivedConfigBase):
             VirtualServerNotFoundError: 当虚拟服务器不存在时
         """
         # 参数验证
-        try:
-            KeepAlivedConfigValidator.validate_string(real_server_ip, "真实服务器IP", allow_empty=False)
-        except (KeepAlivedConfigTypeError, VirtualServerParameterError) as e:
-            return OperationResult.fail(str(e))
-            
-        try:
-            KeepAlivedConfigValidator.validate_port(real_server_port, "真实服务器端口")
-        except KeepAlivedConfigTypeError as e:
-            return OperationResult.fail(str(e))
-            
-        try:
-            KeepAlivedConfigValidator.validate_non_negative_integer(weight, "权重")
-        except VirtualServerParameterError as e:
-            return OperationResult.fail(str(e))
-            
-        try:
-            KeepAlivedConfigValidator.validate_choice(health_check, "健康检查类型", 
-                                                    ["TCP_CHECK", "HTTP_GET", "SSL_GET", "DNS_CHECK", "MISC_CHECK", "UDP_CHECK"])
-        except VirtualServerParameterError as e:
-            return OperationResult.fail(str(e))
+        error = self._validate_real_server_args(real_server_ip, real_server_port, weight, health_check)
+        if error is not None:
+            return OperationResult.fail(error)
             
         # 获取虚拟服务器
         vs_block = self._get_virtual_server_internal(virtual_server_ip, virtual_server_port)
@@ -696,52 +696,16 @@ class KeepAlivedConfigVirtualServer(KeepAlivedConfigBase):
             raise RealServerExistsError(f"真实服务器 '{rs_name}' 已存在于虚拟服务器 '{virtual_server_ip} {virtual_server_port}' 中")
             
         # 创建真实服务器块
-        rs_block = KeepAlivedConfigBlock("real_server", rs_name, comments or [])
-        
-        # 添加权重参数
-        rs_block.add_param(KeepAlivedConfigParam("weight", str(weight)))
-        
-        # 处理健康检查参数默认值
-        if health_check_params is None:
-            health_check_params = {}
-        
-        # 添加健康检查配置
-        if health_check == "TCP_CHECK":
-            health_check_block = KeepAlivedConfigBlock("TCP_CHECK")
-            connect_timeout = health_check_params.get("connect_timeout", KeepAlivedConfigDefaults.TCP_CHECK_CONNECT_TIMEOUT)
-            delay_before_retry = health_check_params.get("delay_before_retry", KeepAlivedConfigDefaults.TCP_CHECK_DELAY_BEFORE_RETRY)
-            health_check_block.add_param(KeepAlivedConfigParam("connect_timeout", str(connect_timeout)))
-            health_check_block.add_param(KeepAlivedConfigParam("delay_before_retry", str(delay_before_retry)))
-            rs_block.add_param(health_check_block)
-            
-        elif health_check == "HTTP_GET":
-            health_check_block = KeepAlivedConfigBlock("HTTP_GET")
-            url = health_check_params.get("url", KeepAlivedConfigDefaults.HTTP_GET_URL)
-            digest = health_check_params.get("digest")
-            status_code = health_check_params.get("status_code")
-            
-            health_check_block.add_param(KeepAlivedConfigParam("url", url))
-            if digest is not None:
-                health_check_block.add_param(KeepAlivedConfigParam("digest", digest))
-            if status_code is not None:
-                health_check_block.add_param(KeepAlivedConfigParam("status_code", str(status_code)))
-            rs_block.add_param(health_check_block)
-            
-        elif health_check == "UDP_CHECK":
-            health_check_block = KeepAlivedConfigBlock("UDP_CHECK")
-            connect_timeout = health_check_params.get("connect_timeout", KeepAlivedConfigDefaults.UDP_CHECK_CONNECT_TIMEOUT)
-            delay_before_retry = health_check_params.get("delay_before_retry", KeepAlivedConfigDefaults.UDP_CHECK_DELAY_BEFORE_RETRY)
-            health_check_block.add_param(KeepAlivedConfigParam("connect_timeout", str(connect_timeout)))
-            health_check_block.add_param(KeepAlivedConfigParam("delay_before_retry", str(delay_before_retry)))
-            rs_block.add_param(health_check_block)
-            
-        # 可以继续添加其他健康检查类型...
+        rs_block = self._build_real_server_block(rs_name, weight, health_check, health_check_params, comments)
         
         # 添加到虚拟服务器中
         vs_block.add_param(rs_block)
+        self.config.indexes.add_real_servers(vs_block, [rs_block])
         
         return OperationResult.ok(f"真实服务器 '{rs_name}' 添加成功", rs_block)
 
+    @KeepAlivedConfigMetrics.timed("virtual_server.get_real_server")
+    @KeepAlivedConfigRWLock.reading
     def get_real_server(
         self, 
         virtual_server_ip: str, 
@@ -788,6 +752,8 @@ class KeepAlivedConfigVirtualServer(KeepAlivedConfigBase):
         else:
             return OperationResult.fail(f"真实服务器 '{real_server_ip} {real_server_port}' 在虚拟服务器 '{virtual_server_ip} {virtual_server_port}' 中不存在")
 
+    @KeepAlivedConfigMetrics.timed("virtual_server.list_real_servers")
+    @KeepAlivedConfigRWLock.reading
     def list_real_servers(self, virtual_server_ip: str, virtual_server_port: Union[int, str]) -> OperationResult:
         """
         列出虚拟服务器中的所有真实服务器
@@ -825,6 +791,8 @@ class KeepAlivedConfigVirtualServer(KeepAlivedConfigBase):
                     real_servers.append(parts[1])
         return OperationResult.ok(f"成功获取虚拟服务器 '{virtual_server_ip} {virtual_server_port}' 中的真实服务器列表", real_servers)
 
+    @KeepAlivedConfigMetrics.timed("virtual_server.remove_real_server")
+    @KeepAlivedConfigRWLock.writing
     def remove_real_server(
         self, 
         virtual_server_ip: str, 
@@ -867,15 +835,16 @@ class KeepAlivedConfigVirtualServer(KeepAlivedConfigBase):
             raise VirtualServerNotFoundError(f"虚拟服务器 '{virtual_server_ip} {virtual_server_port}' 不存在")
             
         rs_name = f"{real_server_ip} {real_server_port}"
-        for i, param in enumerate(vs_block.params):
-            if isinstance(param, KeepAlivedConfigBlock) and \
-               param.name.startswith("real_server") and \
-               param.name.endswith(rs_name):
-                vs_block.params.pop(i)
-                return OperationResult.ok(f"真实服务器 '{rs_name}' 从虚拟服务器 '{virtual_server_ip} {virtual_server_port}' 中删除成功")
+        rs_block = vs_block.params.find_one(f"real_server {rs_name}", KeepAlivedConfigBlock)
+        if rs_block is not None:
+            vs_block.params.remove(rs_block)
+            self.config.indexes.remove_real_servers(vs_block, [rs_block])
+            return OperationResult.ok(f"真实服务器 '{rs_name}' 从虚拟服务器 '{virtual_server_ip} {virtual_server_port}' 中删除成功")
                 
         raise RealServerNotFoundError(f"真实服务器 '{rs_name}' 在虚拟服务器 '{virtual_server_ip} {virtual_server_port}' 中不存在")
 
+    @KeepAlivedConfigMetrics.timed("virtual_server.update_real_server")
+    @KeepAlivedConfigRWLock.writing
     def update_real_server(
         self,
         virtual_server_ip: str,
@@ -931,58 +900,237 @@ class KeepAlivedConfigVirtualServer(KeepAlivedConfigBase):
             raise RealServerNotFoundError(f"真实服务器 '{real_server_ip} {real_server_port}' 在虚拟服务器 '{virtual_server_ip} {virtual_server_port}' 中不存在")
             
         # 参数验证
-        if weight is not None:
-            try:
-                KeepAlivedConfigValidator.validate_non_negative_integer(weight, "权重")
-            except VirtualServerParameterError as e:
-                return OperationResult.fail(str(e))
+        error = self._validate_real_server_update_args(weight)
+        if error is not None:
+            return OperationResult.fail(error)
             
-        # 更新权重
-        if weight is not None:
-            self._update_param(rs_block, "weight", str(weight))
-            
-        # 更新健康检查配置
-        if health_check_params is not None:
-            # 更新TCP_CHECK参数
-            if "connect_timeout" in health_check_params:
-                tcp_check_block = self._get_sub_block(rs_block, "TCP_CHECK")
-                if tcp_check_block:
-                    self._update_param(tcp_check_block, "connect_timeout", str(health_check_params["connect_timeout"]))
-                    
-            if "delay_before_retry" in health_check_params:
-                tcp_check_block = self._get_sub_block(rs_block, "TCP_CHECK")
-                if tcp_check_block:
-                    self._update_param(tcp_check_block, "delay_before_retry", str(health_check_params["delay_before_retry"]))
-                    
-            # 更新UDP_CHECK参数
-            if "connect_timeout" in health_check_params:
-                udp_check_block = self._get_sub_block(rs_block, "UDP_CHECK")
-                if udp_check_block:
-                    self._update_param(udp_check_block, "connect_timeout", str(health_check_params["connect_timeout"]))
-                    
-            if "delay_before_retry" in health_check_params:
-                udp_check_block = self._get_sub_block(rs_block, "UDP_CHECK")
-                if udp_check_block:
-                    self._update_param(udp_check_block, "delay_before_retry", str(health_check_params["delay_before_retry"]))
-                    
-            # 更新HTTP_GET参数
-            if "url" in health_check_params:
-                http_get_block = self._get_sub_block(rs_block, "HTTP_GET")
-                if http_get_block:
-                    self._update_param(http_get_block, "url", health_check_params["url"])
-                    
-            if "digest" in health_check_params:
-                http_get_block = self._get_sub_block(rs_block, "HTTP_GET")
-                if http_get_block:
-                    self._update_param(http_get_block, "digest", health_check_params["digest"])
-                    
-            if "status_code" in health_check_params:
-                http_get_block = self._get_sub_block(rs_block, "HTTP_GET")
-                if http_get_block:
-                    self._update_param(http_get_block, "status_code", str(health_check_params["status_code"]))
+        self._apply_real_server_update(rs_block, weight, health_check_params)
             
         return OperationResult.ok(f"真实服务器 '{real_server_ip} {real_server_port}' 更新成功")
 
+    @KeepAlivedConfigMetrics.timed("virtual_server.add_real_servers")
+    @KeepAlivedConfigRWLock.writing
+    def add_real_servers(
+        self,
+        virtual_server_ip: str,
+        virtual_server_port: Union[int, str],
+        specs: List[Dict[str, Any]]
+    ) -> OperationResult:
+        """
+        批量为虚拟服务器添加真实服务器
+        
+        虚拟服务器只查找一次，已有真实服务器的"IP 端口"集合只构建一次，所有条目先统一验证，
+        再一次性添加到虚拟服务器中，耗时与条目数量成线性关系。
+        验证失败或已存在的条目不会被添加，其结果记录在对应的单项结果中。
+        
+        Args:
+            virtual_server_ip (str): 虚拟服务器IP地址
+            virtual_server_port (Union[int, str]): 虚拟服务器端口
+            specs (List[Dict[str, Any]]): 真实服务器参数列表，每一项的键与add_real_server的参数相同
+                (real_server_ip, real_server_port, weight, health_check, health_check_params, comments)
+            
+        Returns:
+            OperationResult: 操作结果对象，数据部分为按输入顺序排列的单项结果列表，
+            所有条目都添加成功时才为成功
+            
+        Example:
+            ```python
+            result = vs_manager.add_real_servers("192.168.1.100", 80, [
+                {"real_server_ip": "192.168.1.101", "real_server_port": 8080},
+                {"real_server_ip": "192.168.1.102", "real_server_port": 8080, "weight": 2},
+            ])
+            for item in result.data:
+                print(item.success, item.message)
+            ```
+            
+        Raises:
+            VirtualServerNotFoundError: 当虚拟服务器不存在时
+        """
+        vs_block = self._get_virtual_server_internal(virtual_server_ip, virtual_server_port)
+        if vs_block is None:
+            raise VirtualServerNotFoundError(f"虚拟服务器 '{virtual_server_ip} {virtual_server_port}' 不存在")
+        vs_name = f"{virtual_server_ip} {virtual_server_port}"
+        
+        existing = self._real_server_names(vs_block)
+        results = []
+        rs_blocks = []
+        for spec in specs:
+            args, error = self._read_real_server_spec(spec, self._ADD_SPEC_KEYS)
+            if error is None:
+                error = self._validate_real_server_args(
+                    args["real_server_ip"],
+                    args["real_server_port"],
+                    args.get("weight", KeepAlivedConfigDefaults.REAL_SERVER_WEIGHT),
+                    args.get("health_check", KeepAlivedConfigDefaults.REAL_SERVER_HEALTH_CHECK),
+                )
+            if error is not None:
+                results.append(OperationResult.fail(error))
+                continue
+                
+            rs_name = f"{args['real_server_ip']} {args['real_server_port']}"
+            if rs_name in existing:
+                results.append(OperationResult.fail(
+                    f"真实服务器 '{rs_name}' 已存在于虚拟服务器 '{vs_name}' 中",
+                    RealServerExistsError(f"真实服务器 '{rs_name}' 已存在于虚拟服务器 '{vs_name}' 中"),
+                ))
+                continue
+                
+            existing.add(rs_name)
+            rs_block = self._build_real_server_block(
+                rs_name,
+                args.get("weight", KeepAlivedConfigDefaults.REAL_SERVER_WEIGHT),
+                args.get("health_check", KeepAlivedConfigDefaults.REAL_SERVER_HEALTH_CHECK),
+                args.get("health_check_params"),
+                args.get("comments"),
+            )
+            rs_blocks.append(rs_block)
+            results.append(OperationResult.ok(f"真实服务器 '{rs_name}' 添加成功", rs_block))
+            
+        # 一次性添加到虚拟服务器中
+        vs_block.params.extend(rs_blocks)
+        self.config.indexes.add_real_servers(vs_block, rs_blocks)
+        
+        return self._bulk_result("添加", len(rs_blocks), results)
+
+    @KeepAlivedConfigMetrics.timed("virtual_server.remove_real_servers")
+    @KeepAlivedConfigRWLock.writing
+    def remove_real_servers(
+        self,
+        virtual_server_ip: str,
+        virtual_server_port: Union[int, str],
+        specs: List[Any]
+    ) -> OperationResult:
+        """
+        批量从虚拟服务器中删除真实服务器
+        
+        所有待删除的真实服务器先通过名称索引定位，再一次性从虚拟服务器中移除，
+        不会为每个条目重新扫描参数列表。
+        
+        Args:
+            virtual_server_ip (str): 虚拟服务器IP地址
+            virtual_server_port (Union[int, str]): 虚拟服务器端口
+            specs (List[Any]): 真实服务器列表，每一项为(real_server_ip, real_server_port)元组
+                或包含real_server_ip和real_server_port键的字典
+            
+        Returns:
+            OperationResult: 操作结果对象，数据部分为按输入顺序排列的单项结果列表，
+            所有条目都删除成功时才为成功
+            
+        Example:
+            ```python
+            result = vs_manager.remove_real_servers("192.168.1.100", 80, [
+                ("192.168.1.101", 8080),
+                ("192.168.1.102", 8080),
+            ])
+            ```
+            
+        Raises:
+            VirtualServerNotFoundError: 当虚拟服务器不存在时
+        """
+        vs_block = self._get_virtual_server_internal(virtual_server_ip, virtual_server_port)
+        if vs_block is None:
+            raise VirtualServerNotFoundError(f"虚拟服务器 '{virtual_server_ip} {virtual_server_port}' 不存在")
+        vs_name = f"{virtual_server_ip} {virtual_server_port}"
+        
+        results = []
+        removed = {}
+        for spec in specs:
+            if isinstance(spec, tuple) and len(spec) == 2:
+                spec = {"real_server_ip": spec[0], "real_server_port": spec[1]}
+            args, error = self._read_real_server_spec(spec, self._KEY_SPEC_KEYS)
+            if error is not None:
+                results.append(OperationResult.fail(error))
+                continue
+                
+            rs_name = f"{args['real_server_ip']} {args['real_server_port']}"
+            rs_block = vs_block.params.find_one(f"real_server {rs_name}", KeepAlivedConfigBlock)
+            if rs_block is None or id(rs_block) in removed:
+                results.append(OperationResult.fail(
+                    f"真实服务器 '{rs_name}' 在虚拟服务器 '{vs_name}' 中不存在",
+                    RealServerNotFoundError(f"真实服务器 '{rs_name}' 在虚拟服务器 '{vs_name}' 中不存在"),
+                ))
+                continue
+                
+            removed[id(rs_block)] = rs_block
+            results.append(OperationResult.ok(f"真实服务器 '{rs_name}' 从虚拟服务器 '{vs_name}' 中删除成功"))
+            
+        # 一次性移除所有待删除的真实服务器
+        if removed:
+            vs_block.params[:] = [node for node in vs_block.params if id(node) not in removed]
+            self.config.indexes.remove_real_servers(vs_block, removed.values())
+            
+        return self._bulk_result("删除", len(removed), results)
+
+    @KeepAlivedConfigMetrics.timed("virtual_server.update_real_servers")
+    @KeepAlivedConfigRWLock.writing
+    def update_real_servers(
+        self,
+        virtual_server_ip: str,
+        virtual_server_port: Union[int, str],
+        specs: List[Dict[str, Any]]
+    ) -> OperationResult:
+        """
+        批量更新虚拟服务器中的真实服务器
+        
+        所有条目先统一验证并定位，验证失败或不存在的条目不会被更新，
+        其余条目按输入顺序更新。
+        
+        Args:
+            virtual_server_ip (str): 虚拟服务器IP地址
+            virtual_server_port (Union[int, str]): 虚拟服务器端口
+            specs (List[Dict[str, Any]]): 更新参数列表，每一项的键与update_real_server的参数相同
+                (real_server_ip, real_server_port, weight, health_check_params)
+            
+        Returns:
+            OperationResult: 操作结果对象，数据部分为按输入顺序排列的单项结果列表，
+            所有条目都更新成功时才为成功
+            
+        Example:
+            ```python
+            result = vs_manager.update_real_servers("192.168.1.100", 80, [
+                {"real_server_ip": "192.168.1.101", "real_server_port": 8080, "weight": 0},
+                {"real_server_ip": "192.168.1.102", "real_server_port": 8080, "weight": 0},
+            ])
+            ```
+            
+        Raises:
+            VirtualServerNotFoundError: 当虚拟服务器不存在时
+        """
+        vs_block = self._get_virtual_server_internal(virtual_server_ip, virtual_server_port)
+        if vs_block is None:
+            raise VirtualServerNotFoundError(f"虚拟服务器 '{virtual_server_ip} {virtual_server_port}' 不存在")
+        vs_name = f"{virtual_server_ip} {virtual_server_port}"
+        
+        # 先验证所有条目，再统一更新
+        results = []
+        updates = []
+        for spec in specs:
+            args, error = self._read_real_server_spec(spec, self._UPDATE_SPEC_KEYS)
+            if error is None:
+                error = self._validate_real_server_update_args(args.get("weight"))
+            if error is not None:
+                results.append(OperationResult.fail(error))
+                continue
+                
+            rs_name = f"{args['real_server_ip']} {args['real_server_port']}"
+            rs_block = vs_block.params.find_one(f"real_server {rs_name}", KeepAlivedConfigBlock)
+            if rs_block is None:
+                results.append(OperationResult.fail(
+                    f"真实服务器 '{rs_name}' 在虚拟服务器 '{vs_name}' 中不存在",
+                    RealServerNotFoundError(f"真实服务器 '{rs_name}' 在虚拟服务器 '{vs_name}' 中不存在"),
+                ))
+                continue
+                
+            updates.append((rs_block, args))
+            results.append(OperationResult.ok(f"真实服务器 '{rs_name}' 更新成功", rs_block))
+            
+        for rs_block, args in updates:
+            self._apply_real_server_update(rs_block, args.get("weight"), args.get("health_check_params"))
+            
+        return self._bulk_result("更新", len(updates), results)
+
+    @KeepAlivedConfigMetrics.timed("virtual_server.validate_configuration")
+    @KeepAlivedConfigRWLock.reading
     def validate_configuration(self) -> OperationResult:
         """
         验证配置的一致性和完整性
@@ -1035,12 +1183,7 @@ class KeepAlivedConfigVirtualServer(KeepAlivedConfigBase):
             Optional[KeepAlivedConfigBlock]: 虚拟服务器块，如果不存在则返回None
         """
         vs_name = f"{virtual_server_ip} {virtual_server_port}"
-        for param in self.config.params:
-            if isinstance(param, KeepAlivedConfigBlock) and \
-               param.name.startswith("virtual_server") and \
-               param.name.endswith(vs_name):
-                return param
-        return None
+        return self.config.params.find_one(f"virtual_server {vs_name}", KeepAlivedConfigBlock)
 
     def _get_real_server_internal(
         self, 
@@ -1067,14 +1210,205 @@ class KeepAlivedConfigVirtualServer(KeepAlivedConfigBase):
             return None
             
         rs_name = f"{real_server_ip} {real_server_port}"
-        for param in vs_block.params:
-            if isinstance(param, KeepAlivedConfigBlock) and \
-               param.name.startswith("real_server") and \
-               param.name.endswith(rs_name):
-                return param
-                
+        return vs_block.params.find_one(f"real_server {rs_name}", KeepAlivedConfigBlock)
+
+    _KEY_SPEC_KEYS = ("real_server_ip", "real_server_port")
+    _ADD_SPEC_KEYS = _KEY_SPEC_KEYS + ("weight", "health_check", "health_check_params", "comments")
+    _UPDATE_SPEC_KEYS = _KEY_SPEC_KEYS + ("weight", "health_check_params")
+
+    def _validate_real_server_args(
+        self,
+        real_server_ip: str,
+        real_server_port: Union[int, str],
+        weight: int,
+        health_check: str
+    ) -> Optional[str]:
+        """
+        内部方法：验证真实服务器参数
+        
+        Returns:
+            Optional[str]: 错误信息，验证通过时返回None
+        """
+        try:
+            KeepAlivedConfigValidator.validate_string(real_server_ip, "真实服务器IP", allow_empty=False)
+            KeepAlivedConfigValidator.validate_port(real_server_port, "真实服务器端口")
+            KeepAlivedConfigValidator.validate_non_negative_integer(weight, "权重")
+            KeepAlivedConfigValidator.validate_choice(health_check, "健康检查类型", 
+                                                    ["TCP_CHECK", "HTTP_GET", "SSL_GET", "DNS_CHECK", "MISC_CHECK", "UDP_CHECK"])
+        except (KeepAlivedConfigTypeError, VirtualServerParameterError) as e:
+            return str(e)
         return None
 
+    def _validate_real_server_update_args(self, weight: Optional[int]) -> Optional[str]:
+        """
+        内部方法：验证真实服务器更新参数
+        
+        Returns:
+            Optional[str]: 错误信息，验证通过时返回None
+        """
+        if weight is not None:
+            try:
+                KeepAlivedConfigValidator.validate_non_negative_integer(weight, "权重")
+            except VirtualServerParameterError as e:
+                return str(e)
+        return None
+
+    def _read_real_server_spec(self, spec: Any, allowed_keys: tuple) -> tuple:
+        """
+        内部方法：读取批量操作中的单个真实服务器条目
+        
+        Returns:
+            tuple: (参数字典, 错误信息)，错误信息为None表示条目有效
+        """
+        if not isinstance(spec, dict):
+            return None, f"真实服务器条目必须是字典, got {type(spec)}"
+        unknown = [key for key in spec if key not in allowed_keys]
+        if unknown:
+            return None, f"真实服务器条目包含未知参数: {', '.join(map(str, unknown))}"
+        missing = [key for key in self._KEY_SPEC_KEYS if key not in spec]
+        if missing:
+            return None, f"真实服务器条目缺少参数: {', '.join(missing)}"
+        return spec, None
+
+    def _real_server_names(self, vs_block: KeepAlivedConfigBlock) -> set:
+        """
+        内部方法：获取虚拟服务器中所有真实服务器的"IP 端口"集合
+        """
+        return {
+            node.name.split(" ", 1)[1]
+            for node in vs_block.params
+            if isinstance(node, KeepAlivedConfigBlock) and node.name.startswith("real_server ")
+        }
+
+    def _build_real_server_block(
+        self,
+        rs_name: str,
+        weight: int,
+        health_check: str,
+        health_check_params: Optional[Dict[str, Any]],
+        comments: Optional[List[KeepAlivedConfigComment]]
+    ) -> KeepAlivedConfigBlock:
+        """
+        内部方法：创建真实服务器块
+        
+        Args:
+            rs_name (str): 真实服务器名称，格式为"IP 端口"
+            weight (int): 权重
+            health_check (str): 健康检查类型
+            health_check_params (Optional[Dict[str, Any]]): 健康检查参数
+            comments (Optional[List[KeepAlivedConfigComment]]): 注释列表
+            
+        Returns:
+            KeepAlivedConfigBlock: 真实服务器块
+        """
+        rs_block = KeepAlivedConfigBlock("real_server", rs_name, comments or [])
+        
+        # 添加权重参数
+        rs_block.add_param(KeepAlivedConfigParam("weight", str(weight)))
+        
+        # 处理健康检查参数默认值
+        if health_check_params is None:
+            health_check_params = {}
+        
+        
+        # 添加健康检查配置
+        if health_check == "TCP_CHECK":
+            health_check_block = KeepAlivedConfigBlock("TCP_CHECK")
+            connect_timeout = health_check_params.get("connect_timeout", KeepAlivedConfigDefaults.TCP_CHECK_CONNECT_TIMEOUT)
+            delay_before_retry = health_check_params.get("delay_before_retry", KeepAlivedConfigDefaults.TCP_CHECK_DELAY_BEFORE_RETRY)
+            health_check_block.add_param(KeepAlivedConfigParam("connect_timeout", str(connect_timeout)))
+            health_check_block.add_param(KeepAlivedConfigParam("delay_before_retry", str(delay_before_retry)))
+            rs_block.add_param(health_check_block)
+            
+        elif health_check == "HTTP_GET":
+            health_check_block = KeepAlivedConfigBlock("HTTP_GET")
+            url = health_check_params.get("url", KeepAlivedConfigDefaults.HTTP_GET_URL)
+            digest = health_check_params.get("digest")
+            status_code = health_check_params.get("status_code")
+            
+            health_check_block.add_param(KeepAlivedConfigParam("url", url))
+            if digest is not None:
+                health_check_block.add_param(KeepAlivedConfigParam("digest", digest))
+            if status_code is not None:
+                health_check_block.add_param(KeepAlivedConfigParam("status_code", str(status_code)))
+            rs_block.add_param(health_check_block)
+            
+        elif health_check == "UDP_CHECK":
+            health_check_block = KeepAlivedConfigBlock("UDP_CHECK")
+            connect_timeout = health_check_params.get("connect_timeout", KeepAlivedConfigDefaults.UDP_CHECK_CONNECT_TIMEOUT)
+            delay_before_retry = health_check_params.get("delay_before_retry", KeepAlivedConfigDefaults.UDP_CHECK_DELAY_BEFORE_RETRY)
+            health_check_block.add_param(KeepAlivedConfigParam("connect_timeout", str(connect_timeout)))
+            health_check_block.add_param(KeepAlivedConfigParam("delay_before_retry", str(delay_before_retry)))
+            rs_block.add_param(health_check_block)
+        
+        return rs_block
+
+    def _apply_real_server_update(
+        self,
+        rs_block: KeepAlivedConfigBlock,
+        weight: Optional[int],
+        health_check_params: Optional[Dict[str, Any]]
+    ):
+        """
+        内部方法：将已验证的更新参数应用到真实服务器块
+        """
+        # 更新权重
+        if weight is not None:
+            self._update_param(rs_block, "weight", str(weight))
+            
+        # 更新健康检查配置
+        if health_check_params is not None:
+            # 更新TCP_CHECK参数
+            if "connect_timeout" in health_check_params:
+                tcp_check_block = self._get_sub_block(rs_block, "TCP_CHECK")
+                if tcp_check_block:
+                    self._update_param(tcp_check_block, "connect_timeout", str(health_check_params["connect_timeout"]))
+                    
+            if "delay_before_retry" in health_check_params:
+                tcp_check_block = self._get_sub_block(rs_block, "TCP_CHECK")
+                if tcp_check_block:
+                    self._update_param(tcp_check_block, "delay_before_retry", str(health_check_params["delay_before_retry"]))
+                    
+            # 更新UDP_CHECK参数
+            if "connect_timeout" in health_check_params:
+                udp_check_block = self._get_sub_block(rs_block, "UDP_CHECK")
+                if udp_check_block:
+                    self._update_param(udp_check_block, "connect_timeout", str(health_check_params["connect_timeout"]))
+                    
+            if "delay_before_retry" in health_check_params:
+                udp_check_block = self._get_sub_block(rs_block, "UDP_CHECK")
+                if udp_check_block:
+                    self._update_param(udp_check_block, "delay_before_retry", str(health_check_params["delay_before_retry"]))
+                    
+            # 更新HTTP_GET参数
+            if "url" in health_check_params:
+                http_get_block = self._get_sub_block(rs_block, "HTTP_GET")
+                if http_get_block:
+                    self._update_param(http_get_block, "url", health_check_params["url"])
+                    
+            if "digest" in health_check_params:
+                http_get_block = self._get_sub_block(rs_block, "HTTP_GET")
+                if http_get_block:
+                    self._update_param(http_get_block, "digest", health_check_params["digest"])
+                    
+            if "status_code" in health_check_params:
+                http_get_block = self._get_sub_block(rs_block, "HTTP_GET")
+                if http_get_block:
+                    self._update_param(http_get_block, "status_code", str(health_check_params["status_code"]))
+
+    @staticmethod
+    def _bulk_result(action: str, succeeded: int, results: List[OperationResult]) -> OperationResult:
+        """
+        内部方法：汇总批量操作的单项结果
+        """
+        failed = len(results) - succeeded
+        message = f"成功{action} {succeeded} 个真实服务器，失败 {failed} 个"
+        if failed:
+            result = OperationResult.fail(message)
+            result.data = results
+            return result
+        return OperationResult.ok(message, results)
+
     def _get_param(self, block: KeepAlivedConfigBlock, param_name: str) -> Optional[KeepAlivedConfigParam]:
         """
         在块中查找指定名称的参数
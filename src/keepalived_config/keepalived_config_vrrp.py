@@ -1,3 +1,4 @@
+import dataclasses
 from typing import Optional, List, Dict, Any, Union
 from keepalived_config.keepalived_config import KeepAlivedConfig
 from keepalived_config.keepalived_config_block import KeepAlivedConfigBlock
@@ -8,6 +9,8 @@ from keepalived_config.keepalived_config_comment import (
 )
 from keepalived_config.keepalived_config_constants import KeepAlivedConfigDefaults
 from keepalived_config.keepalived_config_result import OperationResult
+from keepalived_config.keepalived_config_metrics import KeepAlivedConfigMetrics
+from keepalived_config.keepalived_config_lock import KeepAlivedConfigRWLock
 from keepalived_config.keepalived_config_templates import KeepAlivedConfigTemplates
 from keepalived_config.keepalived_config_types import VRRPConfig
 from keepalived_config.keepalived_config_exceptions import (
@@ -31,8 +34,27 @@ class KeepAlivedConfigVRRP(KeepAlivedConfigBase):
     - 更新VRRP实例的配置参数 (update_vrrp_instance)
     - 列出所有存在的VRRP实例 (list_vrrp_instances)
     - 从模板创建VRRP实例 (create_from_template)
+    - 批量创建和更新VRRP实例 (create_vrrp_instances, update_vrrp_instances)
+    - 分配和释放空闲的虚拟路由器ID (allocate_vrid, release_vrid)
     """
 
+    # VRRP实例参数名称（与VRRPConfig的字段一致）
+    _VRRP_FIELDS = tuple(field.name for field in dataclasses.fields(VRRPConfig))
+    
+    # 未提供配置对象时使用的默认值
+    _VRRP_DEFAULTS = {
+        "state": "BACKUP",
+        "interface": "eth0",
+        "virtual_router_id": 51,
+        "priority": 100,
+        "advert_int": 1,
+        "auth_type": "PASS",
+        "nopreempt": False,
+    }
+    
+    # 可分配的虚拟路由器ID（1-255）在位图中对应的位
+    _VRID_MASK = ((1 << 256) - 1) & ~1
+
     def __init__(self, config: KeepAlivedConfig):
         """
         初始化VRRP管理器
@@ -42,6 +64,8 @@ class KeepAlivedConfigVRRP(KeepAlivedConfigBase):
         """
         super().__init__()
         self.config = config
+        # 接口 -> 已分配但尚未被实例使用的虚拟路由器ID位图
+        self._reserved_vrids: Dict[str, int] = {}
 
     def __enter__(self):
         """
@@ -64,6 +88,8 @@ class KeepAlivedConfigVRRP(KeepAlivedConfigBase):
         # VRRP管理器本身不处理自动保存，因为配置保存由KeepAlivedConfig处理
         pass
 
+    @KeepAlivedConfigMetrics.timed("vrrp.create_vrrp_instance")
+    @KeepAlivedConfigRWLock.writing
     def create_vrrp_instance(
         self, 
         instance_name: str,
@@ -153,143 +179,51 @@ class KeepAlivedConfigVRRP(KeepAlivedConfigBase):
             TypeError: 当参数类型错误时
             VRRPInstanceExistsError: 当VRRP实例已存在时
         """
-        # 如果提供了配置对象，则使用配置对象的值作为默认值
-        if config is not None:
-            # 使用配置对象的值作为默认值
-            state = state if state is not None else config.state
-            interface = interface if interface is not None else config.interface
-            virtual_router_id = virtual_router_id if virtual_router_id is not None else config.virtual_router_id
-            priority = priority if priority is not None else config.priority
-            advert_int = advert_int if advert_int is not None else config.advert_int
-            auth_type = auth_type if auth_type is not None else config.auth_type
-            auth_pass = auth_pass if auth_pass is not None else config.auth_pass
-            virtual_ipaddresses = virtual_ipaddresses if virtual_ipaddresses is not None else config.virtual_ipaddresses
-            nopreempt = nopreempt if nopreempt is not None else config.nopreempt
-            preempt_delay = preempt_delay if preempt_delay is not None else config.preempt_delay
-            garp_master_delay = garp_master_delay if garp_master_delay is not None else config.garp_master_delay
-            # 新增参数
-            unicast_src_ip = unicast_src_ip if unicast_src_ip is not None else config.unicast_src_ip
-            unicast_peer = unicast_peer if unicast_peer is not None else config.unicast_peer
-            smtp_alert = smtp_alert if smtp_alert is not None else config.smtp_alert
-            notify_master = notify_master if notify_master is not None else config.notify_master
-            notify_backup = notify_backup if notify_backup is not None else config.notify_backup
-            notify_fault = notify_fault if notify_fault is not None else config.notify_fault
-        
-        # 如果没有提供配置对象，使用默认值
-        if config is None:
-            # 设置默认值
-            state = state if state is not None else "BACKUP"
-            interface = interface if interface is not None else "eth0"
-            virtual_router_id = virtual_router_id if virtual_router_id is not None else 51
-            priority = priority if priority is not None else 100
-            advert_int = advert_int if advert_int is not None else 1
-            auth_type = auth_type if auth_type is not None else "PASS"
-            virtual_ipaddresses = virtual_ipaddresses if virtual_ipaddresses is not None else []
-            nopreempt = nopreempt if nopreempt is not None else False
+        args = self._resolve_vrrp_args(config, {
+            "state": state,
+            "interface": interface,
+            "virtual_router_id": virtual_router_id,
+            "priority": priority,
+            "advert_int": advert_int,
+            "auth_type": auth_type,
+            "auth_pass": auth_pass,
+            "virtual_ipaddresses": virtual_ipaddresses,
+            "nopreempt": nopreempt,
+            "preempt_delay": preempt_delay,
+            "garp_master_delay": garp_master_delay,
+            "unicast_src_ip": unicast_src_ip,
+            "unicast_peer": unicast_peer,
+            "smtp_alert": smtp_alert,
+            "notify_master": notify_master,
+            "notify_backup": notify_backup,
+            "notify_fault": notify_fault,
+        })
         
         # 参数验证
-        try:
-            KeepAlivedConfigValidator.validate_string(instance_name, "实例名称", allow_empty=False)
-        except (KeepAlivedConfigTypeError, VRRPParameterError) as e:
-            return OperationResult.fail(str(e))
-            
-        try:
-            KeepAlivedConfigValidator.validate_choice(state, "状态", ["MASTER", "BACKUP"])
-        except VRRPParameterError as e:
-            return OperationResult.fail(str(e))
-            
-        try:
-            KeepAlivedConfigValidator.validate_string(interface, "网络接口", allow_empty=False)
-        except (KeepAlivedConfigTypeError, VRRPParameterError) as e:
-            return OperationResult.fail(str(e))
-            
-        try:
-            KeepAlivedConfigValidator.validate_integer_in_range(virtual_router_id, "虚拟路由器ID", 0, 255)
-        except VRRPParameterError as e:
-            return OperationResult.fail(str(e))
-            
-        try:
-            KeepAlivedConfigValidator.validate_integer_in_range(priority, "优先级", 0, 255)
-        except VRRPParameterError as e:
-            return OperationResult.fail(str(e))
-            
-        try:
-            KeepAlivedConfigValidator.validate_positive_integer(advert_int, "广播间隔")
-        except VRRPParameterError as e:
-            return OperationResult.fail(str(e))
-            
-        if auth_type not in ["PASS", "AH"]:
-            return OperationResult.fail("认证类型必须是 'PASS' 或 'AH'")
-            
-        if virtual_ipaddresses is None:
-            virtual_ipaddresses = []
+        error = self._validate_vrrp_args(instance_name, args)
+        if error is not None:
+            return OperationResult.fail(error)
             
         # 检查是否已存在同名实例
         if self.get_vrrp_instance(instance_name) is not None:
             raise VRRPInstanceExistsError(f"VRRP实例 '{instance_name}' 已存在")
             
-        # 创建VRRP实例块
-        vrrp_block = KeepAlivedConfigBlock("vrrp_instance", instance_name, comments or [])
-        
-        # 添加基本参数
-        vrrp_block.add_param(KeepAlivedConfigParam("state", state))
-        vrrp_block.add_param(KeepAlivedConfigParam("interface", interface))
-        vrrp_block.add_param(KeepAlivedConfigParam("virtual_router_id", str(virtual_router_id)))
-        vrrp_block.add_param(KeepAlivedConfigParam("priority", str(priority)))
-        vrrp_block.add_param(KeepAlivedConfigParam("advert_int", str(advert_int)))
-        
-        # 添加认证配置
-        if auth_pass:
-            auth_block = KeepAlivedConfigBlock("authentication")
-            auth_block.add_param(KeepAlivedConfigParam("auth_type", auth_type))
-            auth_block.add_param(KeepAlivedConfigParam("auth_pass", auth_pass))
-            vrrp_block.add_param(auth_block)
-        
-        # 添加虚拟IP地址
-        if virtual_ipaddresses:
-            vip_block = KeepAlivedConfigBlock("virtual_ipaddress")
-            for vip in virtual_ipaddresses:
-                vip_block.add_param(KeepAlivedConfigParam("", vip))
-            vrrp_block.add_param(vip_block)
-            
-        # 添加可选参数
-        if nopreempt:
-            vrrp_block.add_param(KeepAlivedConfigParam("nopreempt"))
-            
-        if preempt_delay is not None:
-            vrrp_block.add_param(KeepAlivedConfigParam("preempt_delay", str(preempt_delay)))
-            
-        if garp_master_delay is not None:
-            vrrp_block.add_param(KeepAlivedConfigParam("garp_master_delay", str(garp_master_delay)))
-            
-        # 添加新增参数
-        if unicast_src_ip is not None:
-            vrrp_block.add_param(KeepAlivedConfigParam("unicast_src_ip", unicast_src_ip))
-            
-        if unicast_peer is not None:
-            unicast_peer_block = KeepAlivedConfigBlock("unicast_peer")
-            for peer in unicast_peer:
-                unicast_peer_block.add_param(KeepAlivedConfigParam("", peer))
-            vrrp_block.add_param(unicast_peer_block)
-            
-        if smtp_alert is not None:
-            smtp_alert_param = "smtp_alert" if smtp_alert else "no_smtp_alert"
-            vrrp_block.add_param(KeepAlivedConfigParam(smtp_alert_param))
+        # 检查虚拟路由器ID是否已在接口上被使用
+        error = self._check_router_id(instance_name, args["interface"], args["virtual_router_id"])
+        if error is not None:
+            return OperationResult.fail(error)
             
-        if notify_master is not None:
-            vrrp_block.add_param(KeepAlivedConfigParam("notify_master", notify_master))
-            
-        if notify_backup is not None:
-            vrrp_block.add_param(KeepAlivedConfigParam("notify_backup", notify_backup))
-            
-        if notify_fault is not None:
-            vrrp_block.add_param(KeepAlivedConfigParam("notify_fault", notify_fault))
+        # 创建VRRP实例块
+        vrrp_block = self._build_vrrp_block(instance_name, args, comments)
         
         # 添加到配置中
         self.config.params.append(vrrp_block)
+        self._track_vrrp_instance(vrrp_block)
         
         return OperationResult.ok(f"VRRP实例 '{instance_name}' 创建成功", vrrp_block)
 
+    @KeepAlivedConfigMetrics.timed("vrrp.create_from_template")
+    @KeepAlivedConfigRWLock.writing
     def create_from_template(self, template_name: str, instance_name: str, config: VRRPConfig = None, **kwargs) -> OperationResult:
         """
         从模板创建VRRP实例
@@ -342,24 +276,34 @@ class KeepAlivedConfigVRRP(KeepAlivedConfigBase):
                     kwargs[attr_name] = attr_value
         
         try:
-            # 使用模板创建VRRP实例配置
-            template_config = KeepAlivedConfigTemplates.from_template(template_name, instance_name, **kwargs)
-            
             # 检查是否已存在同名实例
             if self.get_vrrp_instance(instance_name) is not None:
                 return OperationResult.fail(f"VRRP实例 '{instance_name}' 已存在")
             
+            # 使用模板创建VRRP实例配置
+            template_config = KeepAlivedConfigTemplates.from_template(template_name, instance_name, **kwargs)
+            
             # 获取模板生成的VRRP块
             if template_config.params and isinstance(template_config.params[0], KeepAlivedConfigBlock):
                 vrrp_block = template_config.params[0]
+                error = self._check_router_id(
+                    instance_name,
+                    self._param_value(vrrp_block, "interface"),
+                    self._param_value(vrrp_block, "virtual_router_id"),
+                )
+                if error is not None:
+                    return OperationResult.fail(error)
                 # 添加到当前配置中
                 self.config.params.append(vrrp_block)
+                self._track_vrrp_instance(vrrp_block)
                 return OperationResult.ok(f"VRRP实例 '{instance_name}' 从模板 '{template_name}' 创建成功", vrrp_block)
             else:
                 return OperationResult.fail("模板未生成有效的VRRP实例配置")
         except Exception as e:
             return OperationResult.fail(f"从模板创建VRRP实例失败: {str(e)}", e)
 
+    @KeepAlivedConfigMetrics.timed("vrrp.get_vrrp_instance")
+    @KeepAlivedConfigRWLock.reading
     def get_vrrp_instance(self, instance_name: str) -> Optional[KeepAlivedConfigBlock]:
         """
         获取指定名称的VRRP实例
@@ -376,14 +320,10 @@ class KeepAlivedConfigVRRP(KeepAlivedConfigBase):
         if not isinstance(instance_name, str):
             raise KeepAlivedConfigTypeError(f"Instance name must be a string, got {type(instance_name)}")
             
-        for param in self.config.params:
-            if isinstance(param, KeepAlivedConfigBlock) and \
-               param.name.startswith("vrrp_instance") and \
-               param.name.endswith(instance_name):
-                return param
-                
-        return None
+        return self.config.params.find_one(f"vrrp_instance {instance_name}", KeepAlivedConfigBlock)
 
+    @KeepAlivedConfigMetrics.timed("vrrp.remove_vrrp_instance")
+    @KeepAlivedConfigRWLock.writing
     def remove_vrrp_instance(self, instance_name: str) -> OperationResult:
         """
         删除指定名称的VRRP实例
@@ -411,15 +351,16 @@ class KeepAlivedConfigVRRP(KeepAlivedConfigBase):
         if not isinstance(instance_name, str):
             raise KeepAlivedConfigTypeError("实例名称必须是字符串")
             
-        for i, param in enumerate(self.config.params):
-            if isinstance(param, KeepAlivedConfigBlock) and \
-               param.name.startswith("vrrp_instance") and \
-               param.name.endswith(instance_name):
-                self.config.params.pop(i)
-                return OperationResult.ok(f"VRRP实例 '{instance_name}' 删除成功")
+        vrrp_block = self.get_vrrp_instance(instance_name)
+        if vrrp_block is not None:
+            self.config.params.remove(vrrp_block)
+            self.config.indexes.remove_vrrp_instance(vrrp_block)
+            return OperationResult.ok(f"VRRP实例 '{instance_name}' 删除成功")
                 
         raise VRRPInstanceNotFoundError(f"VRRP实例 '{instance_name}' 不存在")
 
+    @KeepAlivedConfigMetrics.timed("vrrp.update_vrrp_instance")
+    @KeepAlivedConfigRWLock.writing
     def update_vrrp_instance(
         self,
         instance_name: str,
@@ -491,22 +432,614 @@ class KeepAlivedConfigVRRP(KeepAlivedConfigBase):
         if vrrp_block is None:
             raise VRRPInstanceNotFoundError(f"VRRP实例 '{instance_name}' 不存在")
             
+        args = {
+            "state": state,
+            "interface": interface,
+            "virtual_router_id": virtual_router_id,
+            "priority": priority,
+            "advert_int": advert_int,
+            "auth_type": auth_type,
+            "auth_pass": auth_pass,
+            "virtual_ipaddresses": virtual_ipaddresses,
+            "nopreempt": nopreempt,
+            "preempt_delay": preempt_delay,
+            "garp_master_delay": garp_master_delay,
+            "unicast_src_ip": unicast_src_ip,
+            "unicast_peer": unicast_peer,
+            "smtp_alert": smtp_alert,
+            "notify_master": notify_master,
+            "notify_backup": notify_backup,
+            "notify_fault": notify_fault,
+        }
+        
+        # 参数验证
+        error = self._validate_vrrp_update_args(args)
+        if error is not None:
+            return OperationResult.fail(error)
+            
+        # 更新后的(interface, virtual_router_id)不能与其他实例冲突
+        if interface is not None or virtual_router_id is not None:
+            error = self._check_router_id(
+                instance_name,
+                interface if interface is not None else self._param_value(vrrp_block, "interface"),
+                virtual_router_id if virtual_router_id is not None else self._param_value(vrrp_block, "virtual_router_id"),
+            )
+            if error is not None:
+                return OperationResult.fail(error)
+            
+        self._apply_vrrp_update(vrrp_block, args)
+            
+        return OperationResult.ok(f"VRRP实例 '{instance_name}' 更新成功")
+
+    @KeepAlivedConfigMetrics.timed("vrrp.create_vrrp_instances")
+    @KeepAlivedConfigRWLock.writing
+    def create_vrrp_instances(self, mapping: Dict[str, VRRPConfig]) -> OperationResult:
+        """
+        批量创建VRRP实例
+        
+        所有实例先统一合并默认值并验证，实例名称和(interface, virtual_router_id)冲突
+        通过一次遍历构建的集合检查（同时检查与现有实例以及批次内部的冲突），
+        全部通过后一次性添加到配置中。任何一个实例无效时不会创建任何实例。
+        
+        Args:
+            mapping (Dict[str, VRRPConfig]): 实例名称到VRRP配置对象的映射，值为None时使用默认值
+            
+        Returns:
+            OperationResult: 操作结果对象，成功时数据部分为按映射顺序排列的VRRP实例块列表，
+            失败时数据部分为实例名称到错误信息的字典
+            
+        Example:
+            ```python
+            result = vrrp_manager.create_vrrp_instances({
+                "VI_1": VRRPConfig(interface="eth0", virtual_router_id=51, virtual_ipaddresses=["10.0.0.1/24"]),
+                "VI_2": VRRPConfig(interface="eth0", virtual_router_id=52, virtual_ipaddresses=["10.0.0.2/24"]),
+            })
+            if not result:
+                for name, error in result.data.items():
+                    print(f"{name}: {error}")
+            ```
+        """
+        existing_names, router_ids = self._vrrp_instance_keys()
+        
+        issues = {}
+        resolved = []
+        for instance_name, config in mapping.items():
+            if config is not None and not isinstance(config, VRRPConfig):
+                issues[instance_name] = f"VRRP配置必须是VRRPConfig, got {type(config)}"
+                continue
+                
+            args = self._resolve_vrrp_args(config, {})
+            error = self._validate_vrrp_args(instance_name, args)
+            if error is None and instance_name in existing_names:
+                error = f"VRRP实例 '{instance_name}' 已存在"
+            if error is None:
+                error = self._claim_router_id(router_ids, instance_name, args["interface"], args["virtual_router_id"])
+            if error is not None:
+                issues[instance_name] = error
+                continue
+                
+            resolved.append((instance_name, args))
+            
+        if issues:
+            return self._bulk_failure("创建", issues)
+            
+        # 一次性添加到配置中
+        vrrp_blocks = [self._build_vrrp_block(instance_name, args) for instance_name, args in resolved]
+        self.config.params.extend(vrrp_blocks)
+        for vrrp_block in vrrp_blocks:
+            self._track_vrrp_instance(vrrp_block)
+        
+        return OperationResult.ok(f"成功创建 {len(vrrp_blocks)} 个VRRP实例", vrrp_blocks)
+
+    @KeepAlivedConfigMetrics.timed("vrrp.update_vrrp_instances")
+    @KeepAlivedConfigRWLock.writing
+    def update_vrrp_instances(self, mapping: Dict[str, Union[VRRPConfig, Dict[str, Any]]]) -> OperationResult:
+        """
+        批量更新VRRP实例
+        
+        所有实例先统一验证，并检查更新后的(interface, virtual_router_id)是否与其他实例冲突，
+        全部通过后才开始更新。任何一个实例无效时不会更新任何实例。
+        
+        Args:
+            mapping (Dict[str, Union[VRRPConfig, Dict[str, Any]]]): 实例名称到更新参数的映射。
+                字典的键与update_vrrp_instance的参数相同，只更新给出的参数；
+                VRRPConfig表示完整的目标配置，值为None的字段不更新，auth_pass为空时不更新认证配置
+            
+        Returns:
+            OperationResult: 操作结果对象，成功时数据部分为按映射顺序排列的VRRP实例块列表，
+            失败时数据部分为实例名称到错误信息的字典
+            
+        Example:
+            ```python
+            result = vrrp_manager.update_vrrp_instances({
+                "VI_1": {"priority": 150},
+                "VI_2": {"priority": 150, "state": "MASTER"},
+            })
+            ```
+        """
+        existing_names, router_ids = self._vrrp_instance_keys()
+        
+        issues = {}
+        updates = []
+        for instance_name, update in mapping.items():
+            vrrp_block = existing_names.get(instance_name)
+            if vrrp_block is None:
+                issues[instance_name] = f"VRRP实例 '{instance_name}' 不存在"
+                continue
+                
+            if isinstance(update, VRRPConfig):
+                args = self._config_update_args(update)
+            elif isinstance(update, dict):
+                unknown = [key for key in update if key not in self._VRRP_FIELDS]
+                if unknown:
+                    issues[instance_name] = f"未知参数: {', '.join(map(str, unknown))}"
+                    continue
+                args = update
+            else:
+                issues[instance_name] = f"更新参数必须是VRRPConfig或字典, got {type(update)}"
+                continue
+                
+            error = self._validate_vrrp_update_args(args)
+            if error is not None:
+                issues[instance_name] = error
+                continue
+                
+            updates.append((instance_name, vrrp_block, args))
+            
+        # 更新后的(interface, virtual_router_id)不能与其他实例冲突
+        if not issues:
+            updated_names = {instance_name for instance_name, _, _ in updates}
+            router_ids = {key: name for key, name in router_ids.items() if name not in updated_names}
+            for instance_name, vrrp_block, args in updates:
+                interface = args.get("interface")
+                if interface is None:
+                    interface = self._param_value(vrrp_block, "interface")
+                virtual_router_id = args.get("virtual_router_id")
+                if virtual_router_id is None:
+                    virtual_router_id = self._param_value(vrrp_block, "virtual_router_id")
+                error = self._claim_router_id(router_ids, instance_name, interface, virtual_router_id)
+                if error is not None:
+                    issues[instance_name] = error
+                    
+        if issues:
+            return self._bulk_failure("更新", issues)
+            
+        for _, vrrp_block, args in updates:
+            self._apply_vrrp_update(vrrp_block, args)
+            
+        return OperationResult.ok(
+            f"成功更新 {len(updates)} 个VRRP实例", [vrrp_block for _, vrrp_block, _ in updates]
+        )
+
+    @KeepAlivedConfigMetrics.timed("vrrp.list_vrrp_instances")
+    @KeepAlivedConfigRWLock.reading
+    def list_vrrp_instances(self) -> List[str]:
+        """
+        列出所有VRRP实例名称
+        
+        Returns:
+            List[str]: VRRP实例名称列表
+        """
+        instances = []
+        for param in self.config.params:
+            if isinstance(param, KeepAlivedConfigBlock) and param.name.startswith("vrrp_instance"):
+                # 提取实例名称 (格式: "vrrp_instance INSTANCE_NAME")
+                parts = param.name.split(" ", 1)
+                if len(parts) == 2:
+                    instances.append(parts[1])
+        return instances
+
+    @KeepAlivedConfigMetrics.timed("vrrp.allocate_vrid")
+    @KeepAlivedConfigRWLock.writing
+    def allocate_vrid(self, interface: str) -> OperationResult:
+        """
+        为网络接口分配一个空闲的虚拟路由器ID
+        
+        在接口已使用ID的位图（由配置索引维护，首次使用时一次遍历构建）和已分配ID的位图上
+        查找最小的空闲ID（1-255），耗时与VRRP实例数量无关。分配的ID在使用它创建实例、
+        或调用release_vrid之前不会被再次分配；实例删除后其ID自动变为空闲。
+        
+        Args:
+            interface (str): 网络接口
+            
+        Returns:
+            OperationResult: 操作结果对象，成功时数据部分为分配的虚拟路由器ID，
+            接口上没有空闲ID时返回失败结果
+            
+        Example:
+            ```python
+            result = vrrp_manager.allocate_vrid("eth1")
+            if result:
+                vrrp_manager.create_vrrp_instance("VI_10", interface="eth1", virtual_router_id=result.data)
+            ```
+            
+        Raises:
+            KeepAlivedConfigTypeError: 当网络接口不是字符串时
+        """
+        if not isinstance(interface, str):
+            raise KeepAlivedConfigTypeError(f"网络接口必须是字符串, got {type(interface)}")
+            
+        reserved = self._reserved_vrids.get(interface, 0)
+        free = self._VRID_MASK & ~(self.config.indexes.get_router_id_bitmap(interface) | reserved)
+        if not free:
+            return OperationResult.fail(f"接口 '{interface}' 上没有空闲的虚拟路由器ID")
+            
+        # 最低位的1即最小的空闲ID
+        virtual_router_id = (free & -free).bit_length() - 1
+        self._reserved_vrids[interface] = reserved | (1 << virtual_router_id)
+        return OperationResult.ok(
+            f"为接口 '{interface}' 分配虚拟路由器ID {virtual_router_id}", virtual_router_id
+        )
+
+    @KeepAlivedConfigMetrics.timed("vrrp.release_vrid")
+    @KeepAlivedConfigRWLock.writing
+    def release_vrid(self, interface: str, virtual_router_id: int) -> OperationResult:
+        """
+        释放allocate_vrid分配但尚未使用的虚拟路由器ID
+        
+        已被VRRP实例使用的ID不能释放，删除实例后其ID自动变为空闲。
+        
+        Args:
+            interface (str): 网络接口
+            virtual_router_id (int): 虚拟路由器ID
+            
+        Returns:
+            OperationResult: 操作结果对象
+            
+        Raises:
+            KeepAlivedConfigTypeError: 当参数类型错误时
+        """
+        if not isinstance(interface, str):
+            raise KeepAlivedConfigTypeError(f"网络接口必须是字符串, got {type(interface)}")
+        if not isinstance(virtual_router_id, int):
+            raise KeepAlivedConfigTypeError(f"虚拟路由器ID必须是整数, got {type(virtual_router_id)}")
+            
+        reserved = self._reserved_vrids.get(interface, 0)
+        bit = 1 << virtual_router_id if 0 <= virtual_router_id <= 255 else 0
+        if reserved & bit:
+            reserved &= ~bit
+            if reserved:
+                self._reserved_vrids[interface] = reserved
+            else:
+                del self._reserved_vrids[interface]
+            return OperationResult.ok(f"接口 '{interface}' 上的虚拟路由器ID {virtual_router_id} 已释放")
+            
+        owner = self.config.indexes.get_vrrp_instance_by_router_id(interface, virtual_router_id)
+        if owner is not None:
+            return OperationResult.fail(
+                f"虚拟路由器ID {virtual_router_id} 在接口 '{interface}' 上被VRRP实例 '{owner}' 使用，请先删除该实例"
+            )
+        return OperationResult.fail(f"接口 '{interface}' 上的虚拟路由器ID {virtual_router_id} 未被分配")
+
+    def _vrrp_instance_keys(self) -> tuple:
+        """
+        内部方法：一次遍历获取现有VRRP实例的名称和(interface, virtual_router_id)
+        
+        Returns:
+            tuple: (实例名称到VRRP实例块的字典, (interface, virtual_router_id)到实例名称的字典)
+        """
+        names = {}
+        router_ids = {}
+        for param in self.config.params:
+            if isinstance(param, KeepAlivedConfigBlock) and param.name.startswith("vrrp_instance "):
+                instance_name = param.name.split(" ", 1)[1]
+                names.setdefault(instance_name, param)
+                interface = self._param_value(param, "interface")
+                virtual_router_id = self._param_value(param, "virtual_router_id")
+                if interface is not None and virtual_router_id is not None:
+                    router_ids.setdefault((interface, str(virtual_router_id)), instance_name)
+        return names, router_ids
+
+    def _param_value(self, block: KeepAlivedConfigBlock, param_name: str) -> Optional[str]:
+        """
+        内部方法：获取块中指定参数的值，参数不存在时返回None
+        """
+        param = self._get_param(block, param_name)
+        return param.value if param is not None else None
+
+    @staticmethod
+    def _claim_router_id(
+        router_ids: Dict[tuple, str],
+        instance_name: str,
+        interface: str,
+        virtual_router_id: Union[int, str]
+    ) -> Optional[str]:
+        """
+        内部方法：检查并占用接口上的虚拟路由器ID
+        
+        Returns:
+            Optional[str]: 冲突时返回错误信息，否则返回None
+        """
+        key = (interface, str(virtual_router_id))
+        owner = router_ids.get(key)
+        if owner is not None and owner != instance_name:
+            return f"虚拟路由器ID {virtual_router_id} 在接口 '{interface}' 上已被VRRP实例 '{owner}' 使用"
+        router_ids[key] = instance_name
+        return None
+
+    def _check_router_id(
+        self,
+        instance_name: str,
+        interface: Optional[str],
+        virtual_router_id: Union[int, str, None]
+    ) -> Optional[str]:
+        """
+        内部方法：通过配置索引检查接口上的虚拟路由器ID是否已被其他实例使用
+        
+        Returns:
+            Optional[str]: 冲突时返回错误信息，否则返回None
+        """
+        if interface is None or virtual_router_id is None:
+            return None
+        owner = self.config.indexes.get_vrrp_instance_by_router_id(interface, virtual_router_id)
+        if owner is not None and owner != instance_name:
+            return f"虚拟路由器ID {virtual_router_id} 在接口 '{interface}' 上已被VRRP实例 '{owner}' 使用"
+        return None
+
+    def _track_vrrp_instance(self, vrrp_block: KeepAlivedConfigBlock):
+        """
+        内部方法：记录新添加到配置中的VRRP实例（更新索引并消耗已分配的ID）
+        """
+        self.config.indexes.add_vrrp_instance(vrrp_block)
+        self._consume_vrid(vrrp_block)
+
+    def _consume_vrid(self, vrrp_block: KeepAlivedConfigBlock):
+        """
+        内部方法：实例使用了已分配的ID后，该ID不再作为保留ID，实例删除后即可重新分配
+        """
+        if not self._reserved_vrids:
+            return
+        interface = self._param_value(vrrp_block, "interface")
+        reserved = self._reserved_vrids.get(interface)
+        if not reserved:
+            return
+        try:
+            virtual_router_id = int(self._param_value(vrrp_block, "virtual_router_id"))
+        except (TypeError, ValueError):
+            return
+        if 0 <= virtual_router_id <= 255:
+            reserved &= ~(1 << virtual_router_id)
+            if reserved:
+                self._reserved_vrids[interface] = reserved
+            else:
+                del self._reserved_vrids[interface]
+
+    @staticmethod
+    def _config_update_args(config: VRRPConfig) -> Dict[str, Any]:
+        """
+        内部方法：将VRRP配置对象转换为更新参数
+        """
+        args = {
+            key: value for key, value in dataclasses.asdict(config).items() if value is not None
+        }
+        # 与创建时一致，auth_pass为空时不处理认证配置
+        if not config.auth_pass:
+            args.pop("auth_type", None)
+            args.pop("auth_pass", None)
+        return args
+
+    @staticmethod
+    def _bulk_failure(action: str, issues: Dict[str, str]) -> OperationResult:
+        """
+        内部方法：创建批量操作的失败结果
+        """
+        result = OperationResult.fail(
+            f"批量{action}VRRP实例失败，{len(issues)} 个实例无效，未做任何修改"
+        )
+        result.data = issues
+        return result
+
+    def _resolve_vrrp_args(self, config: Optional[VRRPConfig], args: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        内部方法：合并显式参数、配置对象和默认值，得到创建VRRP实例所需的完整参数
+        
+        Args:
+            config (Optional[VRRPConfig]): VRRP配置对象
+            args (Dict[str, Any]): 显式传入的参数，值为None表示未指定
+            
+        Returns:
+            Dict[str, Any]: 合并后的参数
+        """
+        args = {field_name: args.get(field_name) for field_name in self._VRRP_FIELDS}
+        if config is not None:
+            # 使用配置对象的值作为默认值
+            for field_name in self._VRRP_FIELDS:
+                if args.get(field_name) is None:
+                    args[field_name] = getattr(config, field_name)
+        else:
+            # 设置默认值
+            for field_name, default in self._VRRP_DEFAULTS.items():
+                if args.get(field_name) is None:
+                    args[field_name] = default
+                    
+        if args["virtual_ipaddresses"] is None:
+            args["virtual_ipaddresses"] = []
+        return args
+
+    def _validate_vrrp_args(self, instance_name: str, args: Dict[str, Any]) -> Optional[str]:
+        """
+        内部方法：验证创建VRRP实例的参数
+        
+        Returns:
+            Optional[str]: 错误信息，验证通过时返回None
+        """
+        try:
+            KeepAlivedConfigValidator.validate_string(instance_name, "实例名称", allow_empty=False)
+            KeepAlivedConfigValidator.validate_choice(args["state"], "状态", ["MASTER", "BACKUP"])
+            KeepAlivedConfigValidator.validate_string(args["interface"], "网络接口", allow_empty=False)
+            KeepAlivedConfigValidator.validate_integer_in_range(args["virtual_router_id"], "虚拟路由器ID", 0, 255)
+            KeepAlivedConfigValidator.validate_integer_in_range(args["priority"], "优先级", 0, 255)
+            KeepAlivedConfigValidator.validate_positive_integer(args["advert_int"], "广播间隔")
+        except (KeepAlivedConfigTypeError, VRRPParameterError) as e:
+            return str(e)
+            
+        if args["auth_type"] not in ["PASS", "AH"]:
+            return "认证类型必须是 'PASS' 或 'AH'"
+        return None
+
+    def _validate_vrrp_update_args(self, args: Dict[str, Any]) -> Optional[str]:
+        """
+        内部方法：验证更新VRRP实例的参数
+        
+        Returns:
+            Optional[str]: 错误信息，验证通过时返回None
+        """
+        state = args.get("state")
+        virtual_router_id = args.get("virtual_router_id")
+        priority = args.get("priority")
+        advert_int = args.get("advert_int")
+        auth_type = args.get("auth_type")
+        
         # 参数验证
         if state is not None and state not in ["MASTER", "BACKUP"]:
-            return OperationResult.fail("状态必须是 'MASTER' 或 'BACKUP'")
+            return "状态必须是 'MASTER' 或 'BACKUP'"
             
         if virtual_router_id is not None and not (0 <= virtual_router_id <= 255):
-            return OperationResult.fail("虚拟路由器ID必须是0到255之间的整数")
+            return "虚拟路由器ID必须是0到255之间的整数"
             
         if priority is not None and not (0 <= priority <= 255):
-            return OperationResult.fail("优先级必须是0到255之间的整数")
+            return "优先级必须是0到255之间的整数"
             
         if advert_int is not None and advert_int <= 0:
-            return OperationResult.fail("广播间隔必须是正整数")
+            return "广播间隔必须是正整数"
             
         if auth_type is not None and auth_type not in ["PASS", "AH"]:
-            return OperationResult.fail("认证类型必须是 'PASS' 或 'AH'")
+            return "认证类型必须是 'PASS' 或 'AH'"
+        return None
+
+    def _build_vrrp_block(
+        self,
+        instance_name: str,
+        args: Dict[str, Any],
+        comments: Optional[List[KeepAlivedConfigComment]] = None
+    ) -> KeepAlivedConfigBlock:
+        """
+        内部方法：使用已验证的参数创建VRRP实例块
+        
+        Args:
+            instance_name (str): 实例名称
+            args (Dict[str, Any]): _resolve_vrrp_args返回的完整参数
+            comments (Optional[List[KeepAlivedConfigComment]]): 注释列表
+            
+        Returns:
+            KeepAlivedConfigBlock: VRRP实例块
+        """
+        return self._build_vrrp_block_from_fields(instance_name, comments, **args)
+
+    def _build_vrrp_block_from_fields(
+        self,
+        instance_name: str,
+        comments: Optional[List[KeepAlivedConfigComment]],
+        state: str = None,
+        interface: str = None,
+        virtual_router_id: int = None,
+        priority: int = None,
+        advert_int: int = None,
+        auth_type: str = None,
+        auth_pass: str = None,
+        virtual_ipaddresses: List[str] = None,
+        nopreempt: bool = None,
+        preempt_delay: int = None,
+        garp_master_delay: int = None,
+        unicast_src_ip: str = None,
+        unicast_peer: List[str] = None,
+        smtp_alert: bool = None,
+        notify_master: str = None,
+        notify_backup: str = None,
+        notify_fault: str = None
+    ) -> KeepAlivedConfigBlock:
+        # 创建VRRP实例块
+        vrrp_block = KeepAlivedConfigBlock("vrrp_instance", instance_name, comments or [])
+        
+        # 添加基本参数
+        vrrp_block.add_param(KeepAlivedConfigParam("state", state))
+        vrrp_block.add_param(KeepAlivedConfigParam("interface", interface))
+        vrrp_block.add_param(KeepAlivedConfigParam("virtual_router_id", str(virtual_router_id)))
+        vrrp_block.add_param(KeepAlivedConfigParam("priority", str(priority)))
+        vrrp_block.add_param(KeepAlivedConfigParam("advert_int", str(advert_int)))
+        
+        # 添加认证配置
+        if auth_pass:
+            auth_block = KeepAlivedConfigBlock("authentication")
+            auth_block.add_param(KeepAlivedConfigParam("auth_type", auth_type))
+            auth_block.add_param(KeepAlivedConfigParam("auth_pass", auth_pass))
+            vrrp_block.add_param(auth_block)
+        
+        # 添加虚拟IP地址
+        if virtual_ipaddresses:
+            vip_block = KeepAlivedConfigBlock("virtual_ipaddress")
+            for vip in virtual_ipaddresses:
+                vip_block.add_param(KeepAlivedConfigParam("", vip))
+            vrrp_block.add_param(vip_block)
+            
+        # 添加可选参数
+        if nopreempt:
+            vrrp_block.add_param(KeepAlivedConfigParam("nopreempt"))
+            
+        if preempt_delay is not None:
+            vrrp_block.add_param(KeepAlivedConfigParam("preempt_delay", str(preempt_delay)))
+            
+        if garp_master_delay is not None:
+            vrrp_block.add_param(KeepAlivedConfigParam("garp_master_delay", str(garp_master_delay)))
+            
+        # 添加新增参数
+        if unicast_src_ip is not None:
+            vrrp_block.add_param(KeepAlivedConfigParam("unicast_src_ip", unicast_src_ip))
+            
+        if unicast_peer is not None:
+            unicast_peer_block = KeepAlivedConfigBlock("unicast_peer")
+            for peer in unicast_peer:
+                unicast_peer_block.add_param(KeepAlivedConfigParam("", peer))
+            vrrp_block.add_param(unicast_peer_block)
+            
+        if smtp_alert is not None:
+            smtp_alert_param = "smtp_alert" if smtp_alert else "no_smtp_alert"
+            vrrp_block.add_param(KeepAlivedConfigParam(smtp_alert_param))
+            
+        if notify_master is not None:
+            vrrp_block.add_param(KeepAlivedConfigParam("notify_master", notify_master))
+            
+        if notify_backup is not None:
+            vrrp_block.add_param(KeepAlivedConfigParam("notify_backup", notify_backup))
             
+        if notify_fault is not None:
+            vrrp_block.add_param(KeepAlivedConfigParam("notify_fault", notify_fault))
+        
+        return vrrp_block
+
+    def _apply_vrrp_update(self, vrrp_block: KeepAlivedConfigBlock, args: Dict[str, Any]):
+        """
+        内部方法：将已验证的更新参数应用到VRRP实例块
+        
+        Args:
+            vrrp_block (KeepAlivedConfigBlock): VRRP实例块
+            args (Dict[str, Any]): 更新参数，值为None表示不更新
+        """
+        self._apply_vrrp_update_fields(vrrp_block, **args)
+        self.config.indexes.update_vrrp_instance(vrrp_block)
+        self._consume_vrid(vrrp_block)
+
+    def _apply_vrrp_update_fields(
+        self,
+        vrrp_block: KeepAlivedConfigBlock,
+        state: str = None,
+        interface: str = None,
+        virtual_router_id: int = None,
+        priority: int = None,
+        advert_int: int = None,
+        auth_type: str = None,
+        auth_pass: str = None,
+        virtual_ipaddresses: List[str] = None,
+        nopreempt: bool = None,
+        preempt_delay: int = None,
+        garp_master_delay: int = None,
+        unicast_src_ip: str = None,
+        unicast_peer: List[str] = None,
+        smtp_alert: bool = None,
+        notify_master: str = None,
+        notify_backup: str = None,
+        notify_fault: str = None
+    ):
         # 更新参数
         if state is not None:
             self._update_param(vrrp_block, "state", state)
@@ -600,24 +1133,6 @@ class KeepAlivedConfigVRRP(KeepAlivedConfigBase):
             
         if notify_fault is not None:
             self._update_param(vrrp_block, "notify_fault", notify_fault)
-            
-        return OperationResult.ok(f"VRRP实例 '{instance_name}' 更新成功")
-
-    def list_vrrp_instances(self) -> List[str]:
-        """
-        列出所有VRRP实例名称
-        
-        Returns:
-            List[str]: VRRP实例名称列表
-        """
-        instances = []
-        for param in self.config.params:
-            if isinstance(param, KeepAlivedConfigBlock) and param.name.startswith("vrrp_instance"):
-                # 提取实例名称 (格式: "vrrp_instance INSTANCE_NAME")
-                parts = param.name.split(" ", 1)
-                if len(parts) == 2:
-                    instances.append(parts[1])
-        return instances
 
     def _get_param(self, block: KeepAlivedConfigBlock, param_name: str) -> Optional[KeepAlivedConfigParam]:
         """
@@ -0,0 +1,140 @@
+import os
+import sys
+import io
+import tempfile
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.append(SRC_DIR)
+
+from keepalived_config.keepalived_config import KeepAlivedConfig, _AtomicFileWriter
+from keepalived_config.keepalived_config_parser import KeepAlivedConfigParser
+from keepalived_config.keepalived_config_param import KeepAlivedConfigParam
+
+SAMPLE_FILE = os.path.join(os.path.dirname(__file__), "..", "samples", "keepalived.conf")
+
+
+def test_write_to():
+    config = KeepAlivedConfigParser().parse_file(SAMPLE_FILE)
+    expected = "".join(item.to_str() + "\n" for item in config.params)
+
+    buffer = io.StringIO()
+    config.write_to(buffer)
+    assert buffer.getvalue() == expected
+    assert config.to_str() == expected
+    assert list(config.iter_lines()) == expected.split("\n")[:-1]
+
+
+def test_save(tmp_path):
+    config = KeepAlivedConfigParser().parse_file(SAMPLE_FILE)
+    target = tmp_path / "keepalived.conf"
+
+    config.save(str(target))
+    assert target.read_text() == config.to_str()
+
+
+def test_empty_config():
+    assert KeepAlivedConfig().to_str() == ""
+    assert list(KeepAlivedConfig().iter_lines()) == []
+
+
+def test_atomic_save(tmp_path):
+    config = KeepAlivedConfigParser().parse_file(SAMPLE_FILE)
+    target = tmp_path / "keepalived.conf"
+    target.write_text("old\n")
+    os.chmod(target, 0o640)
+
+    assert config.save(str(target), atomic=True, backup=True) is True
+    assert target.read_text() == config.to_str()
+    assert (tmp_path / "keepalived.conf.bak").read_text() == "old\n"
+    assert os.stat(target).st_mode & 0o777 == 0o640
+    assert sorted(os.listdir(tmp_path)) == ["keepalived.conf", "keepalived.conf.bak"]
+
+
+def test_atomic_save_skips_unchanged(tmp_path, monkeypatch):
+    config = KeepAlivedConfigParser().parse_file(SAMPLE_FILE)
+    target = tmp_path / "keepalived.conf"
+    config.save(str(target), atomic=True)
+    inode = os.stat(target).st_ino
+
+    assert config.save(str(target), atomic=True) is False
+    assert os.stat(target).st_ino == inode
+
+    # unchanged files are compared before anything is written
+    def fail(*args, **kwargs):
+        raise AssertionError("unchanged file written")
+
+    monkeypatch.setattr(tempfile, "mkstemp", fail)
+    monkeypatch.setattr(os, "fsync", fail)
+    assert config.save(str(target), atomic=True) is False
+    monkeypatch.undo()
+
+    config.params.append(KeepAlivedConfigParam("changed", "1"))
+    assert config.save(str(target), atomic=True) is True
+    assert os.stat(target).st_ino != inode
+    assert os.listdir(tmp_path) == ["keepalived.conf"]
+
+
+def test_atomic_save_compares_while_rendering(tmp_path, monkeypatch):
+    # small copy chunks, the matching prefix is copied in several reads
+    monkeypatch.setattr(_AtomicFileWriter, "_COPY_CHUNK_SIZE", 7)
+    config = KeepAlivedConfigParser().parse_file(SAMPLE_FILE)
+    target = tmp_path / "keepalived.conf"
+    expected = config.to_str()
+
+    # differs at the end, in the middle, the target is longer or shorter
+    for old in (
+        expected[:-2] + "x\n",
+        expected[: len(expected) // 2] + "changed" + expected[len(expected) // 2 :],
+        expected + "extra 1\n",
+        expected[:-10],
+        "",
+    ):
+        target.write_text(old)
+        assert config.save(str(target), atomic=True) is True
+        assert target.read_text() == expected
+        assert os.listdir(tmp_path) == ["keepalived.conf"]
+    assert config.save(str(target), atomic=True) is False
+
+
+def test_atomic_save_through_symlink(tmp_path):
+    config = KeepAlivedConfigParser().parse_file(SAMPLE_FILE)
+    target = tmp_path / "real.conf"
+    target.write_text("old\n")
+    link = tmp_path / "keepalived.conf"
+    link.symlink_to(target)
+
+    config.save(str(link), atomic=True)
+    assert link.is_symlink()
+    assert target.read_text() == config.to_str()
+
+
+def test_save_after_edit(tmp_path):
+    config = KeepAlivedConfigParser().parse_string(
+        "virtual_server 10.0.0.1 80 {\n"
+        "    real_server 10.0.0.2 80 {\n"
+        "        weight 1\n"
+        "    }\n"
+        "}\n"
+        "virtual_server 10.0.0.3 80 {\n"
+        "}"
+    )
+    target = tmp_path / "keepalived.conf"
+    config.save(str(target))
+
+    config.params[0].params[0].params[0].value = "2"
+    config.save(str(target))
+
+    assert target.read_text() == (
+        "virtual_server 10.0.0.1 80 {\n"
+        "    real_server 10.0.0.2 80 {\n"
+        "        weight 2\n"
+        "    }\n"
+        "}\n"
+        "virtual_server 10.0.0.3 80 {\n"
+        "}\n"
+    )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,280 @@
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.append(SRC_DIR)
+
+from keepalived_config.keepalived_config_async import AsyncKeepAlivedConfigManager
+from keepalived_config.keepalived_config_manager import KeepAlivedConfigManager
+from keepalived_config.keepalived_config_exceptions import (
+    ConfigParseError,
+    ConfigTransactionError,
+    VirtualServerNotFoundError,
+)
+
+
+CONFIG = """# main config
+global_defs {
+    router_id LB1
+}
+
+vrrp_instance VI_1 {
+    state MASTER
+    interface eth0
+    virtual_router_id 51
+    priority 100
+    virtual_ipaddress {
+        10.0.0.100/24
+    }
+}
+
+include conf.d/*.conf
+
+virtual_server 10.0.0.100 80 {
+    delay_loop 6
+    lb_algo rr
+    lb_kind DR
+    protocol TCP
+    real_server 10.0.1.1 80 {
+        weight 1 # primary
+    }
+}
+"""
+
+
+def write_config(tmp_path):
+    conf_dir = tmp_path / "conf.d"
+    conf_dir.mkdir()
+    (conf_dir / "vs.conf").write_text(
+        "virtual_server 10.0.0.200 443 {\n    delay_loop 6\n    lb_algo rr\n    lb_kind NAT\n    protocol TCP\n}\n"
+    )
+    config_file = tmp_path / "keepalived.conf"
+    config_file.write_text(CONFIG)
+    return str(config_file)
+
+
+class RecordingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.calls = 0
+
+    def submit(self, fn, *args, **kwargs):
+        self.calls += 1
+        return super().submit(fn, *args, **kwargs)
+
+
+def test_load_and_save_like_the_sync_manager(tmp_path):
+    config_file = write_config(tmp_path)
+    manager = KeepAlivedConfigManager()
+    expected = manager.load_config(config_file, resolve_includes=True)
+
+    async def run():
+        with RecordingExecutor() as executor:
+            async_manager = AsyncKeepAlivedConfigManager(executor=executor)
+            result = await async_manager.load_config(config_file, resolve_includes=True)
+            assert result.success == expected.success and result.message == expected.message
+            assert await async_manager.to_str() == manager.config.to_str()
+            assert async_manager.config.include_files == manager.config.include_files
+            assert await async_manager.vrrp_instances() == manager.vrrp_instances
+            assert await async_manager.virtual_servers() == manager.virtual_servers
+            assert (await async_manager.validate()).success == manager.validate().success
+
+            result = await async_manager.save_config(str(tmp_path / "async.conf"))
+            # parsing, rendering and writing ran in the executor
+            assert executor.calls >= 3
+            return result
+
+    result = asyncio.run(run())
+    assert result.data
+    manager.save_config(str(tmp_path / "sync.conf"))
+    assert (tmp_path / "async.conf").read_text() == (tmp_path / "sync.conf").read_text()
+
+    with pytest.raises(ConfigParseError):
+        manager.load_config(str(tmp_path / "missing.conf"))
+    with pytest.raises(ConfigParseError):
+        asyncio.run(AsyncKeepAlivedConfigManager().load_config(str(tmp_path / "missing.conf")))
+
+
+def test_parse_in_process_pool(tmp_path):
+    config_file = write_config(tmp_path)
+    expected = KeepAlivedConfigManager()
+    expected.load_config(config_file, resolve_includes=True)
+
+    async def run():
+        with ProcessPoolExecutor(max_workers=1) as processes:
+            async_manager = AsyncKeepAlivedConfigManager(process_executor=processes, process_min_bytes=0)
+            await async_manager.load_config(config_file, resolve_includes=True)
+            return async_manager.config
+
+    config = asyncio.run(run())
+    assert config.to_str() == expected.config.to_str()
+    assert config.config_file == expected.config.config_file
+    assert config.include_files == expected.config.include_files
+    assert [item.source_file for item in config.params] == [
+        item.source_file for item in expected.config.params
+    ]
+
+
+def test_methods_are_serialized_coroutines():
+    async def run():
+        manager = AsyncKeepAlivedConfigManager()
+        vs = manager.virtual_server
+        await vs.create_virtual_server("10.0.0.1", 80)
+
+        inside = 0
+        overlaps = []
+        original = manager.manager.virtual_server.add_real_server
+
+        def add_real_server(*args, **kwargs):
+            nonlocal inside
+            inside += 1
+            overlaps.append(inside)
+            try:
+                return original(*args, **kwargs)
+            finally:
+                inside -= 1
+
+        manager.manager.virtual_server.add_real_server = add_real_server
+        results = await asyncio.gather(
+            *(vs.add_real_server("10.0.0.1", 80, f"10.0.1.{i}", 80) for i in range(1, 21)),
+            manager.save_config(os.devnull),
+        )
+        assert all(results)
+        assert max(overlaps) == 1
+        assert len((await vs.list_real_servers("10.0.0.1", 80)).data) == 20
+
+        # same exceptions as the sync manager
+        with pytest.raises(VirtualServerNotFoundError):
+            await vs.add_real_server("10.0.0.2", 80, "10.0.1.1", 80)
+
+    asyncio.run(run())
+
+
+def test_transaction():
+    async def run():
+        manager = AsyncKeepAlivedConfigManager()
+        vs = manager.virtual_server
+        before = await manager.to_str()
+        saved = []
+
+        # the lock is reentrant for the task running the transaction
+        with pytest.raises(VirtualServerNotFoundError):
+            async with manager.transaction():
+                await vs.create_virtual_server("10.0.0.1", 80)
+                await vs.add_real_server("10.0.0.2", 80, "10.0.1.1", 80)
+        assert await manager.to_str() == before
+
+        async def save_hook(changes):
+            await asyncio.sleep(0)
+            saved.append(changes)
+
+        async with manager.transaction(save_hook=save_hook) as tx:
+            await vs.create_virtual_server("10.0.0.1", 80)
+            with pytest.raises(ConfigTransactionError):
+                async with manager.transaction(save_hook=save_hook):
+                    pass
+            with pytest.raises(RuntimeError):
+                async with manager.transaction():
+                    await vs.add_real_server("10.0.0.1", 80, "10.0.1.1", 80)
+                    raise RuntimeError("savepoint")
+        assert saved == [tx.changes]
+        assert [change.name for change in tx.changes] == ["virtual_server 10.0.0.1 80"]
+        assert (await vs.list_real_servers("10.0.0.1", 80)).data == []
+
+        # child tasks created inside the transaction share its lock
+        async with manager.transaction():
+            await asyncio.wait_for(
+                asyncio.gather(
+                    vs.add_real_server("10.0.0.1", 80, "10.0.1.2", 80),
+                    vs.add_real_server("10.0.0.1", 80, "10.0.1.3", 80),
+                ),
+                timeout=2,
+            )
+        assert len((await vs.list_real_servers("10.0.0.1", 80)).data) == 2
+
+        def failing_hook(changes):
+            raise OSError("save failed")
+
+        with pytest.raises(OSError):
+            async with manager.transaction(save_hook=failing_hook):
+                await vs.remove_virtual_server("10.0.0.1", 80)
+        assert await manager.virtual_servers() == ["10.0.0.1 80"]
+
+    asyncio.run(run())
+
+
+def test_child_tasks_of_a_lock_scope():
+    async def run():
+        manager = AsyncKeepAlivedConfigManager()
+        vs = manager.virtual_server
+        await vs.create_virtual_server("10.0.0.1", 80)
+        order = []
+
+        async def hold(name):
+            async with manager.locked():
+                order.append(f"{name}-in")
+                await asyncio.sleep(0.01)
+                order.append(f"{name}-out")
+
+        # a task that outlives the scope it was created in waits for the lock again
+        async with manager.locked():
+            background = asyncio.create_task(hold("bg"))
+        other = asyncio.create_task(hold("other"))
+        await asyncio.gather(background, other)
+        assert order in (
+            ["bg-in", "bg-out", "other-in", "other-out"],
+            ["other-in", "other-out", "bg-in", "bg-out"],
+        )
+
+        # children of a scope rejoin it one after another, a save in the thread pool
+        # does not overlap the edits of its siblings
+        inside = 0
+        overlaps = []
+
+        def counted(func, delay=0):
+            def call(*args, **kwargs):
+                nonlocal inside
+                inside += 1
+                overlaps.append(inside)
+                try:
+                    # keep the save in the thread pool long enough for an overlap to show
+                    time.sleep(delay)
+                    return func(*args, **kwargs)
+                finally:
+                    inside -= 1
+            return call
+
+        manager.manager.save_config = counted(manager.manager.save_config, 0.02)
+        manager.manager.virtual_server.add_real_server = counted(manager.manager.virtual_server.add_real_server)
+        async with manager.transaction():
+            await asyncio.wait_for(
+                asyncio.gather(
+                    manager.save_config(os.devnull),
+                    *(vs.add_real_server("10.0.0.1", 80, f"10.0.1.{i}", 80) for i in range(1, 11)),
+                    manager.save_config(os.devnull),
+                ),
+                timeout=5,
+            )
+        assert max(overlaps) == 1
+        assert len((await vs.list_real_servers("10.0.0.1", 80)).data) == 10
+
+    asyncio.run(run())
+
+
+def test_auto_save(tmp_path):
+    target = tmp_path / "keepalived.conf"
+
+    async def run():
+        async with AsyncKeepAlivedConfigManager(auto_save_path=str(target)) as manager:
+            await manager.vrrp.create_vrrp_instance("VI_1", "MASTER", "eth0", 51, 100)
+
+    asyncio.run(run())
+    assert "vrrp_instance VI_1 {" in target.read_text()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -112,3 +112,62 @@ def test_to_str():
         + f"{KeepAlivedConfigConstants.get_indent(1)}mykey myvalue\n"
         + "}"
     )
+
+
+def test_iter_lines_and_write_to():
+    import io
+
+    block = KeepAlivedConfigBlock("virtual_server", "10.0.0.1 80")
+    block.add_comment(KeepAlivedConfigComment("server"))
+    block.add_param(KeepAlivedConfigParam("lb_kind", "DR"))
+    block.add_param(KeepAlivedConfigParam("", ""))
+    real_server = KeepAlivedConfigBlock("real_server", "10.0.0.2 80")
+    real_server.add_param(KeepAlivedConfigParam("weight", "1"))
+    block.add_param(real_server)
+
+    lines = list(block.iter_lines(1))
+    assert lines[0] == f"{KeepAlivedConfigConstants.get_indent(1)}# server"
+    assert lines[1] == f"{KeepAlivedConfigConstants.get_indent(1)}virtual_server 10.0.0.1 80 {{"
+    assert lines[3] == ""
+    assert "\n".join(lines) == block.to_str(1)
+
+    buffer = io.StringIO()
+    block.write_to(buffer, 1)
+    assert buffer.getvalue() == block.to_str(1)
+
+
+def test_dirty_tracking():
+    virtual_server = KeepAlivedConfigBlock("virtual_server", "10.0.0.1 80")
+    real_server = KeepAlivedConfigBlock("real_server", "10.0.0.2 80")
+    weight = KeepAlivedConfigParam("weight", "1")
+    real_server.add_param(weight)
+    other = KeepAlivedConfigBlock("real_server", "10.0.0.3 80")
+    virtual_server.add_param(real_server)
+    virtual_server.add_param(other)
+    assert virtual_server.dirty
+
+    rendered = virtual_server.to_str()
+    assert not virtual_server.dirty and not real_server.dirty and not other.dirty
+    assert virtual_server.to_str() is rendered
+
+    # reading comments changes nothing
+    assert weight.comments == []
+    assert not virtual_server.dirty
+
+    weight.value = "5"
+    assert real_server.dirty and virtual_server.dirty
+    assert not other.dirty
+    assert "weight 5" in virtual_server.to_str()
+
+    virtual_server.params.remove(other)
+    assert virtual_server.dirty
+    assert "10.0.0.3" not in virtual_server.to_str()
+
+    real_server.comments.append(KeepAlivedConfigComment("changed"))
+    assert "# changed" in virtual_server.to_str()
+    real_server.comments = []
+    assert "# changed" not in virtual_server.to_str()
+
+    # the cached text is only reused for the same indent level
+    assert virtual_server.to_str(1).startswith(KeepAlivedConfigConstants.get_indent(1))
+
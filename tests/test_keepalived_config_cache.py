@@ -0,0 +1,124 @@
+import os
+import sys
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.append(SRC_DIR)
+
+from keepalived_config.keepalived_config_cache import KeepAlivedConfigParseCache
+from keepalived_config.keepalived_config_parser import KeepAlivedConfigParser
+from keepalived_config.keepalived_config_exceptions import (
+    KeepAlivedConfigValueError,
+    KeepAlivedConfigTypeError,
+)
+
+CONFIG = "global_defs {\n    router_id LVS_1\n}\nvirtual_server 10.0.0.1 80 {\n    lb_kind DR\n}\n"
+
+
+def parse(cache, path, **kwargs):
+    return KeepAlivedConfigParser(cache=cache).parse_file(str(path), **kwargs)
+
+
+def test_invalid_cache(tmp_path):
+    with pytest.raises(KeepAlivedConfigTypeError):
+        KeepAlivedConfigParseCache(None)
+
+    with pytest.raises(KeepAlivedConfigValueError):
+        KeepAlivedConfigParseCache(str(tmp_path), max_bytes=0)
+
+
+def test_cache_hit_and_miss(tmp_path):
+    config_file = tmp_path / "keepalived.conf"
+    config_file.write_text(CONFIG)
+    cache = KeepAlivedConfigParseCache(str(tmp_path / "cache"))
+
+    first = parse(cache, config_file)
+    second = parse(cache, config_file)
+
+    assert [item.to_str() for item in second.params] == [
+        item.to_str() for item in first.params
+    ]
+    assert [item.to_str() for item in first.params] == [
+        item.to_str() for item in KeepAlivedConfigParser().parse_file(str(config_file)).params
+    ]
+    assert second.params[0] is not first.params[0]
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+
+    # keep_empty_lines is part of the key
+    parse(cache, config_file, keep_empty_lines=False)
+    assert cache.stats()["misses"] == 2
+
+
+def test_cache_detects_changes(tmp_path):
+    config_file = tmp_path / "keepalived.conf"
+    config_file.write_text(CONFIG)
+    cache = KeepAlivedConfigParseCache(str(tmp_path / "cache"))
+    parse(cache, config_file)
+
+    stat = os.stat(config_file)
+    config_file.write_text(CONFIG.replace("DR", "TUN"))
+    # same mtime and size, only the content hash differs
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    config = parse(cache, config_file)
+    assert config.params[1].params[0].value == "TUN"
+    assert cache.stats()["hits"] == 0
+
+
+def test_cache_invalidate(tmp_path):
+    config_file = tmp_path / "keepalived.conf"
+    config_file.write_text(CONFIG)
+    cache = KeepAlivedConfigParseCache(str(tmp_path / "cache"))
+
+    parse(cache, config_file)
+    cache.invalidate(str(config_file))
+    assert cache.stats()["entries"] == 0
+
+    parse(cache, config_file)
+    cache.invalidate()
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["misses"] == 2
+
+
+def test_cache_eviction(tmp_path):
+    cache = KeepAlivedConfigParseCache(str(tmp_path / "cache"), max_bytes=400)
+    for i in range(5):
+        config_file = tmp_path / f"keepalived{i}.conf"
+        config_file.write_text(CONFIG)
+        parse(cache, config_file)
+
+    stats = cache.stats()
+    assert stats["evictions"] > 0
+    assert stats["size"] <= 400
+    assert stats["entries"] >= 1
+
+
+def test_cache_empty_file(tmp_path):
+    config_file = tmp_path / "keepalived.conf"
+    config_file.write_text("")
+    cache = KeepAlivedConfigParseCache(str(tmp_path / "cache"))
+
+    with pytest.raises(KeepAlivedConfigValueError):
+        parse(cache, config_file)
+
+
+def test_cache_included_files(tmp_path):
+    (tmp_path / "vs.conf").write_text("virtual_server 10.0.0.1 80 {\n}\n")
+    config_file = tmp_path / "keepalived.conf"
+    config_file.write_text("include vs.conf\n")
+    cache = KeepAlivedConfigParseCache(str(tmp_path / "cache"))
+
+    parse(cache, config_file, resolve_includes=True)
+    config = parse(cache, config_file, resolve_includes=True)
+
+    assert config.params[1].name == "virtual_server 10.0.0.1 80"
+    assert config.params[1].source_file == str(tmp_path / "vs.conf")
+    assert cache.stats()["hits"] == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
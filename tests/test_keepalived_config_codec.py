@@ -0,0 +1,50 @@
+import os
+import sys
+import json
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.append(SRC_DIR)
+
+from keepalived_config.keepalived_config_codec import KeepAlivedConfigCodec
+from keepalived_config.keepalived_config_parser import KeepAlivedConfigParser
+from keepalived_config.keepalived_config_block import KeepAlivedConfigBlock
+from keepalived_config.keepalived_config_comment import KeepAlivedConfigCommentTypes
+from keepalived_config.keepalived_config_exceptions import KeepAlivedConfigValueError
+
+
+def test_encode_decode_round_trip():
+    sample_file = os.path.join(os.path.dirname(__file__), "..", "samples", "keepalived.conf")
+    config = KeepAlivedConfigParser().parse_file(sample_file)
+
+    data = json.loads(json.dumps(KeepAlivedConfigCodec.encode(config.params)))
+    items = KeepAlivedConfigCodec.decode(data)
+
+    assert [item.to_str() for item in items] == [item.to_str() for item in config.params]
+
+
+def test_decode_tree():
+    config = KeepAlivedConfigParser().parse_string(
+        "# server\nvirtual_server 10.0.0.1 80 {\n    lb_kind DR # direct\n}",
+        keep_empty_lines=False,
+    )
+
+    block = KeepAlivedConfigCodec.decode(KeepAlivedConfigCodec.encode(config.params))[0]
+    assert isinstance(block, KeepAlivedConfigBlock)
+    assert block.name == "virtual_server 10.0.0.1 80"
+    assert block.comments[0].comment_str == "server"
+    assert block.params[0].value == "DR"
+    assert block.params[0].comments[0].type == KeepAlivedConfigCommentTypes.INLINE
+    assert block is not config.params[0]
+
+
+def test_decode_invalid():
+    with pytest.raises(KeepAlivedConfigValueError):
+        KeepAlivedConfigCodec.decode([[5, "a"]])
+
+    with pytest.raises(KeepAlivedConfigValueError):
+        KeepAlivedConfigCodec.decode([[0, "a"]])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,274 @@
+import os
+import sys
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.append(SRC_DIR)
+
+from keepalived_config.keepalived_config_diff import (
+    KeepAlivedConfigDiff,
+    KeepAlivedConfigChange,
+    KeepAlivedConfigChangeTypes,
+)
+from keepalived_config.keepalived_config_parser import KeepAlivedConfigParser
+from keepalived_config.keepalived_config_param_list import KeepAlivedConfigParamList
+from keepalived_config.keepalived_config_exceptions import (
+    KeepAlivedConfigTypeError,
+    ConfigPatchError,
+)
+
+OLD_CONFIG = """
+vrrp_instance VI_1 {
+    state MASTER
+    priority 100
+    virtual_ipaddress {
+        192.168.1.100/24
+    }
+}
+virtual_server 10.0.0.1 80 {
+    lb_algo rr
+    real_server 10.0.0.2 80 {
+        weight 1
+    }
+    real_server 10.0.0.3 80 {
+        weight 1
+    }
+}
+virtual_server 10.0.0.9 80 {
+}
+"""
+
+NEW_CONFIG = """
+virtual_server 10.0.0.1 80 {
+    # comments and blank lines are ignored
+
+    real_server 10.0.0.3 80 {
+        weight 1
+    }
+    lb_algo wrr
+    real_server 10.0.0.2 80 {
+        weight 2
+    }
+    real_server 10.0.0.4 80 {
+        weight 1
+    }
+}
+vrrp_instance VI_1 {
+    state MASTER
+    priority 100
+    virtual_ipaddress {
+        192.168.1.100/24
+        192.168.1.101/24
+    }
+}
+"""
+
+
+def parse(config_string):
+    return KeepAlivedConfigParser().parse_string(config_string)
+
+
+def summary(changes):
+    return [(change.type, change.path, change.is_block) for change in changes]
+
+
+def test_compare():
+    changes = KeepAlivedConfigDiff.compare(parse(OLD_CONFIG), parse(NEW_CONFIG))
+
+    assert summary(changes) == [
+        (KeepAlivedConfigChangeTypes.MODIFIED, ("vrrp_instance VI_1",), True),
+        (KeepAlivedConfigChangeTypes.MODIFIED, ("vrrp_instance VI_1", "virtual_ipaddress"), True),
+        (KeepAlivedConfigChangeTypes.ADDED, ("vrrp_instance VI_1", "virtual_ipaddress", "192.168.1.101/24"), False),
+        (KeepAlivedConfigChangeTypes.MODIFIED, ("virtual_server 10.0.0.1 80",), True),
+        (KeepAlivedConfigChangeTypes.MODIFIED, ("virtual_server 10.0.0.1 80", "lb_algo"), False),
+        (KeepAlivedConfigChangeTypes.MODIFIED, ("virtual_server 10.0.0.1 80", "real_server 10.0.0.2 80"), True),
+        (KeepAlivedConfigChangeTypes.MODIFIED, ("virtual_server 10.0.0.1 80", "real_server 10.0.0.2 80", "weight"), False),
+        (KeepAlivedConfigChangeTypes.ADDED, ("virtual_server 10.0.0.1 80", "real_server 10.0.0.4 80"), True),
+        (KeepAlivedConfigChangeTypes.REMOVED, ("virtual_server 10.0.0.9 80",), True),
+    ]
+
+    lb_algo = changes[4]
+    assert (lb_algo.old, lb_algo.new) == ("rr", "wrr")
+    assert lb_algo.name == "lb_algo"
+    assert changes[-1].new is None
+    assert changes[-1].old.name == "virtual_server 10.0.0.9 80"
+
+
+def test_compare_identical():
+    assert KeepAlivedConfigDiff.compare(parse(OLD_CONFIG), parse(OLD_CONFIG)) == []
+
+    config = parse(OLD_CONFIG)
+    assert config.diff(config) == []
+
+
+def test_compare_duplicate_params():
+    old = parse("block {\n    item a\n    item b\n    item b\n}")
+    new = parse("block {\n    item b\n    item c\n}")
+
+    changes = old.diff(new)
+    assert [(c.type, c.old, c.new) for c in changes[1:]] == [
+        (KeepAlivedConfigChangeTypes.REMOVED, "a", None),
+        (KeepAlivedConfigChangeTypes.REMOVED, "b", None),
+        (KeepAlivedConfigChangeTypes.ADDED, None, "c"),
+    ]
+
+
+def test_compare_invalid():
+    with pytest.raises(KeepAlivedConfigTypeError):
+        KeepAlivedConfigDiff.compare(parse(OLD_CONFIG), None)
+
+
+def test_apply_patch():
+    old, new = parse(OLD_CONFIG), parse(NEW_CONFIG)
+
+    old.apply_patch(old.diff(new))
+
+    assert old.diff(new) == []
+    # added blocks are copied, not shared with the source tree
+    added = old.params.find_one("virtual_server 10.0.0.1 80").params.find_one("real_server 10.0.0.4 80")
+    assert added is not new.params.find_one("virtual_server 10.0.0.1 80").params.find_one("real_server 10.0.0.4 80")
+
+
+def test_apply_serialized_patch():
+    old, new = parse(OLD_CONFIG), parse(NEW_CONFIG)
+
+    data = KeepAlivedConfigDiff.dumps(old.diff(new))
+    changes = KeepAlivedConfigDiff.loads(data)
+
+    assert [(c.type, c.path, c.is_block) for c in changes] == [
+        (c.type, c.path, c.is_block) for c in old.diff(new)
+    ]
+    old.apply_patch(changes)
+    assert old.diff(new) == []
+
+
+def test_apply_patch_rollback():
+    old, new = parse(OLD_CONFIG), parse(NEW_CONFIG)
+    expected = old.to_str()
+    changes = old.diff(new)
+    changes.append(
+        KeepAlivedConfigChange(
+            KeepAlivedConfigChangeTypes.MODIFIED,
+            ("virtual_server 10.0.0.1 80", "lb_algo"),
+            "unknown",
+            "wrr",
+        )
+    )
+
+    with pytest.raises(ConfigPatchError):
+        old.apply_patch(changes)
+    assert old.to_str() == expected
+
+    with pytest.raises(ConfigPatchError):
+        old.apply_patch(
+            [KeepAlivedConfigChange(KeepAlivedConfigChangeTypes.REMOVED, ("missing", "weight"), "1")]
+        )
+
+    with pytest.raises(ConfigPatchError):
+        KeepAlivedConfigDiff.loads("[[1]]")
+
+
+DUPLICATE_CONFIG = """
+virtual_server 10.0.0.1 80 {
+    real_server 10.0.0.2 80 {
+        weight 1
+        HTTP_GET {
+            url {
+                path /
+                status_code 200
+            }
+            url {
+                path /health
+                status_code 200
+            }
+        }
+    }
+    real_server 10.0.0.2 80 {
+        weight 1
+    }
+    real_server 10.0.0.2 80 {
+        weight 1
+    }
+}
+"""
+
+
+def test_duplicate_block_names():
+    old = parse(DUPLICATE_CONFIG)
+    new = parse(
+        DUPLICATE_CONFIG.replace("/health\n                status_code 200", "/health\n                status_code 503")
+    )
+    # the second real server changes, the third is removed
+    real_servers = new.params[1].params.find_keyword("real_server")
+    real_servers[1].params.find_one("weight").value = "2"
+    new.params[1].params.remove(real_servers[2])
+
+    changes = old.diff(new)
+    status = [change for change in changes if change.name == "status_code"]
+    assert status[0].occurrences == (0, 0, 0, 1, 0)
+    assert [change.occurrences for change in changes if change.name == "weight"] == [(0, 1, 0)]
+
+    for patch in (changes, KeepAlivedConfigDiff.loads(KeepAlivedConfigDiff.dumps(changes))):
+        target = parse(DUPLICATE_CONFIG)
+        target.apply_patch(patch)
+        assert target.to_str() == new.to_str()
+        assert target.diff(new) == []
+
+    # the occurrence must exist
+    with pytest.raises(ConfigPatchError):
+        old.apply_patch(
+            [
+                KeepAlivedConfigChange(
+                    KeepAlivedConfigChangeTypes.MODIFIED,
+                    ("virtual_server 10.0.0.1 80", "real_server 10.0.0.2 80", "weight"),
+                    "1",
+                    "5",
+                    (0, 3, 0),
+                )
+            ]
+        )
+
+
+
+def test_apply_many_removals(monkeypatch):
+    text = "virtual_server 10.0.0.1 80 {\n    delay_loop 6\n" + "".join(
+        f"    real_server 10.0.{i // 250}.{i % 250} 80 {{\n        weight 1\n    }}\n" for i in range(3000)
+    ) + "}\n"
+    old = parse(text)
+    new = parse(text)
+    params = new.params[0].params
+    # every other real server and the duplicate values of a param
+    params[:] = [node for i, node in enumerate(params) if i % 2 == 0]
+    params.append(KeepAlivedConfigParser().parse_string("delay_loop 6\n").params[0])
+    changes = old.diff(new)
+    assert len(changes) == 1502
+
+    # each parameter list is rebuilt once, nodes are not popped one by one
+    def pop(self, i=-1):
+        raise AssertionError("node removed one by one")
+
+    monkeypatch.setattr(KeepAlivedConfigParamList, "pop", pop)
+    target = parse(text)
+    target.apply_patch(changes)
+    assert target.to_str() == new.to_str()
+
+    # a failing patch leaves the removals unapplied
+    before = target.to_str()
+    with pytest.raises(ConfigPatchError):
+        target.apply_patch(
+            [
+                KeepAlivedConfigChange(
+                    KeepAlivedConfigChangeTypes.REMOVED, ("virtual_server 10.0.0.1 80", "delay_loop"), "6", None
+                ),
+                KeepAlivedConfigChange(
+                    KeepAlivedConfigChangeTypes.REMOVED, ("virtual_server 10.0.0.1 80", "delay_loop"), "6", None
+                ),
+                KeepAlivedConfigChange(
+                    KeepAlivedConfigChangeTypes.REMOVED, ("virtual_server 10.0.0.1 80", "delay_loop"), "6", None
+                ),
+            ]
+        )
+    assert target.to_str() == before
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -23,7 +23,8 @@ from keepalived_config.keepalived_config_exceptions import (
     TemplateNotFoundError,
     ConfigParseError,
     ConfigSaveError,
-    ConfigValidationError
+    ConfigValidationError,
+    ConfigPatchError
 )
 
 
@@ -151,6 +152,10 @@ def test_config_exceptions():
     # Test ConfigValidationError
     with pytest.raises(ConfigValidationError):
         raise ConfigValidationError("Config validation error")
+    
+    # Test ConfigPatchError
+    with pytest.raises(ConfigPatchError):
+        raise ConfigPatchError("Config patch error")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,157 @@
+import os
+import sys
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.append(SRC_DIR)
+
+from keepalived_config.keepalived_config_manager import KeepAlivedConfigManager
+from keepalived_config.keepalived_config_parser import KeepAlivedConfigParser
+from keepalived_config.keepalived_config_index import KeepAlivedConfigIndexes
+from keepalived_config.keepalived_config_types import VRRPConfig
+
+
+CONFIG = """
+vrrp_instance VI_1 {
+    state MASTER
+    interface eth0
+    virtual_router_id 51
+    priority 100
+    virtual_ipaddress {
+        10.0.0.100/24
+        10.0.0.101
+    }
+}
+
+virtual_server 10.0.0.100 80 {
+    lb_algo rr
+    real_server 10.9.0.17 80 {
+        weight 1
+    }
+    real_server 10.9.0.17 8080 {
+        weight 1
+    }
+}
+"""
+
+
+def snapshot(config):
+    """Query results of a freshly built index"""
+    indexes = KeepAlivedConfigIndexes(config)
+    indexes._ensure_built()
+    return (
+        indexes._router_ids,
+        indexes._interfaces,
+        indexes._vips,
+        indexes._real_servers,
+    )
+
+
+def assert_consistent(config):
+    indexes = config.indexes
+    assert (
+        indexes._router_ids,
+        indexes._interfaces,
+        indexes._vips,
+        indexes._real_servers,
+    ) == snapshot(config)
+
+
+def test_queries_on_parsed_config():
+    config = KeepAlivedConfigParser().parse_string(CONFIG)
+    indexes = config.indexes
+    assert not indexes.built
+
+    assert indexes.get_vrrp_instance_by_router_id("eth0", 51) == "VI_1"
+    assert indexes.get_vrrp_instance_by_router_id("eth0", "51") == "VI_1"
+    assert indexes.get_vrrp_instance_by_router_id("eth1", 51) is None
+    assert indexes.get_router_ids("eth0") == {51: "VI_1"}
+    assert indexes.get_vrrp_instances_by_interface("eth0") == ["VI_1"]
+    assert indexes.get_vrrp_instances_by_vip("10.0.0.100") == ["VI_1"]
+    assert indexes.get_vrrp_instances_by_vip("10.0.0.101/32") == ["VI_1"]
+    assert indexes.get_vrrp_instances_by_vip("10.0.0.102") == []
+    assert indexes.get_virtual_servers_by_real_server("10.9.0.17") == ["10.0.0.100 80"]
+    assert indexes.built
+
+
+def test_managers_maintain_indexes():
+    manager = KeepAlivedConfigManager()
+    indexes = manager.config.indexes
+    indexes.get_router_ids("eth0")
+
+    manager.vrrp.create_vrrp_instance(
+        "VI_1", "MASTER", "eth0", 51, 100, virtual_ipaddresses=["10.0.0.100/24"]
+    )
+    manager.vrrp.create_vrrp_instances({
+        "VI_2": VRRPConfig(interface="eth1", virtual_router_id=52, virtual_ipaddresses=["10.0.1.100/24"]),
+    })
+    manager.vrrp.create_from_template(
+        "complete_vrrp_backup", "VI_3", interface="eth1", virtual_router_id=53, priority=90,
+    )
+    assert indexes.get_router_ids("eth1") == {52: "VI_2", 53: "VI_3"}
+    assert indexes.get_vrrp_instances_by_vip("10.0.1.100") == ["VI_2"]
+    assert_consistent(manager.config)
+
+    manager.vrrp.update_vrrp_instance("VI_1", interface="eth1", virtual_router_id=54,
+                                      virtual_ipaddresses=["10.0.0.200/24"])
+    assert indexes.get_vrrp_instance_by_router_id("eth0", 51) is None
+    assert indexes.get_vrrp_instance_by_router_id("eth1", 54) == "VI_1"
+    assert indexes.get_vrrp_instances_by_vip("10.0.0.100") == []
+    assert indexes.get_vrrp_instances_by_vip("10.0.0.200") == ["VI_1"]
+    manager.vrrp.update_vrrp_instances({"VI_2": {"virtual_router_id": 60}})
+    assert indexes.get_vrrp_instance_by_router_id("eth1", 60) == "VI_2"
+    assert_consistent(manager.config)
+
+    manager.vrrp.remove_vrrp_instance("VI_3")
+    assert indexes.get_router_ids("eth1") == {54: "VI_1", 60: "VI_2"}
+    assert_consistent(manager.config)
+
+    vs = manager.virtual_server
+    vs.create_virtual_server("10.0.0.200", 80)
+    vs.create_virtual_server("10.0.0.200", 443)
+    vs.add_real_server("10.0.0.200", 80, "10.9.0.17", 80)
+    vs.add_real_servers("10.0.0.200", 443, [
+        {"real_server_ip": "10.9.0.17", "real_server_port": 443},
+        {"real_server_ip": "10.9.0.18", "real_server_port": 443},
+    ])
+    assert indexes.get_virtual_servers_by_real_server("10.9.0.17") == ["10.0.0.200 80", "10.0.0.200 443"]
+    assert_consistent(manager.config)
+
+    vs.remove_real_servers("10.0.0.200", 443, [("10.9.0.17", 443)])
+    assert indexes.get_virtual_servers_by_real_server("10.9.0.17") == ["10.0.0.200 80"]
+    vs.remove_real_server("10.0.0.200", 80, "10.9.0.17", 80)
+    assert indexes.get_virtual_servers_by_real_server("10.9.0.17") == []
+    vs.remove_virtual_server("10.0.0.200", 443)
+    assert indexes.get_virtual_servers_by_real_server("10.9.0.18") == []
+    assert_consistent(manager.config)
+
+
+def test_same_real_server_ip_on_several_ports():
+    config = KeepAlivedConfigParser().parse_string(CONFIG)
+    manager = KeepAlivedConfigManager(config)
+    indexes = config.indexes
+
+    manager.virtual_server.remove_real_server("10.0.0.100", 80, "10.9.0.17", 80)
+    # the real server on port 8080 still points at the ip
+    assert indexes.get_virtual_servers_by_real_server("10.9.0.17") == ["10.0.0.100 80"]
+    manager.virtual_server.remove_real_server("10.0.0.100", 80, "10.9.0.17", 8080)
+    assert indexes.get_virtual_servers_by_real_server("10.9.0.17") == []
+
+
+def test_invalidate():
+    config = KeepAlivedConfigParser().parse_string(CONFIG)
+    indexes = config.indexes
+    assert indexes.get_vrrp_instances_by_interface("eth0") == ["VI_1"]
+
+    # direct edits bypass the managers
+    config.params.remove(config.params.find_one("vrrp_instance VI_1"))
+    assert indexes.get_vrrp_instances_by_interface("eth0") == ["VI_1"]
+    indexes.invalidate()
+    assert indexes.get_vrrp_instances_by_interface("eth0") == []
+
+    config.set_params([])
+    assert indexes.get_virtual_servers_by_real_server("10.9.0.17") == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,129 @@
+import os
+import sys
+import threading
+import time
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.append(SRC_DIR)
+
+from keepalived_config.keepalived_config_lock import KeepAlivedConfigRWLock
+from keepalived_config.keepalived_config_manager import KeepAlivedConfigManager
+from keepalived_config.keepalived_config_exceptions import ConfigLockError
+
+
+def run_threads(*targets):
+    threads = [threading.Thread(target=target) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+        assert not thread.is_alive()
+
+
+def test_readers_run_in_parallel():
+    lock = KeepAlivedConfigRWLock()
+    barrier = threading.Barrier(3, timeout=5)
+
+    def reader():
+        with lock.read_locked():
+            # every reader holds the lock at the same time
+            barrier.wait()
+
+    run_threads(reader, reader, reader)
+
+
+def test_writer_excludes_readers():
+    lock = KeepAlivedConfigRWLock()
+    events = []
+    writer_inside = threading.Event()
+
+    def writer():
+        with lock.write_locked():
+            writer_inside.set()
+            time.sleep(0.05)
+            events.append("write done")
+
+    def reader():
+        writer_inside.wait(5)
+        with lock.read_locked():
+            events.append("read")
+
+    run_threads(writer, reader)
+    assert events == ["write done", "read"]
+
+
+def test_reentrancy():
+    lock = KeepAlivedConfigRWLock()
+    with lock.write_locked():
+        with lock.write_locked():
+            with lock.read_locked():
+                pass
+    with lock.read_locked():
+        with lock.read_locked():
+            with pytest.raises(ConfigLockError):
+                lock.acquire_write()
+
+    def writer():
+        with lock.write_locked():
+            pass
+
+    # everything was released, another thread can write
+    run_threads(writer)
+    with pytest.raises(ConfigLockError):
+        lock.release()
+
+
+def test_manager_thread_safe_mode():
+    assert not KeepAlivedConfigManager().thread_safe
+    with KeepAlivedConfigManager().read_locked():
+        pass
+
+    manager = KeepAlivedConfigManager(thread_safe=True)
+    assert manager.thread_safe
+    assert manager.vrrp._lock is manager._lock
+    assert manager.virtual_server._lock is manager._lock
+
+    manager.virtual_server.create_virtual_server("10.0.0.1", 80, delay_loop=1, persistence_timeout=1)
+    errors = []
+    stop = threading.Event()
+
+    def writer():
+        for i in range(2, 200):
+            # both parameters are changed by one call
+            manager.virtual_server.update_virtual_server("10.0.0.1", 80, delay_loop=i, persistence_timeout=i)
+            manager.virtual_server.add_real_server("10.0.0.1", 80, "10.0.1.1", i)
+        stop.set()
+
+    def reader():
+        while not stop.is_set():
+            with manager.read_locked():
+                block = manager.virtual_server.get_virtual_server("10.0.0.1", 80).data
+                delay_loop = manager.virtual_server._get_param(block, "delay_loop").value
+                persistence_timeout = manager.virtual_server._get_param(block, "persistence_timeout").value
+            if delay_loop != persistence_timeout:
+                errors.append((delay_loop, persistence_timeout))
+            manager.virtual_server.list_real_servers("10.0.0.1", 80)
+
+    run_threads(writer, reader, reader)
+    assert errors == []
+    assert len(manager.virtual_server.list_real_servers("10.0.0.1", 80).data) == 198
+    assert manager.validate()
+
+
+def test_manager_load_config_swaps_under_lock(tmp_path):
+    config_file = tmp_path / "keepalived.conf"
+    config_file.write_text("global_defs {\n    router_id LB1\n}\n")
+
+    manager = KeepAlivedConfigManager(thread_safe=True)
+    manager.load_config(str(config_file))
+    # the recreated managers share the lock
+    assert manager.vrrp._lock is manager._lock
+    assert manager.virtual_server._lock is manager._lock
+    with manager.write_locked():
+        manager.vrrp.create_vrrp_instance("VI_1", "MASTER", "eth0", 51, 100)
+    assert manager.vrrp_instances == ["VI_1"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,163 @@
+import os
+import sys
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.append(SRC_DIR)
+
+from keepalived_config.keepalived_config_manager import KeepAlivedConfigManager
+from keepalived_config.keepalived_config_parser import KeepAlivedConfigParser
+from keepalived_config.keepalived_config_metrics import (
+    KeepAlivedConfigMetrics,
+    KeepAlivedConfigMetricsSink,
+    KeepAlivedConfigHistogramSink,
+    KeepAlivedConfigCallbackSink,
+    KeepAlivedConfigPrometheusSink,
+)
+from keepalived_config.keepalived_config_exceptions import (
+    KeepAlivedConfigTypeError,
+    KeepAlivedConfigValueError,
+    VRRPInstanceNotFoundError,
+)
+
+
+CONFIG = """
+vrrp_instance VI_1 {
+    state MASTER
+    interface eth0
+    virtual_router_id 51
+    priority 100
+}
+"""
+
+
+def test_disabled_by_default():
+    assert KeepAlivedConfigMetrics.get_sink() is None
+    # recording without a sink does nothing
+    KeepAlivedConfigMetrics.record("noop", 1.0)
+    KeepAlivedConfigParser().parse_string(CONFIG)
+
+
+def test_trace_records_parse_phases_and_operations(tmp_path):
+    with KeepAlivedConfigMetrics.trace() as sink:
+        assert KeepAlivedConfigMetrics.get_sink() is sink
+        manager = KeepAlivedConfigManager(KeepAlivedConfigParser().parse_string(CONFIG))
+        manager.vrrp.create_vrrp_instance("VI_2", "BACKUP", "eth0", 52, 90)
+        manager.vrrp.update_vrrp_instance("VI_2", priority=80)
+        manager.virtual_server.create_virtual_server("10.0.0.1", 80)
+        manager.virtual_server.add_real_server("10.0.0.1", 80, "10.0.1.1", 80)
+        manager.validate()
+        manager.save_config(str(tmp_path / "keepalived.conf"))
+        manager.config.to_str()
+        with pytest.raises(VRRPInstanceNotFoundError):
+            manager.vrrp.remove_vrrp_instance("VI_3")
+
+    assert KeepAlivedConfigMetrics.get_sink() is None
+    stats = sink.stats()
+    for name in (
+        "parser.parse_string",
+        "parser.read",
+        "parser.tokenize",
+        "parser.build",
+        "vrrp.create_vrrp_instance",
+        "vrrp.update_vrrp_instance",
+        "virtual_server.create_virtual_server",
+        "virtual_server.add_real_server",
+        "manager.validate",
+        "manager.save_config",
+        "config.save",
+        "config.to_str",
+    ):
+        assert stats[name]["count"] >= 1, name
+    # failed calls are recorded too
+    assert stats["vrrp.remove_vrrp_instance"]["count"] == 1
+
+    entry = stats["parser.parse_string"]
+    assert entry["min"] <= entry["mean"] <= entry["max"]
+    assert entry["buckets"][float("inf")] == entry["count"]
+
+
+def test_parse_file_phases(tmp_path):
+    config_file = tmp_path / "keepalived.conf"
+    config_file.write_text(CONFIG)
+
+    with KeepAlivedConfigMetrics.trace() as sink:
+        config = KeepAlivedConfigParser().parse_file(str(config_file))
+    assert config.to_str() == KeepAlivedConfigParser().parse_string(CONFIG).to_str()
+    stats = sink.stats()
+    assert stats["parser.parse_file"]["count"] == 1
+    assert stats["parser.read"]["count"] == 1
+    assert stats["parser.build"]["count"] == 1
+
+
+def test_histogram_buckets():
+    sink = KeepAlivedConfigHistogramSink(buckets=(0.1, 1.0))
+    sink.record("op", 0.05)
+    sink.record("op", 0.1)
+    sink.record("op", 0.5)
+    sink.record("op", 2.0)
+
+    entry = sink.stats()["op"]
+    assert entry["count"] == 4
+    assert entry["total"] == pytest.approx(2.65)
+    assert entry["min"] == 0.05
+    assert entry["max"] == 2.0
+    assert entry["buckets"] == {0.1: 2, 1.0: 3, float("inf"): 4}
+
+    sink.reset()
+    assert sink.stats() == {}
+
+    with pytest.raises(KeepAlivedConfigValueError):
+        KeepAlivedConfigHistogramSink(buckets=(1.0, 0.1))
+    with pytest.raises(KeepAlivedConfigValueError):
+        KeepAlivedConfigHistogramSink(buckets=())
+
+
+def test_callback_sink_and_nested_traces():
+    calls = []
+    outer = KeepAlivedConfigCallbackSink(lambda name, seconds: calls.append(name))
+
+    with KeepAlivedConfigMetrics.trace(outer):
+        with KeepAlivedConfigMetrics.trace() as inner:
+            KeepAlivedConfigParser().parse_string(CONFIG)
+        KeepAlivedConfigMetrics.record("outer", 0.0)
+
+    assert "parser.parse_string" in inner.stats()
+    assert calls == ["outer"]
+
+    with pytest.raises(KeepAlivedConfigTypeError):
+        KeepAlivedConfigCallbackSink("not callable")
+    with pytest.raises(KeepAlivedConfigTypeError):
+        KeepAlivedConfigMetrics.set_sink(object())
+    assert KeepAlivedConfigMetrics.get_sink() is None
+
+    # record() is abstract
+    class NoRecordSink(KeepAlivedConfigMetricsSink):
+        pass
+
+    with pytest.raises(TypeError):
+        NoRecordSink()
+
+
+def test_prometheus_sink(tmp_path):
+    path = tmp_path / "keepalived_config.prom"
+    with KeepAlivedConfigMetrics.trace(KeepAlivedConfigPrometheusSink(str(path), buckets=(0.5, 1.0))) as sink:
+        KeepAlivedConfigMetrics.record("config.save", 0.25)
+        KeepAlivedConfigMetrics.record("config.save", 0.75)
+
+    assert sink.path == str(path)
+    assert path.read_text() == (
+        "# HELP keepalived_config_operation_seconds Duration of keepalived_config operations in seconds.\n"
+        "# TYPE keepalived_config_operation_seconds histogram\n"
+        'keepalived_config_operation_seconds_bucket{operation="config.save",le="0.5"} 1\n'
+        'keepalived_config_operation_seconds_bucket{operation="config.save",le="1.0"} 2\n'
+        'keepalived_config_operation_seconds_bucket{operation="config.save",le="+Inf"} 2\n'
+        'keepalived_config_operation_seconds_sum{operation="config.save"} 1.0\n'
+        'keepalived_config_operation_seconds_count{operation="config.save"} 2\n'
+    )
+    # no temporary files are left behind
+    assert os.listdir(tmp_path) == ["keepalived_config.prom"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -125,3 +125,17 @@ def test_to_str():
         + "\n"
         + f"param value{KeepAlivedConfigConstants.get_indent(1)}{KeepAlivedConfigComment.COMMENT_INDICATOR} inline comment"
     )
+
+
+def test_compact_nodes():
+    param = KeepAlivedConfigParam("param", value="value")
+    assert not hasattr(param, "__dict__")
+    with pytest.raises(AttributeError):
+        param.unknown_attribute = 1
+
+    # the comments list is only created when it is needed
+    other = KeepAlivedConfigParam("other")
+    other.comments.append(KeepAlivedConfigComment("comment"))
+    assert len(other.comments) == 1
+    assert param.comments == []
+
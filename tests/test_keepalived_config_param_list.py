@@ -0,0 +1,95 @@
+import os
+import sys
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.append(SRC_DIR)
+
+from keepalived_config.keepalived_config_param_list import KeepAlivedConfigParamList
+from keepalived_config.keepalived_config_param import KeepAlivedConfigParam
+from keepalived_config.keepalived_config_block import KeepAlivedConfigBlock
+from keepalived_config.keepalived_config import KeepAlivedConfig
+
+
+def test_find():
+    weight = KeepAlivedConfigParam("weight", "1")
+    rs1 = KeepAlivedConfigBlock("real_server", "10.0.0.1 80")
+    rs2 = KeepAlivedConfigBlock("real_server", "10.0.0.1 80")
+    params = KeepAlivedConfigParamList([weight, rs1, rs2])
+
+    assert params.find("weight") == [weight]
+    assert params.find("real_server 10.0.0.1 80") == [rs1, rs2]
+    assert params.find("missing") == []
+    assert params.find_one("real_server 10.0.0.1 80") is rs1
+    assert params.find_one("weight", KeepAlivedConfigBlock) is None
+
+
+def test_index_follows_mutations():
+    a = KeepAlivedConfigParam("a", "1")
+    b = KeepAlivedConfigParam("b", "2")
+    params = KeepAlivedConfigParamList([a])
+    assert params.find_one("a") is a
+
+    params.append(b)
+    assert params.find_one("b") is b
+
+    params.remove(a)
+    assert params.find_one("a") is None
+
+    c = KeepAlivedConfigParam("c", "3")
+    params.extend([c])
+    assert params.pop() is c
+    assert params.find_one("c") is None
+
+    params.insert(0, a)
+    assert params.find_one("a") is a
+
+    params[0] = c
+    assert params.find_one("a") is None
+    assert params.find_one("c") is c
+
+    del params[0]
+    assert params.find("c") == []
+
+    params.clear()
+    assert params.find("b") == []
+
+
+def test_index_follows_rename():
+    param = KeepAlivedConfigParam("old", "1")
+    block = KeepAlivedConfigBlock("block")
+    block.add_param(param)
+    assert block.params.find_one("old") is param
+
+    param.name = "new"
+    assert block.params.find_one("old") is None
+    assert block.params.find_one("new") is param
+
+
+def test_config_params_are_indexed():
+    block = KeepAlivedConfigBlock("vrrp_instance", "VI_1")
+    config = KeepAlivedConfig(params=[block])
+
+    assert isinstance(config.params, KeepAlivedConfigParamList)
+    assert config.params.find_one("vrrp_instance VI_1") is block
+
+
+def test_find_keyword():
+    rs1 = KeepAlivedConfigBlock("real_server", "10.0.0.1 80")
+    rs2 = KeepAlivedConfigBlock("real_server", "10.0.0.2 80")
+    lb_kind = KeepAlivedConfigParam("lb_kind", "DR")
+    params = KeepAlivedConfigParamList([rs1, lb_kind])
+
+    assert params.find_keyword("real_server") == [rs1]
+    assert params.find_keyword("lb_kind") == [lb_kind]
+    params.append(rs2)
+    assert params.find_keyword("real_server") == [rs1, rs2]
+    params.remove(rs1)
+    assert params.find_keyword("real_server") == [rs2]
+    rs2.name = "sorry_server 10.0.0.2 80"
+    assert params.find_keyword("real_server") == []
+    assert params.find_keyword("sorry_server") == [rs2]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -6,6 +6,8 @@ SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
 sys.path.append(SRC_DIR)
 
 from keepalived_config.keepalived_config_parser import KeepAlivedConfigParser
+from keepalived_config.keepalived_config_block import KeepAlivedConfigBlock
+from keepalived_config.keepalived_config_comment import KeepAlivedConfigCommentTypes
 from keepalived_config.keepalived_config_exceptions import ConfigParseError, KeepAlivedConfigValueError
 
 
@@ -81,5 +83,287 @@ def test_valid_parse_file():
             os.remove(temp_file)
 
 
+def test_parse_tree():
+    config = KeepAlivedConfigParser().parse_string(
+        "# server\n"
+        "virtual_server 192.168.1.100 80 {\n"
+        "    lb_kind DR # direct routing\n"
+        "    real_server 192.168.1.101 80 {\n"
+        "        weight 1\n"
+        "    }\n"
+        "}",
+        keep_empty_lines=False,
+    )
+
+    assert len(config.params) == 1
+    vs_block = config.params[0]
+    assert isinstance(vs_block, KeepAlivedConfigBlock)
+    assert vs_block.name == "virtual_server 192.168.1.100 80"
+    assert vs_block.comments[0].comment_str == "server"
+
+    lb_kind, real_server = vs_block.params
+    assert lb_kind.value == "DR"
+    assert lb_kind.comments[0].type == KeepAlivedConfigCommentTypes.INLINE
+    assert real_server.name == "real_server 192.168.1.101 80"
+    assert real_server.params[0].name == "weight"
+
+
+def test_parse_sample_round_trip():
+    sample_file = os.path.join(os.path.dirname(__file__), "..", "samples", "keepalived.conf")
+    with open(sample_file, "r") as f:
+        contents = f.read()
+
+    config = KeepAlivedConfigParser().parse_string(contents)
+    reparsed = KeepAlivedConfigParser().parse_string(
+        "\n".join(item.to_str() for item in config.params)
+    )
+
+    assert [item.to_str() for item in reparsed.params] == [
+        item.to_str() for item in config.params
+    ]
+
+
+def test_closing_brace_after_param():
+    config = KeepAlivedConfigParser().parse_string("block {\nparam value }\nother 1")
+
+    assert len(config.params) == 2
+    assert config.params[0].params[0].value == "value"
+    assert config.params[1].name == "other"
+
+
+def test_parse_deep_nesting():
+    config = KeepAlivedConfigParser().parse_string(
+        "virtual_server 10.0.0.1 80 {\n"
+        "    real_server 10.0.0.2 80 {\n"
+        "        HTTP_GET {\n"
+        "            url {\n"
+        "                path /health\n"
+        "\n"
+        "                # expected digest\n"
+        "            }\n"
+        "\n"
+        "            connect_timeout 3\n"
+        "        }\n"
+        "        weight 1\n"
+        "    }\n"
+        "}\n"
+        "global_defs {\n"
+        "}"
+    )
+
+    vs_block = config.params[0]
+    rs_block = vs_block.params[0]
+    http_get_block = rs_block.params[0]
+    url_block = http_get_block.params[0]
+    assert url_block.name == "url"
+    assert url_block.params[0].name == "path"
+    assert [p.name for p in http_get_block.params] == ["url", "", "connect_timeout"]
+    assert rs_block.params[-1].name == "weight"
+    assert config.params[1].name == "global_defs"
+
+
+def test_unbalanced_braces():
+    with pytest.raises(ValueError):
+        KeepAlivedConfigParser().parse_string("block {\n}\n}")
+
+    with pytest.raises(ConfigParseError):
+        KeepAlivedConfigParser().parse_string("a {\nb {\n}")
+
+
+def test_iter_parse_file(tmp_path):
+    sample_file = os.path.join(os.path.dirname(__file__), "..", "samples", "keepalived.conf")
+    with open(sample_file, "r") as f:
+        contents = f.read()
+
+    items = list(KeepAlivedConfigParser().iter_parse(sample_file))
+    config = KeepAlivedConfigParser().parse_string(contents)
+
+    assert [item.to_str() for item in items] == [
+        item.to_str() for item in config.params
+    ]
+
+
+def test_iter_parse_yields_completed_items():
+    import io
+
+    stream = io.StringIO(
+        "global_defs {\n"
+        "    router_id LVS_1\n"
+        "}\n"
+        "vrrp_instance VI_1 {\n"
+        "    state MASTER\n"
+        "}\n"
+        "virtual_server 10.0.0.1 80 {\n"
+        "    real_server 10.0.0.2 80 {\n"
+        "        weight 1\n"
+        "    }\n"
+        "}\n"
+    )
+
+    blocks = []
+    for item in KeepAlivedConfigParser().iter_parse(stream, keep_empty_lines=False):
+        assert isinstance(item, KeepAlivedConfigBlock)
+        # the block is complete when it is yielded
+        assert item.params
+        blocks.append(item.name)
+
+    assert blocks == [
+        "global_defs",
+        "vrrp_instance VI_1",
+        "virtual_server 10.0.0.1 80",
+    ]
+
+
+def test_iter_parse_invalid():
+    from keepalived_config.keepalived_config_exceptions import KeepAlivedConfigTypeError
+    import io
+
+    with pytest.raises(KeepAlivedConfigTypeError):
+        list(KeepAlivedConfigParser().iter_parse(123))
+
+    with pytest.raises(FileNotFoundError):
+        list(KeepAlivedConfigParser().iter_parse("/non/existent/file.conf"))
+
+    items = KeepAlivedConfigParser().iter_parse(io.StringIO("a 1\nblock {\nb 2\n"))
+    assert next(items).name == "a"
+    with pytest.raises(ConfigParseError):
+        next(items)
+
+
+def write_include_tree(tmp_path):
+    conf_dir = tmp_path / "conf.d"
+    conf_dir.mkdir()
+    (conf_dir / "20-vs.conf").write_text(
+        "virtual_server 10.0.0.1 80 {\n    lb_kind DR\n}\n"
+    )
+    (conf_dir / "10-vrrp.conf").write_text(
+        "vrrp_instance VI_1 {\n    state MASTER\n}\ninclude nested/*.conf\n"
+    )
+    (conf_dir / "nested").mkdir()
+    (conf_dir / "nested" / "vs2.conf").write_text(
+        "virtual_server 10.0.0.2 80 {\n}\n"
+    )
+    main_file = tmp_path / "keepalived.conf"
+    main_file.write_text(
+        "global_defs {\n    router_id LVS_1\n}\ninclude conf.d/*.conf\nlast_param 1\n"
+    )
+    return main_file, conf_dir
+
+
+def test_parse_file_without_include_resolution(tmp_path):
+    main_file, _ = write_include_tree(tmp_path)
+
+    config = KeepAlivedConfigParser().parse_file(str(main_file), keep_empty_lines=False)
+
+    assert [item.name for item in config.params] == ["global_defs", "include", "last_param"]
+    assert config.include_files == []
+
+
+def test_parse_file_resolve_includes(tmp_path):
+    main_file, conf_dir = write_include_tree(tmp_path)
+
+    config = KeepAlivedConfigParser().parse_file(
+        str(main_file), keep_empty_lines=False, resolve_includes=True, max_workers=2
+    )
+
+    assert [item.name for item in config.params] == [
+        "global_defs",
+        "include",
+        "vrrp_instance VI_1",
+        "include",
+        "virtual_server 10.0.0.2 80",
+        "virtual_server 10.0.0.1 80",
+        "last_param",
+    ]
+    assert config.params[0].source_file is None
+    assert config.params[2].source_file == str(conf_dir / "10-vrrp.conf")
+    assert config.params[4].source_file == str(conf_dir / "nested" / "vs2.conf")
+    assert config.include_files == [
+        str(conf_dir / "10-vrrp.conf"),
+        str(conf_dir / "nested" / "vs2.conf"),
+        str(conf_dir / "20-vs.conf"),
+    ]
+
+
+def test_save_resolved_includes(tmp_path):
+    main_file, conf_dir = write_include_tree(tmp_path)
+
+    config = KeepAlivedConfigParser().parse_file(
+        str(main_file), keep_empty_lines=False, resolve_includes=True
+    )
+    # drop the virtual server of the nested file and modify the one of 20-vs.conf
+    del config.params[4]
+    config.params[4].params[0].value = "NAT"
+    config.save()
+
+    assert main_file.read_text() == (
+        "global_defs {\n    router_id LVS_1\n}\ninclude conf.d/*.conf\nlast_param 1\n"
+    )
+    assert (conf_dir / "10-vrrp.conf").read_text() == (
+        "vrrp_instance VI_1 {\n    state MASTER\n}\ninclude nested/*.conf\n"
+    )
+    assert (conf_dir / "nested" / "vs2.conf").read_text() == ""
+    assert (conf_dir / "20-vs.conf").read_text() == (
+        "virtual_server 10.0.0.1 80 {\n    lb_kind NAT\n}\n"
+    )
+
+
+def test_save_resolved_includes_to_another_file(tmp_path):
+    main_file, conf_dir = write_include_tree(tmp_path)
+    fragments = {path: path.read_text() for path in conf_dir.rglob("*.conf")}
+
+    config = KeepAlivedConfigParser().parse_file(
+        str(main_file), keep_empty_lines=False, resolve_includes=True
+    )
+    config.params[5].params[0].value = "NAT"
+    export = tmp_path / "export" / "keepalived.conf"
+    export.parent.mkdir()
+    config.save(str(export))
+
+    # everything goes to the export, the included files are left alone
+    assert export.read_text() == config.to_str()
+    assert {path: path.read_text() for path in conf_dir.rglob("*.conf")} == fragments
+    assert config.save(str(export), atomic=True) is False
+    with config.snapshot() as snapshot:
+        assert snapshot.to_str() == config.to_str()
+
+    # the resolved include directives are left out, reparsing yields every item once
+    (export.parent / "conf.d").mkdir()
+    (export.parent / "conf.d" / "10-vrrp.conf").write_text("vrrp_instance VI_2 {\n}\n")
+    exported = KeepAlivedConfigParser().parse_file(
+        str(export), keep_empty_lines=False, resolve_includes=True
+    )
+    assert [item.name for item in exported.params] == [
+        "global_defs",
+        "vrrp_instance VI_1",
+        "virtual_server 10.0.0.2 80",
+        "virtual_server 10.0.0.1 80",
+        "last_param",
+    ]
+    assert exported.include_files == []
+    assert exported.params[3].params[0].value == "NAT"
+
+
+def test_circular_include(tmp_path):
+    (tmp_path / "a.conf").write_text("include b.conf\n")
+    (tmp_path / "b.conf").write_text("include a.conf\n")
+
+    with pytest.raises(ConfigParseError):
+        KeepAlivedConfigParser().parse_file(
+            str(tmp_path / "a.conf"), resolve_includes=True
+        )
+
+
+def test_parsed_keywords_are_shared():
+    config = KeepAlivedConfigParser().parse_string(
+        "real_server 10.0.0.1 80 {\n    TCP_CHECK {\n        connect_timeout 3\n    }\n}\n"
+        "real_server 10.0.0.2 80 {\n    TCP_CHECK {\n        connect_timeout 3\n    }\n}"
+    )
+
+    first, second = config.params[0], config.params[1]
+    assert first.params[0].name is second.params[0].name
+    assert first.params[0].params[0].name is second.params[0].params[0].name
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
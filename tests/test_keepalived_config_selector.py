@@ -0,0 +1,125 @@
+import os
+import sys
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.append(SRC_DIR)
+
+from keepalived_config.keepalived_config_parser import KeepAlivedConfigParser
+from keepalived_config.keepalived_config_manager import KeepAlivedConfigManager
+from keepalived_config.keepalived_config_selector import KeepAlivedConfigSelector
+from keepalived_config.keepalived_config_exceptions import (
+    KeepAlivedConfigTypeError,
+    KeepAlivedConfigValueError,
+)
+
+
+CONFIG = """
+vrrp_instance VI_1 {
+    interface eth0
+    virtual_router_id 51
+    virtual_ipaddress {
+        10.0.0.1/24
+        10.0.0.2
+    }
+}
+
+vrrp_instance VI_2 {
+    interface eth1
+    virtual_ipaddress {
+        10.0.1.1/24
+    }
+}
+
+virtual_server 10.0.0.1 80 {
+    lb_kind DR
+    real_server 10.1.0.1 80 {
+        weight 0
+    }
+    real_server 10.1.0.2 80 {
+        weight 1
+        HTTP_GET {
+            url {
+                path /health
+            }
+        }
+    }
+}
+
+virtual_server 10.0.0.1 443 {
+    lb_kind NAT
+    real_server 10.1.0.3 443 {
+        weight 0
+    }
+}
+"""
+
+
+def names(nodes):
+    return [node.name or node.value for node in nodes]
+
+
+@pytest.fixture
+def config():
+    return KeepAlivedConfigParser().parse_string(CONFIG)
+
+
+def test_select_keywords_and_arguments(config):
+    assert names(config.select("vrrp_instance")) == ["vrrp_instance VI_1", "vrrp_instance VI_2"]
+    assert names(config.select("vrrp_instance/VI_2")) == ["vrrp_instance VI_2"]
+    assert names(config.select("vrrp_instance/VI_1/interface")) == ["interface"]
+    assert names(config.select("vrrp_instance/*/virtual_ipaddress/*")) == [
+        "10.0.0.1/24", "10.0.0.2", "10.0.1.1/24",
+    ]
+    # a step that doesn't match the arguments addresses the children
+    assert names(config.select("virtual_server/real_server")) == [
+        "real_server 10.1.0.1 80", "real_server 10.1.0.2 80", "real_server 10.1.0.3 443",
+    ]
+    assert names(config.select("virtual_server/real_server/HTTP_GET/url/path")) == ["path"]
+    assert names(config.select("vrrp_instance/VI_3")) == []
+
+
+def test_select_full_names_globs_and_quotes(config):
+    assert names(config.select("virtual_server 10.0.0.1 443/real_server")) == ["real_server 10.1.0.3 443"]
+    assert names(config.select("virtual_server/* 443")) == ["virtual_server 10.0.0.1 443"]
+    assert names(config.select("vrrp_*/VI_?")) == ["vrrp_instance VI_1", "vrrp_instance VI_2"]
+    assert names(config.select("*")) == [
+        "vrrp_instance VI_1", "vrrp_instance VI_2", "virtual_server 10.0.0.1 80", "virtual_server 10.0.0.1 443",
+    ]
+    assert names(config.select('vrrp_instance/*/virtual_ipaddress/"10.0.0.1/24"')) == ["10.0.0.1/24"]
+
+
+def test_select_predicates(config):
+    assert names(config.select("virtual_server[lb_kind=DR]/real_server[weight=0]")) == ["real_server 10.1.0.1 80"]
+    assert names(config.select("virtual_server/real_server[weight!=0]")) == ["real_server 10.1.0.2 80"]
+    assert names(config.select("virtual_server/real_server[HTTP_GET]")) == ["real_server 10.1.0.2 80"]
+    assert names(config.select("vrrp_instance[interface=eth*]")) == ["vrrp_instance VI_1", "vrrp_instance VI_2"]
+    assert names(config.select('vrrp_instance/*[interface="eth1"]')) == ["vrrp_instance VI_2"]
+    assert names(config.select("vrrp_instance[virtual_router_id][interface=eth0]")) == ["vrrp_instance VI_1"]
+    assert names(config.select("virtual_server/real_server/HTTP_GET/url[path=/health]")) == ["url"]
+
+
+def test_select_is_lazy_and_follows_changes(config):
+    results = config.select("virtual_server/real_server")
+    assert next(results).name == "real_server 10.1.0.1 80"
+
+    manager = KeepAlivedConfigManager(config)
+    manager.virtual_server.add_real_server("10.0.0.1", 80, "10.1.0.4", 80, weight=0)
+    assert names(config.select("virtual_server 10.0.0.1 80/real_server[weight=0]")) == [
+        "real_server 10.1.0.1 80", "real_server 10.1.0.4 80",
+    ]
+    manager.virtual_server.update_real_server("10.0.0.1", 80, "10.1.0.1", 80, weight=5)
+    assert names(config.select("virtual_server 10.0.0.1 80/real_server[weight=0]")) == ["real_server 10.1.0.4 80"]
+
+
+def test_select_errors(config):
+    assert KeepAlivedConfigSelector.compile("a/b[c=d]") is KeepAlivedConfigSelector.compile("a/b[c=d]")
+    for query in ["", "a//b", "a[b", "a]", 'a/"b', "a[=x]", "a[b]c"]:
+        with pytest.raises(KeepAlivedConfigValueError):
+            config.select(query)
+    with pytest.raises(KeepAlivedConfigTypeError):
+        config.select(None)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
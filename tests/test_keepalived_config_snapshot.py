@@ -0,0 +1,227 @@
+import gc
+import os
+import sys
+import threading
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.append(SRC_DIR)
+
+from keepalived_config.keepalived_config_manager import KeepAlivedConfigManager
+from keepalived_config.keepalived_config_parser import KeepAlivedConfigParser
+from keepalived_config.keepalived_config_param import KeepAlivedConfigParam
+from keepalived_config.keepalived_config_block import KeepAlivedConfigBlock
+from keepalived_config.keepalived_config_comment import KeepAlivedConfigComment
+from keepalived_config.keepalived_config_snapshot import KeepAlivedConfigSnapshot
+from keepalived_config.keepalived_config_exceptions import KeepAlivedConfigValueError
+
+
+CONFIG = """# main config
+global_defs {
+    router_id LB1 # inline
+}
+
+vrrp_instance VI_1 {
+    state MASTER
+    interface eth0
+    virtual_router_id 51
+    priority 100
+    virtual_ipaddress {
+        10.0.0.100/24
+    }
+}
+
+virtual_server 10.0.0.100 80 {
+    delay_loop 6
+    lb_algo rr
+    lb_kind DR
+    protocol TCP
+    real_server 10.0.1.1 80 {
+        weight 1
+        TCP_CHECK {
+            connect_timeout 3
+        }
+    }
+}
+"""
+
+
+def parse():
+    return KeepAlivedConfigParser().parse_string(CONFIG)
+
+
+def test_snapshot_renders_like_the_config():
+    config = parse()
+    # render caches of the config are used for unchanged blocks
+    expected = config.to_str()
+    with config.snapshot() as snapshot:
+        assert snapshot.to_str() == expected
+        assert "\n".join(snapshot.iter_lines()) == "\n".join(config.iter_lines())
+        assert [item.name for item in snapshot.params] == [item.name for item in config.params]
+        assert snapshot.preserved == 0
+
+    fresh = parse()
+    with fresh.snapshot() as snapshot:
+        # nothing rendered yet
+        assert snapshot.to_str() == expected
+
+
+def test_snapshot_is_isolated_from_later_edits():
+    config = parse()
+    before = config.to_str()
+    snapshot = config.snapshot()
+
+    manager = KeepAlivedConfigManager(config)
+    manager.vrrp.update_vrrp_instance("VI_1", priority=150, virtual_ipaddresses=["10.0.0.200/24"])
+    manager.virtual_server.add_real_server("10.0.0.100", 80, "10.0.1.2", 80)
+    manager.virtual_server.update_real_server("10.0.0.100", 80, "10.0.1.1", 80, weight=5)
+    manager.vrrp.create_vrrp_instance("VI_2", "BACKUP", "eth0", 52, 90)
+    config.params.find_one("global_defs").params[0].comments.append(KeepAlivedConfigComment("new"))
+    config.params[0].add_comment(KeepAlivedConfigComment("more"))
+    after = config.to_str()
+
+    assert after != before
+    assert snapshot.to_str() == before
+    assert snapshot.validate()
+
+    vrrp = snapshot.params.find_one("vrrp_instance VI_1")
+    assert vrrp.is_block
+    assert vrrp.params.find_one("priority").value == "100"
+    assert [node.name for node in vrrp.params.find_one("virtual_ipaddress").params] == ["10.0.0.100/24"]
+    vs = snapshot.params.find_one("virtual_server 10.0.0.100 80")
+    assert len(vs.params.find_keyword("real_server")) == 1
+
+    # the live config is unaffected by the snapshot
+    assert config.to_str() == after
+    snapshot.release()
+    assert snapshot.released
+    with pytest.raises(KeepAlivedConfigValueError):
+        snapshot.to_str()
+
+
+def test_nodes_moved_to_another_config():
+    config = parse()
+    other = parse()
+    expected = config.to_str()
+    with config.snapshot() as snapshot:
+        config.to_str()
+        vs = config.params.pop(4)
+        other.params.append(vs)
+        # edited after the move, only the new configuration can be found from the nodes
+        real_server = vs.params.find_keyword("real_server")[0]
+        real_server.params.find_one("weight").value = "5"
+        real_server.params.find_one("TCP_CHECK").params.append(KeepAlivedConfigParam("retry", "2"))
+        vs.name = "virtual_server 10.0.0.200 80"
+        assert snapshot.to_str() == expected
+
+        # a block detached into a new block
+        block = config.params.find_one("vrrp_instance VI_1").params.pop(4)
+        holder = KeepAlivedConfigBlock("holder")
+        holder.params.append(block)
+        block.params[0].name = "10.0.0.200/24"
+        assert snapshot.to_str() == expected
+
+
+def test_memory_is_proportional_to_edits():
+    text = "".join(
+        f"virtual_server 10.0.{i // 250}.{i % 250} 80 {{\n    delay_loop 6\n"
+        f"    real_server 10.1.{i // 250}.{i % 250} 80 {{\n        weight 1\n    }}\n}}\n"
+        for i in range(500)
+    )
+    config = KeepAlivedConfigParser().parse_string(text)
+    with config.snapshot() as snapshot:
+        weight = config.params[10].params[1].params[0]
+        weight.value = "2"
+        weight.value = "3"
+        # one preserved state, no matter how large the config or how often the param changes
+        assert snapshot.preserved == 1
+        config.params[20].params.append(KeepAlivedConfigParam("lb_algo", "rr"))
+        assert snapshot.preserved == 2
+        assert snapshot.params[10].params[1].params[0].value == "1"
+        assert len(snapshot.params[20].params) == 2
+
+        # reads preserve nothing
+        for block in config.params[:50]:
+            for node in block.params:
+                node.comments
+                node.name
+        assert snapshot.preserved == 2
+
+
+def test_several_snapshots():
+    config = parse()
+    global_defs = config.params.find_one("global_defs")
+    router_id = global_defs.params[0]
+
+    names = [item.name for item in config.params]
+    first = config.snapshot()
+    router_id.value = "LB2"
+    second = config.snapshot()
+    router_id.value = "LB3"
+    third = config.snapshot()
+
+    def router_id_of(snapshot):
+        return snapshot.params.find_one("global_defs").params[0].value
+
+    assert router_id_of(first) == "LB1"
+    assert router_id_of(second) == "LB2"
+    assert router_id_of(third) == "LB3"
+    assert first.epoch < second.epoch < third.epoch
+
+    # set_params replaces the top level list, snapshots keep the old one
+    config.set_params([KeepAlivedConfigBlock("global_defs")])
+    assert [item.name for item in third.params] == names
+    for snapshot in (first, second, third):
+        snapshot.release()
+
+
+def test_unreleased_snapshots_are_released_by_gc():
+    gc.collect()
+    active = KeepAlivedConfigSnapshot._active
+    config = parse()
+    config.snapshot()
+    gc.collect()
+    assert KeepAlivedConfigSnapshot._active == active
+
+    snapshot = config.snapshot()
+    assert KeepAlivedConfigSnapshot._active == active + 1
+    snapshot.release()
+    snapshot.release()
+    assert KeepAlivedConfigSnapshot._active == active
+
+
+def test_lock_free_readers_see_a_consistent_version():
+    manager = KeepAlivedConfigManager(thread_safe=True)
+    manager.virtual_server.create_virtual_server("10.0.0.1", 80, delay_loop=1, persistence_timeout=1)
+    stop = threading.Event()
+    errors = []
+
+    def writer():
+        for i in range(2, 300):
+            with manager.write_locked():
+                manager.virtual_server.update_virtual_server("10.0.0.1", 80, delay_loop=i, persistence_timeout=i)
+                manager.virtual_server.add_real_server("10.0.0.1", 80, "10.0.1.1", i)
+        stop.set()
+
+    def reader():
+        while not stop.is_set():
+            with manager.snapshot() as snapshot:
+                vs = snapshot.params.find_one("virtual_server 10.0.0.1 80")
+                first = snapshot.to_str()
+                delay_loop = vs.params.find_one("delay_loop").value
+                persistence_timeout = vs.params.find_one("persistence_timeout").value
+                if delay_loop != persistence_timeout or snapshot.to_str() != first:
+                    errors.append((delay_loop, persistence_timeout))
+                if len(vs.params.find_keyword("real_server")) != int(delay_loop) - 1:
+                    errors.append(("real servers", delay_loop))
+
+    threads = [threading.Thread(target=target) for target in (writer, reader, reader)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+    assert errors == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -7,6 +7,7 @@ sys.path.append(SRC_DIR)
 
 from keepalived_config.keepalived_config_templates import KeepAlivedConfigTemplates
 from keepalived_config.keepalived_config import KeepAlivedConfig
+from keepalived_config.keepalived_config_exceptions import TemplateError
 
 
 def test_list_templates():
@@ -348,5 +349,176 @@ def test_udp_check_health_type():
     assert "delay_before_retry 5" in config_str
 
 
+def test_missing_placeholders_are_reported():
+    """Test that placeholders without value or default raise instead of leaking into the output"""
+    with pytest.raises(TemplateError) as exc_info:
+        KeepAlivedConfigTemplates.from_template("complete_vrrp_backup", "VI_1", interface="eth0")
+    assert "priority" in str(exc_info.value)
+    assert "virtual_router_id" in str(exc_info.value)
+
+    # defaults fill the optional placeholders, unused and None values are ignored
+    config = KeepAlivedConfigTemplates.from_template(
+        "complete_vrrp_backup",
+        "VI_1",
+        interface="eth0",
+        virtual_router_id=51,
+        priority=100,
+        advert_int=None,
+        unused_param="ignored",
+    )
+    config_str = config.params[0].to_str()
+    assert "{" not in config_str.replace(" {\n", "\n")
+    assert "advert_int 1" in config_str
+    assert "auth_pass CHANGEME" in config_str
+    assert "192.168.1.100/24" in config_str
+
+
+def test_invalid_placeholders_fail_at_registration():
+    """Test that malformed placeholders are reported when the template is registered"""
+    for value in ["{not valid}", "{unclosed", "{}"]:
+        with pytest.raises(TemplateError):
+            KeepAlivedConfigTemplates.register_template(
+                "broken_template", {"type": "test_block", "params": {"test_param": value}}
+            )
+    assert not KeepAlivedConfigTemplates.template_exists("broken_template")
+
+
+def test_template_placeholders_and_defaults():
+    """Test placeholder introspection, template defaults and list values"""
+    KeepAlivedConfigTemplates.register_template(
+        "vip_template",
+        {
+            "type": "vrrp_instance",
+            "params": {
+                "interface": "{interface}",
+                "priority": "{priority}",
+                "track_interface": ["{interface}", "lo"],
+                "virtual_ipaddress": ["{virtual_ipaddress}"],
+            },
+            "defaults": {"priority": 90},
+        },
+    )
+    try:
+        placeholders = KeepAlivedConfigTemplates.get_template_placeholders("vip_template")
+        assert placeholders == {
+            "interface": None,
+            "priority": 90,
+            "virtual_ipaddress": "192.168.1.100/24",
+        }
+
+        config = KeepAlivedConfigTemplates.from_template(
+            "vip_template",
+            "VI_LIST",
+            interface="eth1",
+            virtual_ipaddress=["10.0.0.1/24", "10.0.0.2/24"],
+        )
+        vrrp_block = config.params[0]
+        assert "priority 90" in vrrp_block.to_str()
+        vip_block = vrrp_block.params.find_one("virtual_ipaddress")
+        assert [param.value for param in vip_block.params] == ["10.0.0.1/24", "10.0.0.2/24"]
+        track_block = vrrp_block.params.find_one("track_interface")
+        assert [param.value for param in track_block.params] == ["eth1", "lo"]
+    finally:
+        KeepAlivedConfigTemplates.unregister_template("vip_template")
+
+
+def test_template_is_compiled_once():
+    """Test that the render plan is reused between calls"""
+    KeepAlivedConfigTemplates.from_template("basic_global", smtp_server="smtp.example.com",
+                                            notification_email_from="a@example.com", smtp_connect_timeout=30)
+    compiled = KeepAlivedConfigTemplates._get_compiled("basic_global")
+    KeepAlivedConfigTemplates.from_template("basic_global", smtp_server="smtp.example.com",
+                                            notification_email_from="a@example.com", smtp_connect_timeout=30)
+    assert KeepAlivedConfigTemplates._get_compiled("basic_global") is compiled
+
+
+def test_virtual_server_template_name_and_optional_http_params():
+    """Test that virtual server templates are named and unset optional HTTP params are left out"""
+    config = KeepAlivedConfigTemplates.from_template(
+        "basic_virtual_server",
+        virtual_server_ip="10.0.0.1",
+        virtual_server_port=443,
+        health_check_type="HTTP_GET",
+        http_url="/health",
+    )
+    config_str = config.params[0].to_str()
+    assert config.params[0].name == "virtual_server 10.0.0.1 443"
+    assert "url /health" in config_str
+    assert "digest" not in config_str
+    assert "status_code" not in config_str
+    assert "{" not in config_str.replace(" {\n", "\n")
+
+
+def test_render_many_row_formats():
+    """Test rendering a template for dict rows, dataclass rows and columnar input"""
+    from keepalived_config.keepalived_config_types import VRRPConfig
+
+    single = KeepAlivedConfigTemplates.from_template(
+        "complete_vrrp_backup", "VI_2", interface="eth0", virtual_router_id=52, priority=90
+    ).params[0].to_str()
+
+    dict_rows = [
+        {"instance_name": f"VI_{i}", "interface": "eth0", "virtual_router_id": 50 + i, "priority": 90}
+        for i in range(1, 4)
+    ]
+    columns = {
+        "instance_name": ["VI_1", "VI_2", "VI_3"],
+        "interface": ["eth0"] * 3,
+        "virtual_router_id": [51, 52, 53],
+        "priority": [90] * 3,
+    }
+    config_rows = [VRRPConfig(interface="eth0", virtual_router_id=50 + i, priority=90) for i in range(1, 4)]
+
+    for blocks in (
+        KeepAlivedConfigTemplates.render_many("complete_vrrp_backup", dict_rows),
+        KeepAlivedConfigTemplates.render_many("complete_vrrp_backup", columns),
+        KeepAlivedConfigTemplates.render_many(
+            "complete_vrrp_backup", config_rows, instance_names=["VI_1", "VI_2", "VI_3"]
+        ),
+    ):
+        assert [block.name for block in blocks] == [
+            "vrrp_instance VI_1", "vrrp_instance VI_2", "vrrp_instance VI_3",
+        ]
+        assert blocks[1].to_str() == single
+        # every block owns its nodes
+        assert blocks[0].params[0] is not blocks[1].params[0]
+
+    blocks = KeepAlivedConfigTemplates.render_many(
+        "complete_vrrp_backup",
+        [VRRPConfig(interface="eth1", virtual_router_id=1, virtual_ipaddresses=["10.0.0.1/24", "10.0.0.2/24"])],
+        instance_names=["VI_VIPS"],
+    )
+    vip_block = blocks[0].params.find_one("virtual_ipaddress")
+    assert [param.value for param in vip_block.params] == ["10.0.0.1/24", "10.0.0.2/24"]
+
+
+def test_render_many_stream_and_errors():
+    """Test streaming mode and row errors of render_many"""
+    rows = [{"virtual_server_ip": "10.0.0.1", "virtual_server_port": 80 + i} for i in range(3)]
+    rows.append({"virtual_server_ip": "10.0.0.1"})
+
+    blocks = KeepAlivedConfigTemplates.render_many("basic_virtual_server", iter(rows), stream=True)
+    assert not isinstance(blocks, list)
+    assert next(blocks).name == "virtual_server 10.0.0.1 80"
+    assert next(blocks).name == "virtual_server 10.0.0.1 81"
+    assert next(blocks).name == "virtual_server 10.0.0.1 82"
+    with pytest.raises(TemplateError) as exc_info:
+        next(blocks)
+    assert "Row 3" in str(exc_info.value)
+
+    with pytest.raises(TemplateError):
+        KeepAlivedConfigTemplates.render_many("basic_virtual_server", rows)
+
+    with pytest.raises(ValueError):
+        KeepAlivedConfigTemplates.render_many(
+            "complete_vrrp_backup", {"instance_name": ["VI_1"], "priority": [90, 100]}
+        )
+
+    with pytest.raises(ValueError):
+        KeepAlivedConfigTemplates.render_many(
+            "complete_vrrp_backup", [{"interface": "eth0", "virtual_router_id": 1, "priority": 90}]
+        )
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
@@ -0,0 +1,94 @@
+import os
+import sys
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.append(SRC_DIR)
+
+from keepalived_config.keepalived_config_tokenizer import (
+    KeepAlivedConfigTokenizer,
+    KeepAlivedConfigTokenTypes,
+)
+from keepalived_config.keepalived_config_comment import KeepAlivedConfigCommentTypes
+
+
+def tokenize(text):
+    return list(KeepAlivedConfigTokenizer().tokenize(text.split("\n")))
+
+
+def token_types(text):
+    return [token.type for token in tokenize(text)]
+
+
+def test_key_value_block():
+    tokens = tokenize("virtual_server 192.168.1.100 80 {")
+    assert [t.type for t in tokens] == [
+        KeepAlivedConfigTokenTypes.KEY,
+        KeepAlivedConfigTokenTypes.VALUE,
+        KeepAlivedConfigTokenTypes.BLOCK_START,
+    ]
+    assert tokens[0].value == "virtual_server"
+    assert tokens[1].value == "192.168.1.100 80"
+    assert all(t.line_nr == 1 for t in tokens)
+
+
+def test_block_end_and_blank():
+    assert token_types("}\n\n  ") == [
+        KeepAlivedConfigTokenTypes.BLOCK_END,
+        KeepAlivedConfigTokenTypes.BLANK,
+        KeepAlivedConfigTokenTypes.BLANK,
+    ]
+
+
+def test_comments():
+    tokens = tokenize("# generic comment\n! other comment")
+    assert [t.type for t in tokens] == [KeepAlivedConfigTokenTypes.COMMENT] * 2
+    assert tokens[0].value.comment_str == "generic comment"
+    assert tokens[0].value.type == KeepAlivedConfigCommentTypes.GENERIC
+    assert tokens[1].value.comment_str == "other comment"
+
+
+def test_inline_comment_precedes_key():
+    tokens = tokenize("lb_kind DR # direct routing")
+    assert [t.type for t in tokens] == [
+        KeepAlivedConfigTokenTypes.COMMENT,
+        KeepAlivedConfigTokenTypes.KEY,
+        KeepAlivedConfigTokenTypes.VALUE,
+    ]
+    assert tokens[0].value.type == KeepAlivedConfigCommentTypes.INLINE
+    assert tokens[0].value.comment_str == "direct routing"
+    assert tokens[2].value == "DR"
+
+
+def test_hash_without_space_is_part_of_value():
+    tokens = tokenize("auth_pass se#cret #x")
+    assert tokens[1].value == "se#cret #x"
+
+
+def test_single_value_without_key():
+    tokens = tokenize("192.168.1.100/24")
+    assert [t.type for t in tokens] == [KeepAlivedConfigTokenTypes.KEY]
+    assert tokens[0].value == "192.168.1.100/24"
+
+
+def test_trailing_newline_of_file_lines():
+    tokens = list(KeepAlivedConfigTokenizer().tokenize(["a 1\n", "b 2\n"]))
+    assert [t.type for t in tokens] == [
+        KeepAlivedConfigTokenTypes.KEY,
+        KeepAlivedConfigTokenTypes.VALUE,
+        KeepAlivedConfigTokenTypes.KEY,
+        KeepAlivedConfigTokenTypes.VALUE,
+        KeepAlivedConfigTokenTypes.BLANK,
+    ]
+
+
+def test_invalid_lines():
+    with pytest.raises(ValueError):
+        tokenize("this is { invalid")
+
+    with pytest.raises(ValueError):
+        tokenize("#")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,212 @@
+import os
+import sys
+import threading
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.append(SRC_DIR)
+
+from keepalived_config.keepalived_config_manager import KeepAlivedConfigManager
+from keepalived_config.keepalived_config_parser import KeepAlivedConfigParser
+from keepalived_config.keepalived_config_param import KeepAlivedConfigParam
+from keepalived_config.keepalived_config_block import KeepAlivedConfigBlock
+from keepalived_config.keepalived_config_comment import KeepAlivedConfigComment
+from keepalived_config.keepalived_config_diff import KeepAlivedConfigChangeTypes
+from keepalived_config.keepalived_config_exceptions import (
+    ConfigTransactionError,
+    VirtualServerNotFoundError,
+)
+
+
+CONFIG = """global_defs {
+    router_id LB1
+}
+
+vrrp_instance VI_1 {
+    state MASTER
+    interface eth0
+    virtual_router_id 51
+    priority 100
+    virtual_ipaddress {
+        10.0.0.100/24
+    }
+}
+
+virtual_server 10.0.0.100 80 {
+    delay_loop 6
+    lb_algo rr
+    lb_kind DR
+    protocol TCP
+    real_server 10.0.1.1 80 {
+        weight 1 # primary
+    }
+}
+"""
+
+
+def make_manager(**kwargs):
+    return KeepAlivedConfigManager(KeepAlivedConfigParser().parse_string(CONFIG), **kwargs)
+
+
+def test_rollback_on_error():
+    manager = make_manager()
+    config = manager.config
+    before = config.to_str()
+    # build the indexes, the rollback has to invalidate them
+    assert config.indexes.get_vrrp_instance_by_router_id("eth0", 51) == "VI_1"
+
+    with pytest.raises(VirtualServerNotFoundError):
+        with manager.transaction() as tx:
+            manager.vrrp.update_vrrp_instance("VI_1", priority=150, virtual_router_id=52)
+            manager.vrrp.create_vrrp_instance("VI_2", "BACKUP", "eth1", 60, 90)
+            manager.virtual_server.create_virtual_server("10.0.0.200", 443)
+            manager.virtual_server.update_real_server("10.0.0.100", 80, "10.0.1.1", 80, weight=5)
+            config.params.find_one("global_defs").params[0].comments.append(KeepAlivedConfigComment("note"))
+            config.params.pop(0)
+            assert tx.edits > 0
+            manager.virtual_server.add_real_server("10.0.0.1", 80, "10.0.1.2", 80)
+
+    assert not tx.active
+    assert config.to_str() == before
+    assert manager.vrrp_instances == ["VI_1"]
+    assert config.indexes.get_vrrp_instance_by_router_id("eth0", 51) == "VI_1"
+    assert config.indexes.get_vrrp_instance_by_router_id("eth1", 60) is None
+    assert len(manager.virtual_server.list_virtual_servers().data) == 1
+    assert manager.validate()
+    # the restored tree can be edited again
+    manager.virtual_server.add_real_server("10.0.0.100", 80, "10.0.1.2", 80)
+    assert len(manager.virtual_server.list_real_servers("10.0.0.100", 80).data) == 2
+
+
+def test_undo_log_is_proportional_to_edits():
+    text = "".join(
+        f"virtual_server 10.0.{i // 250}.{i % 250} 80 {{\n    delay_loop 6\n"
+        f"    real_server 10.1.{i // 250}.{i % 250} 80 {{\n        weight 1\n    }}\n}}\n"
+        for i in range(500)
+    )
+    manager = KeepAlivedConfigManager(KeepAlivedConfigParser().parse_string(text))
+    before = manager.config.to_str()
+
+    tx = manager.transaction()
+    for block in manager.config.params:
+        block.comments
+    assert tx.edits == 0
+    manager.virtual_server.update_real_server("10.0.0.10", 80, "10.1.0.10", 80, weight=3)
+    manager.virtual_server.add_real_server("10.0.0.20", 80, "10.1.0.99", 80)
+    # the weight param and the real server list of one virtual server
+    assert tx.edits == 2
+    tx.rollback()
+    assert manager.config.to_str() == before
+
+
+def test_nested_savepoints():
+    manager = make_manager()
+    vs = manager.virtual_server
+
+    with manager.transaction() as tx:
+        vs.create_virtual_server("10.0.0.200", 443)
+        with pytest.raises(RuntimeError):
+            with tx.savepoint() as savepoint:
+                assert savepoint.parent is tx
+                vs.add_real_server("10.0.0.200", 443, "10.0.2.1", 443)
+                raise RuntimeError("undo the savepoint only")
+        assert vs.list_real_servers("10.0.0.200", 443).data == []
+
+        # a nested transaction is a savepoint as well
+        with manager.transaction() as inner:
+            assert inner.parent is tx
+            vs.add_real_server("10.0.0.200", 443, "10.0.2.2", 443)
+            with pytest.raises(ConfigTransactionError):
+                tx.savepoint()
+            deeper = inner.savepoint()
+            vs.remove_real_server("10.0.0.200", 443, "10.0.2.2", 443)
+            deeper.rollback()
+
+    assert not tx.active
+    assert vs.get_real_server("10.0.0.200", 443, "10.0.2.2", 443)
+    assert len(vs.list_real_servers("10.0.0.200", 443).data) == 1
+    with pytest.raises(ConfigTransactionError):
+        tx.commit()
+    with pytest.raises(ConfigTransactionError):
+        tx.rollback()
+
+
+def test_save_hook_receives_the_change_set(tmp_path):
+    manager = make_manager()
+    calls = []
+
+    with manager.transaction(save_hook=calls.append) as tx:
+        manager.vrrp.update_vrrp_instance("VI_1", priority=150)
+        manager.virtual_server.add_real_server("10.0.0.100", 80, "10.0.1.2", 80)
+        with pytest.raises(ConfigTransactionError):
+            manager.transaction(save_hook=calls.append)
+
+    assert len(calls) == 1
+    assert calls[0] is tx.changes
+    changes = {(change.type, change.path[-1]) for change in tx.changes}
+    assert (KeepAlivedConfigChangeTypes.MODIFIED, "priority") in changes
+    assert (KeepAlivedConfigChangeTypes.ADDED, "real_server 10.0.1.2 80") in changes
+
+    # nothing changed, nothing to save
+    with manager.transaction(save_hook=calls.append) as tx:
+        manager.vrrp.update_vrrp_instance("VI_1", priority=150)
+    assert tx.changes == []
+    assert len(calls) == 1
+
+    # a failing hook rolls the transaction back
+    target = tmp_path / "keepalived.conf"
+    before = manager.config.to_str()
+
+    def save(changes):
+        manager.save_config(str(target))
+        raise OSError("replication failed")
+
+    with pytest.raises(OSError):
+        with manager.transaction(save_hook=save):
+            manager.virtual_server.remove_real_server("10.0.0.100", 80, "10.0.1.1", 80)
+    assert manager.config.to_str() == before
+
+
+def test_rollback_of_replaced_params_and_config(tmp_path):
+    manager = make_manager()
+    config = manager.config
+    before = config.to_str()
+    config_file = tmp_path / "keepalived.conf"
+    config_file.write_text("global_defs {\n    router_id LB2\n}\n")
+
+    with manager.transaction() as tx:
+        config.set_params(list(config.params) + [KeepAlivedConfigParam("enable_script_security")])
+        manager.load_config(str(config_file))
+        assert manager.vrrp_instances == []
+        tx.rollback()
+
+    assert manager.config is config
+    assert manager.vrrp.config is config
+    assert config.to_str() == before
+    assert all(item._parent is config.params for item in config.params)
+    config.params.append(KeepAlivedConfigBlock("vrrp_sync_group", "G1"))
+    assert "vrrp_sync_group G1 {" in config.to_str()
+
+
+def test_transaction_holds_the_write_lock():
+    manager = make_manager(thread_safe=True)
+    started = threading.Event()
+    seen = []
+
+    def reader():
+        started.set()
+        # waits until the transaction has finished
+        seen.append(len(manager.virtual_server.list_real_servers("10.0.0.100", 80).data))
+
+    with manager.transaction():
+        thread = threading.Thread(target=reader)
+        thread.start()
+        started.wait(5)
+        manager.virtual_server.add_real_server("10.0.0.100", 80, "10.0.1.2", 80)
+        manager.virtual_server.add_real_server("10.0.0.100", 80, "10.0.1.3", 80)
+    thread.join(timeout=10)
+    assert seen == [3]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
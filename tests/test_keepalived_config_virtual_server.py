@@ -9,6 +9,11 @@ from keepalived_config.keepalived_config import KeepAlivedConfig
 from keepalived_config.keepalived_config_virtual_server import KeepAlivedConfigVirtualServer
 from keepalived_config.keepalived_config_block import KeepAlivedConfigBlock
 from keepalived_config.keepalived_config_param import KeepAlivedConfigParam
+from keepalived_config.keepalived_config_exceptions import (
+    RealServerExistsError,
+    RealServerNotFoundError,
+    VirtualServerNotFoundError,
+)
 
 
 def test_create_virtual_server():
@@ -909,5 +914,107 @@ def test_create_virtual_server_with_config_object_and_override():
     assert "protocol TCP" in config_str  # 被覆盖
 
 
+def _create_bulk_virtual_server():
+    config = KeepAlivedConfig()
+    vs_manager = KeepAlivedConfigVirtualServer(config)
+    vs_manager.create_virtual_server("192.168.1.100", 80)
+    return config, vs_manager
+
+
+def test_add_real_servers():
+    """Test adding real servers in bulk"""
+    config, vs_manager = _create_bulk_virtual_server()
+    vs_manager.add_real_server("192.168.1.100", 80, "10.0.0.1", 8080)
+
+    result = vs_manager.add_real_servers("192.168.1.100", 80, [
+        {"real_server_ip": "10.0.0.2", "real_server_port": 8080, "weight": 3},
+        {"real_server_ip": "10.0.0.1", "real_server_port": 8080},
+        {"real_server_ip": "10.0.0.3", "real_server_port": 8080, "health_check": "HTTP_GET",
+         "health_check_params": {"url": "/health", "status_code": 200}},
+        {"real_server_ip": "10.0.0.3", "real_server_port": 8080},
+        {"real_server_ip": "10.0.0.4", "real_server_port": 8080, "weight": -1},
+        {"real_server_ip": "10.0.0.5"},
+        {"real_server_ip": "10.0.0.6", "real_server_port": 8080, "wieght": 1},
+    ])
+
+    assert result.success is False
+    assert [item.success for item in result.data] == [True, False, True, False, False, False, False]
+    assert isinstance(result.data[1].error, RealServerExistsError)
+    assert isinstance(result.data[3].error, RealServerExistsError)
+    assert "wieght" in result.data[6].message
+
+    assert vs_manager.list_real_servers("192.168.1.100", 80).data == [
+        "10.0.0.1 8080", "10.0.0.2 8080", "10.0.0.3 8080",
+    ]
+    rs_block = vs_manager.get_real_server("192.168.1.100", 80, "10.0.0.3", 8080).data
+    assert rs_block is result.data[2].data
+    assert "url /health" in rs_block.to_str()
+    assert "weight 3" in vs_manager.get_real_server("192.168.1.100", 80, "10.0.0.2", 8080).data.to_str()
+
+    # the bulk result matches adding the same server one by one
+    single_config, single_manager = _create_bulk_virtual_server()
+    single_manager.add_real_server("192.168.1.100", 80, "10.0.0.1", 8080)
+    single_manager.add_real_server("192.168.1.100", 80, "10.0.0.2", 8080, weight=3)
+    single_manager.add_real_server("192.168.1.100", 80, "10.0.0.3", 8080, health_check="HTTP_GET",
+                                   health_check_params={"url": "/health", "status_code": 200})
+    assert config.to_str() == single_config.to_str()
+
+    with pytest.raises(VirtualServerNotFoundError):
+        vs_manager.add_real_servers("192.168.1.200", 80, [])
+
+
+def test_remove_real_servers():
+    """Test removing real servers in bulk"""
+    _, vs_manager = _create_bulk_virtual_server()
+    vs_manager.add_real_servers("192.168.1.100", 80, [
+        {"real_server_ip": f"10.0.0.{i}", "real_server_port": 8080} for i in range(1, 6)
+    ])
+
+    result = vs_manager.remove_real_servers("192.168.1.100", 80, [
+        ("10.0.0.2", 8080),
+        {"real_server_ip": "10.0.0.4", "real_server_port": 8080},
+        ("10.0.0.2", 8080),
+        ("10.0.0.9", 8080),
+    ])
+
+    assert result.success is False
+    assert [item.success for item in result.data] == [True, True, False, False]
+    assert isinstance(result.data[3].error, RealServerNotFoundError)
+    assert vs_manager.list_real_servers("192.168.1.100", 80).data == [
+        "10.0.0.1 8080", "10.0.0.3 8080", "10.0.0.5 8080",
+    ]
+    assert vs_manager.get_real_server("192.168.1.100", 80, "10.0.0.2", 8080).success is False
+
+    result = vs_manager.remove_real_servers("192.168.1.100", 80, [("10.0.0.1", 8080)])
+    assert result.success is True
+
+
+def test_update_real_servers():
+    """Test updating real servers in bulk"""
+    _, vs_manager = _create_bulk_virtual_server()
+    vs_manager.add_real_servers("192.168.1.100", 80, [
+        {"real_server_ip": "10.0.0.1", "real_server_port": 8080},
+        {"real_server_ip": "10.0.0.2", "real_server_port": 8080},
+    ])
+
+    result = vs_manager.update_real_servers("192.168.1.100", 80, [
+        {"real_server_ip": "10.0.0.1", "real_server_port": 8080, "weight": 0},
+        {"real_server_ip": "10.0.0.2", "real_server_port": 8080,
+         "health_check_params": {"connect_timeout": 10}},
+    ])
+    assert result.success is True
+    assert "weight 0" in result.data[0].data.to_str()
+    assert "connect_timeout 10" in result.data[1].data.to_str()
+
+    result = vs_manager.update_real_servers("192.168.1.100", 80, [
+        {"real_server_ip": "10.0.0.1", "real_server_port": 8080, "weight": -1},
+        {"real_server_ip": "10.0.0.9", "real_server_port": 8080, "weight": 1},
+        {"real_server_ip": "10.0.0.2", "real_server_port": 8080, "weight": 5},
+    ])
+    assert [item.success for item in result.data] == [False, False, True]
+    assert "weight 0" in vs_manager.get_real_server("192.168.1.100", 80, "10.0.0.1", 8080).data.to_str()
+    assert "weight 5" in vs_manager.get_real_server("192.168.1.100", 80, "10.0.0.2", 8080).data.to_str()
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
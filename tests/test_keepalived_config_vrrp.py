@@ -608,5 +608,167 @@ def test_create_vrrp_instance_with_config_object_and_override():
     assert "advert_int 2" in config_str  # 被覆盖
 
 
+def test_get_vrrp_instance_exact_name():
+    """Test that instance lookups match the whole instance name"""
+    config = KeepAlivedConfig()
+    vrrp_manager = KeepAlivedConfigVRRP(config)
+    vrrp_manager.create_vrrp_instance(
+        instance_name="XVI_1",
+        state="MASTER",
+        interface="eth0",
+        virtual_router_id=51,
+        priority=100,
+    )
+
+    assert vrrp_manager.get_vrrp_instance("VI_1") is None
+    assert vrrp_manager.get_vrrp_instance("XVI_1") is config.params[0]
+
+
+def test_create_vrrp_instances():
+    """Test creating VRRP instances in bulk"""
+    from keepalived_config.keepalived_config_types import VRRPConfig
+
+    config = KeepAlivedConfig()
+    vrrp_manager = KeepAlivedConfigVRRP(config)
+    vrrp_manager.create_vrrp_instance("VI_0", interface="eth0", virtual_router_id=50)
+
+    result = vrrp_manager.create_vrrp_instances({
+        "VI_1": VRRPConfig(interface="eth0", virtual_router_id=51, virtual_ipaddresses=["10.0.0.1/24"]),
+        "VI_2": VRRPConfig(interface="eth1", virtual_router_id=51, state="MASTER"),
+        "VI_3": None,
+    })
+    assert result.success is False
+    # VI_3 uses the default virtual_router_id 51 on eth0, already taken by VI_1
+    assert list(result.data) == ["VI_3"]
+    assert vrrp_manager.list_vrrp_instances() == ["VI_0"]
+
+    result = vrrp_manager.create_vrrp_instances({
+        "VI_0": VRRPConfig(virtual_router_id=60),
+        "VI_1": VRRPConfig(interface="eth0", virtual_router_id=50),
+        "VI_2": VRRPConfig(virtual_router_id=300),
+        "VI_3": VRRPConfig(virtual_router_id=61),
+    })
+    assert result.success is False
+    assert sorted(result.data) == ["VI_0", "VI_1", "VI_2"]
+    assert "VI_0" in result.data["VI_1"]
+    assert vrrp_manager.list_vrrp_instances() == ["VI_0"]
+
+    result = vrrp_manager.create_vrrp_instances({
+        "VI_1": VRRPConfig(interface="eth0", virtual_router_id=51, virtual_ipaddresses=["10.0.0.1/24"]),
+        "VI_2": VRRPConfig(interface="eth1", virtual_router_id=51, state="MASTER"),
+    })
+    assert result.success is True
+    assert [block.name for block in result.data] == ["vrrp_instance VI_1", "vrrp_instance VI_2"]
+    assert vrrp_manager.list_vrrp_instances() == ["VI_0", "VI_1", "VI_2"]
+    assert vrrp_manager.get_vrrp_instance("VI_2") is result.data[1]
+
+    # the bulk result matches creating the same instance one by one
+    single_config = KeepAlivedConfig()
+    KeepAlivedConfigVRRP(single_config).create_vrrp_instance(
+        "VI_1", config=VRRPConfig(interface="eth0", virtual_router_id=51, virtual_ipaddresses=["10.0.0.1/24"])
+    )
+    assert single_config.params[0].to_str() == result.data[0].to_str()
+
+
+def test_update_vrrp_instances():
+    """Test updating VRRP instances in bulk"""
+    from keepalived_config.keepalived_config_types import VRRPConfig
+
+    config = KeepAlivedConfig()
+    vrrp_manager = KeepAlivedConfigVRRP(config)
+    vrrp_manager.create_vrrp_instances({
+        "VI_1": VRRPConfig(interface="eth0", virtual_router_id=51),
+        "VI_2": VRRPConfig(interface="eth0", virtual_router_id=52),
+    })
+
+    result = vrrp_manager.update_vrrp_instances({
+        "VI_1": {"priority": 150},
+        "VI_2": {"virtual_router_id": 51},
+        "VI_3": {"priority": 150},
+        "VI_4": {"priorty": 150},
+    })
+    assert result.success is False
+    assert sorted(result.data) == ["VI_3", "VI_4"]
+    assert "priority 100" in vrrp_manager.get_vrrp_instance("VI_1").to_str()
+
+    result = vrrp_manager.update_vrrp_instances({
+        "VI_1": {"priority": 150},
+        "VI_2": {"virtual_router_id": 51},
+    })
+    assert result.success is False
+    assert list(result.data) == ["VI_2"]
+    assert "priority 100" in vrrp_manager.get_vrrp_instance("VI_1").to_str()
+
+    # swapping router ids between the updated instances is allowed
+    result = vrrp_manager.update_vrrp_instances({
+        "VI_1": {"virtual_router_id": 52, "priority": 150},
+        "VI_2": VRRPConfig(interface="eth0", virtual_router_id=51, state="MASTER"),
+    })
+    assert result.success is True
+    vi_1 = vrrp_manager.get_vrrp_instance("VI_1").to_str()
+    vi_2 = vrrp_manager.get_vrrp_instance("VI_2").to_str()
+    assert "virtual_router_id 52" in vi_1 and "priority 150" in vi_1
+    assert "virtual_router_id 51" in vi_2 and "state MASTER" in vi_2
+
+
+def test_allocate_and_release_vrid():
+    """Test the free VRID allocator"""
+    from keepalived_config.keepalived_config_parser import KeepAlivedConfigParser
+
+    config = KeepAlivedConfigParser().parse_string(
+        "vrrp_instance VI_1 {\n    interface eth1\n    virtual_router_id 1\n}\n"
+        "vrrp_instance VI_2 {\n    interface eth1\n    virtual_router_id 3\n}\n"
+    )
+    vrrp_manager = KeepAlivedConfigVRRP(config)
+
+    # allocated ids are reserved until they are used or released
+    assert vrrp_manager.allocate_vrid("eth1").data == 2
+    assert vrrp_manager.allocate_vrid("eth1").data == 4
+    assert vrrp_manager.allocate_vrid("eth0").data == 1
+    assert vrrp_manager.release_vrid("eth1", 2)
+    assert not vrrp_manager.release_vrid("eth1", 2)
+    assert not vrrp_manager.release_vrid("eth1", 3)
+    assert vrrp_manager.allocate_vrid("eth1").data == 2
+
+    # creating an instance consumes the reservation, removing it frees the id
+    assert vrrp_manager.create_vrrp_instance("VI_4", interface="eth1", virtual_router_id=4)
+    assert not vrrp_manager.release_vrid("eth1", 4)
+    vrrp_manager.remove_vrrp_instance("VI_4")
+    assert vrrp_manager.allocate_vrid("eth1").data == 4
+
+    # every id of the interface is in use
+    for virtual_router_id in range(5, 256):
+        assert vrrp_manager.allocate_vrid("eth1").data == virtual_router_id
+    result = vrrp_manager.allocate_vrid("eth1")
+    assert not result
+    assert result.data is None
+
+
+def test_vrid_collisions():
+    """Test VRID collision detection on create and update"""
+    config = KeepAlivedConfig()
+    vrrp_manager = KeepAlivedConfigVRRP(config)
+    assert vrrp_manager.create_vrrp_instance("VI_1", interface="eth0", virtual_router_id=51)
+
+    result = vrrp_manager.create_vrrp_instance("VI_2", interface="eth0", virtual_router_id=51)
+    assert not result
+    assert "VI_1" in result.message
+    assert vrrp_manager.get_vrrp_instance("VI_2") is None
+
+    result = vrrp_manager.create_from_template(
+        "complete_vrrp_backup", "VI_2", interface="eth0", virtual_router_id=51, priority=90
+    )
+    assert not result
+    assert vrrp_manager.get_vrrp_instance("VI_2") is None
+
+    # the same id on another interface is fine
+    assert vrrp_manager.create_vrrp_instance("VI_2", interface="eth1", virtual_router_id=51)
+    assert not vrrp_manager.update_vrrp_instance("VI_2", interface="eth0")
+    assert vrrp_manager.update_vrrp_instance("VI_2", interface="eth0", virtual_router_id=52)
+    # an instance does not collide with itself
+    assert vrrp_manager.update_vrrp_instance("VI_2", virtual_router_id=52, priority=90)
+    assert config.indexes.get_router_ids("eth0") == {51: "VI_1", 52: "VI_2"}
+
+
 if __name__ == "__main__":
-    pytest.main([__file__])
\ No newline at end of file
+    pytest.main([__file__])